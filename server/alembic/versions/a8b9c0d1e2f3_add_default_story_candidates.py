@@ -0,0 +1,112 @@
+"""add_default_story_candidates
+
+Revision ID: a8b9c0d1e2f3
+Revises: f7a8b9c0d1e2
+Create Date: 2026-10-16 00:00:00.000000
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy import text
+from sqlalchemy.dialects.postgresql import UUID
+
+# revision identifiers, used by Alembic.
+revision: str = "a8b9c0d1e2f3"
+down_revision: Union[str, None] = "f7a8b9c0d1e2"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Dense integer ids over the person tag instances with a story order, so
+    # the default story can be sampled by id instead of ORDER BY RANDOM().
+    op.create_table(
+        "default_story_candidates",
+        sa.Column("id", sa.BigInteger, primary_key=True, autoincrement=True),
+        sa.Column(
+            "tag_instance_id",
+            UUID(as_uuid=True),
+            sa.ForeignKey("tag_instances.id", ondelete="CASCADE"),
+            nullable=False,
+            unique=True,
+        ),
+    )
+
+    # Rows are only ever added, when a person tag instance first gets a story
+    # order. Readers skip rows whose story order has since been cleared, so a
+    # rebalance (which clears and rewrites the order) leaves the ids dense.
+    op.execute(
+        text(
+            """
+            CREATE FUNCTION add_default_story_candidate() RETURNS trigger AS $$
+            BEGIN
+                INSERT INTO default_story_candidates (tag_instance_id)
+                SELECT NEW.id
+                WHERE EXISTS (
+                    SELECT 1 FROM tags WHERE id = NEW.tag_id AND type = 'PERSON'
+                )
+                AND NOT EXISTS (
+                    SELECT 1 FROM default_story_candidates
+                    WHERE tag_instance_id = NEW.id
+                )
+                ON CONFLICT DO NOTHING;
+                RETURN NULL;
+            END;
+            $$ LANGUAGE plpgsql;
+            """
+        )
+    )
+    op.execute(
+        text(
+            """
+            CREATE TRIGGER tag_instances_default_story_candidate_insert
+            AFTER INSERT ON tag_instances
+            FOR EACH ROW WHEN (NEW.story_order IS NOT NULL)
+            EXECUTE FUNCTION add_default_story_candidate();
+            """
+        )
+    )
+    op.execute(
+        text(
+            """
+            CREATE TRIGGER tag_instances_default_story_candidate_update
+            AFTER UPDATE OF story_order ON tag_instances
+            FOR EACH ROW WHEN (OLD.story_order IS NULL AND NEW.story_order IS NOT NULL)
+            EXECUTE FUNCTION add_default_story_candidate();
+            """
+        )
+    )
+
+    op.execute(
+        text(
+            """
+            INSERT INTO default_story_candidates (tag_instance_id)
+            SELECT tag_instances.id
+            FROM tag_instances
+            JOIN tags ON tags.id = tag_instances.tag_id
+            WHERE tag_instances.story_order IS NOT NULL
+            AND tags.type = 'PERSON'
+            ORDER BY tag_instances.id;
+            """
+        )
+    )
+
+
+def downgrade() -> None:
+    op.execute(
+        text(
+            "DROP TRIGGER IF EXISTS tag_instances_default_story_candidate_update "
+            "ON tag_instances;"
+        )
+    )
+    op.execute(
+        text(
+            "DROP TRIGGER IF EXISTS tag_instances_default_story_candidate_insert "
+            "ON tag_instances;"
+        )
+    )
+    op.execute(text("DROP FUNCTION IF EXISTS add_default_story_candidate();"))
+    op.drop_table("default_story_candidates")
@@ -0,0 +1,33 @@
+"""add_revisions_table
+
+Revision ID: b9c0d1e2f3a4
+Revises: a8b9c0d1e2f3
+Create Date: 2026-10-16 00:00:00.000000
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects.postgresql import BIGINT, VARCHAR
+
+# revision identifiers, used by Alembic.
+revision: str = "b9c0d1e2f3a4"
+down_revision: Union[str, None] = "a8b9c0d1e2f3"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Per-story (and global event) revision counters, served as ETags so
+    # unchanged /history and /history/nearby responses can be revalidated.
+    op.create_table(
+        "revisions",
+        sa.Column("key", VARCHAR, primary_key=True),
+        sa.Column("revision", BIGINT, nullable=False),
+    )
+
+
+def downgrade() -> None:
+    op.drop_table("revisions")
@@ -0,0 +1,67 @@
+"""add_year_and_sort_key_columns
+
+Revision ID: c0d1e2f3a4b5
+Revises: b9c0d1e2f3a4
+Create Date: 2026-10-16 00:00:00.000000
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+from sqlalchemy import text
+
+# revision identifiers, used by Alembic.
+revision: str = "c0d1e2f3a4b5"
+down_revision: Union[str, None] = "b9c0d1e2f3a4"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+TABLES = ("times", "summaries")
+
+
+def upgrade() -> None:
+    # Numeric forms of the wikidata datetime string, so that story ordering
+    # and year ranges no longer compare or parse strings at query time
+    # ('+' sorts before '-', which put BCE dates after CE ones):
+    #   year:     '-0500-03-21T00:00:00Z' -> -500
+    #   sort_key: time_key * 100 + precision, a total order of datetime and
+    #             precision, see apps.history.time_key.
+    # A datetime without a sign, as ISO dates are written, is a positive year.
+    # Both are generated, so existing rows are filled in here and new rows on
+    # insert.
+    for table in TABLES:
+        op.execute(
+            text(
+                f"""
+                ALTER TABLE {table}
+                ADD COLUMN year BIGINT GENERATED ALWAYS AS (
+                    CASE WHEN datetime ~ '^[+-]?[0-9]+-' THEN
+                        (CASE WHEN left(datetime, 1) = '-' THEN -1 ELSE 1 END)
+                        * substring(datetime from '^[+-]?([0-9]+)-')::bigint
+                    END
+                ) STORED,
+                ADD COLUMN sort_key BIGINT GENERATED ALWAYS AS (
+                    CASE WHEN datetime ~ '^[+-]?[0-9]+-[0-9]{{2}}-[0-9]{{2}}' THEN
+                        ((CASE WHEN left(datetime, 1) = '-' THEN -1 ELSE 1 END)
+                        * substring(datetime from '^[+-]?([0-9]+)-')::bigint * 10000
+                        + substring(datetime from '^[+-]?[0-9]+-([0-9]{{2}})')::bigint * 100
+                        + substring(datetime from '^[+-]?[0-9]+-[0-9]{{2}}-([0-9]{{2}})')::bigint)
+                        * 100 + coalesce(precision, 0)
+                    END
+                ) STORED;
+                """
+            )
+        )
+        op.execute(text(f"CREATE INDEX idx_{table}_sort_key ON {table} (sort_key);"))
+
+
+def downgrade() -> None:
+    for table in TABLES:
+        op.execute(text(f"DROP INDEX IF EXISTS idx_{table}_sort_key;"))
+        op.execute(
+            text(
+                f"ALTER TABLE {table} DROP COLUMN IF EXISTS sort_key, "
+                "DROP COLUMN IF EXISTS year;"
+            )
+        )
@@ -0,0 +1,230 @@
+"""add_story_stats_table
+
+Revision ID: d1e2f3a4b5c6
+Revises: c0d1e2f3a4b5
+Create Date: 2026-10-17 00:00:00.000000
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy import text
+from sqlalchemy.dialects.postgresql import BIGINT, INTEGER, UUID, VARCHAR
+
+# revision identifiers, used by Alembic.
+revision: str = "d1e2f3a4b5c6"
+down_revision: Union[str, None] = "c0d1e2f3a4b5"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # One row of precomputed metadata per story, keyed by tag id for wikidata
+    # stories and by stories.id for text-reader stories, so that story names
+    # and year ranges are read without aggregating over the story's events.
+    op.create_table(
+        "story_stats",
+        sa.Column("story_id", UUID(as_uuid=True), primary_key=True),
+        sa.Column("name", VARCHAR, nullable=True),
+        sa.Column("description", VARCHAR, nullable=True),
+        sa.Column("event_count", INTEGER, nullable=False, server_default="0"),
+        sa.Column("earliest_year", BIGINT, nullable=True),
+        sa.Column("latest_year", BIGINT, nullable=True),
+        sa.Column("earliest_sort_key", BIGINT, nullable=True),
+        sa.Column("latest_sort_key", BIGINT, nullable=True),
+        sa.Column("earliest_datetime", VARCHAR, nullable=True),
+        sa.Column("latest_datetime", VARCHAR, nullable=True),
+    )
+
+    # Events are only ever added to a story, so each new tag instance or
+    # story summary folds its summary into the row. The summary already
+    # exists, with its time, when it is linked to a story.
+    op.execute(
+        text(
+            """
+            CREATE FUNCTION add_story_stats_event() RETURNS trigger AS $$
+            DECLARE
+                target_story_id UUID;
+            BEGIN
+                IF TG_TABLE_NAME = 'tag_instances' THEN
+                    target_story_id := NEW.tag_id;
+                ELSE
+                    target_story_id := NEW.story_id;
+                END IF;
+                INSERT INTO story_stats AS stats (
+                    story_id, event_count, earliest_year, latest_year,
+                    earliest_sort_key, latest_sort_key,
+                    earliest_datetime, latest_datetime
+                )
+                SELECT
+                    target_story_id, 1, s.year, s.year,
+                    s.sort_key, s.sort_key, s.datetime, s.datetime
+                FROM summaries s
+                WHERE s.id = NEW.summary_id
+                ON CONFLICT (story_id) DO UPDATE SET
+                    event_count = stats.event_count + 1,
+                    earliest_year = LEAST(stats.earliest_year, EXCLUDED.earliest_year),
+                    latest_year = GREATEST(stats.latest_year, EXCLUDED.latest_year),
+                    earliest_datetime = CASE
+                        WHEN EXCLUDED.earliest_sort_key < stats.earliest_sort_key
+                            OR stats.earliest_sort_key IS NULL
+                        THEN EXCLUDED.earliest_datetime
+                        ELSE stats.earliest_datetime
+                    END,
+                    latest_datetime = CASE
+                        WHEN EXCLUDED.latest_sort_key > stats.latest_sort_key
+                            OR stats.latest_sort_key IS NULL
+                        THEN EXCLUDED.latest_datetime
+                        ELSE stats.latest_datetime
+                    END,
+                    earliest_sort_key = LEAST(
+                        stats.earliest_sort_key, EXCLUDED.earliest_sort_key
+                    ),
+                    latest_sort_key = GREATEST(
+                        stats.latest_sort_key, EXCLUDED.latest_sort_key
+                    );
+                RETURN NULL;
+            END;
+            $$ LANGUAGE plpgsql;
+            """
+        )
+    )
+    for table in ("tag_instances", "story_summaries"):
+        op.execute(
+            text(
+                f"""
+                CREATE TRIGGER {table}_story_stats_insert
+                AFTER INSERT ON {table}
+                FOR EACH ROW EXECUTE FUNCTION add_story_stats_event();
+                """
+            )
+        )
+
+    # A wikidata story's primary name is the first one given to it, and its
+    # description the first one which is not null.
+    op.execute(
+        text(
+            """
+            CREATE FUNCTION add_story_stats_name() RETURNS trigger AS $$
+            BEGIN
+                INSERT INTO story_stats AS stats (story_id, name, description)
+                VALUES (NEW.tag_id, NEW.name, NEW.description)
+                ON CONFLICT (story_id) DO UPDATE SET
+                    name = COALESCE(stats.name, EXCLUDED.name),
+                    description = COALESCE(stats.description, EXCLUDED.description);
+                RETURN NULL;
+            END;
+            $$ LANGUAGE plpgsql;
+            """
+        )
+    )
+    op.execute(
+        text(
+            """
+            CREATE TRIGGER story_names_story_stats_insert
+            AFTER INSERT ON story_names
+            FOR EACH ROW EXECUTE FUNCTION add_story_stats_name();
+            """
+        )
+    )
+    op.execute(
+        text(
+            """
+            CREATE FUNCTION set_story_stats_name() RETURNS trigger AS $$
+            BEGIN
+                INSERT INTO story_stats AS stats (story_id, name, description)
+                VALUES (NEW.id, NEW.name, NEW.description)
+                ON CONFLICT (story_id) DO UPDATE SET
+                    name = EXCLUDED.name,
+                    description = EXCLUDED.description;
+                RETURN NULL;
+            END;
+            $$ LANGUAGE plpgsql;
+            """
+        )
+    )
+    op.execute(
+        text(
+            """
+            CREATE TRIGGER stories_story_stats_upsert
+            AFTER INSERT OR UPDATE OF name, description ON stories
+            FOR EACH ROW EXECUTE FUNCTION set_story_stats_name();
+            """
+        )
+    )
+
+    op.execute(
+        text(
+            """
+            WITH names AS (
+                SELECT
+                    tag_id AS story_id,
+                    (array_agg(name))[1] AS name,
+                    (array_agg(description) FILTER (
+                        WHERE description IS NOT NULL
+                    ))[1] AS description
+                FROM story_names
+                GROUP BY tag_id
+                UNION ALL
+                SELECT id, name, description FROM stories
+            ),
+            events AS (
+                SELECT
+                    story_events.story_id,
+                    COUNT(*) AS event_count,
+                    MIN(s.year) AS earliest_year,
+                    MAX(s.year) AS latest_year,
+                    MIN(s.sort_key) AS earliest_sort_key,
+                    MAX(s.sort_key) AS latest_sort_key,
+                    (array_agg(s.datetime ORDER BY s.sort_key) FILTER (
+                        WHERE s.sort_key IS NOT NULL
+                    ))[1] AS earliest_datetime,
+                    (array_agg(s.datetime ORDER BY s.sort_key DESC) FILTER (
+                        WHERE s.sort_key IS NOT NULL
+                    ))[1] AS latest_datetime
+                FROM (
+                    SELECT tag_id AS story_id, summary_id FROM tag_instances
+                    UNION ALL
+                    SELECT story_id, summary_id FROM story_summaries
+                ) story_events
+                JOIN summaries s ON s.id = story_events.summary_id
+                GROUP BY story_events.story_id
+            )
+            INSERT INTO story_stats (
+                story_id, name, description, event_count,
+                earliest_year, latest_year, earliest_sort_key, latest_sort_key,
+                earliest_datetime, latest_datetime
+            )
+            SELECT
+                COALESCE(names.story_id, events.story_id),
+                names.name,
+                names.description,
+                COALESCE(events.event_count, 0),
+                events.earliest_year,
+                events.latest_year,
+                events.earliest_sort_key,
+                events.latest_sort_key,
+                events.earliest_datetime,
+                events.latest_datetime
+            FROM names
+            FULL OUTER JOIN events ON events.story_id = names.story_id;
+            """
+        )
+    )
+
+
+def downgrade() -> None:
+    op.execute(text("DROP TRIGGER IF EXISTS stories_story_stats_upsert ON stories;"))
+    op.execute(
+        text("DROP TRIGGER IF EXISTS story_names_story_stats_insert ON story_names;")
+    )
+    for table in ("tag_instances", "story_summaries"):
+        op.execute(
+            text(f"DROP TRIGGER IF EXISTS {table}_story_stats_insert ON {table};")
+        )
+    op.execute(text("DROP FUNCTION IF EXISTS set_story_stats_name();"))
+    op.execute(text("DROP FUNCTION IF EXISTS add_story_stats_name();"))
+    op.execute(text("DROP FUNCTION IF EXISTS add_story_stats_event();"))
+    op.drop_table("story_stats")
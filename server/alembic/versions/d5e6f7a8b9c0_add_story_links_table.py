@@ -0,0 +1,62 @@
+"""add_story_links_table
+
+Revision ID: d5e6f7a8b9c0
+Revises: c4d5e6f7a8b9
+Create Date: 2026-10-16 00:00:00.000000
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects.postgresql import UUID, VARCHAR
+
+# revision identifiers, used by Alembic.
+revision: str = "d5e6f7a8b9c0"
+down_revision: Union[str, None] = "c4d5e6f7a8b9"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # One row per (story, direction): where the /history walk continues after
+    # the last (or before the first) event of the story. Rows are written when
+    # story order is calculated; stories without a row fall back to resolving
+    # the related story at read time.
+    op.create_table(
+        "story_links",
+        sa.Column(
+            "tag_id",
+            UUID(as_uuid=True),
+            sa.ForeignKey("tags.id", ondelete="CASCADE"),
+            primary_key=True,
+        ),
+        sa.Column("direction", VARCHAR, primary_key=True),
+        sa.Column(
+            "summary_id",
+            UUID(as_uuid=True),
+            sa.ForeignKey("summaries.id", ondelete="CASCADE"),
+            nullable=False,
+        ),
+        sa.Column(
+            "related_story_id",
+            UUID(as_uuid=True),
+            sa.ForeignKey("tags.id", ondelete="CASCADE"),
+            nullable=True,
+        ),
+        sa.Column(
+            "related_event_id",
+            UUID(as_uuid=True),
+            sa.ForeignKey("summaries.id", ondelete="CASCADE"),
+            nullable=True,
+        ),
+    )
+    op.create_index(
+        "idx_story_links_related_story_id", "story_links", ["related_story_id"]
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("idx_story_links_related_story_id")
+    op.drop_table("story_links")
@@ -0,0 +1,62 @@
+"""add_summaries_spacetime_index
+
+Revision ID: e6f7a8b9c0d1
+Revises: d5e6f7a8b9c0
+Create Date: 2026-10-16 00:00:00.000000
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+from sqlalchemy import text
+
+# revision identifiers, used by Alembic.
+revision: str = "e6f7a8b9c0d1"
+down_revision: Union[str, None] = "d5e6f7a8b9c0"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # btree_gist lets calendar_model and time_key share a GiST index with the
+    # location, so the nearby query is answered by one index scan.
+    op.execute(text("CREATE EXTENSION IF NOT EXISTS btree_gist;"))
+
+    # Sortable numeric form of the wikidata datetime string:
+    # '+1685-03-21T00:00:00Z' -> 16850321, '-0500-00-00T00:00:00Z' -> -5000000.
+    # Prefix matches on the string become ranges on this key.
+    op.execute(
+        text(
+            """
+            ALTER TABLE summaries ADD COLUMN time_key BIGINT GENERATED ALWAYS AS (
+                CASE WHEN datetime ~ '^[+-][0-9]+-[0-9]{2}-[0-9]{2}' THEN
+                    (CASE WHEN left(datetime, 1) = '-' THEN -1 ELSE 1 END)
+                    * substring(datetime from '^[+-]([0-9]+)-')::bigint * 10000
+                    + substring(datetime from '^[+-][0-9]+-([0-9]{2})')::bigint * 100
+                    + substring(datetime from '^[+-][0-9]+-[0-9]{2}-([0-9]{2})')::bigint
+                END
+            ) STORED;
+            """
+        )
+    )
+    op.execute(
+        text(
+            "CREATE INDEX idx_summaries_spacetime ON summaries "
+            "USING gist (calendar_model, time_key, point(longitude, latitude));"
+        )
+    )
+
+    # superseded by idx_summaries_spacetime
+    op.execute(text("DROP INDEX IF EXISTS idx_summaries_nearby;"))
+
+
+def downgrade() -> None:
+    op.execute(
+        text(
+            "CREATE INDEX idx_summaries_nearby "
+            "ON summaries (calendar_model, datetime text_pattern_ops, latitude, longitude);"
+        )
+    )
+    op.execute(text("DROP INDEX IF EXISTS idx_summaries_spacetime;"))
+    op.execute(text("ALTER TABLE summaries DROP COLUMN IF EXISTS time_key;"))
@@ -0,0 +1,55 @@
+"""add_story_order_jobs_table
+
+Revision ID: e7f8a9b0c1d2
+Revises: d1e2f3a4b5c6
+Create Date: 2026-10-17 00:00:00.000000
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy import text
+from sqlalchemy.dialects.postgresql import BIGINT, TIMESTAMP, UUID
+
+# revision identifiers, used by Alembic.
+revision: str = "e7f8a9b0c1d2"
+down_revision: Union[str, None] = "d1e2f3a4b5c6"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # At most one pending job per story: new events for a story which is
+    # already queued bump its request count instead of adding a row, and
+    # workers claim due rows with FOR UPDATE SKIP LOCKED.
+    op.create_table(
+        "story_order_jobs",
+        sa.Column(
+            "tag_id",
+            UUID(as_uuid=True),
+            sa.ForeignKey("tags.id", ondelete="CASCADE"),
+            primary_key=True,
+        ),
+        sa.Column("requests", BIGINT, nullable=False, server_default="1"),
+        sa.Column("run_after", TIMESTAMP(timezone=True), nullable=False),
+    )
+    op.create_index("idx_story_order_jobs_run_after", "story_order_jobs", ["run_after"])
+
+    # queue the stories which still have unordered events
+    op.execute(
+        text(
+            """
+            INSERT INTO story_order_jobs (tag_id, run_after)
+            SELECT DISTINCT tag_id, now()
+            FROM tag_instances
+            WHERE story_order IS NULL;
+            """
+        )
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("idx_story_order_jobs_run_after", table_name="story_order_jobs")
+    op.drop_table("story_order_jobs")
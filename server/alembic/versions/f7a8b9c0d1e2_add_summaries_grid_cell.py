@@ -0,0 +1,41 @@
+"""add_summaries_grid_cell
+
+Revision ID: f7a8b9c0d1e2
+Revises: e6f7a8b9c0d1
+Create Date: 2026-10-16 00:00:00.000000
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+from sqlalchemy import text
+
+# revision identifiers, used by Alembic.
+revision: str = "f7a8b9c0d1e2"
+down_revision: Union[str, None] = "e6f7a8b9c0d1"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Map grid cell of the location at zoom 20: the longitude column in the
+    # high bits and the latitude row in the low 20 bits, so the cell at any
+    # coarser zoom is a pair of shifts. LEAST ignores NULLs, hence the CASE.
+    # See apps.history.grid_cell.
+    op.execute(
+        text(
+            """
+            ALTER TABLE summaries ADD COLUMN grid_cell BIGINT GENERATED ALWAYS AS (
+                CASE WHEN latitude IS NOT NULL AND longitude IS NOT NULL THEN
+                    (LEAST(floor((longitude + 180) / 360 * 1048576), 1048575)::bigint << 20)
+                    | LEAST(floor((latitude + 90) / 180 * 1048576), 1048575)::bigint
+                END
+            ) STORED;
+            """
+        )
+    )
+
+
+def downgrade() -> None:
+    op.execute(text("ALTER TABLE summaries DROP COLUMN IF EXISTS grid_cell;"))
@@ -0,0 +1,50 @@
+"""add_events_revision_sequence
+
+Revision ID: f9a0b1c2d3e4
+Revises: e7f8a9b0c1d2
+Create Date: 2026-10-17 12:00:00.000000
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy import text
+
+# revision identifiers, used by Alembic.
+revision: str = "f9a0b1c2d3e4"
+down_revision: Union[str, None] = "e7f8a9b0c1d2"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # The events revision moves from a shared revisions row, which every
+    # event write locked until commit, to a sequence. It continues from the
+    # row's value so that existing ETags don't match by accident.
+    op.execute(sa.schema.CreateSequence(sa.Sequence("events_revision_seq")))
+    op.execute(
+        text(
+            """
+            SELECT setval('events_revision_seq', revision)
+            FROM revisions
+            WHERE key = 'events';
+            """
+        )
+    )
+    op.execute(text("DELETE FROM revisions WHERE key = 'events';"))
+
+
+def downgrade() -> None:
+    op.execute(
+        text(
+            """
+            INSERT INTO revisions (key, revision)
+            SELECT 'events', last_value
+            FROM events_revision_seq
+            WHERE is_called;
+            """
+        )
+    )
+    op.execute(sa.schema.DropSequence(sa.Sequence("events_revision_seq")))
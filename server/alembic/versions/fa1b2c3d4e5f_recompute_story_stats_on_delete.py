@@ -0,0 +1,278 @@
+"""recompute_story_stats_on_delete
+
+Revision ID: fa1b2c3d4e5f
+Revises: f9a0b1c2d3e4
+Create Date: 2026-10-17 18:00:00.000000
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+from sqlalchemy import text
+
+# revision identifiers, used by Alembic.
+revision: str = "fa1b2c3d4e5f"
+down_revision: Union[str, None] = "f9a0b1c2d3e4"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+EVENT_TABLES = (("tag_instances", "tag_id"), ("story_summaries", "story_id"))
+NAME_TABLES = (("story_names", "tag_id"), ("stories", "id"))
+
+
+def upgrade() -> None:
+    # The insert triggers fold new events and names into story_stats, but a
+    # removed or moved event can't be folded out of a minimum or a maximum.
+    # recompute_story_stats rebuilds the rows of the given stories from
+    # their remaining events, and from their remaining names when
+    # recompute_names is true. Rows left without a name or events are
+    # deleted. The triggers below call it; call it directly after changing
+    # events with the triggers disabled, e.g. during a bulk repair.
+    op.execute(
+        text(
+            """
+            CREATE FUNCTION recompute_story_stats(
+                story_ids UUID[], recompute_names BOOLEAN DEFAULT true
+            ) RETURNS void AS $$
+            BEGIN
+                WITH targets AS (
+                    SELECT DISTINCT story_id
+                    FROM unnest(story_ids) AS target(story_id)
+                    WHERE story_id IS NOT NULL
+                ),
+                names AS (
+                    SELECT
+                        tag_id AS story_id,
+                        (array_agg(name))[1] AS name,
+                        (array_agg(description) FILTER (
+                            WHERE description IS NOT NULL
+                        ))[1] AS description
+                    FROM story_names
+                    WHERE tag_id IN (SELECT story_id FROM targets)
+                    GROUP BY tag_id
+                    UNION ALL
+                    SELECT id, name, description FROM stories
+                    WHERE id IN (SELECT story_id FROM targets)
+                ),
+                events AS (
+                    SELECT
+                        story_events.story_id,
+                        COUNT(*) AS event_count,
+                        MIN(s.year) AS earliest_year,
+                        MAX(s.year) AS latest_year,
+                        MIN(s.sort_key) AS earliest_sort_key,
+                        MAX(s.sort_key) AS latest_sort_key,
+                        (array_agg(s.datetime ORDER BY s.sort_key) FILTER (
+                            WHERE s.sort_key IS NOT NULL
+                        ))[1] AS earliest_datetime,
+                        (array_agg(s.datetime ORDER BY s.sort_key DESC) FILTER (
+                            WHERE s.sort_key IS NOT NULL
+                        ))[1] AS latest_datetime
+                    FROM (
+                        SELECT tag_id AS story_id, summary_id FROM tag_instances
+                        WHERE tag_id IN (SELECT story_id FROM targets)
+                        UNION ALL
+                        SELECT story_id, summary_id FROM story_summaries
+                        WHERE story_id IN (SELECT story_id FROM targets)
+                    ) story_events
+                    JOIN summaries s ON s.id = story_events.summary_id
+                    GROUP BY story_events.story_id
+                )
+                INSERT INTO story_stats AS stats (
+                    story_id, name, description, event_count,
+                    earliest_year, latest_year, earliest_sort_key,
+                    latest_sort_key, earliest_datetime, latest_datetime
+                )
+                SELECT
+                    targets.story_id,
+                    names.name,
+                    names.description,
+                    COALESCE(events.event_count, 0),
+                    events.earliest_year,
+                    events.latest_year,
+                    events.earliest_sort_key,
+                    events.latest_sort_key,
+                    events.earliest_datetime,
+                    events.latest_datetime
+                FROM targets
+                LEFT JOIN names ON names.story_id = targets.story_id
+                LEFT JOIN events ON events.story_id = targets.story_id
+                ON CONFLICT (story_id) DO UPDATE SET
+                    name = CASE
+                        WHEN recompute_names THEN EXCLUDED.name
+                        ELSE stats.name
+                    END,
+                    description = CASE
+                        WHEN recompute_names THEN EXCLUDED.description
+                        ELSE stats.description
+                    END,
+                    event_count = EXCLUDED.event_count,
+                    earliest_year = EXCLUDED.earliest_year,
+                    latest_year = EXCLUDED.latest_year,
+                    earliest_sort_key = EXCLUDED.earliest_sort_key,
+                    latest_sort_key = EXCLUDED.latest_sort_key,
+                    earliest_datetime = EXCLUDED.earliest_datetime,
+                    latest_datetime = EXCLUDED.latest_datetime;
+
+                DELETE FROM story_stats
+                WHERE story_id = ANY(story_ids)
+                    AND name IS NULL
+                    AND event_count = 0;
+            END;
+            $$ LANGUAGE plpgsql;
+            """
+        )
+    )
+
+    # Deletes are handled once per statement, so that deleting a tag and,
+    # by cascade, all of its instances recomputes its story once.
+    for table, story_column in EVENT_TABLES + NAME_TABLES:
+        recompute_names = "true" if (table, story_column) in NAME_TABLES else "false"
+        op.execute(
+            text(
+                f"""
+                CREATE FUNCTION remove_{table}_story_stats() RETURNS trigger AS $$
+                BEGIN
+                    PERFORM recompute_story_stats(
+                        ARRAY(SELECT DISTINCT {story_column} FROM removed_rows),
+                        {recompute_names}
+                    );
+                    RETURN NULL;
+                END;
+                $$ LANGUAGE plpgsql;
+                """
+            )
+        )
+        op.execute(
+            text(
+                f"""
+                CREATE TRIGGER {table}_story_stats_delete
+                AFTER DELETE ON {table}
+                REFERENCING OLD TABLE AS removed_rows
+                FOR EACH STATEMENT EXECUTE FUNCTION remove_{table}_story_stats();
+                """
+            )
+        )
+
+    # Moving an event to another story or summary is rare, and tag instances
+    # are updated constantly for their story order, so moves are handled per
+    # row and only when the story or summary actually changed.
+    op.execute(
+        text(
+            """
+            CREATE FUNCTION move_story_stats_event() RETURNS trigger AS $$
+            BEGIN
+                IF TG_TABLE_NAME = 'tag_instances' THEN
+                    PERFORM recompute_story_stats(
+                        ARRAY[OLD.tag_id, NEW.tag_id], false
+                    );
+                ELSE
+                    PERFORM recompute_story_stats(
+                        ARRAY[OLD.story_id, NEW.story_id], false
+                    );
+                END IF;
+                RETURN NULL;
+            END;
+            $$ LANGUAGE plpgsql;
+            """
+        )
+    )
+    for table, story_column in EVENT_TABLES:
+        op.execute(
+            text(
+                f"""
+                CREATE TRIGGER {table}_story_stats_update
+                AFTER UPDATE OF {story_column}, summary_id ON {table}
+                FOR EACH ROW
+                WHEN (
+                    OLD.{story_column} IS DISTINCT FROM NEW.{story_column}
+                    OR OLD.summary_id IS DISTINCT FROM NEW.summary_id
+                )
+                EXECUTE FUNCTION move_story_stats_event();
+                """
+            )
+        )
+
+    # A summary moved to another time moves the bounds of all its stories;
+    # its year and sort key are generated from its datetime and precision.
+    op.execute(
+        text(
+            """
+            CREATE FUNCTION move_story_stats_summary() RETURNS trigger AS $$
+            BEGIN
+                PERFORM recompute_story_stats(
+                    ARRAY(
+                        SELECT tag_id FROM tag_instances
+                        WHERE summary_id = NEW.id
+                        UNION
+                        SELECT story_id FROM story_summaries
+                        WHERE summary_id = NEW.id
+                    ),
+                    false
+                );
+                RETURN NULL;
+            END;
+            $$ LANGUAGE plpgsql;
+            """
+        )
+    )
+    op.execute(
+        text(
+            """
+            CREATE TRIGGER summaries_story_stats_update
+            AFTER UPDATE OF datetime, precision ON summaries
+            FOR EACH ROW
+            WHEN (
+                OLD.datetime IS DISTINCT FROM NEW.datetime
+                OR OLD.sort_key IS DISTINCT FROM NEW.sort_key
+            )
+            EXECUTE FUNCTION move_story_stats_summary();
+            """
+        )
+    )
+
+    # A renamed or moved story name may have been the story's primary name.
+    op.execute(
+        text(
+            """
+            CREATE FUNCTION change_story_stats_name() RETURNS trigger AS $$
+            BEGIN
+                PERFORM recompute_story_stats(ARRAY[OLD.tag_id, NEW.tag_id]);
+                RETURN NULL;
+            END;
+            $$ LANGUAGE plpgsql;
+            """
+        )
+    )
+    op.execute(
+        text(
+            """
+            CREATE TRIGGER story_names_story_stats_update
+            AFTER UPDATE OF tag_id, name, description ON story_names
+            FOR EACH ROW EXECUTE FUNCTION change_story_stats_name();
+            """
+        )
+    )
+
+
+def downgrade() -> None:
+    op.execute(
+        text("DROP TRIGGER IF EXISTS story_names_story_stats_update ON story_names;")
+    )
+    op.execute(
+        text("DROP TRIGGER IF EXISTS summaries_story_stats_update ON summaries;")
+    )
+    for table, _ in EVENT_TABLES:
+        op.execute(
+            text(f"DROP TRIGGER IF EXISTS {table}_story_stats_update ON {table};")
+        )
+    for table, _ in EVENT_TABLES + NAME_TABLES:
+        op.execute(
+            text(f"DROP TRIGGER IF EXISTS {table}_story_stats_delete ON {table};")
+        )
+        op.execute(text(f"DROP FUNCTION IF EXISTS remove_{table}_story_stats();"))
+    op.execute(text("DROP FUNCTION IF EXISTS change_story_stats_name();"))
+    op.execute(text("DROP FUNCTION IF EXISTS move_story_stats_summary();"))
+    op.execute(text("DROP FUNCTION IF EXISTS move_story_stats_event();"))
+    op.execute(text("DROP FUNCTION IF EXISTS recompute_story_stats(UUID[], BOOLEAN);"))
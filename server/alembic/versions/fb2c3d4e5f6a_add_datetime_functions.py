@@ -0,0 +1,136 @@
+"""add_datetime_functions
+
+Revision ID: fb2c3d4e5f6a
+Revises: fa1b2c3d4e5f
+Create Date: 2026-10-17 20:00:00.000000
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+from sqlalchemy import text
+
+# revision identifiers, used by Alembic.
+revision: str = "fb2c3d4e5f6a"
+down_revision: Union[str, None] = "fa1b2c3d4e5f"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# (table, generated columns) in the order they're added
+TABLES = (
+    ("summaries", ("time_key", "year", "sort_key")),
+    ("times", ("year", "sort_key")),
+)
+COLUMNS = {
+    "time_key": "datetime_time_key(datetime)",
+    "year": "datetime_year(datetime)",
+    "sort_key": "datetime_time_key(datetime) * 100 + coalesce(precision, 0)",
+}
+# the expressions they replace, which disagreed on whether a datetime
+# needs a sign
+PREVIOUS_COLUMNS = {
+    "time_key": """
+        CASE WHEN datetime ~ '^[+-][0-9]+-[0-9]{2}-[0-9]{2}' THEN
+            (CASE WHEN left(datetime, 1) = '-' THEN -1 ELSE 1 END)
+            * substring(datetime from '^[+-]([0-9]+)-')::bigint * 10000
+            + substring(datetime from '^[+-][0-9]+-([0-9]{2})')::bigint * 100
+            + substring(datetime from '^[+-][0-9]+-[0-9]{2}-([0-9]{2})')::bigint
+        END
+    """,
+    "year": """
+        CASE WHEN datetime ~ '^[+-]?[0-9]+-' THEN
+            (CASE WHEN left(datetime, 1) = '-' THEN -1 ELSE 1 END)
+            * substring(datetime from '^[+-]?([0-9]+)-')::bigint
+        END
+    """,
+    "sort_key": """
+        CASE WHEN datetime ~ '^[+-]?[0-9]+-[0-9]{2}-[0-9]{2}' THEN
+            ((CASE WHEN left(datetime, 1) = '-' THEN -1 ELSE 1 END)
+            * substring(datetime from '^[+-]?([0-9]+)-')::bigint * 10000
+            + substring(datetime from '^[+-]?[0-9]+-([0-9]{2})')::bigint * 100
+            + substring(datetime from '^[+-]?[0-9]+-[0-9]{2}-([0-9]{2})')::bigint)
+            * 100 + coalesce(precision, 0)
+        END
+    """,
+}
+
+
+def upgrade() -> None:
+    # One parse rule for every generated time column, as in
+    # apps.history.time_key: a datetime without a sign is a positive year.
+    # time_key used to require the sign, so such events had a year and a
+    # story order but were never nearby.
+    op.execute(
+        text(
+            """
+            CREATE OR REPLACE FUNCTION datetime_parts(datetime VARCHAR)
+            RETURNS TEXT[] AS $$
+                SELECT regexp_match(
+                    datetime, '^([+-]?)([0-9]+)-([0-9]{2})-([0-9]{2})'
+                )
+            $$ LANGUAGE sql IMMUTABLE STRICT PARALLEL SAFE;
+
+            CREATE OR REPLACE FUNCTION datetime_year(datetime VARCHAR)
+            RETURNS BIGINT AS $$
+                SELECT (CASE WHEN parts[1] = '-' THEN -1 ELSE 1 END)
+                    * parts[2]::bigint
+                FROM datetime_parts(datetime) AS parts
+            $$ LANGUAGE sql IMMUTABLE STRICT PARALLEL SAFE;
+
+            CREATE OR REPLACE FUNCTION datetime_time_key(datetime VARCHAR)
+            RETURNS BIGINT AS $$
+                SELECT datetime_year(datetime) * 10000
+                    + parts[3]::bigint * 100 + parts[4]::bigint
+                FROM datetime_parts(datetime) AS parts
+            $$ LANGUAGE sql IMMUTABLE STRICT PARALLEL SAFE;
+            """
+        )
+    )
+    _replace_columns(COLUMNS)
+
+
+def downgrade() -> None:
+    _replace_columns(PREVIOUS_COLUMNS)
+    op.execute(text("DROP FUNCTION IF EXISTS datetime_time_key(VARCHAR);"))
+    op.execute(text("DROP FUNCTION IF EXISTS datetime_year(VARCHAR);"))
+    op.execute(text("DROP FUNCTION IF EXISTS datetime_parts(VARCHAR);"))
+
+
+def _replace_columns(expressions: dict[str, str]) -> None:
+    """Regenerate the time columns with the given expressions. Postgres 16
+    can't change a generation expression, so the columns, their indexes and
+    the trigger whose condition reads sort_key are dropped and recreated."""
+    op.execute(
+        text("DROP TRIGGER IF EXISTS summaries_story_stats_update ON summaries;")
+    )
+    for table, columns in TABLES:
+        drops = ", ".join(f"DROP COLUMN {column}" for column in columns)
+        adds = ", ".join(
+            f"ADD COLUMN {column} BIGINT GENERATED ALWAYS AS ({expressions[column]}) "
+            "STORED"
+            for column in columns
+        )
+        op.execute(text(f"ALTER TABLE {table} {drops};"))
+        op.execute(text(f"ALTER TABLE {table} {adds};"))
+        op.execute(text(f"CREATE INDEX idx_{table}_sort_key ON {table} (sort_key);"))
+    op.execute(
+        text(
+            "CREATE INDEX idx_summaries_spacetime ON summaries "
+            "USING gist (calendar_model, time_key, point(longitude, latitude));"
+        )
+    )
+    op.execute(
+        text(
+            """
+            CREATE TRIGGER summaries_story_stats_update
+            AFTER UPDATE OF datetime, precision ON summaries
+            FOR EACH ROW
+            WHEN (
+                OLD.datetime IS DISTINCT FROM NEW.datetime
+                OR OLD.sort_key IS DISTINCT FROM NEW.sort_key
+            )
+            EXECUTE FUNCTION move_story_stats_summary();
+            """
+        )
+    )
@@ -0,0 +1,326 @@
+"""story_stats_statement_triggers
+
+Revision ID: fc3d4e5f6a7b
+Revises: fb2c3d4e5f6a
+Create Date: 2026-10-17 22:00:00.000000
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+from sqlalchemy import text
+
+# revision identifiers, used by Alembic.
+revision: str = "fc3d4e5f6a7b"
+down_revision: Union[str, None] = "fb2c3d4e5f6a"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+EVENT_TABLES = ("tag_instances", "story_summaries")
+
+# recompute_story_stats, rebuilt from story_event_stats rather than its own
+# copy of the aggregate; {events} is the source of its event columns
+RECOMPUTE_STORY_STATS = """
+    CREATE OR REPLACE FUNCTION recompute_story_stats(
+        story_ids UUID[], recompute_names BOOLEAN DEFAULT true
+    ) RETURNS void AS $$
+    BEGIN
+        WITH targets AS (
+            SELECT DISTINCT story_id
+            FROM unnest(story_ids) AS target(story_id)
+            WHERE story_id IS NOT NULL
+        ),
+        names AS (
+            SELECT
+                tag_id AS story_id,
+                (array_agg(name))[1] AS name,
+                (array_agg(description) FILTER (
+                    WHERE description IS NOT NULL
+                ))[1] AS description
+            FROM story_names
+            WHERE tag_id IN (SELECT story_id FROM targets)
+            GROUP BY tag_id
+            UNION ALL
+            SELECT id, name, description FROM stories
+            WHERE id IN (SELECT story_id FROM targets)
+        ),
+        events AS ({events})
+        INSERT INTO story_stats AS stats (
+            story_id, name, description, event_count,
+            earliest_year, latest_year, earliest_sort_key,
+            latest_sort_key, earliest_datetime, latest_datetime
+        )
+        SELECT
+            targets.story_id,
+            names.name,
+            names.description,
+            COALESCE(events.event_count, 0),
+            events.earliest_year,
+            events.latest_year,
+            events.earliest_sort_key,
+            events.latest_sort_key,
+            events.earliest_datetime,
+            events.latest_datetime
+        FROM targets
+        LEFT JOIN names ON names.story_id = targets.story_id
+        LEFT JOIN events ON events.story_id = targets.story_id
+        ORDER BY targets.story_id
+        ON CONFLICT (story_id) DO UPDATE SET
+            name = CASE
+                WHEN recompute_names THEN EXCLUDED.name
+                ELSE stats.name
+            END,
+            description = CASE
+                WHEN recompute_names THEN EXCLUDED.description
+                ELSE stats.description
+            END,
+            event_count = EXCLUDED.event_count,
+            earliest_year = EXCLUDED.earliest_year,
+            latest_year = EXCLUDED.latest_year,
+            earliest_sort_key = EXCLUDED.earliest_sort_key,
+            latest_sort_key = EXCLUDED.latest_sort_key,
+            earliest_datetime = EXCLUDED.earliest_datetime,
+            latest_datetime = EXCLUDED.latest_datetime;
+
+        DELETE FROM story_stats
+        WHERE story_id = ANY(story_ids)
+            AND name IS NULL
+            AND event_count = 0;
+    END;
+    $$ LANGUAGE plpgsql;
+"""
+
+
+def upgrade() -> None:
+    # The stats of (story_id, summary_id) event pairs, one row per story:
+    # the single copy of the aggregate behind every story_stats write.
+    op.execute(
+        text(
+            """
+            CREATE FUNCTION story_event_stats(story_ids UUID[], summary_ids UUID[])
+            RETURNS TABLE (
+                story_id UUID,
+                event_count BIGINT,
+                earliest_year BIGINT,
+                latest_year BIGINT,
+                earliest_sort_key BIGINT,
+                latest_sort_key BIGINT,
+                earliest_datetime VARCHAR,
+                latest_datetime VARCHAR
+            ) AS $$
+                SELECT
+                    story_events.story_id,
+                    COUNT(*),
+                    MIN(s.year),
+                    MAX(s.year),
+                    MIN(s.sort_key),
+                    MAX(s.sort_key),
+                    (array_agg(s.datetime ORDER BY s.sort_key) FILTER (
+                        WHERE s.sort_key IS NOT NULL
+                    ))[1],
+                    (array_agg(s.datetime ORDER BY s.sort_key DESC) FILTER (
+                        WHERE s.sort_key IS NOT NULL
+                    ))[1]
+                FROM unnest(story_ids, summary_ids)
+                    AS story_events(story_id, summary_id)
+                JOIN summaries s ON s.id = story_events.summary_id
+                GROUP BY story_events.story_id
+            $$ LANGUAGE sql STABLE;
+            """
+        )
+    )
+
+    # New events are folded in once per statement rather than once per row,
+    # so that a transaction holds each story's row lock from a single upsert,
+    # and takes the locks in story order: two transactions adding events to
+    # the same stories in a different order would otherwise deadlock.
+    op.execute(
+        text(
+            """
+            CREATE FUNCTION add_story_stats_events() RETURNS trigger AS $$
+            DECLARE
+                story_ids UUID[];
+                summary_ids UUID[];
+            BEGIN
+                IF TG_TABLE_NAME = 'tag_instances' THEN
+                    SELECT array_agg(tag_id), array_agg(summary_id)
+                    INTO story_ids, summary_ids
+                    FROM added_rows;
+                ELSE
+                    SELECT array_agg(story_id), array_agg(summary_id)
+                    INTO story_ids, summary_ids
+                    FROM added_rows;
+                END IF;
+                INSERT INTO story_stats AS stats (
+                    story_id, event_count, earliest_year, latest_year,
+                    earliest_sort_key, latest_sort_key,
+                    earliest_datetime, latest_datetime
+                )
+                SELECT * FROM story_event_stats(story_ids, summary_ids)
+                ORDER BY story_id
+                ON CONFLICT (story_id) DO UPDATE SET
+                    event_count = stats.event_count + EXCLUDED.event_count,
+                    earliest_year = LEAST(stats.earliest_year, EXCLUDED.earliest_year),
+                    latest_year = GREATEST(stats.latest_year, EXCLUDED.latest_year),
+                    earliest_datetime = CASE
+                        WHEN EXCLUDED.earliest_sort_key < stats.earliest_sort_key
+                            OR stats.earliest_sort_key IS NULL
+                        THEN EXCLUDED.earliest_datetime
+                        ELSE stats.earliest_datetime
+                    END,
+                    latest_datetime = CASE
+                        WHEN EXCLUDED.latest_sort_key > stats.latest_sort_key
+                            OR stats.latest_sort_key IS NULL
+                        THEN EXCLUDED.latest_datetime
+                        ELSE stats.latest_datetime
+                    END,
+                    earliest_sort_key = LEAST(
+                        stats.earliest_sort_key, EXCLUDED.earliest_sort_key
+                    ),
+                    latest_sort_key = GREATEST(
+                        stats.latest_sort_key, EXCLUDED.latest_sort_key
+                    );
+                RETURN NULL;
+            END;
+            $$ LANGUAGE plpgsql;
+            """
+        )
+    )
+    for table in EVENT_TABLES:
+        op.execute(
+            text(f"DROP TRIGGER IF EXISTS {table}_story_stats_insert ON {table};")
+        )
+        op.execute(
+            text(
+                f"""
+                CREATE TRIGGER {table}_story_stats_insert
+                AFTER INSERT ON {table}
+                REFERENCING NEW TABLE AS added_rows
+                FOR EACH STATEMENT EXECUTE FUNCTION add_story_stats_events();
+                """
+            )
+        )
+    op.execute(text("DROP FUNCTION IF EXISTS add_story_stats_event();"))
+
+    op.execute(
+        text(
+            RECOMPUTE_STORY_STATS.format(
+                events="""
+                    SELECT stats.*
+                    FROM (
+                        SELECT
+                            array_agg(story_id) AS story_ids,
+                            array_agg(summary_id) AS summary_ids
+                        FROM (
+                            SELECT tag_id AS story_id, summary_id
+                            FROM tag_instances
+                            WHERE tag_id IN (SELECT story_id FROM targets)
+                            UNION ALL
+                            SELECT story_id, summary_id FROM story_summaries
+                            WHERE story_id IN (SELECT story_id FROM targets)
+                        ) story_events
+                    ) pairs,
+                    story_event_stats(pairs.story_ids, pairs.summary_ids) AS stats
+                """
+            )
+        )
+    )
+
+
+def downgrade() -> None:
+    op.execute(
+        text(
+            RECOMPUTE_STORY_STATS.format(
+                events="""
+                    SELECT
+                        story_events.story_id,
+                        COUNT(*) AS event_count,
+                        MIN(s.year) AS earliest_year,
+                        MAX(s.year) AS latest_year,
+                        MIN(s.sort_key) AS earliest_sort_key,
+                        MAX(s.sort_key) AS latest_sort_key,
+                        (array_agg(s.datetime ORDER BY s.sort_key) FILTER (
+                            WHERE s.sort_key IS NOT NULL
+                        ))[1] AS earliest_datetime,
+                        (array_agg(s.datetime ORDER BY s.sort_key DESC) FILTER (
+                            WHERE s.sort_key IS NOT NULL
+                        ))[1] AS latest_datetime
+                    FROM (
+                        SELECT tag_id AS story_id, summary_id FROM tag_instances
+                        WHERE tag_id IN (SELECT story_id FROM targets)
+                        UNION ALL
+                        SELECT story_id, summary_id FROM story_summaries
+                        WHERE story_id IN (SELECT story_id FROM targets)
+                    ) story_events
+                    JOIN summaries s ON s.id = story_events.summary_id
+                    GROUP BY story_events.story_id
+                """
+            )
+        )
+    )
+    op.execute(
+        text(
+            """
+            CREATE FUNCTION add_story_stats_event() RETURNS trigger AS $$
+            DECLARE
+                target_story_id UUID;
+            BEGIN
+                IF TG_TABLE_NAME = 'tag_instances' THEN
+                    target_story_id := NEW.tag_id;
+                ELSE
+                    target_story_id := NEW.story_id;
+                END IF;
+                INSERT INTO story_stats AS stats (
+                    story_id, event_count, earliest_year, latest_year,
+                    earliest_sort_key, latest_sort_key,
+                    earliest_datetime, latest_datetime
+                )
+                SELECT
+                    target_story_id, 1, s.year, s.year,
+                    s.sort_key, s.sort_key, s.datetime, s.datetime
+                FROM summaries s
+                WHERE s.id = NEW.summary_id
+                ON CONFLICT (story_id) DO UPDATE SET
+                    event_count = stats.event_count + 1,
+                    earliest_year = LEAST(stats.earliest_year, EXCLUDED.earliest_year),
+                    latest_year = GREATEST(stats.latest_year, EXCLUDED.latest_year),
+                    earliest_datetime = CASE
+                        WHEN EXCLUDED.earliest_sort_key < stats.earliest_sort_key
+                            OR stats.earliest_sort_key IS NULL
+                        THEN EXCLUDED.earliest_datetime
+                        ELSE stats.earliest_datetime
+                    END,
+                    latest_datetime = CASE
+                        WHEN EXCLUDED.latest_sort_key > stats.latest_sort_key
+                            OR stats.latest_sort_key IS NULL
+                        THEN EXCLUDED.latest_datetime
+                        ELSE stats.latest_datetime
+                    END,
+                    earliest_sort_key = LEAST(
+                        stats.earliest_sort_key, EXCLUDED.earliest_sort_key
+                    ),
+                    latest_sort_key = GREATEST(
+                        stats.latest_sort_key, EXCLUDED.latest_sort_key
+                    );
+                RETURN NULL;
+            END;
+            $$ LANGUAGE plpgsql;
+            """
+        )
+    )
+    for table in EVENT_TABLES:
+        op.execute(
+            text(f"DROP TRIGGER IF EXISTS {table}_story_stats_insert ON {table};")
+        )
+        op.execute(
+            text(
+                f"""
+                CREATE TRIGGER {table}_story_stats_insert
+                AFTER INSERT ON {table}
+                FOR EACH ROW EXECUTE FUNCTION add_story_stats_event();
+                """
+            )
+        )
+    op.execute(text("DROP FUNCTION IF EXISTS add_story_stats_events();"))
+    op.execute(text("DROP FUNCTION IF EXISTS story_event_stats(UUID[], UUID[]);"))
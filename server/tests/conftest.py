@@ -38,6 +38,8 @@ def truncate_db(session: Session):
         truncate tag_instances cascade;
         truncate tags cascade;
         truncate times cascade;
+        truncate revisions;
+        truncate story_stats;
     """
     session.execute(text(truncate_stmt))
 
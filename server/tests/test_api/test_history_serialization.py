@@ -0,0 +1,30 @@
+import json
+from typing import get_args
+
+from pydantic import BaseModel
+
+import the_history_atlas.api.types.history as api_types
+from the_history_atlas.api.handlers.history import convert_story_to_api, story_to_json
+from the_history_atlas.api.responses import ORJSONResponse
+from the_history_atlas.scripts.benchmark_history_serialization import build_story
+
+
+def _assert_keys_match(model: type[BaseModel], content: dict) -> None:
+    """Validation ignores unknown keys, so compare the keys at every level."""
+    assert content.keys() == model.model_fields.keys()
+    for name, field in model.model_fields.items():
+        for nested in (field.annotation, *get_args(field.annotation)):
+            if isinstance(nested, type) and issubclass(nested, BaseModel):
+                values = content[name]
+                for value in values if isinstance(values, list) else [values]:
+                    _assert_keys_match(nested, value)
+
+
+def test_story_json_matches_the_api_model():
+    story = build_story(event_count=3)
+    body = ORJSONResponse(content=story_to_json(story, index=2)).body
+
+    assert api_types.Story.model_validate_json(body) == convert_story_to_api(
+        story, index=2
+    )
+    _assert_keys_match(api_types.Story, json.loads(body))
@@ -21,12 +21,17 @@ from the_history_atlas.api.types.tags import (
     WikiDataTimeInput,
     WikiDataTagPointer,
     WikiDataEventInput,
+    WikiDataBulkEventInput,
+    WikiDataBulkPeopleInput,
+    WikiDataBulkPlacesInput,
+    WikiDataBulkTimesInput,
     WikiDataCitationInput,
     TagInput,
     WikiDataPersonOutput,
     WikiDataPlaceOutput,
     WikiDataTimeOutput,
     WikiDataEventOutput,
+    MAX_BULK_EVENTS,
 )
 from the_history_atlas.apps.domain.core import StoryOrder
 from the_history_atlas.apps.history.repository import Repository
@@ -192,8 +197,54 @@ def create_event(
 
 
 @pytest.fixture
-def client(cleanup_db):
-    return TestClient(get_app())
+def client(cleanup_db, config, monkeypatch):
+    # stories are ordered by the app's queue worker; have it take each job as
+    # soon as it is queued, and wait for the queue to drain after each event
+    monkeypatch.setenv("STORY_ORDER_JOB_DELAY_SECONDS", "0")
+    monkeypatch.setenv("STORY_ORDER_JOB_POLL_SECONDS", "0.05")
+    engine = create_engine(config.DB_URI)
+
+    def wait_for_story_order(response) -> None:
+        if response.request.method != "POST" or "/events" not in str(
+            response.request.url
+        ):
+            return
+        response.read()
+        if response.status_code != 200:
+            return
+        body = response.json()
+        if "results" in body:
+            event_ids = [result["id"] for result in body["results"] if result["id"]]
+        else:
+            event_ids = [body["id"]]
+        # only the stories of these events; a job which fails stays leased,
+        # and fails the test here rather than later
+        with engine.connect() as connection:
+            for _ in range(200):
+                queued = connection.execute(
+                    text(
+                        """
+                        SELECT count(*) FROM story_order_jobs
+                        WHERE tag_id IN (
+                            SELECT tag_id FROM tag_instances
+                            WHERE summary_id = ANY(CAST(:event_ids AS UUID[]))
+                        )
+                        """
+                    ),
+                    {"event_ids": event_ids},
+                ).scalar_one()
+                connection.rollback()
+                if not queued:
+                    return
+                sleep(0.05)
+        pytest.fail(f"The stories of events {event_ids} were not ordered in 10 s")
+
+    # run the app's lifespan, so requests share one event loop and the async
+    # connection pool is disposed on it
+    with TestClient(get_app()) as client:
+        client.event_hooks = {"response": [wait_for_story_order]}
+        yield client
+    engine.dispose()
 
 
 @pytest.fixture
@@ -245,6 +296,102 @@ def test_create_time(client: TestClient, auth_headers: dict) -> None:
     assert response.status_code == 200, response.text
 
 
+def test_create_people_bulk(client: TestClient, auth_headers: dict) -> None:
+    existing = create_person(client, auth_headers)
+    new_people = [_generate_fake_person() for _ in range(3)]
+    input = WikiDataBulkPeopleInput(
+        people=[
+            *new_people,
+            WikiDataPersonInput(**existing.model_dump()),
+            new_people[0],
+        ]
+    )
+
+    response = client.post(
+        "/wikidata/people/bulk", data=input.model_dump_json(), headers=auth_headers
+    )
+    assert response.status_code == 200, response.text
+    output = response.json()
+    assert {tag["wikidata_id"] for tag in output["created"]} == {
+        person.wikidata_id for person in new_people
+    }
+    assert output["existing"] == [
+        {"wikidata_id": existing.wikidata_id, "id": str(existing.id)}
+    ]
+
+    # the created people are full tags, with names and stories
+    tags = client.get(
+        "/wikidata/tags",
+        params={"wikidata_ids": [person.wikidata_id for person in new_people]},
+        headers=auth_headers,
+    ).json()["wikidata_ids"]
+    assert all(tag["id"] is not None for tag in tags)
+    response = client.get(
+        "/stories/search", params={"query": new_people[1].name}, headers=auth_headers
+    )
+    assert response.status_code == 200, response.text
+    assert f"The Life of {new_people[1].name}" in {
+        story["name"] for story in response.json()["results"]
+    }
+
+    # creating them again reports every one as existing
+    response = client.post(
+        "/wikidata/people/bulk", data=input.model_dump_json(), headers=auth_headers
+    )
+    assert response.status_code == 200, response.text
+    assert response.json()["created"] == []
+    assert len(response.json()["existing"]) == 4
+
+
+def test_create_places_bulk(client: TestClient, auth_headers: dict) -> None:
+    places = [_generate_fake_place() for _ in range(3)]
+    input = WikiDataBulkPlacesInput(places=places)
+
+    response = client.post(
+        "/wikidata/places/bulk", data=input.model_dump_json(), headers=auth_headers
+    )
+    assert response.status_code == 200, response.text
+    assert len(response.json()["created"]) == 3
+    assert response.json()["existing"] == []
+
+
+def test_create_times_bulk(client: TestClient, auth_headers: dict) -> None:
+    times = [_generate_fake_time() for _ in range(3)]
+    input = WikiDataBulkTimesInput(times=times)
+
+    response = client.post(
+        "/wikidata/times/bulk", data=input.model_dump_json(), headers=auth_headers
+    )
+    assert response.status_code == 200, response.text
+    assert len(response.json()["created"]) == 3
+
+    response = client.post(
+        "/times/exist",
+        json={
+            "datetime": times[0].date,
+            "calendar_model": times[0].calendar_model,
+            "precision": times[0].precision,
+        },
+        headers=auth_headers,
+    )
+    assert response.status_code == 200, response.text
+    assert response.json()["id"] is not None
+
+
+def test_create_times_bulk_requires_wikidata_id(
+    client: TestClient, auth_headers: dict
+) -> None:
+    time = _generate_fake_time()
+    time.wikidata_id = None
+    time.wikidata_url = None
+    input = WikiDataBulkTimesInput(times=[time])
+
+    response = client.post(
+        "/wikidata/times/bulk", data=input.model_dump_json(), headers=auth_headers
+    )
+    assert response.status_code == 422, response.text
+
+
 @pytest.fixture
 def wikidata_ids(engine) -> list[str]:
     tags = [
@@ -502,6 +649,61 @@ class TestCreateEvent:
         assert response.status_code == 409, response.text
         assert "already exists" in response.json()["detail"]
 
+    def test_create_events_bulk(self, client: TestClient, auth_headers: dict):
+        event_input = self._event(client, auth_headers)
+        response = client.post(
+            "/wikidata/events", data=event_input.model_dump_json(), headers=auth_headers
+        )
+        assert response.status_code == 200, response.text
+
+        second = event_input.model_copy(update={"summary": "second summary"})
+        third = event_input.model_copy(update={"summary": "third summary"})
+        unknown_tag = event_input.model_copy(
+            update={
+                "summary": "unknown tag summary",
+                "tags": [event_input.tags[0].model_copy(update={"id": uuid4()})],
+            }
+        )
+        bulk_input = WikiDataBulkEventInput(
+            events=[event_input, second, unknown_tag, third, second]
+        )
+        response = client.post(
+            "/wikidata/events/bulk",
+            data=bulk_input.model_dump_json(),
+            headers=auth_headers,
+        )
+        assert response.status_code == 200, response.text
+        results = response.json()["results"]
+        assert [result["status"] for result in results] == [
+            "duplicate",
+            "created",
+            "missing_tags",
+            "created",
+            "duplicate",
+        ]
+        assert results[1]["id"] is not None
+        assert results[0]["id"] is None
+
+        history_json = client.get("/history")
+        assert history_json.status_code == 200, history_json.text
+        story = Story.model_validate(history_json.json())
+        texts = {event.text for event in story.events}
+        assert {"second summary", "third summary"} <= texts
+        assert "unknown tag summary" not in texts
+
+    def test_create_events_bulk_rejects_oversized_batch(
+        self, client: TestClient, auth_headers: dict
+    ) -> None:
+        event = self._event(client, auth_headers).model_dump(mode="json")
+        response = client.post(
+            "/wikidata/events/bulk",
+            json={"events": [event] * (MAX_BULK_EVENTS + 1)},
+            headers=auth_headers,
+        )
+        assert response.status_code == 422, response.text
+        [error] = response.json()["detail"]
+        assert error["type"] == "too_long"
+
 
 @pytest.fixture
 def seed_story(client: TestClient, auth_headers: dict):
@@ -1060,6 +1262,122 @@ class TestGetHistory:
         story = Story.model_validate(response.json())
         assert len(story.events) == 1
 
+    def test_body_matches_response_model(
+        self, client: TestClient, auth_headers: dict
+    ) -> None:
+        """The body is encoded without response_model validation, so expect
+        it to be exactly what the validated model would have produced."""
+        # arrange
+        person = create_person(client, auth_headers)
+        event = create_event(
+            person=person,
+            place=create_place(client, auth_headers),
+            time=create_time(client, auth_headers),
+            client=client,
+            auth_headers=auth_headers,
+        )
+
+        # act
+        response = client.get(
+            "/history",
+            params=QueryParams(storyId=person.id, eventId=event.id),
+        )
+
+        # assert
+        assert response.status_code == 200
+        assert response.headers["content-type"] == "application/json"
+        body = response.json()
+        assert Story.model_validate(body).model_dump(mode="json") == body
+
+    def test_new_event_invalidates_cached_story(
+        self, client: TestClient, auth_headers: dict
+    ) -> None:
+        # arrange
+        person = create_person(client, auth_headers)
+        first_event = create_event(
+            person=person,
+            place=create_place(client, auth_headers),
+            time=create_time(client, auth_headers, end_date="-10y"),
+            client=client,
+            auth_headers=auth_headers,
+        )
+        params = QueryParams(storyId=person.id, eventId=first_event.id)
+        response = client.get("/history", params=params)
+        assert response.status_code == 200
+        assert len(Story.model_validate(response.json()).events) == 1
+
+        # act
+        create_event(
+            person=person,
+            place=create_place(client, auth_headers),
+            time=create_time(client, auth_headers, start_date="-9y"),
+            client=client,
+            auth_headers=auth_headers,
+        )
+        response = client.get("/history", params=params)
+
+        # assert
+        assert response.status_code == 200
+        assert len(Story.model_validate(response.json()).events) == 2
+
+    def test_unchanged_story_returns_304(
+        self, client: TestClient, auth_headers: dict
+    ) -> None:
+        # arrange
+        person = create_person(client, auth_headers)
+        first_event = create_event(
+            person=person,
+            place=create_place(client, auth_headers),
+            time=create_time(client, auth_headers, end_date="-10y"),
+            client=client,
+            auth_headers=auth_headers,
+        )
+        params = QueryParams(storyId=person.id, eventId=first_event.id)
+        response = client.get("/history", params=params)
+        assert response.status_code == 200
+        etag = response.headers["ETag"]
+        assert "s-maxage" in response.headers["Cache-Control"]
+
+        # act
+        not_modified = client.get(
+            "/history", params=params, headers={"If-None-Match": etag}
+        )
+
+        # assert
+        assert not_modified.status_code == 304
+        assert not_modified.headers["ETag"] == etag
+        assert not_modified.content == b""
+
+        # a new event in the story changes its revision
+        create_event(
+            person=person,
+            place=create_place(client, auth_headers),
+            time=create_time(client, auth_headers, start_date="-9y"),
+            client=client,
+            auth_headers=auth_headers,
+        )
+        response = client.get(
+            "/history", params=params, headers={"If-None-Match": etag}
+        )
+        assert response.status_code == 200
+        assert response.headers["ETag"] != etag
+        assert len(Story.model_validate(response.json()).events) == 2
+
+    def test_default_story_has_no_etag(
+        self, client: TestClient, auth_headers: dict
+    ) -> None:
+        person = create_person(client, auth_headers)
+        create_event(
+            person=person,
+            place=create_place(client, auth_headers),
+            time=create_time(client, auth_headers),
+            client=client,
+            auth_headers=auth_headers,
+        )
+        response = client.get("/history")
+        assert response.status_code == 200
+        assert "ETag" not in response.headers
+
     def test_missing_story_raises_404(
         self, client: TestClient, auth_headers: dict
     ) -> None:
@@ -1585,6 +1903,42 @@ class TestGetNearbyEvents:
         event_ids = [e["eventId"] for e in data["events"]]
         assert str(event2.id) in event_ids
 
+    def test_unchanged_results_return_304(
+        self, client: TestClient, auth_headers: dict
+    ) -> None:
+        params = {
+            "eventId": str(uuid4()),
+            "calendarModel": "https://www.wikidata.org/wiki/Q12138",
+            "precision": 9,
+            "datetime": "+1685-03-21T00:00:00Z",
+            "minLat": 50.0,
+            "maxLat": 52.0,
+            "minLng": 9.0,
+            "maxLng": 11.0,
+        }
+        response = client.get("/history/nearby", params=params)
+        assert response.status_code == 200
+        etag = response.headers["ETag"]
+
+        response = client.get(
+            "/history/nearby", params=params, headers={"If-None-Match": etag}
+        )
+        assert response.status_code == 304
+
+        # any new event may be nearby
+        create_event(
+            client=client,
+            person=create_person(client, auth_headers),
+            place=create_place(client, auth_headers),
+            time=create_time(client, auth_headers),
+            auth_headers=auth_headers,
+        )
+        response = client.get(
+            "/history/nearby", params=params, headers={"If-None-Match": etag}
+        )
+        assert response.status_code == 200
+        assert response.headers["ETag"] != etag
+
     def test_missing_params_returns_422(self, client: TestClient) -> None:
         """Verify that missing required params returns validation error."""
         response = client.get("/history/nearby")
@@ -1607,3 +1961,99 @@ class TestGetNearbyEvents:
         )
         assert response.status_code == 200
         assert response.json() == {"events": []}
+
+
+class TestGetNearbyClusters:
+    def _create_place(
+        self, client: TestClient, auth_headers: dict, latitude: float, longitude: float
+    ) -> WikiDataPlaceOutput:
+        wikidata_id = generate_wikidata_id()
+        place_input = WikiDataPlaceInput(
+            wikidata_id=wikidata_id,
+            wikidata_url=generate_wikidata_url(wikidata_id),
+            name=f"Cluster Test Place {wikidata_id}",
+            latitude=latitude,
+            longitude=longitude,
+        )
+        place_resp = client.post(
+            "/wikidata/places",
+            data=place_input.model_dump_json(),
+            headers=auth_headers,
+        )
+        return WikiDataPlaceOutput.model_validate(place_resp.json())
+
+    def test_groups_events_by_cell(
+        self, client: TestClient, auth_headers: dict
+    ) -> None:
+        person = create_person(client, auth_headers)
+        near = self._create_place(client, auth_headers, latitude=51.0, longitude=10.0)
+        also_near = self._create_place(
+            client, auth_headers, latitude=51.1, longitude=10.1
+        )
+        far = self._create_place(client, auth_headers, latitude=51.0, longitude=14.0)
+        time_input = WikiDataTimeInput(
+            wikidata_id=generate_wikidata_id(),
+            wikidata_url=generate_wikidata_url("Q888"),
+            name="March 21, 1685",
+            date="+1685-03-21T00:00:00Z",
+            calendar_model="https://www.wikidata.org/wiki/Q12138",
+            precision=11,
+        )
+        time_resp = client.post(
+            "/wikidata/times",
+            data=time_input.model_dump_json(),
+            headers=auth_headers,
+        )
+        time = WikiDataTimeOutput.model_validate(time_resp.json())
+        event_ids = {
+            str(
+                create_event(
+                    client=client,
+                    person=person,
+                    place=place,
+                    time=time,
+                    auth_headers=auth_headers,
+                ).id
+            )
+            for place in (near, also_near, far)
+        }
+
+        response = client.get(
+            "/history/nearby/clusters",
+            params={
+                "calendarModel": "https://www.wikidata.org/wiki/Q12138",
+                "precision": 9,
+                "datetime": "+1685-03-21T00:00:00Z",
+                "zoom": 8,
+                "minLat": 50.0,
+                "maxLat": 52.0,
+                "minLng": 9.0,
+                "maxLng": 15.0,
+            },
+        )
+        assert response.status_code == 200, response.text
+        data = response.json()
+        assert data["zoom"] == 8
+        clusters = sorted(data["clusters"], key=lambda cluster: cluster["longitude"])
+        assert [cluster["count"] for cluster in clusters] == [2, 1]
+        assert clusters[0]["latitude"] == pytest.approx(51.05)
+        assert clusters[0]["longitude"] == pytest.approx(10.05)
+        assert clusters[0]["minLng"] <= 10.0 <= clusters[0]["maxLng"]
+        assert {cluster["event"]["eventId"] for cluster in clusters} <= event_ids
+        assert clusters[1]["event"]["placeName"] == far.name
+
+    def test_zoom_out_of_range_returns_422(self, client: TestClient) -> None:
+        response = client.get(
+            "/history/nearby/clusters",
+            params={
+                "calendarModel": "https://www.wikidata.org/wiki/Q12138",
+                "precision": 9,
+                "datetime": "+1685-03-21T00:00:00Z",
+                "zoom": 21,
+                "minLat": 50.0,
+                "maxLat": 52.0,
+                "minLng": 9.0,
+                "maxLng": 15.0,
+            },
+        )
+        assert response.status_code == 422
@@ -6,12 +6,16 @@ from typing import Dict
 
 from fastapi.testclient import TestClient
 
+from the_history_atlas.api.types.text_reader import MAX_SEARCH_BATCH_SIZE
 from the_history_atlas.main import get_app
 
 
 @pytest.fixture
 def client(cleanup_db):
-    return TestClient(get_app())
+    # run the app's lifespan, so requests share one event loop and the async
+    # connection pool is disposed on it
+    with TestClient(get_app()) as client:
+        yield client
 
 
 @pytest.fixture
@@ -241,6 +245,62 @@ class TestSearchTextReaderPeople:
         assert response.json()["candidates"] == []
 
 
+class TestSearchTextReaderPeopleBatch:
+    def test_returns_candidates_in_order(self, client, auth_headers):
+        for name in ("Batch Person One", "Batch Person Two"):
+            client.post(
+                "/text-reader/people", json={"name": name}, headers=auth_headers
+            )
+
+        response = client.post(
+            "/text-reader/people/search/batch",
+            json={
+                "names": [
+                    "Batch Person Two",
+                    "xyznonexistent999",
+                    "",
+                    "Batch Person One",
+                ]
+            },
+            headers=auth_headers,
+        )
+
+        assert response.status_code == 200
+        results = response.json()["results"]
+        assert len(results) == 4
+        assert results[0]["candidates"][0]["name"] == "Batch Person Two"
+        assert results[1]["candidates"] == []
+        assert results[2]["candidates"] == []
+        assert results[3]["candidates"][0]["name"] == "Batch Person One"
+
+    def test_matches_single_search(self, client, auth_headers):
+        client.post(
+            "/text-reader/people", json={"name": "Johann Bach"}, headers=auth_headers
+        )
+
+        single = client.get(
+            "/text-reader/people/search",
+            params={"name": "Johann Bach"},
+            headers=auth_headers,
+        )
+        batch = client.post(
+            "/text-reader/people/search/batch",
+            json={"names": ["Johann Bach"]},
+            headers=auth_headers,
+        )
+
+        assert batch.json()["results"] == [single.json()]
+
+    def test_rejects_oversized_batch(self, client, auth_headers):
+        response = client.post(
+            "/text-reader/people/search/batch",
+            json={"names": ["Johann Bach"] * (MAX_SEARCH_BATCH_SIZE + 1)},
+            headers=auth_headers,
+        )
+
+        assert response.status_code == 422
+
+
 # --- Text Reader Places Endpoints ---
 
 
@@ -298,6 +358,56 @@ class TestSearchTextReaderPlaces:
         assert len(response.json()["candidates"]) > 0
 
 
+class TestSearchTextReaderPlacesBatch:
+    def test_returns_candidates_in_order(self, client, auth_headers):
+        client.post(
+            "/text-reader/places",
+            json={"name": "Batch Place", "latitude": 45.0, "longitude": 7.0},
+            headers=auth_headers,
+        )
+        client.post(
+            "/text-reader/places",
+            json={"name": "Nearby Batch Town", "latitude": 45.2, "longitude": 7.1},
+            headers=auth_headers,
+        )
+
+        response = client.post(
+            "/text-reader/places/search/batch",
+            json={
+                "queries": [
+                    {"name": "xyznonexistent999"},
+                    {"name": "Batch Place", "latitude": 45.0, "longitude": 7.0},
+                    {"latitude": 45.2, "longitude": 7.1},
+                ],
+                "radius": 0.5,
+            },
+            headers=auth_headers,
+        )
+
+        assert response.status_code == 200
+        results = response.json()["results"]
+        assert len(results) == 3
+        assert results[0]["candidates"] == []
+        # name matches come first, and aren't repeated as nearby places
+        names = [candidate["name"] for candidate in results[1]["candidates"]]
+        assert names[0] == "Batch Place"
+        assert "Nearby Batch Town" in names
+        assert len(set(names)) == len(names)
+        assert {candidate["name"] for candidate in results[2]["candidates"]} == {
+            "Batch Place",
+            "Nearby Batch Town",
+        }
+
+    def test_rejects_oversized_batch(self, client, auth_headers):
+        response = client.post(
+            "/text-reader/places/search/batch",
+            json={"queries": [{"name": "Batch Place"}] * (MAX_SEARCH_BATCH_SIZE + 1)},
+            headers=auth_headers,
+        )
+
+        assert response.status_code == 422
+
+
 # --- Text Reader Time Endpoints ---
 
 
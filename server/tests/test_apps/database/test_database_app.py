@@ -0,0 +1,69 @@
+import pytest
+from prometheus_client import REGISTRY
+from sqlalchemy import text
+
+from the_history_atlas.apps.database import DatabaseApp
+
+
+def _sample(name: str, pool: str) -> float:
+    return REGISTRY.get_sample_value(name, {"pool": pool}) or 0.0
+
+
+@pytest.fixture
+def pool_config(config):
+    config.DB_POOL_SIZE = 1
+    config.DB_MAX_OVERFLOW = 1
+    config.DB_POOL_PRE_PING = True
+    config.DB_STATEMENT_TIMEOUT_MS = 1234
+    return config
+
+
+def test_pool_settings_are_applied(pool_config):
+    engine = DatabaseApp(config_app=pool_config).client()
+    try:
+        assert engine.pool.size() == 1
+        assert engine.pool._max_overflow == 1
+        assert engine.pool._pre_ping is True
+        with engine.connect() as connection:
+            timeout = connection.execute(text("show statement_timeout")).scalar()
+        assert timeout == "1234ms"
+    finally:
+        engine.dispose()
+
+
+def test_pool_metrics(pool_config):
+    engine = DatabaseApp(config_app=pool_config).client()
+    checkouts = _sample("database_pool_checkout_seconds_count", "sync")
+    checked_out = _sample("database_pool_checked_out_connections", "sync")
+    overflow = _sample("database_pool_overflow_connections_total", "sync")
+    try:
+        with engine.connect(), engine.connect():
+            # the second connection is beyond the pool size of 1
+            assert (
+                _sample("database_pool_checked_out_connections", "sync")
+                == checked_out + 2
+            )
+        assert _sample("database_pool_checkout_seconds_count", "sync") == checkouts + 2
+        assert _sample("database_pool_checked_out_connections", "sync") == checked_out
+        assert (
+            _sample("database_pool_overflow_connections_total", "sync") == overflow + 1
+        )
+    finally:
+        engine.dispose()
+
+
+@pytest.mark.asyncio
+async def test_async_pool_settings_are_applied(pool_config):
+    database_app = DatabaseApp(config_app=pool_config)
+    engine = database_app.async_client()
+    checkouts = _sample("database_pool_checkout_seconds_count", "async")
+    try:
+        assert engine.pool.size() == 1
+        async with engine.connect() as connection:
+            timeout = (
+                await connection.execute(text("show statement_timeout"))
+            ).scalar()
+        assert timeout == "1234ms"
+        assert _sample("database_pool_checkout_seconds_count", "async") > checkouts
+    finally:
+        await database_app.dispose_async_client()
@@ -67,6 +67,7 @@ def cleanup_tag(history_db) -> Generator[Callable[[UUID], None], None, None]:
                 -- Delete story names and tag names
                 DELETE FROM story_names WHERE tag_id IN :ids;
                 DELETE FROM tag_names WHERE tag_id IN :ids;
+                DELETE FROM story_stats WHERE story_id IN :ids;
                 
                 -- Finally, delete the tags
                 DELETE FROM tags WHERE id IN :ids;
@@ -0,0 +1,215 @@
+from datetime import datetime, timezone
+
+import pytest
+from sqlalchemy import text
+
+from the_history_atlas.apps.domain.models.history.bulk_load import BulkEvent
+from the_history_atlas.apps.history.bulk_loader import BulkLoader, read_events
+
+
+def _event(
+    summary: str,
+    date: str,
+    place: str = "Q90",
+    person: str = "Q1339",
+    person_name: str = "Johann Sebastian Bach",
+) -> BulkEvent:
+    time_name = date[1:5]
+    return BulkEvent.model_validate(
+        {
+            "summary": summary,
+            "citation": {
+                "access_date": datetime(2025, 1, 1, tzinfo=timezone.utc),
+                "wikidata_item_id": "Q1339",
+                "wikidata_item_title": "Johann Sebastian Bach",
+                "wikidata_item_url": "https://www.wikidata.org/wiki/Q1339",
+            },
+            "tags": [
+                {
+                    "type": "PERSON",
+                    "name": person_name,
+                    "wikidata_id": person,
+                    "wikidata_url": f"https://www.wikidata.org/wiki/{person}",
+                    "start_char": 0,
+                    "stop_char": 21,
+                },
+                {
+                    "type": "PLACE",
+                    "name": f"Place {place}",
+                    "wikidata_id": place,
+                    "wikidata_url": f"https://www.wikidata.org/wiki/{place}",
+                    "latitude": 48.85,
+                    "longitude": 2.35,
+                    "start_char": 25,
+                    "stop_char": 30,
+                },
+                {
+                    "type": "TIME",
+                    "name": time_name,
+                    "date": date,
+                    "calendar_model": "http://www.wikidata.org/entity/Q1985727",
+                    "precision": 9,
+                    "start_char": 34,
+                    "stop_char": 38,
+                },
+            ],
+        }
+    )
+
+
+def _story(history_db, wikidata_id: str) -> list[tuple[str, int]]:
+    with history_db.Session() as session:
+        rows = session.execute(
+            text(
+                """
+                SELECT summaries.text, tag_instances.story_order
+                FROM tag_instances
+                JOIN tags ON tags.id = tag_instances.tag_id
+                JOIN summaries ON summaries.id = tag_instances.summary_id
+                WHERE tags.wikidata_id = :wikidata_id
+                ORDER BY tag_instances.story_order;
+                """
+            ),
+            {"wikidata_id": wikidata_id},
+        ).all()
+    return [(row.text, row.story_order) for row in rows]
+
+
+def test_read_events_ndjson(tmp_path):
+    events = [_event("Bach was born.", "+1685-00-00T00:00:00Z")]
+    path = tmp_path / "events.ndjson"
+    path.write_text("\n".join(event.model_dump_json() for event in events) + "\n\n")
+    assert list(read_events(path)) == events
+
+
+def test_load(history_db, cleanup_db):
+    loader = BulkLoader(repository=history_db, chunk_size=2)
+    stats = loader.load(
+        [
+            _event("Bach moved to Leipzig.", "+1723-00-00T00:00:00Z"),
+            _event("Bach was born.", "+1685-00-00T00:00:00Z", place="Q7070"),
+            _event("Bach moved to Leipzig.", "+1723-00-00T00:00:00Z"),
+        ]
+    )
+    assert stats.events_read == 3
+    assert stats.events_created == 2
+    assert stats.duplicates == 1
+    # a person, two places and two times
+    assert stats.tags_created == 5
+    assert stats.tag_instances_created == 6
+    assert stats.stories_ordered == 5
+    assert _story(history_db, "Q1339") == [
+        ("Bach was born.", 100_000),
+        ("Bach moved to Leipzig.", 101_000),
+    ]
+
+    # existing tags are reused, and the stories renumbered around new events
+    stats = loader.load(
+        [
+            _event("Bach was baptised.", "+1685-00-00T00:00:00Z", place="Q7070"),
+            _event("Bach died.", "+1750-00-00T00:00:00Z"),
+        ]
+    )
+    assert stats.events_created == 2
+    assert stats.tags_created == 1
+    assert _story(history_db, "Q1339") == [
+        ("Bach was born.", 100_000),
+        ("Bach was baptised.", 101_000),
+        ("Bach moved to Leipzig.", 102_000),
+        ("Bach died.", 103_000),
+    ]
+    with history_db.Session() as session:
+        story_names = session.execute(
+            text(
+                """
+                SELECT story_names.name FROM story_names
+                JOIN tags ON tags.id = story_names.tag_id
+                WHERE tags.wikidata_id = 'Q1339';
+                """
+            )
+        ).scalars()
+        assert list(story_names) == ["The Life of Johann Sebastian Bach"]
+        citations = session.execute(
+            text("SELECT count(*) FROM citations WHERE summary_id IS NOT NULL;")
+        ).scalar_one()
+        assert citations == 4
+        stats = session.execute(
+            text(
+                """
+                SELECT event_count, earliest_year, latest_year FROM story_stats
+                JOIN tags ON tags.id = story_stats.story_id
+                WHERE tags.wikidata_id = 'Q1339';
+                """
+            )
+        ).one()
+        assert tuple(stats) == (4, 1685, 1750)
+
+
+def test_load_drops_dependent_story_links(history_db, cleanup_db):
+    loader = BulkLoader(repository=history_db)
+    loader.load(
+        [
+            _event("Bach moved to Leipzig.", "+1723-00-00T00:00:00Z"),
+            _event("Bach was born.", "+1685-00-00T00:00:00Z", place="Q7070"),
+        ]
+    )
+    with history_db.Session() as session:
+        tag_ids = {
+            row.wikidata_id or row.year: row.id
+            for row in session.execute(
+                text(
+                    """
+                    SELECT tags.id, tags.wikidata_id, substr(times.datetime, 2, 4) AS year
+                    FROM tags
+                    LEFT JOIN times ON times.id = tags.id;
+                    """
+                )
+            )
+        }
+        for tag_id in tag_ids.values():
+            history_db.refresh_story_links(tag_id=tag_id, session=session)
+        session.commit()
+    revisions = history_db.get_revisions(tag_ids.values())
+
+    # a new person in Paris, at a time after 1723
+    loader.load(
+        [
+            _event(
+                "Handel visited Paris.",
+                "+1750-00-00T00:00:00Z",
+                person="Q7302",
+                person_name="George Frideric Handel",
+            )
+        ]
+    )
+    with history_db.Session() as session:
+        linked = set(
+            session.execute(text("SELECT DISTINCT tag_id FROM story_links;")).scalars()
+        )
+    # Bach's story continues into Paris, and 1723 is adjacent to 1750
+    assert tag_ids["Q1339"] not in linked
+    assert tag_ids["1723"] not in linked
+    # 1685 neither depends on Paris nor is adjacent to 1750
+    assert tag_ids["1685"] in linked
+    current = history_db.get_revisions(tag_ids.values())
+    assert current[str(tag_ids["Q1339"])] > revisions[str(tag_ids["Q1339"])]
+    assert current[str(tag_ids["1723"])] > revisions[str(tag_ids["1723"])]
+    assert current[str(tag_ids["1685"])] == revisions[str(tag_ids["1685"])]
+
+
+@pytest.mark.parametrize("defer_indexes", [True, False])
+def test_load_keeps_indexes(history_db, cleanup_db, defer_indexes):
+    query = text(
+        """
+        SELECT indexname, indexdef FROM pg_indexes
+        WHERE tablename IN ('summaries', 'tag_instances', 'times')
+        ORDER BY indexname;
+        """
+    )
+    with history_db.Session() as session:
+        before = session.execute(query).all()
+    BulkLoader(repository=history_db, defer_indexes=defer_indexes).load(
+        [_event("Bach was born.", "+1685-00-00T00:00:00Z")]
+    )
+    with history_db.Session() as session:
+        assert session.execute(query).all() == before
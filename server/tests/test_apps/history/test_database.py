@@ -212,6 +212,51 @@ def test_create_tag_instance(history_db):
         session.commit()
 
 
+def test_bulk_create_tag_instances_with_after(history_db):
+    after = [uuid4(), uuid4()]
+    tag_instances = [
+        TagInstanceInput(
+            tag_id=PEOPLE[0].id,
+            summary_id=SUMMARIES[0].id,
+            start_char=start_char,
+            stop_char=start_char + 5,
+            story_order=story_order,
+        )
+        for start_char, story_order in [(0, 1000), (10, None)]
+    ]
+    with history_db.Session() as session:
+        db_builder = DBBuilder(session=session)
+        db_builder.insert_people(people=PEOPLE)
+        db_builder.insert_summaries(summaries=SUMMARIES)
+        models = history_db.bulk_create_tag_instances(
+            tag_instances=tag_instances, session=session, after=after
+        )
+        session.commit()
+
+    assert [model.start_char for model in models] == [0, 10]
+    with history_db.Session() as session:
+        rows = session.execute(
+            text(
+                """
+                select id, start_char, story_order, after
+                from tag_instances where id = any(:ids)
+                order by start_char;
+                """
+            ),
+            {"ids": [model.id for model in models]},
+        ).all()
+        assert [row.id for row in rows] == [model.id for model in models]
+        assert [row.story_order for row in rows] == [1000, None]
+        assert all(row.after == [str(id) for id in after] for row in rows)
+
+        # cleanup
+        session.execute(
+            text("delete from tag_instances where id = any(:ids)"),
+            {"ids": [model.id for model in models]},
+        )
+        session.commit()
+
+
 def test_get_name_success(history_db):
     seed_name_model = NAMES[0]
 
@@ -1090,6 +1135,87 @@ class TestGetTagIdsWithNullOrders:
             session.commit()
 
 
+class TestStoryOrderJobs:
+    def get_job(self, history_db, tag_id):
+        with history_db.Session() as session:
+            return session.execute(
+                text(
+                    """
+                    SELECT requests, run_after > now() AS leased
+                    FROM story_order_jobs WHERE tag_id = :tag_id
+                    """
+                ),
+                {"tag_id": tag_id},
+            ).one_or_none()
+
+    def claim(self, history_db, session, tag_id):
+        jobs = history_db.claim_story_order_jobs(
+            limit=1000, lease_seconds=600, session=session
+        )
+        return [job for job in jobs if job.tag_id == tag_id]
+
+    def test_requests_are_coalesced(self, history_db, engine, cleanup_tag):
+        tag_id = create_tag(engine, "PERSON")
+        cleanup_tag(tag_id)
+        for _ in range(3):
+            with history_db.Session() as session:
+                history_db.enqueue_story_order_jobs(
+                    [tag_id, tag_id], delay_seconds=60, session=session
+                )
+                session.commit()
+        job = self.get_job(history_db, tag_id)
+        assert job.requests == 3
+        # not yet due
+        with history_db.Session() as session:
+            assert self.claim(history_db, session, tag_id) == []
+
+    def test_claim_skips_locked_and_leased_jobs(self, history_db, engine, cleanup_tag):
+        tag_id = create_tag(engine, "PERSON")
+        cleanup_tag(tag_id)
+        with history_db.Session() as session:
+            history_db.enqueue_story_order_jobs(
+                [tag_id], delay_seconds=0, session=session
+            )
+            session.commit()
+
+        with history_db.Session() as first, history_db.Session() as second:
+            (job,) = self.claim(history_db, first, tag_id)
+            assert job.requests == 1
+            assert self.claim(history_db, second, tag_id) == []
+            first.commit()
+            second.rollback()
+            assert self.claim(history_db, second, tag_id) == []
+        assert self.get_job(history_db, tag_id).leased
+
+        with history_db.Session() as session:
+            history_db.finish_story_order_jobs([job], delay_seconds=60, session=session)
+            session.commit()
+        assert self.get_job(history_db, tag_id) is None
+
+    def test_finish_keeps_jobs_requested_while_processing(
+        self, history_db, engine, cleanup_tag
+    ):
+        tag_id = create_tag(engine, "PERSON")
+        cleanup_tag(tag_id)
+        with history_db.Session() as session:
+            history_db.enqueue_story_order_jobs(
+                [tag_id], delay_seconds=0, session=session
+            )
+            session.commit()
+        with history_db.Session() as session:
+            (job,) = self.claim(history_db, session, tag_id)
+            session.commit()
+        with history_db.Session() as session:
+            history_db.enqueue_story_order_jobs(
+                [tag_id], delay_seconds=0, session=session
+            )
+            history_db.finish_story_order_jobs([job], delay_seconds=0, session=session)
+            session.commit()
+        job = self.get_job(history_db, tag_id)
+        assert job.requests == 2
+        assert not job.leased
+
+
 class TestGetNearbyEvents:
     def _setup_nearby_data(self, history_db, session):
         """Create test data for nearby event queries.
@@ -1520,6 +1646,123 @@ class TestGetNearbyEvents:
             )
             assert results == []
 
+    def test_clusters_only_count_events_with_person_and_place(
+        self, history_db, cleanup_db
+    ):
+        calendar_model = "http://www.wikidata.org/entity/Q1985727"
+        with history_db.Session() as session:
+            data = self._setup_nearby_data(history_db, session)
+            tagged = self._create_summary_with_tags(
+                session,
+                data["person_id"],
+                data["place_id"],
+                "Cluster event with a person",
+                "+1685-03-21T00:00:00Z",
+                calendar_model,
+                9,
+                51.0,
+                10.0,
+            )
+            # more precise, in the same cell, but without a person
+            untagged = self._create_summary_with_tags(
+                session,
+                data["person_id"],
+                data["place_id"],
+                "Cluster event without a person",
+                "+1685-03-21T00:00:00Z",
+                calendar_model,
+                11,
+                51.01,
+                10.01,
+            )
+            session.execute(
+                text(
+                    """
+                    DELETE FROM tag_instances
+                    WHERE summary_id = :summary_id AND tag_id = :tag_id
+                    """
+                ),
+                {"summary_id": untagged, "tag_id": data["person_id"]},
+            )
+            session.commit()
+
+            [cluster] = history_db.get_nearby_clusters(
+                calendar_model=calendar_model,
+                precision=9,
+                datetime_prefix="+1685",
+                zoom=8,
+                min_lat=50.0,
+                max_lat=52.0,
+                min_lng=9.0,
+                max_lng=11.0,
+                session=session,
+            )
+            assert cluster.count == 1
+            assert cluster.event.event_id == tagged
+            assert cluster.latitude == pytest.approx(51.0)
+
+    def test_viewport_across_the_antimeridian(self, history_db, cleanup_db):
+        calendar_model = "http://www.wikidata.org/entity/Q1985727"
+        with history_db.Session() as session:
+            data = self._setup_nearby_data(history_db, session)
+            summary_ids = {
+                longitude: self._create_summary_with_tags(
+                    session,
+                    data["person_id"],
+                    data["place_id"],
+                    f"Antimeridian event at {longitude}",
+                    "+1685-03-21T00:00:00Z",
+                    calendar_model,
+                    9,
+                    51.0,
+                    longitude,
+                )
+                for longitude in (179.5, -179.5, 10.0)
+            }
+            session.commit()
+
+            viewport = dict(min_lat=50.0, max_lat=52.0, min_lng=179.0, max_lng=-179.0)
+            results = history_db.get_nearby_events(
+                event_id=uuid4(),
+                calendar_model=calendar_model,
+                precision=9,
+                datetime_prefix="+1685",
+                session=session,
+                **viewport,
+            )
+            assert {row.event_id for row in results} == {
+                summary_ids[179.5],
+                summary_ids[-179.5],
+            }
+            clusters = history_db.get_nearby_clusters(
+                calendar_model=calendar_model,
+                precision=9,
+                datetime_prefix="+1685",
+                zoom=8,
+                session=session,
+                **viewport,
+            )
+            assert sorted(cluster.longitude for cluster in clusters) == [
+                -179.5,
+                179.5,
+            ]
+
+            # a viewport with its latitudes reversed covers nothing
+            assert (
+                history_db.get_nearby_events(
+                    event_id=uuid4(),
+                    calendar_model=calendar_model,
+                    precision=9,
+                    datetime_prefix="+1685",
+                    min_lat=52.0,
+                    max_lat=50.0,
+                    min_lng=9.0,
+                    max_lng=11.0,
+                    session=session,
+                )
+                == []
+            )
+
 
 class TestDefaultStoryCache:
     def setup_test_data(self, history_db):
@@ -1543,10 +1786,10 @@ class TestDefaultStoryCache:
                 text(
                     """
                     INSERT INTO summaries (id, text)
-                    VALUES (:id, 'Test summary')
+                    VALUES (:id, :text)
                     """
                 ),
-                {"id": summary_id},
+                {"id": summary_id, "text": f"Test summary {summary_id}"},
             )
 
             # Create a tag instance with story_order
@@ -1627,3 +1870,149 @@ class TestDefaultStoryCache:
         # Cache should now be populated
         with history_db._cache_lock:
             assert len(history_db._default_story_cache) > 0
+
+    def test_candidates_are_added_when_story_order_is_set(self, history_db):
+        person_id, summary_id = self.setup_test_data(history_db)
+        with history_db.Session() as session:
+            place_id = uuid4()
+            session.execute(
+                text("INSERT INTO tags (id, type) VALUES (:id, 'PLACE')"),
+                {"id": place_id},
+            )
+            unordered_id = uuid4()
+            session.execute(
+                text(
+                    """
+                    INSERT INTO tag_instances (id, tag_id, summary_id, start_char, stop_char, story_order)
+                    VALUES
+                        (:unordered_id, :person_id, :summary_id, 0, 10, NULL),
+                        (:place_instance_id, :place_id, :summary_id, 0, 10, 100000)
+                    """
+                ),
+                {
+                    "unordered_id": unordered_id,
+                    "person_id": person_id,
+                    "summary_id": summary_id,
+                    "place_instance_id": uuid4(),
+                    "place_id": place_id,
+                },
+            )
+            candidate_ids = text(
+                """
+                SELECT default_story_candidates.id FROM default_story_candidates
+                JOIN tag_instances ON tag_instances.id = tag_instance_id
+                WHERE tag_instances.summary_id = :summary_id
+                ORDER BY default_story_candidates.id
+                """
+            )
+            params = {"summary_id": summary_id}
+            # only the ordered person tag instance
+            assert len(session.execute(candidate_ids, params).all()) == 1
+
+            session.execute(
+                text("UPDATE tag_instances SET story_order = 200000 WHERE id = :id"),
+                {"id": unordered_id},
+            )
+            candidates = session.execute(candidate_ids, params).scalars().all()
+            assert len(candidates) == 2
+
+            # a rebalance clears and rewrites the order without adding rows
+            session.execute(
+                text(
+                    "UPDATE tag_instances SET story_order = NULL WHERE tag_id = :tag_id"
+                ),
+                {"tag_id": person_id},
+            )
+            assert history_db._sample_default_stories(10, session) == []
+            session.execute(
+                text(
+                    """
+                    UPDATE tag_instances
+                    SET story_order = CASE WHEN id = :id THEN 1 ELSE 2 END
+                    WHERE tag_id = :tag_id
+                    """
+                ),
+                {"tag_id": person_id, "id": unordered_id},
+            )
+            assert session.execute(candidate_ids, params).scalars().all() == candidates
+            session.commit()
+
+    def test_sample_default_stories(self, history_db):
+        expected = {self.setup_test_data(history_db) for _ in range(3)}
+        with history_db.Session() as session:
+            story_pointers = history_db._sample_default_stories(10, session)
+        assert len(story_pointers) == len(
+            {(pointer.story_id, pointer.event_id) for pointer in story_pointers}
+        )
+        assert {
+            (pointer.story_id, pointer.event_id) for pointer in story_pointers
+        } <= expected
+
+    def test_get_default_story_by_event(self, history_db):
+        person_id, summary_id = self.setup_test_data(history_db)
+        story_pointer = history_db.get_default_story_by_event(event_id=summary_id)
+        assert story_pointer.story_id == person_id
+        assert story_pointer.event_id == summary_id
+
+
+class TestGetRelatedTimeStory:
+    CALENDAR_MODEL = "http://www.wikidata.org/entity/Q1985727"
+
+    def create_times(
+        self, history_db, session, times: list[tuple[str, int]]
+    ) -> list[UUID]:
+        ids = []
+        for datetime, precision in times:
+            time_model = history_db.create_time(
+                session=session,
+                id=uuid4(),
+                datetime=datetime,
+                calendar_model=self.CALENDAR_MODEL,
+                precision=precision,
+            )
+            ids.append(time_model.id)
+        return ids
+
+    def test_orders_bce_years_numerically(self, history_db):
+        # years far outside any other test data; as strings, '-987648'
+        # sorts before '-987649' and every CE year sorts before them all
+        with history_db.Session() as session:
+            earlier, middle, later = self.create_times(
+                history_db,
+                session,
+                [
+                    ("-987650-00-00T00:00:00Z", 9),
+                    ("-987649-00-00T00:00:00Z", 9),
+                    ("-987648-00-00T00:00:00Z", 9),
+                ],
+            )
+            for direction, expected in (("next", later), ("prev", earlier)):
+                related = history_db.get_related_time_story(
+                    story_id=middle, direction=direction, session=session
+                )
+                assert related == expected
+            session.rollback()
+
+    def test_orders_by_precision_within_a_datetime(self, history_db):
+        with history_db.Session() as session:
+            century, year = self.create_times(
+                history_db,
+                session,
+                [
+                    ("-987600-00-00T00:00:00Z", 7),
+                    ("-987600-00-00T00:00:00Z", 9),
+                ],
+            )
+            assert (
+                history_db.get_related_time_story(
+                    story_id=century, direction="next", session=session
+                )
+                == year
+            )
+            assert (
+                history_db.get_related_time_story(
+                    story_id=year, direction="prev", session=session
+                )
+                == century
+            )
+            session.rollback()
@@ -0,0 +1,68 @@
+import pytest
+from sqlalchemy import text
+
+from the_history_atlas.apps.history.grid_cell import (
+    GRID_ZOOM,
+    cell_at_zoom,
+    cell_bounds,
+    grid_cell,
+    viewport_boxes,
+)
+
+
+@pytest.mark.parametrize(
+    "latitude,longitude",
+    [(0.0, 0.0), (48.85, 2.35), (-33.9, 151.2), (90.0, 180.0), (-90.0, -180.0)],
+)
+@pytest.mark.parametrize("zoom", [0, 1, 8, GRID_ZOOM])
+def test_cell_at_zoom_contains_location(latitude, longitude, zoom):
+    cell = cell_at_zoom(grid_cell(latitude, longitude), zoom)
+    min_lat, max_lat, min_lng, max_lng = cell_bounds(cell, zoom)
+    assert min_lat <= latitude <= max_lat
+    assert min_lng <= longitude <= max_lng
+
+
+def test_zoom_zero_is_one_cell():
+    assert cell_at_zoom(grid_cell(-45.0, -120.0), 0) == 0
+    assert cell_at_zoom(grid_cell(45.0, 120.0), 0) == 0
+    assert cell_bounds(0, 0) == (-90, 90, -180, 180)
+
+
+def test_nearby_locations_share_coarse_cells():
+    paris, versailles = grid_cell(48.85, 2.35), grid_cell(48.80, 2.13)
+    assert paris != versailles
+    assert cell_at_zoom(paris, 8) == cell_at_zoom(versailles, 8)
+    assert cell_at_zoom(paris, 8) != cell_at_zoom(grid_cell(51.5, -0.12), 8)
+
+
+def test_generated_column_matches_grid_cell(history_db):
+    locations = [(48.85, 2.35), (-33.9, 151.2), (90.0, 180.0), (None, None)]
+    with history_db.Session() as session:
+        for latitude, longitude in locations:
+            generated = session.execute(
+                text(
+                    """
+                    insert into summaries (id, text, latitude, longitude)
+                    values (gen_random_uuid(), :text, :latitude, :longitude)
+                    returning grid_cell;
+                """
+                ),
+                {
+                    "text": f"grid cell test {latitude} {longitude}",
+                    "latitude": latitude,
+                    "longitude": longitude,
+                },
+            ).scalar_one()
+            assert generated == (
+                grid_cell(latitude, longitude) if latitude is not None else None
+            )
+        session.rollback()
+
+
+def test_viewport_boxes_split_at_the_antimeridian():
+    assert viewport_boxes(10.0, 20.0, -30.0, 40.0) == [(10.0, 20.0, -30.0, 40.0)]
+    assert viewport_boxes(10.0, 20.0, 170.0, -170.0) == [
+        (10.0, 20.0, 170.0, 180.0),
+        (10.0, 20.0, -180.0, -170.0),
+    ]
+    assert viewport_boxes(20.0, 10.0, -30.0, 40.0) == []
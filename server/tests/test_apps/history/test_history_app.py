@@ -1,8 +1,14 @@
-from the_history_atlas.apps.domain.core import PersonInput
+from the_history_atlas.apps.domain.core import (
+    PersonInput,
+    PlaceInput,
+    TagInstance,
+    CitationInput,
+)
 from the_history_atlas.apps.domain.models.history.tables.time import TimePrecision
 import pytest
-from uuid import UUID
+from uuid import UUID, uuid4
 import time
+from sqlalchemy import text
 
 
 def test_create_person(history_app, cleanup_tag) -> None:
@@ -115,6 +121,144 @@ class TestFuzzySearchStories:
         assert len(results) > 0
         assert any("humboldt" in result["name"].lower() for result in results)
 
+    def test_new_names_invalidate_cached_searches(
+        self, engine, config, cleanup_tag, monkeypatch
+    ) -> None:
+        from the_history_atlas.apps.history import HistoryApp
+
+        # searches are cached when they aren't answered by the name index
+        monkeypatch.setattr(config, "NAME_INDEX_ENABLED", False)
+        history_app = HistoryApp(config_app=config, database_client=engine)
+        assert history_app.fuzzy_search_stories("Gottfried Leibniz") == []
+        person = history_app.create_person(
+            person=PersonInput(
+                wikidata_id="Q9047",
+                wikidata_url="https://www.wikidata.org/wiki/Q9047",
+                name="Gottfried Wilhelm Leibniz",
+            )
+        )
+        cleanup_tag(person.id)
+        results = history_app.fuzzy_search_stories(" gottfried  LEIBNIZ")
+        assert [result["id"] for result in results] == [str(person.id)]
+        assert history_app.fuzzy_search_stories("Gottfried Leibniz") is results
+
+    def test_new_events_update_cached_search_years(
+        self, history_app, cleanup_tag
+    ) -> None:
+        person = history_app.create_person(
+            person=PersonInput(
+                wikidata_id="Q1035",
+                wikidata_url="https://www.wikidata.org/wiki/Q1035",
+                name="Charles Darwin",
+            )
+        )
+        cleanup_tag(person.id)
+        [result] = history_app.fuzzy_search_stories("Charles Darwin")
+        assert result["earliestYear"] is None
+        place = history_app.create_place(
+            place=PlaceInput(
+                wikidata_id="Q1949",
+                wikidata_url="https://www.wikidata.org/wiki/Q1949",
+                name="Shrewsbury",
+                latitude=52.7,
+                longitude=-2.75,
+            )
+        )
+        cleanup_tag(place.id)
+        born = history_app.create_time(
+            time=TimeInput(
+                datetime=datetime(1809, 2, 12, tzinfo=timezone.utc),
+                calendar_model="http://www.wikidata.org/entity/Q1985727",
+                precision=11,
+                name="February 12, 1809",
+                wikidata_id=None,
+                wikidata_url=None,
+                date="+1809-02-12T00:00:00Z",
+            )
+        )
+        cleanup_tag(born.id)
+        history_app.create_wikidata_event(
+            text="Charles Darwin was born in Shrewsbury on February 12, 1809",
+            tags=[
+                TagInstance(id=person.id, start_char=0, stop_char=14, name=person.name),
+                TagInstance(id=place.id, start_char=27, stop_char=37, name=place.name),
+                TagInstance(id=born.id, start_char=41, stop_char=58, name=born.name),
+            ],
+            citation=CitationInput(
+                wikidata_item_id="Q1035",
+                wikidata_item_title="Charles Darwin",
+                wikidata_item_url="https://www.wikidata.org/wiki/Q1035",
+                access_date="2023-01-01",
+            ),
+            after=[],
+        )
+
+        [result] = history_app.fuzzy_search_stories("Charles Darwin")
+        assert result["earliestYear"] == 1809
+
+    def test_name_index_matches_typos_and_tracks_years(
+        self, engine, config, cleanup_tag, monkeypatch
+    ) -> None:
+        from the_history_atlas.apps.history import HistoryApp
+
+        monkeypatch.setattr(config, "NAME_INDEX_ENABLED", True)
+        history_app = HistoryApp(config_app=config, database_client=engine)
+        person, place, times, event_ids = _create_person_place_events(
+            history_app, cleanup_tag
+        )
+        # an app started later builds its index from the database
+        restarted_app = HistoryApp(config_app=config, database_client=engine)
+        for app in (history_app, restarted_app):
+            results = app.fuzzy_search_stories("Story Lnik Persn")
+            [result] = [r for r in results if r["id"] == str(person.id)]
+            assert result["name"] == "The Life of Story Link Person"
+            assert result["earliestYear"] == 1712
+            assert result["latestYear"] == 1712
+
+    def test_name_index_ignores_rolled_back_names(
+        self, engine, config, monkeypatch
+    ) -> None:
+        from the_history_atlas.apps.history import HistoryApp
+
+        monkeypatch.setattr(config, "NAME_INDEX_ENABLED", True)
+        history_app = HistoryApp(config_app=config, database_client=engine)
+        repository = history_app._repository
+        with repository.Session() as session:
+            tag_id = uuid4()
+            session.execute(
+                text("INSERT INTO tags (id, type) VALUES (:id, 'PERSON')"),
+                {"id": tag_id},
+            )
+            repository.add_name_to_tag(
+                session=session, tag_id=tag_id, name="Phantom Quintessence"
+            )
+            session.rollback()
+        assert history_app._name_index.search("Phantom Quintessence", limit=20) == []
+
+    def test_name_index_finds_names_from_other_processes(
+        self, engine, config, cleanup_tag, monkeypatch
+    ) -> None:
+        from the_history_atlas.apps.history import HistoryApp
+
+        monkeypatch.setattr(config, "NAME_INDEX_ENABLED", True)
+        indexed_app = HistoryApp(config_app=config, database_client=engine)
+        # another process creates the person
+        other_app = HistoryApp(config_app=config, database_client=engine)
+        person = other_app.create_person(
+            person=PersonInput(
+                wikidata_id="Q7604",
+                wikidata_url="https://www.wikidata.org/wiki/Q7604",
+                name="Leonhard Euler",
+            )
+        )
+        cleanup_tag(person.id)
+
+        # found in the database until the index is rebuilt
+        results = indexed_app.fuzzy_search_stories("Leonhard Euler")
+        assert str(person.id) in [result["id"] for result in results]
+        indexed_app._repository.refresh_name_index()
+        assert indexed_app._name_index.search("Leonhard Euler", limit=20)
+
 
 class TestCalculateStoryOrderRange:
     def test_empty_range(self, history_app, mocker) -> None:
@@ -432,6 +576,624 @@ class TestCalculateStoryOrderRange:
                 cleanup_tag(tag_id)
 
 
+def _create_person_place_events(history_app, cleanup_tag):
+    """Create a person and place with an event on each of three days."""
+    from the_history_atlas.apps.domain.core import (
+        TimeInput,
+        PlaceInput,
+        PersonInput,
+        TagInstance,
+        CitationInput,
+    )
+    import uuid as uuid_mod
+
+    person = history_app.create_person(
+        person=PersonInput(
+            wikidata_id=f"Q{uuid_mod.uuid4().hex[:8]}",
+            wikidata_url=f"https://www.wikidata.org/wiki/Q{uuid_mod.uuid4().hex[:8]}",
+            name="Story Link Person",
+            description="Person for story link test",
+        )
+    )
+    cleanup_tag(person.id)
+    place = history_app.create_place(
+        place=PlaceInput(
+            wikidata_id=f"Q{uuid_mod.uuid4().hex[:8]}",
+            wikidata_url=f"https://www.wikidata.org/wiki/Q{uuid_mod.uuid4().hex[:8]}",
+            name="Story Link Place",
+            latitude=48.0,
+            longitude=2.0,
+            description="Place for story link test",
+        )
+    )
+    cleanup_tag(place.id)
+    times = []
+    for day in (1, 2, 3):
+        created_time = history_app.create_time(
+            time=TimeInput(
+                datetime=datetime(1712, 5, day, tzinfo=timezone.utc),
+                calendar_model="http://www.wikidata.org/entity/Q1985727",
+                precision=11,
+                name=f"May {day}, 1712",
+                wikidata_id=None,
+                wikidata_url=None,
+                date=f"+1712-05-0{day}T00:00:00Z",
+            )
+        )
+        cleanup_tag(created_time.id)
+        times.append(created_time)
+
+    citation = CitationInput(
+        wikidata_item_id="Q12345",
+        wikidata_item_title="Test Item",
+        wikidata_item_url="https://www.wikidata.org/wiki/Q12345",
+        access_date="2023-01-01",
+    )
+    event_ids = []
+    for created_time in times:
+        event_id = history_app.create_wikidata_event(
+            text=f"Story Link Person was at Story Link Place on {created_time.name}",
+            tags=[
+                TagInstance(id=person.id, start_char=0, stop_char=17, name=person.name),
+                TagInstance(id=place.id, start_char=25, stop_char=41, name=place.name),
+                TagInstance(
+                    id=created_time.id,
+                    start_char=45,
+                    stop_char=45 + len(created_time.name),
+                    name=created_time.name,
+                ),
+            ],
+            citation=citation,
+            after=[],
+        )
+        event_ids.append(event_id)
+    return person, place, times, event_ids
+
+
+class TestStoryLinks:
+    def test_links_match_related_story(self, history_app, cleanup_tag) -> None:
+        """Stored story links resolve to the same story as the live walk."""
+        person, place, times, _ = _create_person_place_events(history_app, cleanup_tag)
+
+        tag_ids = [person.id, place.id, *[t.id for t in times]]
+        history_app.calculate_story_order(tag_ids=tag_ids)
+
+        repository = history_app._repository
+        with repository.Session() as session:
+            rows = session.execute(
+                text(
+                    """
+                    select tag_id, direction, summary_id from story_links
+                    where tag_id in :tag_ids
+                """
+                ),
+                {"tag_ids": tuple(tag_ids)},
+            ).all()
+            assert {(row.tag_id, row.direction) for row in rows} == {
+                (tag_id, direction)
+                for tag_id in tag_ids
+                for direction in ("next", "prev")
+            }
+            for row in rows:
+                expected = repository.get_related_story(
+                    summary_id=row.summary_id,
+                    tag_id=row.tag_id,
+                    direction=row.direction,
+                    session=session,
+                )
+                assert (
+                    repository.get_story_link(
+                        summary_id=row.summary_id,
+                        tag_id=row.tag_id,
+                        direction=row.direction,
+                        session=session,
+                    )
+                    == expected
+                )
+            # the person's story continues into the place's story
+            person_next = next(
+                row
+                for row in rows
+                if row.tag_id == person.id and row.direction == "next"
+            )
+            link = repository.get_story_link(
+                summary_id=person_next.summary_id,
+                tag_id=person.id,
+                direction="next",
+                session=session,
+            )
+            assert link is None or link.story_id == place.id
+
+
+class TestStoryOrderJobs:
+    def test_events_queue_their_stories(
+        self, history_app, cleanup_tag, monkeypatch
+    ) -> None:
+        monkeypatch.setattr(history_app.config, "STORY_ORDER_JOB_DELAY_SECONDS", 0)
+        person, place, times, _ = _create_person_place_events(history_app, cleanup_tag)
+        tag_ids = [person.id, place.id, *[t.id for t in times]]
+
+        query = text(
+            """
+            SELECT tag_id, requests FROM story_order_jobs
+            WHERE tag_id = ANY(:tag_ids)
+            """
+        )
+        with history_app._repository.Session() as session:
+            jobs = dict(session.execute(query, {"tag_ids": tag_ids}).all())
+        # one job per story, however many of its events were created
+        assert jobs == {person.id: 3, place.id: 3, **{t.id: 1 for t in times}}
+
+        assert history_app.process_story_order_jobs(limit=1000) >= len(tag_ids)
+        with history_app._repository.Session() as session:
+            assert session.execute(query, {"tag_ids": tag_ids}).all() == []
+            unordered = session.execute(
+                text(
+                    """
+                    SELECT count(*) FROM tag_instances
+                    WHERE tag_id = ANY(:tag_ids) AND story_order IS NULL
+                    """
+                ),
+                {"tag_ids": tag_ids},
+            ).scalar_one()
+        assert unordered == 0
+
+    def test_failed_jobs_stay_queued(
+        self, history_app, cleanup_tag, monkeypatch, mocker
+    ) -> None:
+        monkeypatch.setattr(history_app.config, "STORY_ORDER_JOB_DELAY_SECONDS", 0)
+        person, place, times, _ = _create_person_place_events(history_app, cleanup_tag)
+        mocker.patch.object(
+            history_app, "calculate_story_order", side_effect=RuntimeError
+        )
+        assert history_app.process_story_order_jobs(limit=1000) >= 5
+        with history_app._repository.Session() as session:
+            leased = session.execute(
+                text(
+                    """
+                    SELECT run_after > now() + interval '5 minutes'
+                    FROM story_order_jobs WHERE tag_id = :tag_id
+                    """
+                ),
+                {"tag_id": person.id},
+            ).scalar_one()
+        # retried once the lease expires
+        assert leased
+
+
+class TestRevisions:
+    def test_story_changes_bump_revisions(self, history_app, cleanup_tag) -> None:
+        events_revision = history_app.get_events_revision()
+        person, place, times, event_ids = _create_person_place_events(
+            history_app, cleanup_tag
+        )
+        assert history_app.get_events_revision() == events_revision + 3
+        person_revision = history_app.get_story_revision(person.id)
+        assert person_revision == 3
+        assert history_app.get_story_revision(times[0].id) == 1
+
+        history_app.calculate_story_order(tag_ids=[person.id])
+        assert history_app.get_story_revision(person.id) > person_revision
+
+    def test_cached_window_is_rebuilt_after_another_process_writes(
+        self, history_app, cleanup_tag
+    ) -> None:
+        person, place, times, event_ids = _create_person_place_events(
+            history_app, cleanup_tag
+        )
+        history_app.calculate_story_order(
+            tag_ids=[person.id, place.id, *[t.id for t in times]]
+        )
+        window = history_app.get_story_window(
+            event_id=event_ids[1], story_id=person.id, direction=None
+        )
+        assert {str(person.id), str(place.id)} <= window.revisions.keys()
+        assert (
+            history_app.get_story_window(
+                event_id=event_ids[1], story_id=person.id, direction=None
+            )
+            is window
+        )
+
+        # a write in another process bumps the place's revision without
+        # invalidating this process's cache
+        with history_app._repository.Session() as session:
+            history_app._repository.bump_revisions([place.id], session=session)
+            session.commit()
+
+        rebuilt = history_app.get_story_window(
+            event_id=event_ids[1], story_id=person.id, direction=None
+        )
+        assert rebuilt is not window
+        assert rebuilt.revisions[str(place.id)] == window.revisions[str(place.id)] + 1
+
+    def test_unknown_story_is_revision_zero(self, history_app) -> None:
+        assert history_app.get_story_revision(uuid4()) == 0
+
+
+class TestStoryStats:
+    def get_stats(self, history_app, story_id):
+        with history_app._repository.Session() as session:
+            return session.execute(
+                text("select * from story_stats where story_id = :story_id"),
+                {"story_id": story_id},
+            ).one()
+
+    def test_events_update_stats(self, history_app, cleanup_tag) -> None:
+        person, place, times, event_ids = _create_person_place_events(
+            history_app, cleanup_tag
+        )
+        stats = self.get_stats(history_app, person.id)
+        assert stats.name == "The Life of Story Link Person"
+        assert stats.event_count == 3
+        assert (stats.earliest_year, stats.latest_year) == (1712, 1712)
+        assert stats.earliest_datetime == "+1712-05-01T00:00:00Z"
+        assert stats.latest_datetime == "+1712-05-03T00:00:00Z"
+        assert self.get_stats(history_app, times[0].id).event_count == 1
+
+        # a BCE event is earlier, though its datetime sorts later as a string
+        bce_time = history_app.create_time(
+            time=TimeInput(
+                calendar_model="http://www.wikidata.org/entity/Q1985727",
+                precision=11,
+                name="March 15, 44 BC",
+                wikidata_id=None,
+                wikidata_url=None,
+                date="-0044-03-15T00:00:00Z",
+            )
+        )
+        cleanup_tag(bce_time.id)
+        history_app.create_wikidata_event(
+            text="Story Link Person was at Story Link Place on March 15, 44 BC",
+            tags=[
+                TagInstance(id=person.id, start_char=0, stop_char=17, name=person.name),
+                TagInstance(id=place.id, start_char=25, stop_char=41, name=place.name),
+                TagInstance(
+                    id=bce_time.id, start_char=45, stop_char=60, name=bce_time.name
+                ),
+            ],
+            citation=CitationInput(
+                wikidata_item_id="Q12345",
+                wikidata_item_title="Test Item",
+                wikidata_item_url="https://www.wikidata.org/wiki/Q12345",
+                access_date="2023-01-01",
+            ),
+            after=[],
+        )
+        stats = self.get_stats(history_app, person.id)
+        assert stats.event_count == 4
+        assert (stats.earliest_year, stats.latest_year) == (-44, 1712)
+        assert stats.earliest_datetime == "-0044-03-15T00:00:00Z"
+        assert stats.latest_datetime == "+1712-05-03T00:00:00Z"
+
+        with history_app._repository.Session() as session:
+            story_names = history_app._repository.get_story_names((person.id,), session)
+        assert story_names[person.id]["earliest_year"] == -44
+        assert story_names[person.id]["latest_year"] == 1712
+
+    def test_removed_and_moved_events_update_stats(
+        self, history_app, cleanup_tag
+    ) -> None:
+        person, place, times, event_ids = _create_person_place_events(
+            history_app, cleanup_tag
+        )
+        with history_app._repository.Session() as session:
+            session.execute(
+                text(
+                    """
+                    DELETE FROM tag_instances
+                    WHERE tag_id = :person_id AND summary_id = :summary_id
+                    """
+                ),
+                {"person_id": person.id, "summary_id": event_ids[2]},
+            )
+            session.commit()
+        stats = self.get_stats(history_app, person.id)
+        assert stats.event_count == 2
+        assert stats.earliest_datetime == "+1712-05-01T00:00:00Z"
+        assert stats.latest_datetime == "+1712-05-02T00:00:00Z"
+        assert stats.name == "The Life of Story Link Person"
+
+        # moving the earliest event to the next day moves the earliest bound
+        with history_app._repository.Session() as session:
+            session.execute(
+                text(
+                    """
+                    UPDATE summaries
+                    SET datetime = '+1712-05-02T00:00:00Z'
+                    WHERE id = :summary_id
+                    """
+                ),
+                {"summary_id": event_ids[0]},
+            )
+            session.commit()
+        stats = self.get_stats(history_app, person.id)
+        assert stats.event_count == 2
+        assert stats.earliest_datetime == "+1712-05-02T00:00:00Z"
+
+        # a story left without events or names has no row
+        with history_app._repository.Session() as session:
+            session.execute(
+                text("DELETE FROM tag_instances WHERE tag_id = :time_id"),
+                {"time_id": times[2].id},
+            )
+            session.execute(
+                text("DELETE FROM story_names WHERE tag_id = :time_id"),
+                {"time_id": times[2].id},
+            )
+            session.commit()
+            assert (
+                session.execute(
+                    text("select 1 from story_stats where story_id = :story_id"),
+                    {"story_id": times[2].id},
+                ).first()
+                is None
+            )
+
+
+class TestGetStoryWindow:
+    def test_matches_python_walk(self, history_app, cleanup_tag) -> None:
+        """The single-statement window is the same as walking prev, then next."""
+        from the_history_atlas.apps.domain.core import (
+            CitationInput,
+            PersonInput,
+            StoryPointer,
+            TagInstance,
+            TimeInput,
+        )
+        import uuid as uuid_mod
+
+        first_person, place, first_times, first_event_ids = _create_person_place_events(
+            history_app, cleanup_tag
+        )
+        # a second person at the same place later on, so the walk crosses
+        # from the first person's story into the place's story
+        second_person = history_app.create_person(
+            person=PersonInput(
+                wikidata_id=f"Q{uuid_mod.uuid4().hex[:8]}",
+                wikidata_url=f"https://www.wikidata.org/wiki/Q{uuid_mod.uuid4().hex[:8]}",
+                name="Second Person",
+                description="Second person for story window test",
+            )
+        )
+        cleanup_tag(second_person.id)
+        citation = CitationInput(
+            wikidata_item_id="Q12345",
+            wikidata_item_title="Test Item",
+            wikidata_item_url="https://www.wikidata.org/wiki/Q12345",
+            access_date="2023-01-01",
+        )
+        second_times = []
+        for day in range(4, 10):
+            created_time = history_app.create_time(
+                time=TimeInput(
+                    datetime=datetime(1712, 5, day, tzinfo=timezone.utc),
+                    calendar_model="http://www.wikidata.org/entity/Q1985727",
+                    precision=11,
+                    name=f"May {day}, 1712",
+                    wikidata_id=None,
+                    wikidata_url=None,
+                    date=f"+1712-05-0{day}T00:00:00Z",
+                )
+            )
+            cleanup_tag(created_time.id)
+            second_times.append(created_time)
+            history_app.create_wikidata_event(
+                text=f"Second Person was at Story Link Place on {created_time.name}",
+                tags=[
+                    TagInstance(
+                        id=second_person.id,
+                        start_char=0,
+                        stop_char=13,
+                        name=second_person.name,
+                    ),
+                    TagInstance(
+                        id=place.id, start_char=21, stop_char=37, name=place.name
+                    ),
+                    TagInstance(
+                        id=created_time.id,
+                        start_char=41,
+                        stop_char=41 + len(created_time.name),
+                        name=created_time.name,
+                    ),
+                ],
+                citation=citation,
+                after=[],
+            )
+
+        story_ids = [
+            first_person.id,
+            second_person.id,
+            place.id,
+            *[t.id for t in [*first_times, *second_times]],
+        ]
+        history_app.calculate_story_order(tag_ids=story_ids)
+
+        repository = history_app._repository
+        with repository.Session() as session:
+            story_pointers = session.execute(
+                text(
+                    """
+                    select summary_id as event_id, tag_id as story_id
+                    from tag_instances
+                    where tag_id in :story_ids
+                """
+                ),
+                {"story_ids": tuple(story_ids)},
+            ).all()
+            assert len(story_pointers) == 27
+            crossed_stories = False
+            longest_window = 0
+            for story_pointer in story_pointers:
+                expected = [
+                    *history_app.get_prev_story_pointers(
+                        event_id=story_pointer.event_id,
+                        story_id=story_pointer.story_id,
+                        session=session,
+                    ),
+                    StoryPointer(
+                        event_id=story_pointer.event_id,
+                        story_id=story_pointer.story_id,
+                    ),
+                    *history_app.get_next_story_pointers(
+                        event_id=story_pointer.event_id,
+                        story_id=story_pointer.story_id,
+                        session=session,
+                    ),
+                ]
+                window = repository.get_story_window(
+                    summary_id=story_pointer.event_id,
+                    tag_id=story_pointer.story_id,
+                    session=session,
+                )
+                assert window == expected
+                if len({pointer.story_id for pointer in window}) > 1:
+                    crossed_stories = True
+                longest_window = max(longest_window, len(window))
+            assert crossed_stories
+            # the place's story holds all nine events
+            assert longest_window >= 9
+
+
+class TestGetEvents:
+    def test_single_query_matches_event_order(self, history_app, cleanup_tag) -> None:
+        person, place, times, event_ids = _create_person_place_events(
+            history_app, cleanup_tag
+        )
+        repository = history_app._repository
+        with repository.Session() as session:
+            repository.add_name_to_tag(
+                session=session, tag_id=person.id, name="Another Name"
+            )
+            session.commit()
+
+            events = repository.get_events(
+                event_ids=tuple(reversed(event_ids)), session=session
+            )
+
+        assert [event.event_id for event in events] == list(reversed(event_ids))
+        for event, created_time in zip(events, reversed(times)):
+            assert event.calendar_date.precision == 11
+            assert event.calendar_date.datetime == created_time.date
+            assert event.location_row.tag_id == place.id
+            assert event.location_row.latitude == 48.0
+            assert event.event_row.source_title == "Wikidata"
+            # one tag per tag instance, even when a tag has several names
+            assert sorted(str(tag.tag_id) for tag in event.tags) == sorted(
+                str(tag_id) for tag_id in (person.id, place.id, created_time.id)
+            )
+            assert set(event.names[person.id].names) == {
+                "Story Link Person",
+                "Another Name",
+            }
+
+    def test_missing_events(self, history_app) -> None:
+        from uuid import uuid4
+        from the_history_atlas.apps.history.errors import MissingResourceError
+
+        repository = history_app._repository
+        with repository.Session() as session:
+            with pytest.raises(MissingResourceError):
+                repository.get_events(event_ids=(uuid4(),), session=session)
+
+
+class TestAsyncReads:
+    @pytest.mark.asyncio
+    async def test_async_reads_match_sync(self, engine, config, cleanup_tag) -> None:
+        from the_history_atlas.apps.database import DatabaseApp
+        from the_history_atlas.apps.history import HistoryApp
+
+        database_app = DatabaseApp(config_app=config)
+        history_app = HistoryApp(
+            config_app=config,
+            database_client=engine,
+            async_database_client=database_app.async_client(),
+        )
+        try:
+            person, place, times, event_ids = _create_person_place_events(
+                history_app, cleanup_tag
+            )
+            history_app.calculate_story_order(
+                tag_ids=[person.id, place.id, *[t.id for t in times]]
+            )
+
+            for direction in (None, "next", "prev"):
+                story = await history_app.get_story_list_async(
+                    event_id=event_ids[1], story_id=person.id, direction=direction
+                )
+                history_app._story_cache.clear()
+                assert story == history_app.get_story_list(
+                    event_id=event_ids[1], story_id=person.id, direction=direction
+                )
+
+            default = await history_app.get_default_story_and_event_async(
+                story_id=person.id, event_id=None
+            )
+            assert default == history_app.get_default_story_and_event(
+                story_id=person.id, event_id=None
+            )
+
+            nearby_kwargs = dict(
+                event_id=event_ids[0],
+                calendar_model="http://www.wikidata.org/entity/Q1985727",
+                precision=11,
+                datetime=times[0].date,
+                min_lat=47.0,
+                max_lat=49.0,
+                min_lng=1.0,
+                max_lng=3.0,
+            )
+            nearby = await history_app.get_nearby_events_async(**nearby_kwargs)
+            assert nearby
+            assert nearby == history_app.get_nearby_events(**nearby_kwargs)
+
+            results = await history_app.fuzzy_search_stories_async(
+                search_string="Story Link Person"
+            )
+            assert results
+            assert results == history_app.fuzzy_search_stories(
+                search_string="Story Link Person"
+            )
+        finally:
+            await database_app.dispose_async_client()
+
+    @pytest.mark.asyncio
+    async def test_concurrent_story_reads_are_coalesced(
+        self, engine, config, cleanup_tag, mocker
+    ) -> None:
+        import asyncio
+        from the_history_atlas.apps.database import DatabaseApp
+        from the_history_atlas.apps.history import HistoryApp
+
+        database_app = DatabaseApp(config_app=config)
+        history_app = HistoryApp(
+            config_app=config,
+            database_client=engine,
+            async_database_client=database_app.async_client(),
+        )
+        try:
+            person, place, times, event_ids = _create_person_place_events(
+                history_app, cleanup_tag
+            )
+            history_app.calculate_story_order(
+                tag_ids=[person.id, place.id, *[t.id for t in times]]
+            )
+            spy = mocker.spy(history_app, "_build_story_list")
+
+            stories = await asyncio.gather(
+                *(
+                    history_app.get_story_list_async(
+                        event_id=event_ids[1], story_id=person.id, direction=None
+                    )
+                    for _ in range(5)
+                )
+            )
+            assert spy.call_count == 1
+            assert all(story is stories[0] for story in stories)
+        finally:
+            await database_app.dispose_async_client()
+
+
 class TestGetNearbyEvents:
     def test_precision_to_prefix_mapping(self, history_app) -> None:
         """Test that precision values map to correct datetime prefix lengths."""
@@ -443,6 +1205,230 @@ class TestGetNearbyEvents:
         assert mapping[10] == 8  # month
         assert mapping[11] == 11  # day
 
+    def test_falls_back_to_finest_precision_with_results(
+        self, history_app, cleanup_tag, mocker
+    ) -> None:
+        person, place, times, event_ids = _create_person_place_events(
+            history_app, cleanup_tag
+        )
+        spy = mocker.spy(
+            history_app._repository, "get_nearby_events_at_finest_precision"
+        )
+        nearby_kwargs = dict(
+            calendar_model="http://www.wikidata.org/entity/Q1985727",
+            min_lat=47.0,
+            max_lat=49.0,
+            min_lng=1.0,
+            max_lng=3.0,
+        )
+
+        # nothing else on May 1st, so the results come from the month
+        results = history_app.get_nearby_events(
+            event_id=event_ids[0], precision=11, datetime=times[0].date, **nearby_kwargs
+        )
+        assert {row.event_id for row in results} == set(event_ids[1:])
+        assert spy.call_count == 1
+
+        # an event on the same day is found at day precision, alone
+        other_person = history_app.create_person(
+            person=PersonInput(
+                wikidata_id=f"Q{uuid4().hex[:8]}",
+                wikidata_url=f"https://www.wikidata.org/wiki/Q{uuid4().hex[:8]}",
+                name="Same Day Person",
+                description="Person for nearby fallback test",
+            )
+        )
+        cleanup_tag(other_person.id)
+        same_day_event_id = history_app.create_wikidata_event(
+            text="Same Day Person was at Story Link Place on May 1, 1712",
+            tags=[
+                TagInstance(
+                    id=other_person.id, start_char=0, stop_char=15, name="Same Day"
+                ),
+                TagInstance(id=place.id, start_char=23, stop_char=39, name=place.name),
+                TagInstance(
+                    id=times[0].id, start_char=43, stop_char=54, name=times[0].name
+                ),
+            ],
+            citation=CitationInput(
+                wikidata_item_id="Q12345",
+                wikidata_item_title="Test Item",
+                wikidata_item_url="https://www.wikidata.org/wiki/Q12345",
+                access_date="2023-01-01",
+            ),
+            after=[],
+        )
+        results = history_app.get_nearby_events(
+            event_id=event_ids[0], precision=11, datetime=times[0].date, **nearby_kwargs
+        )
+        assert [row.event_id for row in results] == [same_day_event_id]
+
+    def test_nearby_index_matches_database(
+        self, engine, config, cleanup_tag, mocker
+    ) -> None:
+        from the_history_atlas.apps.history import HistoryApp
+
+        config.NEARBY_INDEX_ENABLED = True
+        history_app = HistoryApp(config_app=config, database_client=engine)
+        person, place, times, event_ids = _create_person_place_events(
+            history_app, cleanup_tag
+        )
+        history_app.build_nearby_index()
+        # events created after the build are added as they're created
+        same_day_event_id = history_app.create_wikidata_event(
+            text="Story Link Person was at Story Link Place again on May 1, 1712",
+            tags=[
+                TagInstance(id=person.id, start_char=0, stop_char=17, name=person.name),
+                TagInstance(id=place.id, start_char=25, stop_char=41, name=place.name),
+                TagInstance(
+                    id=times[0].id, start_char=51, stop_char=62, name=times[0].name
+                ),
+            ],
+            citation=CitationInput(
+                wikidata_item_id="Q12345",
+                wikidata_item_title="Test Item",
+                wikidata_item_url="https://www.wikidata.org/wiki/Q12345",
+                access_date="2023-01-01",
+            ),
+            after=[],
+        )
+        spy = mocker.spy(
+            history_app._repository, "get_nearby_events_at_finest_precision"
+        )
+        nearby_kwargs = dict(
+            calendar_model="http://www.wikidata.org/entity/Q1985727",
+            min_lat=47.0,
+            max_lat=49.0,
+            min_lng=1.0,
+            max_lng=3.0,
+        )
+        for precision, event_id, created_time in (
+            (11, event_ids[0], times[0]),
+            (11, same_day_event_id, times[0]),
+            (10, event_ids[1], times[1]),
+            (9, event_ids[2], times[2]),
+        ):
+            from_index = history_app.get_nearby_events(
+                event_id=event_id,
+                precision=precision,
+                datetime=created_time.date,
+                **nearby_kwargs,
+            )
+            assert spy.call_count == 0
+            from_database = (
+                history_app._repository.get_nearby_events_at_finest_precision(
+                    event_id=event_id,
+                    levels=history_app._nearby_levels(
+                        precision=precision, datetime=created_time.date
+                    ),
+                    **nearby_kwargs,
+                )
+            )
+            spy.reset_mock()
+            assert from_index
+            assert sorted(from_index, key=lambda row: row.event_id) == sorted(
+                from_database, key=lambda row: row.event_id
+            )
+
+    def test_nearby_index_rebuild_finds_events_from_other_processes(
+        self, engine, config, cleanup_tag, mocker
+    ) -> None:
+        from the_history_atlas.apps.history import HistoryApp
+
+        config.NEARBY_INDEX_ENABLED = True
+        indexed_app = HistoryApp(config_app=config, database_client=engine)
+        indexed_app.build_nearby_index()
+        # another process creates the events
+        other_app = HistoryApp(config_app=config, database_client=engine)
+        person, place, times, event_ids = _create_person_place_events(
+            other_app, cleanup_tag
+        )
+        nearby_kwargs = dict(
+            event_id=event_ids[0],
+            calendar_model="http://www.wikidata.org/entity/Q1985727",
+            precision=9,
+            datetime=times[0].date,
+            min_lat=47.0,
+            max_lat=49.0,
+            min_lng=1.0,
+            max_lng=3.0,
+        )
+        assert indexed_app.get_nearby_events(**nearby_kwargs) == []
+
+        # an event indexed while the rebuild reads its rows is kept too
+        get_rows = indexed_app._repository.get_nearby_index_rows
+
+        def get_rows_during_creation(summary_ids=None):
+            if summary_ids is not None:
+                return get_rows(summary_ids=summary_ids)
+            indexed_app._index_nearby_events([event_ids[2]])
+            return [row for row in get_rows() if row.event_id != event_ids[2]]
+
+        mocker.patch.object(
+            indexed_app._repository,
+            "get_nearby_index_rows",
+            side_effect=get_rows_during_creation,
+        )
+        indexed_app.build_nearby_index()
+        results = indexed_app.get_nearby_events(**nearby_kwargs)
+        assert {row.event_id for row in results} == set(event_ids[1:])
+
+    @pytest.mark.asyncio
+    async def test_nearby_version_follows_the_index(
+        self, engine, config, cleanup_tag
+    ) -> None:
+        from the_history_atlas.apps.history import HistoryApp
+
+        config.NEARBY_INDEX_ENABLED = True
+        indexed_app = HistoryApp(config_app=config, database_client=engine)
+        indexed_app.build_nearby_index()
+        other_app = HistoryApp(config_app=config, database_client=engine)
+        other_app.build_nearby_index()
+        version = await indexed_app.get_nearby_version_async()
+        # another process's index answers differently, so its version differs
+        assert await other_app.get_nearby_version_async() != version
+
+        # the events revision moves, but this index doesn't see the events
+        _, _, _, event_ids = _create_person_place_events(other_app, cleanup_tag)
+        assert await indexed_app.get_nearby_version_async() == version
+
+        # as if this process had created the first one
+        indexed_app._index_nearby_events(event_ids[:1])
+        added_version = await indexed_app.get_nearby_version_async()
+        assert added_version != version
+        indexed_app.build_nearby_index()
+        assert await indexed_app.get_nearby_version_async() != added_version
+
+    def test_nearby_index_over_budget_falls_back_to_database(
+        self, engine, config, cleanup_tag, mocker
+    ) -> None:
+        from the_history_atlas.apps.history import HistoryApp
+
+        config.NEARBY_INDEX_ENABLED = True
+        config.NEARBY_INDEX_MAX_BYTES = 1
+        history_app = HistoryApp(config_app=config, database_client=engine)
+        person, place, times, event_ids = _create_person_place_events(
+            history_app, cleanup_tag
+        )
+        history_app.build_nearby_index()
+        assert not history_app._nearby_index.available
+
+        spy = mocker.spy(
+            history_app._repository, "get_nearby_events_at_finest_precision"
+        )
+        results = history_app.get_nearby_events(
+            event_id=event_ids[0],
+            calendar_model="http://www.wikidata.org/entity/Q1985727",
+            precision=10,
+            datetime=times[0].date,
+            min_lat=47.0,
+            max_lat=49.0,
+            min_lng=1.0,
+            max_lng=3.0,
+        )
+        assert {row.event_id for row in results} == set(event_ids[1:])
+        assert spy.call_count == 1
+
     def test_integration(self, history_app, cleanup_tag) -> None:
         """Integration test: create events and query nearby."""
         from the_history_atlas.apps.domain.core import (
@@ -0,0 +1,138 @@
+from uuid import UUID, uuid4
+
+import pytest
+
+from the_history_atlas.apps.history.name_index import (
+    NameIndex,
+    StorySearchRow,
+    words,
+)
+
+
+def _row(
+    name: str, search_names: list[str], text_reader: bool = False
+) -> StorySearchRow:
+    return StorySearchRow(
+        story_id=uuid4(),
+        name=name,
+        description=None,
+        earliest_year=None,
+        latest_year=None,
+        text_reader=text_reader,
+        search_names=search_names,
+    )
+
+
+@pytest.fixture
+def rows() -> list[StorySearchRow]:
+    return [
+        _row("The Life of Alexander von Humboldt", ["Alexander von Humboldt"]),
+        _row("The Life of Alexander the Great", ["Alexander the Great"]),
+        _row("The History of Paris", ["Paris", "Lutetia"]),
+        _row("The Life of Émile Zola", ["Émile Zola"]),
+    ]
+
+
+@pytest.fixture
+def index(rows) -> NameIndex:
+    index = NameIndex()
+    index.build(rows)
+    return index
+
+
+def _names(index: NameIndex, query: str) -> list[str]:
+    return [entry.name for entry in index.search(query)]
+
+
+def test_words_fold_case_and_accents():
+    assert words("Émile  ZOLA, Jr.") == ["emile", "zola", "jr"]
+
+
+def test_exact_match(index):
+    assert _names(index, "paris") == ["The History of Paris"]
+
+
+def test_matches_any_name_of_a_story(index):
+    assert _names(index, "Lutetia") == ["The History of Paris"]
+
+
+def test_prefix_match(index):
+    assert _names(index, "Humbol") == ["The Life of Alexander von Humboldt"]
+
+
+def test_typo_match(index):
+    assert _names(index, "Humbolt") == ["The Life of Alexander von Humboldt"]
+    assert _names(index, "Alexandre") == [
+        "The Life of Alexander the Great",
+        "The Life of Alexander von Humboldt",
+    ]
+
+
+def test_short_words_are_not_typo_matched(index):
+    assert _names(index, "von") == ["The Life of Alexander von Humboldt"]
+    assert _names(index, "vom") == []
+
+
+def test_accents_are_ignored(index):
+    assert _names(index, "emile") == ["The Life of Émile Zola"]
+
+
+def test_every_query_word_must_match(index):
+    assert _names(index, "alexander great") == ["The Life of Alexander the Great"]
+    assert _names(index, "alexander paris") == []
+
+
+def test_exact_matches_rank_above_prefix_and_typo_matches():
+    exact = _row("The Life of Anna", ["Anna"])
+    prefix = _row("The Life of Annabel", ["Annabel"])
+    index = NameIndex()
+    index.build([prefix, exact])
+    assert [entry.id for entry in index.search("anna")] == [
+        exact.story_id,
+        prefix.story_id,
+    ]
+
+
+def test_limit(index):
+    assert len(index.search("alexander", limit=1)) == 1
+
+
+def test_empty_query(index):
+    assert index.search("") == []
+    assert index.search("  ,. ") == []
+
+
+def test_add_name(index):
+    story_id = uuid4()
+    index.add_name(story_id, "Marie Curie")
+    # stories aren't returned until they are named
+    assert index.search("curie") == []
+    index.set_story(story_id, name="The Life of Marie Curie", description="Physicist")
+    [entry] = index.search("curie")
+    assert entry.id == story_id
+    assert entry.description == "Physicist"
+    assert _names(index, "Sklodowska") == []
+    index.add_name(story_id, "Maria Skłodowska")
+    assert _names(index, "Sklodowska") == ["The Life of Marie Curie"]
+
+
+def test_set_story_leaves_unset_details(index, rows):
+    story_id: UUID = rows[2].story_id
+    index.set_story(story_id, earliest_year=-52, latest_year=2024)
+    [entry] = index.search("paris")
+    assert entry.name == "The History of Paris"
+    assert (entry.earliest_year, entry.latest_year) == (-52, 2024)
+
+
+def test_build_keeps_updates_made_while_it_reads_rows(index, rows):
+    story_id = uuid4()
+
+    def read_rows():
+        yield from rows
+        # a name committed after the rebuild's query
+        index.add_name(story_id, "Marie Curie")
+        index.set_story(story_id, name="The Life of Marie Curie")
+
+    index.build(read_rows())
+    assert _names(index, "curie") == ["The Life of Marie Curie"]
+    assert _names(index, "paris") == ["The History of Paris"]
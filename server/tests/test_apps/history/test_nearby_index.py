@@ -0,0 +1,167 @@
+from uuid import uuid4
+
+import pytest
+
+from the_history_atlas.apps.history.nearby_index import (
+    NearbyIndex,
+    NearbyIndexLevel,
+    NearbyIndexRow,
+)
+from the_history_atlas.apps.history.time_key import time_key, time_key_range
+
+GREGORIAN = "http://www.wikidata.org/entity/Q1985727"
+JULIAN = "http://www.wikidata.org/entity/Q1985786"
+
+
+def _row(
+    datetime: str,
+    latitude: float = 48.0,
+    longitude: float = 2.0,
+    precision: int = 11,
+    calendar_model: str = GREGORIAN,
+    event_id=None,
+    person_name: str = "Someone",
+) -> NearbyIndexRow:
+    return NearbyIndexRow(
+        event_id=event_id or uuid4(),
+        story_id=uuid4(),
+        person_name=person_name,
+        person_description=None,
+        summary_text="Someone was somewhere",
+        place_name="Somewhere",
+        latitude=latitude,
+        longitude=longitude,
+        datetime=datetime,
+        precision=precision,
+        calendar_model=calendar_model,
+        time_key=time_key(datetime),
+    )
+
+
+def _levels(precision: int, datetime: str) -> list[NearbyIndexLevel]:
+    prefix_lengths = {9: 5, 10: 8, 11: 11}
+    return [
+        NearbyIndexLevel(level, *time_key_range(datetime[: prefix_lengths[level]]))
+        for level in range(precision, 8, -1)
+    ]
+
+
+def _search(index: NearbyIndex, event_id, datetime: str, precision: int = 11, **kw):
+    bounds = dict(min_lat=47.0, max_lat=49.0, min_lng=1.0, max_lng=3.0)
+    bounds.update(kw)
+    return index.search(
+        event_id=event_id,
+        calendar_model=GREGORIAN,
+        levels=_levels(precision, datetime),
+        **bounds,
+    )
+
+
+@pytest.fixture
+def index() -> NearbyIndex:
+    return NearbyIndex(max_bytes=1024 * 1024)
+
+
+def test_returns_finest_precision_with_results(index):
+    origin = _row("+1712-05-01T00:00:00Z")
+    same_month = _row("+1712-05-20T00:00:00Z")
+    same_year = _row("+1712-09-01T00:00:00Z")
+    assert index.add([origin, same_month, same_year])
+
+    results = _search(index, origin.event_id, origin.datetime)
+    assert [row.event_id for row in results] == [same_month.event_id]
+
+    same_day = _row("+1712-05-01T00:00:00Z")
+    index.add([same_day])
+    results = _search(index, origin.event_id, origin.datetime)
+    assert [row.event_id for row in results] == [same_day.event_id]
+
+
+def test_filters_by_bounds_calendar_and_precision(index):
+    origin = _row("+1712-05-01T00:00:00Z")
+    same_month = _row("+1712-05-02T00:00:00Z")
+    index.add(
+        [
+            origin,
+            same_month,
+            _row("+1712-05-02T00:00:00Z", latitude=10.0),
+            _row("+1712-05-02T00:00:00Z", longitude=-2.0),
+            _row("+1712-05-02T00:00:00Z", calendar_model=JULIAN),
+            # only known to the year, so it can't be on a day in May
+            _row("+1712-05-02T00:00:00Z", precision=9),
+            _row("+1713-05-02T00:00:00Z"),
+        ]
+    )
+    results = _search(index, origin.event_id, origin.datetime, precision=10)
+    assert [row.event_id for row in results] == [same_month.event_id]
+
+
+def test_bounds_span_grid_cells_and_negative_years(index):
+    origin = _row("-0044-03-15T00:00:00Z", latitude=41.9, longitude=12.5)
+    nearby = _row("-0044-03-20T00:00:00Z", latitude=38.1, longitude=15.6)
+    index.add([origin, nearby])
+    results = _search(
+        index,
+        origin.event_id,
+        origin.datetime,
+        precision=10,
+        min_lat=36.0,
+        max_lat=44.0,
+        min_lng=10.0,
+        max_lng=16.0,
+    )
+    assert [row.event_id for row in results] == [nearby.event_id]
+    assert results[0].latitude == nearby.latitude
+    assert results[0].datetime == nearby.datetime
+    assert results[0].person_description is None
+
+
+def test_viewport_across_the_antimeridian(index):
+    origin = _row("+1712-05-01T00:00:00Z", longitude=179.5)
+    east = _row("+1712-05-01T00:00:00Z", longitude=-179.5)
+    index.add([origin, east, _row("+1712-05-01T00:00:00Z", longitude=0.0)])
+    results = _search(index, uuid4(), origin.datetime, min_lng=179.0, max_lng=-179.0)
+    assert {row.event_id for row in results} == {origin.event_id, east.event_id}
+    # latitudes aren't reordered either
+    assert _search(index, uuid4(), origin.datetime, min_lat=49.0, max_lat=47.0) == []
+
+
+def test_rows_of_indexed_events_are_not_added_twice(index):
+    event_id = uuid4()
+    rows = [
+        _row("+1712-05-02T00:00:00Z", event_id=event_id, person_name=name)
+        for name in ("Someone", "Someone Else")
+    ]
+    index.add(rows)
+    index.add(rows)
+    assert len(index) == 2
+
+
+def test_version_changes_with_the_rows(index):
+    row = _row("+1712-05-02T00:00:00Z")
+    version = index.version
+    index.add([row])
+    assert index.version != version
+    version = index.version
+    index.add([row])
+    assert index.version == version
+    index.clear()
+    assert index.version != version
+    assert NearbyIndex(max_bytes=1024).version != NearbyIndex(max_bytes=1024).version
+
+
+def test_exceeding_the_budget_disables_the_index():
+    index = NearbyIndex(max_bytes=2000)
+    origin = _row("+1712-05-01T00:00:00Z")
+    assert index.add([origin])
+    assert _search(index, origin.event_id, origin.datetime) == []
+
+    assert not index.add(
+        [_row("+1712-05-01T00:00:00Z", person_name=str(i)) for i in range(20)]
+    )
+    assert not index.available
+    assert len(index) == 0
+    assert _search(index, origin.event_id, origin.datetime) is None
+
+    index.clear()
+    assert index.available
@@ -0,0 +1,128 @@
+from uuid import uuid4
+
+import pytest
+
+from the_history_atlas.apps.history.search_cache import SearchCache, normalize_query
+
+
+def _results(query: str) -> list[dict]:
+    return [{"id": query, "name": f"The Life of {query}"}]
+
+
+@pytest.fixture
+def cache() -> SearchCache:
+    return SearchCache(max_size=3, ttl_seconds=60)
+
+
+def test_normalize_query():
+    assert normalize_query("  Johann   SEBASTIAN\tBach ") == "johann sebastian bach"
+
+
+def test_get_returns_stored_results(cache):
+    results = _results("bach")
+    cache.put("bach", results, generation=cache.generation)
+    assert cache.get("bach") is results
+
+
+def test_get_missing_query(cache):
+    assert cache.get("bach") is None
+
+
+def test_evicts_least_frequently_used(cache):
+    for query in ("bach", "rome", "napoleon"):
+        cache.put(query, _results(query), generation=0)
+    # bach and napoleon are popular, rome was only looked up once
+    for _ in range(3):
+        assert cache.get("bach") is not None
+    assert cache.get("napoleon") is not None
+    cache.put("paris", _results("paris"), generation=0)
+    assert cache.get("rome") is None
+    assert cache.get("bach") is not None
+    assert cache.get("napoleon") is not None
+    assert cache.get("paris") is not None
+
+
+def test_evicts_least_recently_used_among_equals(cache):
+    for query in ("bach", "rome", "napoleon"):
+        cache.put(query, _results(query), generation=0)
+    cache.put("paris", _results("paris"), generation=0)
+    assert cache.get("bach") is None
+    assert len(cache) == 3
+
+
+def test_expired_entry_keeps_its_count(mocker):
+    now = mocker.patch(
+        "the_history_atlas.apps.history.search_cache.time.monotonic",
+        return_value=0,
+    )
+    cache = SearchCache(max_size=2, ttl_seconds=60)
+    cache.put("bach", _results("bach"), generation=0)
+    assert cache.get("bach") is not None
+    now.return_value = 61
+    assert cache.get("bach") is None
+    cache.put("bach", _results("bach"), generation=0)
+    cache.put("rome", _results("rome"), generation=0)
+    cache.put("paris", _results("paris"), generation=0)
+    assert cache.get("bach") is not None
+    assert cache.get("rome") is None
+
+
+def test_invalidate(cache):
+    cache.put("bach", _results("bach"), generation=cache.generation)
+    assert cache.invalidate() == 1
+    assert cache.get("bach") is None
+
+
+def test_invalidate_stories_drops_only_results_with_the_stories(cache):
+    bach, handel = uuid4(), uuid4()
+    cache.put("bach", [{"id": str(bach)}], generation=cache.generation)
+    cache.put("baroque", [{"id": str(bach)}, {"id": str(handel)}], generation=0)
+    cache.put("handel", [{"id": str(handel)}], generation=0)
+    for _ in range(2):
+        assert cache.get("baroque") is not None
+
+    assert cache.invalidate_stories([bach]) == 2
+    assert cache.get("bach") is None
+    assert cache.get("baroque") is None
+    assert cache.get("handel") is not None
+    # the remaining entries are still evicted in order
+    for query in ("rome", "paris", "vienna"):
+        cache.put(query, _results(query), generation=cache.generation)
+    assert len(cache) == 3
+    assert cache.get("handel") is not None
+
+
+def test_put_discards_results_from_before_invalidation(cache):
+    generation = cache.generation
+    cache.invalidate()
+    cache.put("bach", _results("bach"), generation=generation)
+    assert cache.get("bach") is None
+
+
+def test_put_keeps_results_without_invalidated_stories(cache):
+    bach, handel = uuid4(), uuid4()
+    generation = cache.generation
+    cache.invalidate_stories([bach])
+    cache.put("bach", [{"id": str(bach)}], generation=generation)
+    cache.put("handel", [{"id": str(handel)}], generation=generation)
+    assert cache.get("bach") is None
+    assert cache.get("handel") is not None
+
+
+def test_invalidate_stories_forgets_replaced_and_evicted_results(cache):
+    bach, handel = uuid4(), uuid4()
+    cache.put("composer", [{"id": str(bach)}], generation=cache.generation)
+    cache.put("composer", [{"id": str(handel)}], generation=cache.generation)
+    assert cache.invalidate_stories([bach]) == 0
+    assert len(cache) == 1
+    for query in ("rome", "paris", "vienna"):
+        cache.put(query, _results(query), generation=cache.generation)
+    # "composer" was evicted, so there is nothing left to invalidate
+    assert cache.invalidate_stories([handel]) == 0
+    assert len(cache) == 3
+
+
+def test_zero_size_disables_cache():
+    cache = SearchCache(max_size=0, ttl_seconds=60)
+    cache.put("bach", _results("bach"), generation=0)
+    assert cache.get("bach") is None
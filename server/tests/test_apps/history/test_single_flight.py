@@ -0,0 +1,98 @@
+import asyncio
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from the_history_atlas.apps.history.metrics import SINGLE_FLIGHT_REQUESTS
+from the_history_atlas.apps.history.single_flight import SingleFlight
+
+
+def _coalesced(operation: str) -> float:
+    return SINGLE_FLIGHT_REQUESTS.labels(
+        operation=operation, role="coalesced"
+    )._value.get()
+
+
+def test_concurrent_calls_share_one_computation():
+    flight = SingleFlight("test_threads")
+    release = threading.Event()
+    calls = []
+
+    def compute():
+        calls.append(1)
+        release.wait(timeout=5)
+        return object()
+
+    coalesced_before = _coalesced("test_threads")
+    with ThreadPoolExecutor(max_workers=4) as executor:
+        futures = [executor.submit(flight.do, "key", compute) for _ in range(4)]
+        # wait until every follower is parked on the leader's call
+        deadline = time.monotonic() + 5
+        while _coalesced("test_threads") - coalesced_before < 3:
+            assert time.monotonic() < deadline
+            time.sleep(0.001)
+        release.set()
+        results = [future.result(timeout=5) for future in futures]
+
+    assert len(calls) == 1
+    assert all(result is results[0] for result in results)
+
+
+def test_exceptions_are_shared_and_not_kept():
+    flight = SingleFlight("test_errors")
+
+    def fail():
+        raise ValueError("boom")
+
+    with pytest.raises(ValueError):
+        flight.do("key", fail)
+    # the failed call is forgotten, so the next one computes again
+    assert flight.do("key", lambda: 1) == 1
+
+
+def test_sequential_calls_are_not_coalesced():
+    flight = SingleFlight("test_sequential")
+    calls = []
+    for _ in range(2):
+        flight.do("key", lambda: calls.append(1))
+    assert len(calls) == 2
+
+
+@pytest.mark.asyncio
+async def test_concurrent_async_calls_share_one_computation():
+    flight = SingleFlight("test_async")
+    calls = []
+
+    async def compute():
+        calls.append(1)
+        await asyncio.sleep(0.01)
+        return object()
+
+    results = await asyncio.gather(
+        *(flight.do_async("key", compute) for _ in range(5)),
+        flight.do_async("other key", compute),
+    )
+
+    assert len(calls) == 2
+    assert all(result is results[0] for result in results[:5])
+    assert results[5] is not results[0]
+
+
+@pytest.mark.asyncio
+async def test_cancelled_caller_does_not_cancel_the_computation():
+    flight = SingleFlight("test_cancel")
+
+    async def compute():
+        await asyncio.sleep(0.01)
+        return "done"
+
+    first = asyncio.ensure_future(flight.do_async("key", compute))
+    second = asyncio.ensure_future(flight.do_async("key", compute))
+    await asyncio.sleep(0)
+    first.cancel()
+
+    assert await second == "done"
+    with pytest.raises(asyncio.CancelledError):
+        await first
@@ -0,0 +1,109 @@
+from uuid import uuid4
+
+import pytest
+
+from the_history_atlas.apps.domain.core import Story
+from the_history_atlas.apps.history.story_cache import (
+    StoryCache,
+    StoryCacheKey,
+    VersionedStory,
+)
+
+
+def _key() -> StoryCacheKey:
+    return StoryCacheKey(story_id=uuid4(), event_id=uuid4(), direction=None)
+
+
+def _story(key: StoryCacheKey) -> VersionedStory:
+    return VersionedStory(
+        story=Story(id=key.story_id, name="The Life of Someone", events=[]),
+        revisions={str(key.story_id): 1},
+    )
+
+
+@pytest.fixture
+def cache() -> StoryCache:
+    return StoryCache(max_size=3, ttl_seconds=60)
+
+
+def test_get_returns_stored_story(cache):
+    key = _key()
+    story = _story(key)
+    cache.put(key, story, tag_ids=[key.story_id], generation=cache.generation)
+    assert cache.get(key) is story
+
+
+def test_get_missing_key(cache):
+    assert cache.get(_key()) is None
+
+
+def test_evicts_least_recently_used(cache):
+    keys = [_key() for _ in range(3)]
+    for key in keys:
+        cache.put(key, _story(key), tag_ids=[key.story_id], generation=0)
+    # touch the first key so the second becomes the oldest
+    assert cache.get(keys[0]) is not None
+    new_key = _key()
+    cache.put(new_key, _story(new_key), tag_ids=[new_key.story_id], generation=0)
+
+    assert len(cache) == 3
+    assert cache.get(keys[1]) is None
+    assert cache.get(keys[0]) is not None
+    assert cache.get(new_key) is not None
+
+
+def test_expired_entries_are_not_returned():
+    cache = StoryCache(max_size=3, ttl_seconds=0)
+    key = _key()
+    cache.put(key, _story(key), tag_ids=[key.story_id], generation=0)
+    assert cache.get(key) is None
+    assert len(cache) == 0
+
+
+def test_invalidate_tags_removes_every_window_using_the_tag(cache):
+    shared_tag = uuid4()
+    first, second, unrelated = _key(), _key(), _key()
+    cache.put(first, _story(first), tag_ids=[first.story_id, shared_tag], generation=0)
+    cache.put(
+        second, _story(second), tag_ids=[second.story_id, shared_tag], generation=0
+    )
+    cache.put(unrelated, _story(unrelated), tag_ids=[unrelated.story_id], generation=0)
+
+    assert cache.invalidate_tags([shared_tag]) == 2
+    assert cache.get(first) is None
+    assert cache.get(second) is None
+    assert cache.get(unrelated) is not None
+
+
+def test_put_is_ignored_after_concurrent_invalidation(cache):
+    key = _key()
+    generation = cache.generation
+    # a write lands while the story is being built
+    cache.invalidate_tags([key.story_id])
+    cache.put(key, _story(key), tag_ids=[key.story_id], generation=generation)
+    assert cache.get(key) is None
+
+
+def test_discard_stale_removes_the_entry(cache):
+    key = _key()
+    story = _story(key)
+    cache.put(key, story, tag_ids=[key.story_id], generation=cache.generation)
+    cache.discard_stale(key, story)
+    assert cache.get(key) is None
+
+
+def test_discard_stale_keeps_a_newer_entry(cache):
+    key = _key()
+    stale = _story(key)
+    cache.put(key, stale, tag_ids=[key.story_id], generation=cache.generation)
+    fresh = _story(key)
+    cache.put(key, fresh, tag_ids=[key.story_id], generation=cache.generation)
+    cache.discard_stale(key, stale)
+    assert cache.get(key) is fresh
+
+
+def test_zero_size_disables_cache():
+    cache = StoryCache(max_size=0, ttl_seconds=60)
+    key = _key()
+    cache.put(key, _story(key), tag_ids=[key.story_id], generation=0)
+    assert cache.get(key) is None
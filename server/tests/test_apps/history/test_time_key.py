@@ -0,0 +1,131 @@
+import pytest
+from sqlalchemy import text
+
+from the_history_atlas.apps.history.time_key import (
+    sort_key,
+    time_key,
+    time_key_range,
+)
+
+
+@pytest.mark.parametrize(
+    "datetime,expected",
+    [
+        ("+1685-03-21T00:00:00Z", 16850321),
+        ("+1685-00-00T00:00:00Z", 16850000),
+        ("-0500-03-21T00:00:00Z", -4999679),
+        ("+13798000000-00-00T00:00:00Z", 137980000000000),
+        ("1685-03-21", 16850321),
+        ("+1685", None),
+        ("not a date", None),
+    ],
+)
+def test_time_key(datetime, expected):
+    assert time_key(datetime) == expected
+
+
+def test_time_keys_sort_chronologically():
+    datetimes = [
+        "-0501-12-31T00:00:00Z",
+        "-0500-01-01T00:00:00Z",
+        "-0500-12-31T00:00:00Z",
+        "-0001-06-01T00:00:00Z",
+        "+0001-01-01T00:00:00Z",
+        "+1685-03-21T00:00:00Z",
+        "+1685-03-22T00:00:00Z",
+        "+1686-01-01T00:00:00Z",
+    ]
+    keys = [time_key(datetime) for datetime in datetimes]
+    assert keys == sorted(keys)
+
+
+def test_sort_keys_order_by_time_then_precision():
+    times = [
+        ("-0500-00-00T00:00:00Z", 9),
+        ("-0500-03-21T00:00:00Z", 11),
+        ("+0001-00-00T00:00:00Z", 7),
+        ("+0001-00-00T00:00:00Z", 9),
+        ("+0001-01-01T00:00:00Z", 11),
+        ("1981-08-04", 11),
+    ]
+    keys = [sort_key(datetime, precision) for datetime, precision in times]
+    assert keys == sorted(set(keys))
+    assert sort_key("not a date", 11) is None
+
+
+@pytest.mark.parametrize(
+    "prefix,inside,outside",
+    [
+        ("+1", ["+1000-01-01", "+1999-12-31"], ["+0999-12-31", "+2000-01-01"]),
+        ("+16", ["+1600-01-01", "+1699-12-31"], ["+1599-12-31", "+1700-01-01"]),
+        ("+168", ["+1680-00-00", "+1689-12-31"], ["+1679-12-31", "+1690-01-01"]),
+        ("+1685", ["+1685-00-00", "+1685-12-31"], ["+1684-12-31", "+1686-01-01"]),
+        ("+1685-03", ["+1685-03-01", "+1685-03-31"], ["+1685-02-28", "+1685-04-01"]),
+        ("+1685-03-21", ["+1685-03-21"], ["+1685-03-20", "+1685-03-22"]),
+        ("-05", ["-0500-01-01", "-0599-12-31"], ["-0499-12-31", "-0600-01-01"]),
+        ("-0500", ["-0500-00-00", "-0500-12-31"], ["-0501-12-31", "-0499-01-01"]),
+    ],
+)
+def test_time_key_range_matches_prefix(prefix, inside, outside):
+    low, high = time_key_range(prefix)
+    for datetime in inside:
+        assert datetime.startswith(prefix)
+        assert low <= time_key(datetime) <= high
+    for datetime in outside:
+        assert not datetime.startswith(prefix)
+        assert not low <= time_key(datetime) <= high
+
+
+def test_generated_column_matches_time_key(history_db):
+    datetimes = ["+1685-03-21T00:00:00Z", "-0500-03-21T00:00:00Z", "1981-08-04", None]
+    with history_db.Session() as session:
+        for datetime in datetimes:
+            generated = session.execute(
+                text(
+                    """
+                    insert into summaries (id, text, datetime)
+                    values (gen_random_uuid(), :text, :datetime)
+                    returning time_key;
+                """
+                ),
+                {"text": f"time key test {datetime}", "datetime": datetime},
+            ).scalar_one()
+            assert generated == (time_key(datetime) if datetime else None)
+        session.rollback()
+
+
+@pytest.mark.parametrize("table", ["times", "summaries"])
+def test_generated_year_and_sort_key(history_db, table):
+    times = [
+        ("+1685-03-21T00:00:00Z", 11, 1685),
+        ("-0500-00-00T00:00:00Z", 9, -500),
+        ("1981-08-04", 11, 1981),
+        ("+13798000000-00-00T00:00:00Z", 9, 13798000000),
+        (None, None, None),
+    ]
+    with history_db.Session() as session:
+        for datetime, precision, year in times:
+            id = session.execute(text("select gen_random_uuid();")).scalar_one()
+            if table == "times":
+                session.execute(
+                    text("insert into tags (id, type) values (:id, 'TIME');"),
+                    {"id": id},
+                )
+                insert = """
+                    insert into times (id, datetime, precision)
+                    values (:id, :datetime, :precision)
+                    returning year, sort_key;
+                """
+            else:
+                insert = """
+                    insert into summaries (id, text, datetime, precision)
+                    values (:id, 'sort key test ' || :id, :datetime, :precision)
+                    returning year, sort_key;
+                """
+            row = session.execute(
+                text(insert),
+                {"id": id, "datetime": datetime, "precision": precision},
+            ).one()
+            assert row.year == year
+            assert row.sort_key == (sort_key(datetime, precision) if datetime else None)
+        session.rollback()
@@ -76,3 +76,24 @@ def test_insert(trie: Trie):
     node = trie.root.children["a"].children["a"].children["z"]
     assert len(node.ids) == 1
     assert my_guid in node.ids
+
+
+def test_build_returns_trie():
+    trie = Trie()
+    assert trie.build(entity_tuples=[("a b", "guid")]) is trie
+    assert {result.name for result in trie.find("", res_count=5)} == {"a", "b", "a b"}
+
+
+def test_delete_one_of_several_guids(trie):
+    trie.delete("aa", "84a03b1b-be16-4c39-85b5-65db589f7980")
+    res = trie.find("aa")
+    assert res[0].guids == frozenset(["671ce5f2-9224-4444-a6d2-f873c2cf5d9e"])
+
+
+def test_insert_reuses_deleted_nodes(trie):
+    size = len(trie)
+    trie.delete("abc", "d8f8f057-785f-4a9a-8a27-1add7abb6230")
+    assert len(trie) == size - 1
+    trie.insert(string="abd", guid="guid")
+    assert len(trie) == size
+    assert trie.find("abd")[0] == TrieResult(name="abd", guids=frozenset(["guid"]))
@@ -1,9 +1,11 @@
+import hashlib
 from typing import Literal
 from uuid import UUID
 
-from fastapi import HTTPException
+from fastapi import HTTPException, Response
 
 import the_history_atlas.api.types.history as api_types
+from the_history_atlas.api.responses import ORJSONResponse
 from the_history_atlas.apps.app_manager import AppManager
 from the_history_atlas.apps.domain.core import (
     Story,
@@ -14,7 +16,11 @@ from the_history_atlas.apps.domain.core import (
     Map,
     Point,
 )
+from the_history_atlas.apps.domain.models.history.get_nearby_events import (
+    NearbyEventRow,
+)
 from the_history_atlas.apps.history.errors import MissingResourceError
+from the_history_atlas.apps.history.grid_cell import cell_bounds
 
 
 def to_camel(string: str) -> str:
@@ -22,32 +28,158 @@ def to_camel(string: str) -> str:
     return components[0] + "".join(x.title() for x in components[1:])
 
 
-def get_history_handler(
+async def get_history_handler(
     apps: AppManager,
     event_id: UUID | None,
     story_id: UUID | None,
     direction: Literal["next", "prev"] | None,
-) -> api_types.Story:
+    if_none_match: str | None = None,
+) -> Response:
+    # only a request for a specific window is versioned; the default story
+    # is chosen at random
+    versioned = event_id is not None and story_id is not None
     if not event_id or not story_id:
-        story_pointer = apps.history_app.get_default_story_and_event(
+        story_pointer = await apps.history_app.get_default_story_and_event_async(
             story_id=story_id,
             event_id=event_id,
         )
         story_id = story_pointer.story_id
         event_id = story_pointer.event_id
     try:
-        story = apps.history_app.get_story_list(
+        window = await apps.history_app.get_story_window_async(
             event_id=event_id, story_id=story_id, direction=direction
         )
     except MissingResourceError as exc:
         raise HTTPException(status_code=404, detail=str(exc))
+    etag = None
+    if versioned:
+        # the window walks into related stories, so it is versioned by the
+        # revision of each of them
+        etag = make_etag(
+            "history",
+            story_id,
+            event_id,
+            direction,
+            *(
+                f"{key}={revision}"
+                for key, revision in sorted(window.revisions.items())
+            ),
+        )
+        if etag_matches(if_none_match, etag):
+            return not_modified(apps, etag)
+    story = window.story
     if not direction:
         index = [event.id for event in story.events].index(event_id)
     elif direction == "prev":
         index = len(story.events) - 1
     elif direction == "next":
         index = 0
-    return convert_story_to_api(story, index=index)
+    # the domain story already holds validated data, so it is encoded directly
+    # rather than converted to api_types.Story and validated again
+    response = ORJSONResponse(content=story_to_json(story, index=index))
+    if etag is not None:
+        set_cache_headers(apps, response, etag)
+    return response
+
+
+def make_etag(*parts) -> str:
+    """A weak ETag for a response identified by the given parts, which should
+    include a revision counter of the data it was built from."""
+    digest = hashlib.sha1(":".join(str(part) for part in parts).encode()).hexdigest()
+    return f'W/"{digest[:20]}"'
+
+
+def etag_matches(if_none_match: str | None, etag: str) -> bool:
+    """Weak comparison of an If-None-Match header against an ETag."""
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    opaque_tag = etag.removeprefix("W/")
+    return any(
+        candidate.strip().removeprefix("W/") == opaque_tag
+        for candidate in if_none_match.split(",")
+    )
+
+
+def _cache_control(apps: AppManager) -> str:
+    # browsers revalidate every time; shared caches may serve it for a while
+    return f"public, max-age=0, s-maxage={apps.config_app.HISTORY_CDN_MAX_AGE_SECONDS}"
+
+
+def set_cache_headers(apps: AppManager, response: Response, etag: str) -> None:
+    response.headers["ETag"] = etag
+    response.headers["Cache-Control"] = _cache_control(apps)
+
+
+def not_modified(apps: AppManager, etag: str) -> Response:
+    return Response(
+        status_code=304,
+        headers={"ETag": etag, "Cache-Control": _cache_control(apps)},
+    )
+
+
+def story_to_json(story: Story, index: int) -> dict:
+    """Build the JSON content of an API Story straight from the internal
+    Story model. Must be kept in step with api_types.Story, which
+    tests/test_api/test_history_serialization.py checks."""
+    return {
+        "id": story.id,
+        "name": story.name,
+        "description": story.description,
+        "events": [event_to_json(event) for event in story.events],
+        "index": index,
+    }
+
+
+def event_to_json(event: HistoryEvent) -> dict:
+    """Build the JSON content of an API HistoryEvent."""
+    date = event.date
+    source = event.source
+    return {
+        "id": event.id,
+        "text": event.text,
+        "lang": event.lang,
+        "date": {
+            "datetime": date.datetime,
+            "calendar": date.calendar,
+            "precision": date.precision,
+        },
+        "source": {
+            "id": source.id,
+            "text": source.text,
+            "title": source.title,
+            "author": source.author,
+            "publisher": source.publisher,
+            "pubDate": source.pub_date,
+        },
+        "tags": [
+            {
+                "id": tag.id,
+                "type": tag.type,
+                "startChar": tag.start_char,
+                "stopChar": tag.stop_char,
+                "name": tag.name,
+                "defaultStoryId": tag.default_story_id,
+            }
+            for tag in event.tags
+        ],
+        "map": {
+            "locations": [
+                {
+                    "id": point.id,
+                    "latitude": point.latitude,
+                    "longitude": point.longitude,
+                    "name": point.name,
+                }
+                for point in event.map.locations
+            ]
+        },
+        "focus": event.focus if event.focus else None,
+        "storyTitle": event.story_title,
+        "description": event.description,
+        "stories": event.stories,
+    }
 
 
 def convert_story_to_api(story: Story, index: int) -> api_types.Story:
@@ -123,7 +255,7 @@ def convert_point_to_api(point: Point) -> api_types.Point:
     )
 
 
-def get_nearby_events_handler(
+async def get_nearby_events_handler(
     apps: AppManager,
     event_id: UUID,
     calendar_model: str,
@@ -133,8 +265,24 @@ def get_nearby_events_handler(
     max_lat: float,
     min_lng: float,
     max_lng: float,
-) -> api_types.NearbyEventsResponse:
-    rows = apps.history_app.get_nearby_events(
+    if_none_match: str | None = None,
+) -> Response:
+    version = await apps.history_app.get_nearby_version_async()
+    etag = make_etag(
+        "nearby",
+        event_id,
+        calendar_model,
+        precision,
+        datetime,
+        min_lat,
+        max_lat,
+        min_lng,
+        max_lng,
+        version,
+    )
+    if etag_matches(if_none_match, etag):
+        return not_modified(apps, etag)
+    rows = await apps.history_app.get_nearby_events_async(
         event_id=event_id,
         calendar_model=calendar_model,
         precision=precision,
@@ -144,23 +292,84 @@ def get_nearby_events_handler(
         min_lng=min_lng,
         max_lng=max_lng,
     )
-    return api_types.NearbyEventsResponse(
-        events=[
-            api_types.NearbyEventResult(
-                eventId=row.event_id,
-                storyId=row.story_id,
-                personName=row.person_name,
-                personDescription=row.person_description,
-                summaryText=row.summary_text,
-                placeName=row.place_name,
+    response = ORJSONResponse(
+        content={"events": [nearby_event_to_json(row) for row in rows]}
+    )
+    set_cache_headers(apps, response, etag)
+    return response
+
+
+async def get_nearby_clusters_handler(
+    apps: AppManager,
+    calendar_model: str,
+    precision: int,
+    datetime: str,
+    zoom: int,
+    min_lat: float,
+    max_lat: float,
+    min_lng: float,
+    max_lng: float,
+) -> api_types.NearbyClustersResponse:
+    rows = await apps.history_app.get_nearby_clusters_async(
+        calendar_model=calendar_model,
+        precision=precision,
+        datetime=datetime,
+        zoom=zoom,
+        min_lat=min_lat,
+        max_lat=max_lat,
+        min_lng=min_lng,
+        max_lng=max_lng,
+    )
+    clusters = []
+    for row in rows:
+        cell_min_lat, cell_max_lat, cell_min_lng, cell_max_lng = cell_bounds(
+            row.cell, zoom
+        )
+        clusters.append(
+            api_types.NearbyCluster(
+                minLat=cell_min_lat,
+                maxLat=cell_max_lat,
+                minLng=cell_min_lng,
+                maxLng=cell_max_lng,
                 latitude=row.latitude,
                 longitude=row.longitude,
-                datetime=row.datetime,
-                precision=row.precision,
-                calendarModel=row.calendar_model,
+                count=row.count,
+                event=_nearby_event_result(row.event),
             )
-            for row in rows
-        ]
+        )
+    return api_types.NearbyClustersResponse(zoom=zoom, clusters=clusters)
+
+
+def nearby_event_to_json(row: NearbyEventRow) -> dict:
+    """Build the JSON content of an API NearbyEventResult."""
+    return {
+        "eventId": row.event_id,
+        "storyId": row.story_id,
+        "personName": row.person_name,
+        "personDescription": row.person_description,
+        "summaryText": row.summary_text,
+        "placeName": row.place_name,
+        "latitude": row.latitude,
+        "longitude": row.longitude,
+        "datetime": row.datetime,
+        "precision": row.precision,
+        "calendarModel": row.calendar_model,
+    }
+
+
+def _nearby_event_result(row: NearbyEventRow) -> api_types.NearbyEventResult:
+    return api_types.NearbyEventResult(
+        eventId=row.event_id,
+        storyId=row.story_id,
+        personName=row.person_name,
+        personDescription=row.person_description,
+        summaryText=row.summary_text,
+        placeName=row.place_name,
+        latitude=row.latitude,
+        longitude=row.longitude,
+        datetime=row.datetime,
+        precision=row.precision,
+        calendarModel=row.calendar_model,
     )
 
 
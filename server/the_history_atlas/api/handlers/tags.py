@@ -9,10 +9,25 @@ from the_history_atlas.api.types.tags import (
     WikiDataTagPointer,
     WikiDataEventInput,
     WikiDataEventOutput,
+    WikiDataBulkEventInput,
+    WikiDataBulkEventOutput,
+    WikiDataBulkEventResult,
+    WikiDataBulkPeopleInput,
+    WikiDataBulkPlacesInput,
+    WikiDataBulkTimesInput,
+    WikiDataBulkTagsOutput,
 )
 from fastapi import HTTPException
 from the_history_atlas.apps.app_manager import AppManager
-from the_history_atlas.apps.domain.core import PersonInput, PlaceInput, TimeInput
+from the_history_atlas.apps.domain.core import (
+    PersonInput,
+    PlaceInput,
+    TimeInput,
+    EventInput,
+    TagInstance,
+    CitationInput,
+    CreatedTags,
+)
 from the_history_atlas.apps.history.errors import DuplicateEventError
 
 
@@ -40,6 +55,58 @@ def create_time_handler(
     return WikiDataTimeOutput.model_validate(output, from_attributes=True)
 
 
+def create_people_handler(
+    apps: AppManager, input: WikiDataBulkPeopleInput
+) -> WikiDataBulkTagsOutput:
+    output = apps.history_app.create_people(
+        people=[
+            PersonInput.model_validate(person, from_attributes=True)
+            for person in input.people
+        ]
+    )
+    return _bulk_tags_output(output)
+
+
+def create_places_handler(
+    apps: AppManager, input: WikiDataBulkPlacesInput
+) -> WikiDataBulkTagsOutput:
+    output = apps.history_app.create_places(
+        places=[
+            PlaceInput.model_validate(place, from_attributes=True)
+            for place in input.places
+        ]
+    )
+    return _bulk_tags_output(output)
+
+
+def create_times_handler(
+    apps: AppManager, input: WikiDataBulkTimesInput
+) -> WikiDataBulkTagsOutput:
+    if any(time.wikidata_id is None for time in input.times):
+        raise HTTPException(
+            status_code=422, detail="Times created in bulk must have a wikidata_id"
+        )
+    output = apps.history_app.create_times(
+        times=[
+            TimeInput.model_validate(time, from_attributes=True) for time in input.times
+        ]
+    )
+    return _bulk_tags_output(output)
+
+
+def _bulk_tags_output(output: CreatedTags) -> WikiDataBulkTagsOutput:
+    return WikiDataBulkTagsOutput(
+        created=[
+            WikiDataTagPointer(id=tag.id, wikidata_id=tag.wikidata_id)
+            for tag in output.created
+        ],
+        existing=[
+            WikiDataTagPointer(id=tag.id, wikidata_id=tag.wikidata_id)
+            for tag in output.existing
+        ],
+    )
+
+
 def get_tags_handler(apps: AppManager, wikidata_ids: list[str]) -> WikiDataTagsOutput:
     output = apps.history_app.get_tags_by_wikidata_ids(ids=wikidata_ids)
     return WikiDataTagsOutput(
@@ -64,3 +131,27 @@ def create_event_handler(
             status_code=409, detail="An event with these parameters already exists"
         )
     return WikiDataEventOutput(id=id)
+
+
+def create_events_handler(
+    apps: AppManager, input: WikiDataBulkEventInput
+) -> WikiDataBulkEventOutput:
+    events = [
+        EventInput(
+            text=event.summary,
+            tags=[
+                TagInstance.model_validate(tag, from_attributes=True)
+                for tag in event.tags
+            ],
+            citation=CitationInput.model_validate(event.citation, from_attributes=True),
+            after=event.after,
+        )
+        for event in input.events
+    ]
+    results = apps.history_app.create_wikidata_events(events=events)
+    return WikiDataBulkEventOutput(
+        results=[
+            WikiDataBulkEventResult.model_validate(result, from_attributes=True)
+            for result in results
+        ]
+    )
@@ -1,6 +1,6 @@
 from uuid import UUID
 
-from fastapi import HTTPException, BackgroundTasks
+from fastapi import HTTPException
 
 from the_history_atlas.api.types.text_reader import (
     TextReaderSourceInput,
@@ -16,13 +16,18 @@ from the_history_atlas.api.types.text_reader import (
     TextReaderStoryInput,
     TextReaderStoryOutput,
     PeopleSearchResult,
+    PeopleBatchSearchInput,
+    PeopleBatchSearchResult,
     PersonSearchCandidate,
     PlaceSearchResult,
+    PlacesBatchSearchInput,
+    PlacesBatchSearchResult,
     PlaceSearchCandidate,
     SummaryMatchResult,
 )
 from the_history_atlas.apps.app_manager import AppManager
 from the_history_atlas.apps.domain.core import TagInstance
+from the_history_atlas.apps.domain.models.history.search_places import PlaceQuery
 from the_history_atlas.apps.history.errors import (
     DuplicateEventError,
     MissingTagTypesError,
@@ -44,6 +49,19 @@ def create_source_handler(
 
 def search_people_handler(apps: AppManager, name: str) -> PeopleSearchResult:
     candidates = apps.history_app.search_people_by_name(name=name)
+    return _people_search_result(candidates)
+
+
+def search_people_batch_handler(
+    apps: AppManager, search: PeopleBatchSearchInput
+) -> PeopleBatchSearchResult:
+    results = apps.history_app.search_people_by_names(names=search.names)
+    return PeopleBatchSearchResult(
+        results=[_people_search_result(candidates) for candidates in results]
+    )
+
+
+def _people_search_result(candidates: list[dict]) -> PeopleSearchResult:
     return PeopleSearchResult(
         candidates=[
             PersonSearchCandidate(
@@ -78,6 +96,22 @@ def search_places_handler(
     candidates = apps.history_app.search_places(
         name=name, latitude=latitude, longitude=longitude, radius=radius
     )
+    return _place_search_result(candidates)
+
+
+def search_places_batch_handler(
+    apps: AppManager, search: PlacesBatchSearchInput
+) -> PlacesBatchSearchResult:
+    results = apps.history_app.search_places_batch(
+        queries=[PlaceQuery(**query.model_dump()) for query in search.queries],
+        radius=search.radius,
+    )
+    return PlacesBatchSearchResult(
+        results=[_place_search_result(candidates) for candidates in results]
+    )
+
+
+def _place_search_result(candidates: list[dict]) -> PlaceSearchResult:
     return PlaceSearchResult(
         candidates=[
             PlaceSearchCandidate(
@@ -120,7 +154,6 @@ def create_time_without_wikidata_handler(
 def create_text_reader_event_handler(
     apps: AppManager,
     event: TextReaderEventInput,
-    background_tasks: BackgroundTasks,
 ) -> TextReaderEventOutput:
     # Validate that every tag name appears in the summary at the declared position
     for tag in event.tags:
@@ -163,13 +196,6 @@ def create_text_reader_event_handler(
             detail="An event with this text already exists",
         )
 
-    if apps.config_app.COMPUTE_STORY_ORDER:
-        background_tasks.add_task(
-            lambda: apps.history_app.calculate_story_order(
-                [tag.id for tag in event.tags]
-            ),
-        )
-
     return TextReaderEventOutput(id=summary_id)
 
 
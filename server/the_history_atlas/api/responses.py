@@ -0,0 +1,25 @@
+from typing import Any
+from uuid import UUID
+
+import orjson
+from fastapi.responses import JSONResponse
+
+
+def _default(value: Any) -> Any:
+    # orjson only encodes uuid.UUID itself; asyncpg returns a subclass
+    if isinstance(value, UUID):
+        return str(value)
+    raise TypeError(f"Type is not JSON serializable: {type(value).__name__}")
+
+
+class ORJSONResponse(JSONResponse):
+    """A JSON response rendered by orjson.
+
+    The content is serialized as is: it is not validated against the
+    endpoint's response_model, so handlers returning this must build content
+    which already matches it. UTC datetimes are rendered with a Z suffix, as
+    pydantic renders them.
+    """
+
+    def render(self, content: Any) -> bytes:
+        return orjson.dumps(content, default=_default, option=orjson.OPT_UTC_Z)
@@ -1,4 +1,11 @@
-from fastapi import FastAPI, Depends, Query, HTTPException, BackgroundTasks, Header
+from fastapi import (
+    FastAPI,
+    Depends,
+    Query,
+    HTTPException,
+    Header,
+    Response,
+)
 from typing import Callable, Annotated, Literal, Optional
 from faker import Faker
 import random
@@ -13,6 +20,7 @@ from the_history_atlas.api.handlers.api_keys import (
 from the_history_atlas.api.handlers.history import (
     get_history_handler,
     get_nearby_events_handler,
+    get_nearby_clusters_handler,
     check_time_exists_handler,
 )
 from the_history_atlas.api.handlers.tags import (
@@ -21,12 +29,18 @@ from the_history_atlas.api.handlers.tags import (
     create_time_handler,
     get_tags_handler,
     create_event_handler,
+    create_events_handler,
+    create_people_handler,
+    create_places_handler,
+    create_times_handler,
 )
 from the_history_atlas.api.handlers.text_reader import (
     create_source_handler,
     search_people_handler,
+    search_people_batch_handler,
     create_person_without_wikidata_handler,
     search_places_handler,
+    search_places_batch_handler,
     create_place_without_wikidata_handler,
     create_time_without_wikidata_handler,
     create_text_reader_event_handler,
@@ -52,6 +66,7 @@ from the_history_atlas.api.types.history import (
     TimeExistsResponse,
     StorySearchResponse,
     NearbyEventsResponse,
+    NearbyClustersResponse,
 )
 from the_history_atlas.api.types.tags import (
     WikiDataPersonOutput,
@@ -63,6 +78,12 @@ from the_history_atlas.api.types.tags import (
     WikiDataTagsOutput,
     WikiDataEventOutput,
     WikiDataEventInput,
+    WikiDataBulkEventInput,
+    WikiDataBulkEventOutput,
+    WikiDataBulkPeopleInput,
+    WikiDataBulkPlacesInput,
+    WikiDataBulkTimesInput,
+    WikiDataBulkTagsOutput,
 )
 from the_history_atlas.api.types.text_reader import (
     TextReaderSourceInput,
@@ -78,7 +99,11 @@ from the_history_atlas.api.types.text_reader import (
     TextReaderStoryInput,
     TextReaderStoryOutput,
     PeopleSearchResult,
+    PeopleBatchSearchInput,
+    PeopleBatchSearchResult,
     PlaceSearchResult,
+    PlacesBatchSearchInput,
+    PlacesBatchSearchResult,
     SummaryMatchResult,
 )
 from the_history_atlas.api.types.user import LoginResponse
@@ -92,6 +117,7 @@ from the_history_atlas.apps.domain.models.accounts import UserDetails, GetUserPa
 from the_history_atlas.apps.domain.models.accounts.get_user import (
     GetUserResponsePayload,
 )
+from the_history_atlas.apps.history.grid_cell import GRID_ZOOM
 
 fake = Faker()
 Faker.seed(872)
@@ -256,18 +282,23 @@ def register_rest_endpoints(
 
     # API Endpoints
     @fastapi_app.get("/history", response_model=Story)
-    def get_history(
+    async def get_history(
         apps: Apps,
         eventId: Annotated[UUID, Query()] | None = None,
         storyId: Annotated[UUID, Query()] | None = None,
         direction: Annotated[Literal["next", "prev"], Query()] | None = None,
-    ) -> Story:
-        return get_history_handler(
-            apps=apps, event_id=eventId, story_id=storyId, direction=direction
+        if_none_match: Annotated[Optional[str], Header()] = None,
+    ) -> Story | Response:
+        return await get_history_handler(
+            apps=apps,
+            event_id=eventId,
+            story_id=storyId,
+            direction=direction,
+            if_none_match=if_none_match,
         )
 
     @fastapi_app.get("/history/nearby", response_model=NearbyEventsResponse)
-    def get_nearby_events(
+    async def get_nearby_events(
         apps: Apps,
         eventId: Annotated[UUID, Query()],
         calendarModel: Annotated[str, Query()],
@@ -277,8 +308,9 @@ def register_rest_endpoints(
         maxLat: Annotated[float, Query()],
         minLng: Annotated[float, Query()],
         maxLng: Annotated[float, Query()],
-    ) -> NearbyEventsResponse:
-        return get_nearby_events_handler(
+        if_none_match: Annotated[Optional[str], Header()] = None,
+    ) -> NearbyEventsResponse | Response:
+        return await get_nearby_events_handler(
             apps=apps,
             event_id=eventId,
             calendar_model=calendarModel,
@@ -288,6 +320,31 @@ def register_rest_endpoints(
             max_lat=maxLat,
             min_lng=minLng,
             max_lng=maxLng,
+            if_none_match=if_none_match,
+        )
+
+    @fastapi_app.get("/history/nearby/clusters", response_model=NearbyClustersResponse)
+    async def get_nearby_clusters(
+        apps: Apps,
+        calendarModel: Annotated[str, Query()],
+        precision: Annotated[int, Query()],
+        datetime: Annotated[str, Query()],
+        zoom: Annotated[int, Query(ge=0, le=GRID_ZOOM)],
+        minLat: Annotated[float, Query()],
+        maxLat: Annotated[float, Query()],
+        minLng: Annotated[float, Query()],
+        maxLng: Annotated[float, Query()],
+    ) -> NearbyClustersResponse:
+        return await get_nearby_clusters_handler(
+            apps=apps,
+            calendar_model=calendarModel,
+            precision=precision,
+            datetime=datetime,
+            zoom=zoom,
+            min_lat=minLat,
+            max_lat=maxLat,
+            min_lng=minLng,
+            max_lng=maxLng,
         )
 
     @fastapi_app.post(path="/wikidata/people", response_model=WikiDataPersonOutput)
@@ -308,6 +365,24 @@ def register_rest_endpoints(
     ) -> WikiDataTimeOutput:
         return create_time_handler(apps=apps, time=time)
 
+    @fastapi_app.post("/wikidata/people/bulk", response_model=WikiDataBulkTagsOutput)
+    def create_people_bulk(
+        input: WikiDataBulkPeopleInput, apps: Apps, user: AuthenticatedUser
+    ) -> WikiDataBulkTagsOutput:
+        return create_people_handler(apps=apps, input=input)
+
+    @fastapi_app.post("/wikidata/places/bulk", response_model=WikiDataBulkTagsOutput)
+    def create_places_bulk(
+        input: WikiDataBulkPlacesInput, apps: Apps, user: AuthenticatedUser
+    ) -> WikiDataBulkTagsOutput:
+        return create_places_handler(apps=apps, input=input)
+
+    @fastapi_app.post("/wikidata/times/bulk", response_model=WikiDataBulkTagsOutput)
+    def create_times_bulk(
+        input: WikiDataBulkTimesInput, apps: Apps, user: AuthenticatedUser
+    ) -> WikiDataBulkTagsOutput:
+        return create_times_handler(apps=apps, input=input)
+
     @fastapi_app.get("/wikidata/tags", response_model=WikiDataTagsOutput)
     def get_tags(
         apps: Apps,
@@ -323,16 +398,16 @@ def register_rest_endpoints(
         event: WikiDataEventInput,
         apps: Apps,
         user: AuthenticatedUser,
-        background_tasks: BackgroundTasks,
     ) -> WikiDataEventOutput:
-        output = create_event_handler(apps=apps, event=event)
-        if apps.config_app.COMPUTE_STORY_ORDER:
-            background_tasks.add_task(
-                lambda: apps.history_app.calculate_story_order(
-                    [tag.id for tag in event.tags]
-                ),
-            )
-        return output
+        return create_event_handler(apps=apps, event=event)
+
+    @fastapi_app.post("/wikidata/events/bulk", response_model=WikiDataBulkEventOutput)
+    def create_events(
+        input: WikiDataBulkEventInput,
+        apps: Apps,
+        user: AuthenticatedUser,
+    ) -> WikiDataBulkEventOutput:
+        return create_events_handler(apps=apps, input=input)
 
     @fastapi_app.post("/token")
     def login(
@@ -349,12 +424,12 @@ def register_rest_endpoints(
         return check_time_exists_handler(apps=apps, request=request)
 
     @fastapi_app.get("/stories/search", response_model=StorySearchResponse)
-    def search_stories(
+    async def search_stories(
         query: Annotated[str, Query()],
         apps: Apps,
     ) -> StorySearchResponse:
         """Search for stories using fuzzy text matching."""
-        results = apps.history_app.fuzzy_search_stories(search_string=query)
+        results = await apps.history_app.fuzzy_search_stories_async(search_string=query)
         return StorySearchResponse(results=results)
 
     # --- API Key Management (JWT-only) ---
@@ -398,6 +473,17 @@ def register_rest_endpoints(
     ) -> PeopleSearchResult:
         return search_people_handler(apps=apps, name=name)
 
+    @fastapi_app.post(
+        "/text-reader/people/search/batch",
+        response_model=PeopleBatchSearchResult,
+    )
+    def search_text_reader_people_batch(
+        search: PeopleBatchSearchInput,
+        apps: Apps,
+        user: AuthenticatedUser,
+    ) -> PeopleBatchSearchResult:
+        return search_people_batch_handler(apps=apps, search=search)
+
     @fastapi_app.post("/text-reader/people", response_model=TextReaderPersonOutput)
     def create_text_reader_person(
         person: TextReaderPersonInput,
@@ -426,6 +512,17 @@ def register_rest_endpoints(
             radius=radius,
         )
 
+    @fastapi_app.post(
+        "/text-reader/places/search/batch",
+        response_model=PlacesBatchSearchResult,
+    )
+    def search_text_reader_places_batch(
+        search: PlacesBatchSearchInput,
+        apps: Apps,
+        user: AuthenticatedUser,
+    ) -> PlacesBatchSearchResult:
+        return search_places_batch_handler(apps=apps, search=search)
+
     @fastapi_app.post("/text-reader/places", response_model=TextReaderPlaceOutput)
     def create_text_reader_place(
         place: TextReaderPlaceInput,
@@ -447,11 +544,8 @@ def register_rest_endpoints(
         event: TextReaderEventInput,
         apps: Apps,
         user: AuthenticatedUser,
-        background_tasks: BackgroundTasks,
     ) -> TextReaderEventOutput:
-        return create_text_reader_event_handler(
-            apps=apps, event=event, background_tasks=background_tasks
-        )
+        return create_text_reader_event_handler(apps=apps, event=event)
 
     @fastapi_app.get(
         "/text-reader/summaries/match",
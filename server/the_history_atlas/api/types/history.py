@@ -104,3 +104,20 @@ class NearbyEventResult(BaseModel):
 
 class NearbyEventsResponse(BaseModel):
     events: List[NearbyEventResult]
+
+
+class NearbyCluster(BaseModel):
+    minLat: float
+    maxLat: float
+    minLng: float
+    maxLng: float
+    # centroid of the cell's events
+    latitude: float
+    longitude: float
+    count: int
+    event: NearbyEventResult
+
+
+class NearbyClustersResponse(BaseModel):
+    zoom: int
+    clusters: List[NearbyCluster]
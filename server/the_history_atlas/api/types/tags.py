@@ -2,7 +2,10 @@ from datetime import datetime
 from typing import Literal
 from uuid import UUID
 
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
+
+# the most events created by one bulk request, all in one transaction
+MAX_BULK_EVENTS = 1000
 
 
 class WikiDataPersonInput(BaseModel):
@@ -56,6 +59,23 @@ class WikiDataTagsOutput(BaseModel):
     wikidata_ids: list[WikiDataTagPointer]
 
 
+class WikiDataBulkPeopleInput(BaseModel):
+    people: list[WikiDataPersonInput]
+
+
+class WikiDataBulkPlacesInput(BaseModel):
+    places: list[WikiDataPlaceInput]
+
+
+class WikiDataBulkTimesInput(BaseModel):
+    times: list[WikiDataTimeInput]
+
+
+class WikiDataBulkTagsOutput(BaseModel):
+    created: list[WikiDataTagPointer]
+    existing: list[WikiDataTagPointer]
+
+
 class TagInput(BaseModel):
     id: UUID
     name: str
@@ -79,3 +99,16 @@ class WikiDataEventInput(BaseModel):
 
 class WikiDataEventOutput(BaseModel):
     id: UUID
+
+
+class WikiDataBulkEventInput(BaseModel):
+    events: list[WikiDataEventInput] = Field(max_length=MAX_BULK_EVENTS)
+
+
+class WikiDataBulkEventResult(BaseModel):
+    status: Literal["created", "duplicate", "missing_tags"]
+    id: UUID | None = None
+
+
+class WikiDataBulkEventOutput(BaseModel):
+    results: list[WikiDataBulkEventResult]
@@ -1,7 +1,11 @@
 from typing import Literal
 from uuid import UUID
 
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
+
+# the most names or places searched for in one batch request, as sent by
+# text_reader's rest client
+MAX_SEARCH_BATCH_SIZE = 200
 
 
 # --- Source ---
@@ -146,10 +150,35 @@ class PlaceSearchCandidate(BaseModel):
     longitude: float | None = None
 
 
+class PeopleBatchSearchInput(BaseModel):
+    names: list[str] = Field(max_length=MAX_SEARCH_BATCH_SIZE)
+
+
+class PeopleBatchSearchResult(BaseModel):
+    # in the order of the names searched for
+    results: list[PeopleSearchResult]
+
+
 class PlaceSearchResult(BaseModel):
     candidates: list[PlaceSearchCandidate]
 
 
+class PlaceSearchQuery(BaseModel):
+    name: str = ""
+    latitude: float | None = None
+    longitude: float | None = None
+
+
+class PlacesBatchSearchInput(BaseModel):
+    queries: list[PlaceSearchQuery] = Field(max_length=MAX_SEARCH_BATCH_SIZE)
+    radius: float = 1.0
+
+
+class PlacesBatchSearchResult(BaseModel):
+    # in the order of the queries
+    results: list[PlaceSearchResult]
+
+
 # --- Summary Match ---
 
 
@@ -23,6 +23,7 @@ class AppManager:
         self.history_app = HistoryApp(
             config_app=self.config_app,
             database_client=self.database_app.client(),
+            async_database_client=self.database_app.async_client(),
         )
 
         # Prime the cache and start the refresh thread
@@ -32,6 +33,7 @@ class AppManager:
             self.history_app.start_cache_refresh(
                 refresh_interval_seconds=3600
             )  # Refresh every hour
+            self.history_app.build_nearby_index()
 
             # Register cleanup function to stop the thread on application shutdown
             atexit.register(self._cleanup)
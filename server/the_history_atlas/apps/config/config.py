@@ -22,9 +22,76 @@ class Config:
         # debug mode?
         self.DEBUG = bool(os.environ.get("DEBUG"))
         self.DB_URI = os.environ.get("THA_DB_URI")
+        # async read path; defaults to DB_URI with the asyncpg driver
+        self.ASYNC_DB_URI = os.environ.get("THA_ASYNC_DB_URI")
+        # connection pool settings, applied to both the sync and async engines
+        self.DB_POOL_SIZE = int(os.environ.get("DB_POOL_SIZE", "5"))
+        self.DB_MAX_OVERFLOW = int(os.environ.get("DB_MAX_OVERFLOW", "10"))
+        self.DB_POOL_TIMEOUT_SECONDS = float(
+            os.environ.get("DB_POOL_TIMEOUT_SECONDS", "30")
+        )
+        # -1 never recycles connections
+        self.DB_POOL_RECYCLE_SECONDS = int(
+            os.environ.get("DB_POOL_RECYCLE_SECONDS", "-1")
+        )
+        self.DB_POOL_PRE_PING = (
+            os.environ.get("DB_POOL_PRE_PING", "false").lower() == "true"
+        )
+        # 0 disables the server-side statement timeout
+        self.DB_STATEMENT_TIMEOUT_MS = int(
+            os.environ.get("DB_STATEMENT_TIMEOUT_MS", "0")
+        )
         self.COMPUTE_STORY_ORDER = (
             os.environ.get("COMPUTE_STORY_ORDER", "true").lower() == "true"
         )
+        # new events queue their stories to be ordered after this delay, so a
+        # story gaining many events at once is ordered once
+        self.STORY_ORDER_JOB_DELAY_SECONDS = float(
+            os.environ.get("STORY_ORDER_JOB_DELAY_SECONDS", "10")
+        )
+        self.STORY_ORDER_JOB_BATCH_SIZE = int(
+            os.environ.get("STORY_ORDER_JOB_BATCH_SIZE", "50")
+        )
+        self.STORY_ORDER_JOB_POLL_SECONDS = float(
+            os.environ.get("STORY_ORDER_JOB_POLL_SECONDS", "2")
+        )
+        # run a queue worker in each API process; disable when running
+        # dedicated workers (the_history_atlas.scripts.story_order_worker)
+        self.STORY_ORDER_WORKER_ENABLED = (
+            os.environ.get("STORY_ORDER_WORKER_ENABLED", "true").lower() == "true"
+        )
+        # in-process cache of built /history story windows
+        self.STORY_CACHE_SIZE = int(os.environ.get("STORY_CACHE_SIZE", "1000"))
+        self.STORY_CACHE_TTL_SECONDS = int(
+            os.environ.get("STORY_CACHE_TTL_SECONDS", "300")
+        )
+        # in-process cache of /stories/search results
+        self.SEARCH_CACHE_SIZE = int(os.environ.get("SEARCH_CACHE_SIZE", "5000"))
+        self.SEARCH_CACHE_TTL_SECONDS = int(
+            os.environ.get("SEARCH_CACHE_TTL_SECONDS", "300")
+        )
+        # how long shared caches (a CDN) may serve /history responses before
+        # revalidating their ETag; browsers always revalidate
+        self.HISTORY_CDN_MAX_AGE_SECONDS = int(
+            os.environ.get("HISTORY_CDN_MAX_AGE_SECONDS", "60")
+        )
+        # in-memory index serving /history/nearby; once its estimated size
+        # exceeds the budget it is dropped and queries go to the database.
+        # Each process holds its own, which learns of events created
+        # elsewhere only when it is rebuilt by the cache refresh thread.
+        self.NEARBY_INDEX_ENABLED = (
+            os.environ.get("NEARBY_INDEX_ENABLED", "false").lower() == "true"
+        )
+        self.NEARBY_INDEX_MAX_BYTES = int(
+            os.environ.get("NEARBY_INDEX_MAX_BYTES", str(256 * 1024 * 1024))
+        )
+        # in-memory index of story names serving /stories/search. Each process
+        # holds its own, which learns of names created elsewhere when it is
+        # rebuilt by the cache refresh thread; until then, searches it finds
+        # nothing for fall back to the database.
+        self.NAME_INDEX_ENABLED = (
+            os.environ.get("NAME_INDEX_ENABLED", "true").lower() == "true"
+        )
 
     @staticmethod
     def get_timestamp() -> str:
@@ -1 +1,5 @@
-from the_history_atlas.apps.database.database_app import DatabaseClient, DatabaseApp
+from the_history_atlas.apps.database.database_app import (
+    DatabaseClient,
+    AsyncDatabaseClient,
+    DatabaseApp,
+)
@@ -1,23 +1,87 @@
 from sqlalchemy import create_engine
-from sqlalchemy.engine import Engine
+from sqlalchemy.engine import Engine, make_url
+from sqlalchemy.ext.asyncio import AsyncEngine, create_async_engine
 
 from the_history_atlas.apps.config import Config
+from the_history_atlas.apps.database.pool import (
+    InstrumentedQueuePool,
+    InstrumentedAsyncAdaptedQueuePool,
+)
 
 
 DatabaseClient = Engine
+AsyncDatabaseClient = AsyncEngine
 
 
 class DatabaseApp:
     def __init__(self, config_app: Config):
         self.config_app = config_app
         self._client: DatabaseClient | None = None
+        self._async_client: AsyncDatabaseClient | None = None
 
     def _get_client(self) -> DatabaseClient:
+        connect_args = {}
+        if self.config_app.DB_STATEMENT_TIMEOUT_MS:
+            connect_args["options"] = (
+                f"-c statement_timeout={self.config_app.DB_STATEMENT_TIMEOUT_MS}"
+            )
         return create_engine(
-            self.config_app.DB_URI, echo=self.config_app.DEBUG, future=True
+            self.config_app.DB_URI,
+            echo=self.config_app.DEBUG,
+            future=True,
+            poolclass=InstrumentedQueuePool,
+            connect_args=connect_args,
+            **self._pool_options(),
+        )
+
+    def _get_async_client(self) -> AsyncDatabaseClient:
+        # same database as the sync client, unless configured otherwise,
+        # reached through asyncpg.
+        uri = self.config_app.ASYNC_DB_URI or make_url(self.config_app.DB_URI).set(
+            drivername="postgresql+asyncpg"
+        )
+        connect_args = {}
+        if self.config_app.DB_STATEMENT_TIMEOUT_MS:
+            connect_args["server_settings"] = {
+                "statement_timeout": str(self.config_app.DB_STATEMENT_TIMEOUT_MS)
+            }
+        return create_async_engine(
+            uri,
+            echo=self.config_app.DEBUG,
+            poolclass=InstrumentedAsyncAdaptedQueuePool,
+            connect_args=connect_args,
+            **self._pool_options(),
+        )
+
+    def _pool_options(self) -> dict:
+        """Pool settings shared by the sync and async engines. Each uvicorn
+        worker holds its own pools, so these are per worker."""
+        return dict(
+            pool_size=self.config_app.DB_POOL_SIZE,
+            max_overflow=self.config_app.DB_MAX_OVERFLOW,
+            pool_timeout=self.config_app.DB_POOL_TIMEOUT_SECONDS,
+            pool_recycle=self.config_app.DB_POOL_RECYCLE_SECONDS,
+            pool_pre_ping=self.config_app.DB_POOL_PRE_PING,
         )
 
     def client(self) -> DatabaseClient:
         if self._client is None:
             self._client = self._get_client()
         return self._client
+
+    def async_client(self) -> AsyncDatabaseClient:
+        if self._async_client is None:
+            self._async_client = self._get_async_client()
+        return self._async_client
+
+    def dispose_client(self) -> None:
+        """Close the connections held by the sync connection pool."""
+        if self._client is not None:
+            self._client.dispose()
+
+    async def dispose_async_client(self) -> None:
+        """Close the async connection pool. Must be awaited on the event loop
+        which used it."""
+        if self._async_client is not None:
+            await self._async_client.dispose()
+            self._async_client = None
@@ -0,0 +1,25 @@
+"""Prometheus metrics for the database connection pools.
+
+Metrics are registered on the default prometheus_client registry, which is
+exposed by the Instrumentator on the /metrics endpoint. Each is labelled by
+pool: 'sync' for the engine used by writes and scripts, 'async' for the
+asyncpg engine used by the read endpoints.
+"""
+
+from prometheus_client import Counter, Gauge, Histogram
+
+DB_POOL_CHECKOUT_SECONDS = Histogram(
+    "database_pool_checkout_seconds",
+    "Time spent acquiring a connection from the pool.",
+    ["pool"],
+)
+DB_POOL_CHECKED_OUT = Gauge(
+    "database_pool_checked_out_connections",
+    "Connections currently checked out of the pool.",
+    ["pool"],
+)
+DB_POOL_OVERFLOW = Counter(
+    "database_pool_overflow_connections",
+    "Connections opened beyond the configured pool size.",
+    ["pool"],
+)
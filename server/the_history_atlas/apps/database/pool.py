@@ -0,0 +1,44 @@
+import time
+
+from sqlalchemy.pool import AsyncAdaptedQueuePool, QueuePool
+
+from the_history_atlas.apps.database.metrics import (
+    DB_POOL_CHECKOUT_SECONDS,
+    DB_POOL_CHECKED_OUT,
+    DB_POOL_OVERFLOW,
+)
+
+
+class _InstrumentedPoolMixin:
+    """Records checkout latency, checked out connections, and overflow
+    connections for a QueuePool."""
+
+    metrics_label: str
+
+    def connect(self):
+        start = time.perf_counter()
+        connection = super().connect()
+        DB_POOL_CHECKOUT_SECONDS.labels(pool=self.metrics_label).observe(
+            time.perf_counter() - start
+        )
+        DB_POOL_CHECKED_OUT.labels(pool=self.metrics_label).inc()
+        return connection
+
+    def _do_return_conn(self, record) -> None:
+        DB_POOL_CHECKED_OUT.labels(pool=self.metrics_label).dec()
+        super()._do_return_conn(record)
+
+    def _create_connection(self):
+        connection = super()._create_connection()
+        # overflow() counts connections beyond pool_size
+        if self.overflow() > 0:
+            DB_POOL_OVERFLOW.labels(pool=self.metrics_label).inc()
+        return connection
+
+
+class InstrumentedQueuePool(_InstrumentedPoolMixin, QueuePool):
+    metrics_label = "sync"
+
+
+class InstrumentedAsyncAdaptedQueuePool(_InstrumentedPoolMixin, AsyncAdaptedQueuePool):
+    metrics_label = "async"
@@ -17,6 +17,11 @@ class TagPointer(BaseModel):
     id: UUID | None = None
 
 
+class CreatedTags(BaseModel):
+    created: list[TagPointer]
+    existing: list[TagPointer]
+
+
 class TagInstance(BaseModel):
     id: UUID
     name: str
@@ -31,6 +36,19 @@ class CitationInput(BaseModel):
     wikidata_item_url: str
 
 
+class EventInput(BaseModel):
+    text: str
+    tags: list[TagInstance]
+    citation: CitationInput
+    after: list[UUID]
+
+
+class EventResult(BaseModel):
+    # missing_tags: one of the event's tags doesn't exist
+    status: Literal["created", "duplicate", "missing_tags"]
+    id: UUID | None = None
+
+
 class WikiDataEntity(BaseModel):
     wikidata_id: str
     wikidata_url: str
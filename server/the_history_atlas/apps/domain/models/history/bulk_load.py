@@ -0,0 +1,56 @@
+from typing import Annotated, Literal, Union
+
+from pydantic import Field
+
+from the_history_atlas.apps.domain.core import CitationInput, Precision
+from the_history_atlas.apps.domain.models.base_model import ConfiguredBaseModel
+
+
+class BulkPersonTag(ConfiguredBaseModel):
+    type: Literal["PERSON"]
+    name: str
+    wikidata_id: str
+    wikidata_url: str
+    description: str | None = None
+    start_char: int
+    stop_char: int
+
+
+class BulkPlaceTag(ConfiguredBaseModel):
+    type: Literal["PLACE"]
+    name: str
+    wikidata_id: str
+    wikidata_url: str
+    description: str | None = None
+    latitude: float
+    longitude: float
+    start_char: int
+    stop_char: int
+
+
+class BulkTimeTag(ConfiguredBaseModel):
+    type: Literal["TIME"]
+    name: str
+    # times aren't guaranteed to have an ID in wikidata
+    wikidata_id: str | None = None
+    wikidata_url: str | None = None
+    description: str | None = None
+    date: str
+    calendar_model: str
+    precision: Precision
+    start_char: int
+    stop_char: int
+
+
+BulkTag = Annotated[
+    Union[BulkPersonTag, BulkPlaceTag, BulkTimeTag], Field(discriminator="type")
+]
+
+
+class BulkEvent(ConfiguredBaseModel):
+    """One line of a bulk load export: an event with its citation and the full
+    definition of each of its tags."""
+
+    summary: str
+    citation: CitationInput
+    tags: list[BulkTag]
@@ -15,3 +15,11 @@ class NearbyEventRow(ConfiguredBaseModel):
     datetime: str
     precision: int
     calendar_model: str
+
+
+class NearbyClusterRow(ConfiguredBaseModel):
+    cell: int
+    count: int
+    latitude: float
+    longitude: float
+    event: NearbyEventRow
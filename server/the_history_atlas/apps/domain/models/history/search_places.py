@@ -0,0 +1,7 @@
+from the_history_atlas.apps.domain.models.base_model import ConfiguredBaseModel
+
+
+class PlaceQuery(ConfiguredBaseModel):
+    name: str = ""
+    latitude: float | None = None
+    longitude: float | None = None
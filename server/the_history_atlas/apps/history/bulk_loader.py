@@ -0,0 +1,591 @@
+import io
+import json
+import logging
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Iterable, Iterator
+from uuid import UUID, uuid4
+
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+
+from the_history_atlas.apps.domain.core import PersonInput, PlaceInput, TimeInput
+from the_history_atlas.apps.domain.models.history.bulk_load import (
+    BulkEvent,
+    BulkPersonTag,
+    BulkPlaceTag,
+    BulkTag,
+    BulkTimeTag,
+)
+from the_history_atlas.apps.history.history_app import HistoryApp
+from the_history_atlas.apps.history.repository import Repository
+
+log = logging.getLogger(__name__)
+
+# the tables written by a load, whose secondary indexes are rebuilt once at
+# the end rather than maintained row by row
+LOADED_TABLES = (
+    "tags",
+    "people",
+    "places",
+    "times",
+    "names",
+    "tag_names",
+    "story_names",
+    "summaries",
+    "citations",
+    "tag_instances",
+)
+
+# as in Repository.rebalance_story_order
+BASE_ORDER = 100_000
+INTERVAL = 1_000
+
+STAGING_TABLES = {
+    "load_tags": {
+        "id": "UUID",
+        "key": "VARCHAR",
+        "type": "VARCHAR",
+        "wikidata_id": "VARCHAR",
+        "wikidata_url": "VARCHAR",
+        "name_id": "UUID",
+        "name": "VARCHAR",
+        "story_name_id": "UUID",
+        "story_name": "VARCHAR",
+        "description": "VARCHAR",
+        "latitude": "DOUBLE PRECISION",
+        "longitude": "DOUBLE PRECISION",
+        "datetime": "VARCHAR",
+        "calendar_model": "VARCHAR",
+        "precision": "INTEGER",
+    },
+    "load_events": {
+        "position": "BIGINT",
+        "id": "UUID",
+        "text": "VARCHAR",
+        "datetime": "VARCHAR",
+        "calendar_model": "VARCHAR",
+        "precision": "INTEGER",
+        "latitude": "DOUBLE PRECISION",
+        "longitude": "DOUBLE PRECISION",
+        "citation_id": "UUID",
+        "citation_text": "VARCHAR",
+        "access_date": "VARCHAR",
+    },
+    "load_tag_instances": {
+        "id": "UUID",
+        "summary_id": "UUID",
+        "tag_key": "VARCHAR",
+        "start_char": "INTEGER",
+        "stop_char": "INTEGER",
+    },
+}
+
+
+@dataclass
+class LoadStats:
+    events_read: int = 0
+    events_created: int = 0
+    tags_created: int = 0
+    tag_instances_created: int = 0
+    stories_ordered: int = 0
+    seconds: float = 0.0
+    # seconds taken by each step of the load
+    steps: dict[str, float] = field(default_factory=dict)
+
+    @property
+    def duplicates(self) -> int:
+        return self.events_read - self.events_created
+
+    @property
+    def rows_per_second(self) -> float:
+        rows = self.events_created + self.tags_created + self.tag_instances_created
+        return rows / self.seconds if self.seconds else 0.0
+
+
+def read_events(path: Path) -> Iterator[BulkEvent]:
+    """Stream the events of an NDJSON export, with one BulkEvent per line, or
+    of a Parquet file with the same fields as columns."""
+    if path.suffix == ".parquet":
+        try:
+            import pyarrow.parquet as pq
+        except ImportError:
+            raise RuntimeError("Loading Parquet exports requires pyarrow.")
+        for batch in pq.ParquetFile(path).iter_batches():
+            for row in batch.to_pylist():
+                yield BulkEvent.model_validate(row)
+        return
+    with path.open(encoding="utf-8") as file:
+        for line in file:
+            if line.strip():
+                yield BulkEvent.model_validate_json(line)
+
+
+def _copy_value(value) -> str:
+    """A value in the text format of COPY."""
+    if value is None:
+        return "\\N"
+    return (
+        str(value)
+        .replace("\\", "\\\\")
+        .replace("\t", "\\t")
+        .replace("\n", "\\n")
+        .replace("\r", "\\r")
+    )
+
+
+class _CopyBuffer:
+    """Rows waiting to be copied into one staging table."""
+
+    def __init__(self, table: str):
+        self.table = table
+        self.columns = list(STAGING_TABLES[table])
+        self._buffer = io.StringIO()
+        self.rows = 0
+
+    def add(self, row: dict) -> None:
+        self._buffer.write(
+            "\t".join(_copy_value(row.get(column)) for column in self.columns)
+        )
+        self._buffer.write("\n")
+        self.rows += 1
+
+    def flush(self, cursor) -> None:
+        if not self.rows:
+            return
+        self._buffer.seek(0)
+        cursor.copy_expert(
+            f"COPY {self.table} ({', '.join(self.columns)}) FROM STDIN",
+            self._buffer,
+        )
+        self._buffer = io.StringIO()
+        self.rows = 0
+
+
+class BulkLoader:
+    """
+    Load an export of events straight into the database, for rebuilding an
+    atlas without replaying every event through the API.
+
+    Events are streamed into temporary staging tables with COPY, and then
+    written to the atlas tables with a few set-based statements: tags which
+    already exist, by wikidata id or for times by their date, are reused, and
+    events whose text already exists are skipped. Story order is assigned at
+    the end with one window function pass over every story which gained an
+    event, ordering each by time and keeping the relative order of the events
+    it already had. The whole load is one transaction.
+
+    With `defer_indexes`, the secondary indexes of the loaded tables are
+    dropped for the load and rebuilt once before it commits. This takes
+    exclusive locks on those tables, so is meant for offline rebuilds.
+    Running servers build their search indexes at startup, and should be
+    restarted after a load.
+    """
+
+    def __init__(
+        self,
+        repository: Repository,
+        defer_indexes: bool = True,
+        chunk_size: int = 50_000,
+    ):
+        self._repository = repository
+        self._defer_indexes = defer_indexes
+        self._chunk_size = chunk_size
+
+    def load(self, events: Iterable[BulkEvent]) -> LoadStats:
+        stats = LoadStats()
+        start = time.perf_counter()
+        source_id = self._repository.get_wikidata_source_id()
+        with self._repository.Session() as session:
+            self._create_staging_tables(session)
+            indexes = self._drop_indexes(session) if self._defer_indexes else []
+
+            with self._step(stats, "copy"):
+                self._copy_events(events, session=session, stats=stats)
+            with self._step(stats, "tags"):
+                stats.tags_created = self._insert_tags(session)
+            with self._step(stats, "events"):
+                stats.events_created = self._insert_events(
+                    source_id=source_id, session=session
+                )
+                stats.tag_instances_created = self._insert_tag_instances(session)
+            with self._step(stats, "story order"):
+                stats.stories_ordered = self._order_stories(session)
+            if indexes:
+                with self._step(stats, "indexes"):
+                    for definition in indexes:
+                        session.execute(text(definition))
+                    session.execute(text(f"ANALYZE {', '.join(LOADED_TABLES)};"))
+            with self._step(stats, "commit"):
+                session.commit()
+        self._repository.bump_events_revision()
+        stats.seconds = time.perf_counter() - start
+        return stats
+
+    @staticmethod
+    @contextmanager
+    def _step(stats: LoadStats, name: str) -> Iterator[None]:
+        log.info(f"Bulk load: {name}")
+        start = time.perf_counter()
+        yield
+        stats.steps[name] = time.perf_counter() - start
+        log.info(f"Bulk load: {name} took {stats.steps[name]:.1f} s")
+
+    def _create_staging_tables(self, session: Session) -> None:
+        for table, columns in STAGING_TABLES.items():
+            session.execute(
+                text(
+                    f"""
+                    CREATE TEMPORARY TABLE {table} (
+                        {", ".join(f"{name} {type}" for name, type in columns.items())}
+                    ) ON COMMIT DROP;
+                    """
+                )
+            )
+
+    def _drop_indexes(self, session: Session) -> list[str]:
+        """Drop the secondary indexes of the loaded tables, returning their
+        definitions. Primary keys and the indexes of unique constraints are
+        kept, as the load relies on them to find existing rows."""
+        rows = session.execute(
+            text(
+                """
+                SELECT
+                    index.indexrelid::regclass::text AS name,
+                    pg_get_indexdef(index.indexrelid) AS definition
+                FROM pg_index index
+                WHERE index.indrelid = ANY(CAST(:tables AS regclass[]))
+                AND NOT index.indisunique
+                AND NOT index.indisprimary
+                AND NOT EXISTS (
+                    SELECT 1 FROM pg_constraint
+                    WHERE pg_constraint.conindid = index.indexrelid
+                );
+                """
+            ),
+            {"tables": list(LOADED_TABLES)},
+        ).all()
+        for row in rows:
+            session.execute(text(f"DROP INDEX {row.name};"))
+        log.info(f"Deferred {len(rows)} indexes")
+        return [row.definition for row in rows]
+
+    def _copy_events(
+        self, events: Iterable[BulkEvent], session: Session, stats: LoadStats
+    ) -> None:
+        cursor = session.connection().connection.cursor()
+        buffers = {table: _CopyBuffer(table) for table in STAGING_TABLES}
+        tag_keys: set[str] = set()
+        start = time.perf_counter()
+        for position, event in enumerate(events):
+            summary_id = uuid4()
+            summary = {
+                "position": position,
+                "id": summary_id,
+                "text": event.summary,
+                "citation_id": uuid4(),
+                "citation_text": HistoryApp.wikidata_citation_text(event.citation),
+                "access_date": str(event.citation.access_date),
+            }
+            for tag in event.tags:
+                key = self._tag_key(tag)
+                if key not in tag_keys:
+                    tag_keys.add(key)
+                    buffers["load_tags"].add(self._tag_row(tag, key=key))
+                buffers["load_tag_instances"].add(
+                    {
+                        "id": uuid4(),
+                        "summary_id": summary_id,
+                        "tag_key": key,
+                        "start_char": tag.start_char,
+                        "stop_char": tag.stop_char,
+                    }
+                )
+            # as in HistoryApp.create_wikidata_events
+            time_tag = next((tag for tag in event.tags if tag.type == "TIME"), None)
+            if time_tag:
+                summary["datetime"] = time_tag.date
+                summary["calendar_model"] = time_tag.calendar_model
+                summary["precision"] = time_tag.precision
+            place_tag = next((tag for tag in event.tags if tag.type == "PLACE"), None)
+            if place_tag:
+                summary["latitude"] = place_tag.latitude
+                summary["longitude"] = place_tag.longitude
+            buffers["load_events"].add(summary)
+            stats.events_read += 1
+
+            if buffers["load_events"].rows >= self._chunk_size:
+                for buffer in buffers.values():
+                    buffer.flush(cursor)
+                elapsed = time.perf_counter() - start
+                log.info(
+                    f"Copied {stats.events_read} events "
+                    f"({stats.events_read / elapsed:.0f} events/s)"
+                )
+        for buffer in buffers.values():
+            buffer.flush(cursor)
+        session.execute(text("ANALYZE load_tags, load_events, load_tag_instances;"))
+
+    @staticmethod
+    def _tag_key(tag: BulkTag) -> str:
+        if tag.wikidata_id is not None:
+            return tag.wikidata_id
+        # a time without a wikidata id is the same tag as any other time
+        # with its date, as in Repository.time_exists
+        return f"time:{tag.date}|{tag.calendar_model}|{tag.precision}"
+
+    @staticmethod
+    def _tag_row(tag: BulkTag, key: str) -> dict:
+        row = {
+            "id": uuid4(),
+            "key": key,
+            "type": tag.type,
+            "wikidata_id": tag.wikidata_id,
+            "wikidata_url": tag.wikidata_url,
+            "name_id": uuid4(),
+            "name": tag.name,
+            "story_name_id": uuid4(),
+            "description": tag.description,
+        }
+        if isinstance(tag, BulkPersonTag):
+            story_names = HistoryApp.get_available_person_story_names(
+                PersonInput.model_validate(tag, from_attributes=True)
+            )
+        elif isinstance(tag, BulkPlaceTag):
+            row["latitude"] = tag.latitude
+            row["longitude"] = tag.longitude
+            story_names = HistoryApp.get_available_place_story_names(
+                PlaceInput.model_validate(tag, from_attributes=True)
+            )
+        else:
+            row["datetime"] = tag.date
+            row["calendar_model"] = tag.calendar_model
+            row["precision"] = tag.precision
+            story_names = HistoryApp.get_available_time_story_names(
+                TimeInput.model_validate(tag, from_attributes=True)
+            )
+        # each tag type has a single english story name
+        (story_name,) = story_names
+        row["story_name"] = story_name.name
+        return row
+
+    def _insert_tags(self, session: Session) -> int:
+        """Point the staged tags which already exist at the existing rows, and
+        insert the rest, with their names and story names. Returns the number
+        of tags inserted."""
+        session.execute(
+            text(
+                """
+                ALTER TABLE load_tags ADD COLUMN existing BOOLEAN NOT NULL DEFAULT false;
+                UPDATE load_tags
+                SET id = tags.id, existing = true
+                FROM tags
+                WHERE tags.wikidata_id = load_tags.wikidata_id;
+                UPDATE load_tags
+                SET id = times.id, existing = true
+                FROM times
+                WHERE load_tags.wikidata_id IS NULL
+                AND times.datetime = load_tags.datetime
+                AND times.calendar_model = load_tags.calendar_model
+                AND times.precision = load_tags.precision;
+                """
+            )
+        )
+        created = session.execute(
+            text(
+                """
+                INSERT INTO tags (id, type, wikidata_id, wikidata_url)
+                SELECT id, type, wikidata_id, wikidata_url
+                FROM load_tags WHERE NOT existing;
+                """
+            )
+        ).rowcount
+        session.execute(
+            text(
+                """
+                INSERT INTO people (id)
+                SELECT id FROM load_tags WHERE NOT existing AND type = 'PERSON';
+                INSERT INTO places (id, latitude, longitude)
+                SELECT id, latitude, longitude
+                FROM load_tags WHERE NOT existing AND type = 'PLACE';
+                INSERT INTO times (id, datetime, calendar_model, precision)
+                SELECT id, datetime, calendar_model, precision
+                FROM load_tags WHERE NOT existing AND type = 'TIME';
+                INSERT INTO names (id, name)
+                SELECT DISTINCT ON (name) name_id, name
+                FROM load_tags WHERE NOT existing
+                ORDER BY name
+                ON CONFLICT (name) DO NOTHING;
+                INSERT INTO tag_names (tag_id, name_id)
+                SELECT load_tags.id, names.id
+                FROM load_tags
+                JOIN names ON names.name = load_tags.name
+                WHERE NOT load_tags.existing;
+                INSERT INTO story_names (id, tag_id, name, lang, description)
+                SELECT story_name_id, id, story_name, 'en', description
+                FROM load_tags WHERE NOT existing;
+                """
+            )
+        )
+        return created
+
+    def _insert_events(self, source_id: UUID, session: Session) -> int:
+        """Insert the summaries and citations of the staged events, skipping
+        any whose text already exists. Returns the number of events
+        inserted."""
+        created = session.execute(
+            text(
+                """
+                ALTER TABLE load_events ADD COLUMN created BOOLEAN NOT NULL DEFAULT false;
+                WITH inserted AS (
+                    INSERT INTO summaries (
+                        id, text, datetime, calendar_model, precision,
+                        latitude, longitude
+                    )
+                    SELECT DISTINCT ON (text)
+                        id, text, datetime, calendar_model, precision,
+                        latitude, longitude
+                    FROM load_events
+                    ORDER BY text, position
+                    ON CONFLICT (text) DO NOTHING
+                    RETURNING id
+                )
+                UPDATE load_events SET created = true
+                FROM inserted WHERE inserted.id = load_events.id;
+                """
+            )
+        ).rowcount
+        session.execute(
+            text(
+                """
+                INSERT INTO citations (id, text, source_id, summary_id, access_date)
+                SELECT citation_id, citation_text, :source_id, id, access_date
+                FROM load_events WHERE created;
+                """
+            ),
+            {"source_id": source_id},
+        )
+        return created
+
+    def _insert_tag_instances(self, session: Session) -> int:
+        """Insert the tag instances of the created events. The statement's
+        stats trigger adds them to the stats of their stories, once per
+        story. Returns the number of tag instances inserted."""
+        return session.execute(
+            text(
+                """
+                INSERT INTO tag_instances (
+                    id, start_char, stop_char, summary_id, tag_id, after
+                )
+                SELECT
+                    load_tag_instances.id,
+                    load_tag_instances.start_char,
+                    load_tag_instances.stop_char,
+                    load_tag_instances.summary_id,
+                    load_tags.id,
+                    '[]'::jsonb
+                FROM load_tag_instances
+                JOIN load_events ON load_events.id = load_tag_instances.summary_id
+                JOIN load_tags ON load_tags.key = load_tag_instances.tag_key
+                WHERE load_events.created;
+                """
+            )
+        ).rowcount
+
+    def _order_stories(self, session: Session) -> int:
+        """Renumber every story which gained an event in one pass: by time,
+        then by the order the story's existing events already had, then by
+        the order of the export. Returns the number of stories ordered."""
+        stories = session.execute(
+            text(
+                """
+                CREATE TEMPORARY TABLE load_stories ON COMMIT DROP AS
+                SELECT DISTINCT tag_instances.tag_id AS id
+                FROM tag_instances
+                JOIN load_events ON load_events.id = tag_instances.summary_id
+                WHERE load_events.created;
+                """
+            )
+        ).rowcount
+        session.execute(
+            text(
+                """
+                CREATE TEMPORARY TABLE load_story_orders ON COMMIT DROP AS
+                SELECT
+                    tag_instances.id,
+                    :base_order + :interval * (
+                        row_number() OVER (
+                            PARTITION BY tag_instances.tag_id
+                            ORDER BY
+                                summaries.sort_key,
+                                tag_instances.story_order,
+                                load_events.position,
+                                summaries.id
+                        ) - 1
+                    ) AS story_order
+                FROM tag_instances
+                JOIN load_stories ON load_stories.id = tag_instances.tag_id
+                JOIN summaries ON summaries.id = tag_instances.summary_id
+                LEFT JOIN load_events ON load_events.id = tag_instances.summary_id;
+                -- cleared first, as story_order is unique within a story
+                UPDATE tag_instances SET story_order = NULL
+                FROM load_stories
+                WHERE load_stories.id = tag_instances.tag_id
+                AND tag_instances.story_order IS NOT NULL;
+                UPDATE tag_instances
+                SET story_order = load_story_orders.story_order
+                FROM load_story_orders
+                WHERE load_story_orders.id = tag_instances.id;
+                """
+            ),
+            {"base_order": BASE_ORDER, "interval": INTERVAL},
+        )
+        self._drop_story_links(session)
+        return stories
+
+    def _drop_story_links(self, session: Session) -> None:
+        """Delete the story_links rows which depend on the loaded stories, as
+        Repository.refresh_story_links would recompute them: the stories' own
+        links, links which resolve into them, and the links of the time
+        stories adjacent to a loaded time story. Those links are resolved at
+        read time until story order is next calculated."""
+        session.execute(
+            text(
+                """
+                -- times are ranked in one pass, as the sort_key index may
+                -- have been dropped for the load; every time tied with a
+                -- neighbour is included
+                CREATE TEMPORARY TABLE load_time_ranks ON COMMIT DROP AS
+                SELECT id, dense_rank() OVER (ORDER BY sort_key) AS rank
+                FROM times;
+                CREATE TEMPORARY TABLE load_linked_stories ON COMMIT DROP AS
+                SELECT id FROM load_stories
+                UNION
+                SELECT story_links.tag_id
+                FROM story_links
+                JOIN load_stories ON load_stories.id = story_links.related_story_id
+                UNION
+                SELECT adjacent.id
+                FROM load_time_ranks AS loaded
+                JOIN load_stories ON load_stories.id = loaded.id
+                JOIN load_time_ranks AS adjacent
+                    ON adjacent.rank = loaded.rank - 1
+                UNION
+                SELECT adjacent.id
+                FROM load_time_ranks AS loaded
+                JOIN load_stories ON load_stories.id = loaded.id
+                JOIN load_time_ranks AS adjacent
+                    ON adjacent.rank = loaded.rank + 1;
+                DELETE FROM story_links
+                USING load_linked_stories
+                WHERE story_links.tag_id = load_linked_stories.id;
+                """
+            )
+        )
+        # each of these stories' windows may now continue differently
+        story_ids = session.execute(
+            text("SELECT id FROM load_linked_stories;")
+        ).scalars()
+        self._repository.bump_revisions(story_ids, session=session)
@@ -0,0 +1,56 @@
+"""Precomputed map grid cells for summaries.
+
+The world is divided into 2**GRID_ZOOM columns of longitude and as many rows
+of latitude. A location's cell packs its column into the high bits and its
+row into the low GRID_ZOOM bits, so the cell at any coarser zoom is found by
+shifting both halves. summaries.grid_cell is generated by the database with
+the same formula.
+"""
+
+import math
+
+GRID_ZOOM = 20
+_SIZE = 1 << GRID_ZOOM
+_ROW_MASK = _SIZE - 1
+
+
+def grid_cell(latitude: float, longitude: float) -> int:
+    """The cell at GRID_ZOOM of a location."""
+    column = min(math.floor((longitude + 180) / 360 * _SIZE), _ROW_MASK)
+    row = min(math.floor((latitude + 90) / 180 * _SIZE), _ROW_MASK)
+    return (column << GRID_ZOOM) | row
+
+
+def cell_at_zoom(cell: int, zoom: int) -> int:
+    """The cell at a coarser zoom which contains a GRID_ZOOM cell. At zoom z
+    there are 2**z columns and 2**z rows."""
+    shift = GRID_ZOOM - zoom
+    return ((cell >> (GRID_ZOOM + shift)) << zoom) | ((cell & _ROW_MASK) >> shift)
+
+
+def cell_bounds(cell: int, zoom: int) -> tuple[float, float, float, float]:
+    """The (min_lat, max_lat, min_lng, max_lng) of a cell at the given zoom."""
+    column, row = cell >> zoom, cell & ((1 << zoom) - 1)
+    lng_size, lat_size = 360 / (1 << zoom), 180 / (1 << zoom)
+    return (
+        -90 + row * lat_size,
+        -90 + (row + 1) * lat_size,
+        -180 + column * lng_size,
+        -180 + (column + 1) * lng_size,
+    )
+
+
+def viewport_boxes(
+    min_lat: float, max_lat: float, min_lng: float, max_lng: float
+) -> list[tuple[float, float, float, float]]:
+    """The (min_lat, max_lat, min_lng, max_lng) boxes covering a map viewport.
+
+    A viewport which crosses the antimeridian, with min_lng east of max_lng,
+    is split there into two boxes. One with min_lat north of max_lat covers
+    nothing.
+    """
+    if min_lat > max_lat:
+        return []
+    if min_lng > max_lng:
+        return [(min_lat, max_lat, min_lng, 180.0), (min_lat, max_lat, -180.0, max_lng)]
+    return [(min_lat, max_lat, min_lng, max_lng)]
@@ -1,5 +1,5 @@
 import logging
-from typing import Literal
+from typing import Literal, Callable
 from uuid import UUID, uuid4
 from concurrent.futures import ThreadPoolExecutor
 from math import ceil
@@ -8,7 +8,7 @@ import threading
 from sqlalchemy.exc import IntegrityError
 from sqlalchemy.orm import Session
 
-from the_history_atlas.apps.database import DatabaseClient
+from the_history_atlas.apps.database import DatabaseClient, AsyncDatabaseClient
 from the_history_atlas.apps.domain.core import (
     PersonInput,
     Person,
@@ -17,8 +17,11 @@ from the_history_atlas.apps.domain.core import (
     TimeInput,
     Time,
     TagPointer,
+    CreatedTags,
     CitationInput,
     TagInstance,
+    EventInput,
+    EventResult,
     Story,
     StoryPointer,
     StoryName,
@@ -31,6 +34,7 @@ from the_history_atlas.apps.domain.core import (
 )
 
 from the_history_atlas.apps.config import Config
+from the_history_atlas.apps.domain.models.history.search_places import PlaceQuery
 from the_history_atlas.apps.domain.models.history.tables import TagInstanceModel
 from the_history_atlas.apps.domain.models.history.tables.tag_instance import (
     TagInstanceInput,
@@ -41,6 +45,21 @@ from the_history_atlas.apps.history.errors import (
     MissingResourceError,
     DuplicateEventError,
 )
+from the_history_atlas.apps.history.metrics import NEARBY_QUERIES
+from the_history_atlas.apps.history.name_index import NameIndex, StoryEntry
+from the_history_atlas.apps.history.nearby_index import NearbyIndex, NearbyIndexLevel
+from the_history_atlas.apps.history.search_cache import SearchCache, normalize_query
+from the_history_atlas.apps.history.single_flight import SingleFlight
+from the_history_atlas.apps.history.story_cache import (
+    StoryCache,
+    StoryCacheKey,
+    VersionedStory,
+)
+from the_history_atlas.apps.history.story_order_jobs import (
+    LEASE_SECONDS,
+    StoryOrderWorker,
+)
+from the_history_atlas.apps.history.time_key import time_key_range
 from the_history_atlas.apps.history.trie import Trie
 
 logging.basicConfig(level="DEBUG")
@@ -48,18 +67,97 @@ log = logging.getLogger(__name__)
 
 
 class HistoryApp:
-    def __init__(self, config_app: Config, database_client: DatabaseClient):
+    def __init__(
+        self,
+        config_app: Config,
+        database_client: DatabaseClient,
+        async_database_client: AsyncDatabaseClient | None = None,
+    ):
         self.config = config_app
         source_trie = Trie()
+        name_index = NameIndex() if config_app.NAME_INDEX_ENABLED else None
 
         repository = Repository(
             database_client=database_client,
             source_trie=source_trie,
+            async_database_client=async_database_client,
+            name_index=name_index,
         )
         self._repository = repository
         self._source_trie = source_trie.build(
             entity_tuples=repository.get_all_source_titles_and_authors()
         )
+        self._name_index = name_index
+        repository.refresh_name_index()
+        self._story_cache = StoryCache(
+            max_size=config_app.STORY_CACHE_SIZE,
+            ttl_seconds=config_app.STORY_CACHE_TTL_SECONDS,
+        )
+        self._search_cache = SearchCache(
+            max_size=config_app.SEARCH_CACHE_SIZE,
+            ttl_seconds=config_app.SEARCH_CACHE_TTL_SECONDS,
+        )
+        self._nearby_index = (
+            NearbyIndex(max_bytes=config_app.NEARBY_INDEX_MAX_BYTES)
+            if config_app.NEARBY_INDEX_ENABLED
+            else None
+        )
+        # the events created while the nearby index is being rebuilt
+        self._nearby_rebuild_ids: list[UUID] | None = None
+        self._nearby_rebuild_lock = threading.Lock()
+        # identical concurrent reads share one computation
+        self._story_flight = SingleFlight("get_story_list")
+        self._nearby_flight = SingleFlight("get_nearby_events")
+        self._search_flight = SingleFlight("fuzzy_search_stories")
+        self._story_order_worker: StoryOrderWorker | None = None
+
+    def build_nearby_index(self):
+        """Load every event into a new in-memory nearby index, if it's
+        enabled, and swap it in, so that queries are served by the old index
+        while the new one is built. Called again by the cache refresh thread,
+        as each process's index only receives the events it creates itself."""
+        if self._nearby_index is None:
+            return
+        index = NearbyIndex(max_bytes=self.config.NEARBY_INDEX_MAX_BYTES)
+        with self._nearby_rebuild_lock:
+            self._nearby_rebuild_ids = []
+        built = index.add(self._repository.get_nearby_index_rows())
+        with self._nearby_rebuild_lock:
+            # events created during the build may be missing from its rows
+            pending_ids, self._nearby_rebuild_ids = self._nearby_rebuild_ids, None
+            self._nearby_index = index
+        if pending_ids:
+            index.add(self._repository.get_nearby_index_rows(summary_ids=pending_ids))
+        if built:
+            log.info(f"Built nearby index of {len(index)} rows ({index.nbytes} bytes)")
+
+    def _index_story_years(self, story_ids: list[UUID]) -> None:
+        """Update the year ranges of stories in the name index, if it's
+        enabled, or otherwise drop the cached searches which returned them."""
+        if self._name_index is None:
+            self._search_cache.invalidate_stories(story_ids)
+            return
+        with self._repository.Session() as session:
+            story_names = self._repository.get_story_names(tuple(story_ids), session)
+        for story_id, story_info in story_names.items():
+            self._name_index.set_story(
+                story_id,
+                earliest_year=story_info["earliest_year"],
+                latest_year=story_info["latest_year"],
+            )
+
+    def _index_nearby_events(self, summary_ids: list[UUID]) -> None:
+        """Add newly created events to the nearby index, if it's enabled."""
+        if self._nearby_index is None:
+            return
+        with self._nearby_rebuild_lock:
+            if self._nearby_rebuild_ids is not None:
+                self._nearby_rebuild_ids.extend(summary_ids)
+        if not self._nearby_index.available:
+            return
+        self._nearby_index.add(
+            self._repository.get_nearby_index_rows(summary_ids=summary_ids)
+        )
 
     def prime_cache(self, cache_size=100):
         """Prime the default story and event cache"""
@@ -68,13 +166,30 @@ class HistoryApp:
     def start_cache_refresh(self, refresh_interval_seconds=3600):
         """Start the background cache refresh thread"""
         self._repository.start_cache_refresh_thread(
-            refresh_interval_seconds=refresh_interval_seconds
+            refresh_interval_seconds=refresh_interval_seconds,
+            refresh_hooks=[self.build_nearby_index],
         )
 
     def stop_cache_refresh(self):
         """Stop the background cache refresh thread"""
         self._repository.stop_cache_refresh_thread()
 
+    def start_story_order_worker(self) -> None:
+        """Start a thread processing the story order queue"""
+        if self._story_order_worker is None:
+            self._story_order_worker = StoryOrderWorker(
+                history_app=self,
+                batch_size=self.config.STORY_ORDER_JOB_BATCH_SIZE,
+                poll_interval_seconds=self.config.STORY_ORDER_JOB_POLL_SECONDS,
+            )
+        self._story_order_worker.start()
+
+    def stop_story_order_worker(self) -> None:
+        """Stop the story order queue thread, if running"""
+        if self._story_order_worker is not None:
+            self._story_order_worker.stop()
+            self._story_order_worker = None
+
     def create_person(self, person: PersonInput) -> Person:
         if self._repository.get_tag_id_by_wikidata_id(wikidata_id=person.wikidata_id):
             raise TagExistsError(
@@ -100,6 +215,7 @@ class HistoryApp:
                 story_names=self.get_available_person_story_names(person=person),
             )
             session.commit()
+        self._search_cache.invalidate()
         return Person(id=id, **person.model_dump())
 
     def create_place(self, place: PlaceInput) -> Place:
@@ -129,6 +245,7 @@ class HistoryApp:
                 story_names=self.get_available_place_story_names(place=place),
             )
             session.commit()
+        self._search_cache.invalidate()
         return Place(id=id, **place.model_dump())
 
     def create_time(self, time: TimeInput) -> Time:
@@ -157,8 +274,100 @@ class HistoryApp:
                 story_names=self.get_available_time_story_names(time=time),
             )
             session.commit()
+        self._search_cache.invalidate()
         return Time(id=id, **time.model_dump())
 
+    def create_people(self, people: list[PersonInput]) -> CreatedTags:
+        return self._create_tags(
+            type="PERSON",
+            entities=people,
+            columns=lambda person: {},
+            story_names=self.get_available_person_story_names,
+        )
+
+    def create_places(self, places: list[PlaceInput]) -> CreatedTags:
+        return self._create_tags(
+            type="PLACE",
+            entities=places,
+            columns=lambda place: {
+                "latitude": place.latitude,
+                "longitude": place.longitude,
+            },
+            story_names=self.get_available_place_story_names,
+        )
+
+    def create_times(self, times: list[TimeInput]) -> CreatedTags:
+        """Times must all have a wikidata id, as that is what is used to
+        recognize times which already exist."""
+        return self._create_tags(
+            type="TIME",
+            entities=times,
+            columns=lambda time: {
+                "datetime": time.date,
+                "calendar_model": time.calendar_model,
+                "precision": time.precision,
+            },
+            story_names=self.get_available_time_story_names,
+        )
+
+    def _create_tags(
+        self,
+        type: Literal["PERSON", "PLACE", "TIME"],
+        entities: list[PersonInput] | list[PlaceInput] | list[TimeInput],
+        columns: Callable,
+        story_names: Callable,
+    ) -> CreatedTags:
+        """Create many tags of one type in a single transaction. Tags whose
+        wikidata id already exists are left as they are, and returned as
+        existing rather than raising TagExistsError."""
+        by_wikidata_id = {}
+        for entity in entities:
+            by_wikidata_id.setdefault(entity.wikidata_id, entity)
+        tags = [
+            {
+                "id": uuid4(),
+                "wikidata_id": entity.wikidata_id,
+                "wikidata_url": entity.wikidata_url,
+                **columns(entity),
+            }
+            for entity in by_wikidata_id.values()
+        ]
+        with self._repository.Session() as session:
+            created = self._repository.bulk_create_tags(
+                type=type, tags=tags, session=session
+            )
+            self._repository.bulk_add_names_to_new_tags(
+                {
+                    id: by_wikidata_id[wikidata_id].name
+                    for wikidata_id, id in created.items()
+                },
+                session=session,
+            )
+            self._repository.bulk_add_story_names(
+                {
+                    id: story_names(by_wikidata_id[wikidata_id])
+                    for wikidata_id, id in created.items()
+                },
+                session=session,
+            )
+            session.commit()
+        if created:
+            self._search_cache.invalidate()
+        existing = self._repository.get_tags_by_wikidata_ids(
+            [
+                wikidata_id
+                for wikidata_id in by_wikidata_id
+                if wikidata_id not in created
+            ]
+        )
+        return CreatedTags(
+            created=[
+                TagPointer(id=id, wikidata_id=wikidata_id)
+                for wikidata_id, id in created.items()
+            ],
+            existing=existing,
+        )
+
     def get_tags_by_wikidata_ids(self, ids: list[str]) -> list[TagPointer]:
         return self._repository.get_tags_by_wikidata_ids(wikidata_ids=ids)
 
@@ -169,18 +378,74 @@ class HistoryApp:
         Text-reader stories are returned first and preferred over wikidata stories
         when both match equivalently.
         """
+
+        query = normalize_query(search_string)
+        if self._name_index is not None:
+            # the index answers faster than the cache would, so caching its
+            # results would only make them stale
+            results = self._search_name_index(query)
+            if results:
+                return results
+            return self._search_database(query)
+        results = self._search_cache.get(query)
+        if results is not None:
+            return results
+        generation = self._search_cache.generation
+        results = self._search_database(query)
+        self._search_cache.put(query, results, generation=generation)
+        return results
+
+    def _search_database(self, query: str) -> list[dict[str, str]]:
+        def search() -> list[dict[str, str]]:
+            with self._repository.Session() as session:
+                return self._fuzzy_search_stories(query, session)
+
+        return self._search_flight.do(query, search)
+
+    async def fuzzy_search_stories_async(
+        self, search_string: str
+    ) -> list[dict[str, str]]:
+        """fuzzy_search_stories, reading through the async engine."""
+        query = normalize_query(search_string)
+        if self._name_index is not None:
+            results = self._search_name_index(query)
+            if results:
+                return results
+            return await self._search_database_async(query)
+        results = self._search_cache.get(query)
+        if results is not None:
+            return results
+        generation = self._search_cache.generation
+        results = await self._search_database_async(query)
+        self._search_cache.put(query, results, generation=generation)
+        return results
+
+    async def _search_database_async(self, query: str) -> list[dict[str, str]]:
+        return await self._search_flight.do_async(
+            query,
+            lambda: self._repository.run_read(
+                lambda session: self._fuzzy_search_stories(query, session)
+            ),
+        )
+
+    def _fuzzy_search_stories(
+        self, search_string: str, session: Session
+    ) -> list[dict[str, str]]:
         # Text-reader stories (stories table) — preferred
-        text_reader_results = self._repository.search_stories_by_name(search_string)
+        text_reader_results = self._repository.search_stories_by_name(
+            search_string, session=session
+        )
 
         # Wikidata stories (names/tags tables)
-        matches = self._repository.get_name_by_fuzzy_search(search_string)
+        matches = self._repository.get_name_by_fuzzy_search(
+            search_string, session=session
+        )
         wikidata_results: list[dict] = []
         if matches:
             all_ids: set = set()
             for match in matches:
                 all_ids.update(match.ids)
-            with self._repository.Session() as session:
-                story_names = self._repository.get_story_names(tuple(all_ids), session)
+            story_names = self._repository.get_story_names(tuple(all_ids), session)
             wikidata_results = [
                 {
                     "id": str(story_id),
@@ -192,6 +457,37 @@ class HistoryApp:
                 for story_id, story_info in story_names.items()
             ]
 
+        return self._merge_story_search_results(text_reader_results, wikidata_results)
+
+    def _search_name_index(self, search_string: str) -> list[dict[str, str]]:
+        """Search the name index. It only learns of names created by other
+        processes when it is rebuilt, so a query it finds nothing for falls
+        back to the database."""
+        entries = self._name_index.search(search_string, limit=20)
+        text_reader_results = [
+            self._story_entry_to_result(entry) for entry in entries if entry.text_reader
+        ]
+        wikidata_results = [
+            self._story_entry_to_result(entry)
+            for entry in entries
+            if not entry.text_reader
+        ]
+        return self._merge_story_search_results(text_reader_results, wikidata_results)
+
+    @staticmethod
+    def _story_entry_to_result(entry: StoryEntry) -> dict:
+        return {
+            "id": str(entry.id),
+            "name": entry.name,
+            "description": entry.description,
+            "earliestYear": entry.earliest_year,
+            "latestYear": entry.latest_year,
+        }
+
+    @staticmethod
+    def _merge_story_search_results(
+        text_reader_results: list[dict], wikidata_results: list[dict]
+    ) -> list[dict]:
         # Merge: text-reader first, then wikidata — deduplicate by normalised name
         seen_names: set[str] = set()
         merged: list[dict] = []
@@ -206,6 +502,10 @@ class HistoryApp:
                 merged.append(result)
         return merged
 
+    @staticmethod
+    def wikidata_citation_text(citation: CitationInput) -> str:
+        return f"Wikidata. ({citation.access_date}). {citation.wikidata_item_title} ({citation.wikidata_item_id}). Wikimedia Foundation. {citation.wikidata_item_url}"
+
     def create_wikidata_event(
         self,
         text: str,
@@ -213,18 +513,7 @@ class HistoryApp:
         citation: CitationInput,
         after: list[UUID],
     ):
-        source = self._repository.get_source_by_title(title="Wikidata")
-        if source:
-            source_id = UUID(source.id)
-        else:
-            source_id = uuid4()
-            self._repository.create_source(
-                id=source_id,
-                title="Wikidata",
-                author="Wikidata Contributors",
-                publisher="Wikimedia Foundation",
-                pub_date=None,
-            )
+        source_id = self._repository.get_wikidata_source_id()
         summary_id = uuid4()
 
         with self._repository.Session() as session:
@@ -247,7 +536,7 @@ class HistoryApp:
             except IntegrityError:
                 raise DuplicateEventError
 
-            citation_text = f"Wikidata. ({citation.access_date}). {citation.wikidata_item_title} ({citation.wikidata_item_id}). Wikimedia Foundation. {citation.wikidata_item_url}"
+            citation_text = self.wikidata_citation_text(citation)
             citation_id = uuid4()
             # Use the optimized citation creation method that handles all relationships
             self._repository.create_citation_complete(
@@ -276,11 +565,109 @@ class HistoryApp:
                 after=after,
                 session=session,
             )
+            self._repository.bump_revisions(tag_ids, session=session)
+            self._enqueue_story_order(tag_ids, session=session)
 
             session.commit()
 
+        self._repository.bump_events_revision()
+        self._story_cache.invalidate_tags(tag_ids)
+        self._index_nearby_events([summary_id])
+        self._index_story_years(tag_ids)
         return summary_id
 
+    def create_wikidata_events(self, events: list[EventInput]) -> list[EventResult]:
+        """Create many events in a single transaction.
+
+        The time and place data of every event is looked up in one query,
+        and the summaries, citations and tag instances are each written with
+        a single statement. An event whose text already exists is reported
+        as a duplicate, and one which references an unknown tag is skipped,
+        rather than failing the batch. Returns a result for each event, in
+        order.
+        """
+        source_id = self._repository.get_wikidata_source_id()
+        results: list[EventResult] = []
+        summaries: list[dict] = []
+        with self._repository.Session() as session:
+            tag_data = self._repository.get_event_tag_data(
+                [tag.id for event in events for tag in event.tags], session=session
+            )
+            for event in events:
+                if any(tag.id not in tag_data for tag in event.tags):
+                    results.append(EventResult(status="missing_tags"))
+                    continue
+                summary = {"id": uuid4(), "text": event.text}
+                event_tags = [tag_data[tag.id] for tag in event.tags]
+                time = next((tag for tag in event_tags if tag["type"] == "TIME"), None)
+                if time:
+                    summary["datetime"] = time["datetime"]
+                    summary["calendar_model"] = time["calendar_model"]
+                    summary["precision"] = time["precision"]
+                place = next(
+                    (tag for tag in event_tags if tag["type"] == "PLACE"), None
+                )
+                if place:
+                    summary["latitude"] = place["latitude"]
+                    summary["longitude"] = place["longitude"]
+                summaries.append(summary)
+                results.append(EventResult(status="created", id=summary["id"]))
+
+            created_ids = self._repository.bulk_create_summaries(
+                summaries, session=session
+            )
+            created_events = []
+            for event, result in zip(events, results):
+                if result.status != "created":
+                    continue
+                if result.id not in created_ids:
+                    result.status = "duplicate"
+                    result.id = None
+                    continue
+                created_events.append((result.id, event))
+
+            self._repository.bulk_create_citations(
+                [
+                    {
+                        "id": uuid4(),
+                        "text": self.wikidata_citation_text(event.citation),
+                        "source_id": source_id,
+                        "summary_id": summary_id,
+                        "access_date": str(event.citation.access_date),
+                    }
+                    for summary_id, event in created_events
+                ],
+                session=session,
+            )
+            self._repository.bulk_create_event_tag_instances(
+                tag_instances=[
+                    TagInstanceInput(
+                        start_char=tag.start_char,
+                        stop_char=tag.stop_char,
+                        summary_id=summary_id,
+                        tag_id=tag.id,
+                    )
+                    for summary_id, event in created_events
+                    for tag in event.tags
+                ],
+                after={summary_id: event.after for summary_id, event in created_events},
+                session=session,
+            )
+            tag_ids = list(
+                {tag.id for _, event in created_events for tag in event.tags}
+            )
+            if created_events:
+                self._repository.bump_revisions(tag_ids, session=session)
+                self._enqueue_story_order(tag_ids, session=session)
+            session.commit()
+
+        if created_events:
+            self._repository.bump_events_revision()
+            self._story_cache.invalidate_tags(tag_ids)
+            self._index_nearby_events([summary_id for summary_id, _ in created_events])
+            self._index_story_years(tag_ids)
+        return results
+
     def _resolve_tag_types(self, tag_ids: list[UUID], session: Session) -> set[str]:
         """Look up the set of tag types present among the given tag IDs."""
         from sqlalchemy import text
@@ -364,10 +751,53 @@ class HistoryApp:
                     self._repository.rebalance_story_order(
                         tag_id=tag_id, session=session
                     )
+                self._repository.refresh_story_links(tag_id=tag_id, session=session)
+                session.commit()
+                self._story_cache.invalidate_tags([tag_id])
         finally:
             if session_created:
                 session.close()
 
+    def _enqueue_story_order(self, tag_ids: list[UUID], session: Session) -> None:
+        """Queue the stories of new events to be ordered by a StoryOrderWorker,
+        in the transaction which creates the events."""
+        if not self.config.COMPUTE_STORY_ORDER:
+            return
+        self._repository.enqueue_story_order_jobs(
+            tag_ids,
+            delay_seconds=self.config.STORY_ORDER_JOB_DELAY_SECONDS,
+            session=session,
+        )
+
+    def process_story_order_jobs(self, limit: int) -> int:
+        """Claim up to `limit` due story order jobs and calculate their story
+        order. Jobs which fail are retried once their lease expires. Returns
+        the number of jobs claimed."""
+        with self._repository.Session() as session:
+            jobs = self._repository.claim_story_order_jobs(
+                limit=limit, lease_seconds=LEASE_SECONDS, session=session
+            )
+            session.commit()
+        if not jobs:
+            return 0
+        finished = []
+        for job in jobs:
+            try:
+                self.calculate_story_order([job.tag_id])
+            except Exception as e:
+                log.error(f"Failed to calculate story order for {job.tag_id}: {e}")
+                continue
+            finished.append(job)
+        with self._repository.Session() as session:
+            self._repository.finish_story_order_jobs(
+                finished,
+                delay_seconds=self.config.STORY_ORDER_JOB_DELAY_SECONDS,
+                session=session,
+            )
+            session.commit()
+        log.info(f"Ordered {len(finished)} of {len(jobs)} queued stories")
+        return len(jobs)
+
     def calculate_story_order_range(
         self,
         start_tag_id: UUID | None = None,
@@ -441,23 +871,12 @@ class HistoryApp:
                     session=session,
                 )
             case _:
-                prev_pointers = self.get_prev_story_pointers(
-                    event_id=event_id,
-                    story_id=story_id,
-                    session=session,
-                )
-                queried_event = [
-                    StoryPointer(
-                        story_id=story_id,
-                        event_id=event_id,
-                    )
-                ]
-                next_pointers = self.get_next_story_pointers(
-                    event_id=event_id,
-                    story_id=story_id,
+                # the prev and next walks, resolved in a single statement
+                return self._repository.get_story_window(
+                    summary_id=event_id,
+                    tag_id=story_id,
                     session=session,
                 )
-                return prev_pointers + queried_event + next_pointers
 
     def get_next_story_pointers(
         self, event_id: UUID, story_id: UUID, session: Session
@@ -474,7 +893,7 @@ class HistoryApp:
                 last_story_pointer = StoryPointer(event_id=event_id, story_id=story_id)
             else:
                 last_story_pointer = story_pointers[-1]
-            related_story = self._repository.get_related_story(
+            related_story = self._repository.get_story_link(
                 summary_id=last_story_pointer.event_id,
                 tag_id=last_story_pointer.story_id,
                 direction=DIRECTION,
@@ -507,7 +926,7 @@ class HistoryApp:
                 last_story_pointer = StoryPointer(event_id=event_id, story_id=story_id)
             else:
                 last_story_pointer = story_pointers[0]
-            related_story = self._repository.get_related_story(
+            related_story = self._repository.get_story_link(
                 summary_id=last_story_pointer.event_id,
                 tag_id=last_story_pointer.story_id,
                 direction=DIRECTION,
@@ -527,53 +946,148 @@ class HistoryApp:
     def get_story_list(
         self, event_id: UUID, story_id: UUID, direction: Literal["next", "prev"] | None
     ) -> Story:
-        with self._repository.Session() as session:
-            if self._repository.is_text_reader_story(story_id, session):
-                if direction is None:
-                    prev_pointers = self._repository.get_text_reader_story_pointers(
-                        story_id=story_id,
-                        summary_id=event_id,
-                        direction="prev",
-                        session=session,
-                    )
-                    next_pointers = self._repository.get_text_reader_story_pointers(
-                        story_id=story_id,
-                        summary_id=event_id,
-                        direction="next",
-                        session=session,
-                    )
-                    story_pointers = (
-                        prev_pointers
-                        + [StoryPointer(story_id=story_id, event_id=event_id)]
-                        + next_pointers
-                    )
-                else:
-                    story_pointers = self._repository.get_text_reader_story_pointers(
-                        story_id=story_id,
-                        summary_id=event_id,
-                        direction=direction,
-                        session=session,
-                    )
+        return self.get_story_window(
+            event_id=event_id, story_id=story_id, direction=direction
+        ).story
+
+    async def get_story_list_async(
+        self, event_id: UUID, story_id: UUID, direction: Literal["next", "prev"] | None
+    ) -> Story:
+        """get_story_list, reading through the async engine."""
+        story = await self.get_story_window_async(
+            event_id=event_id, story_id=story_id, direction=direction
+        )
+        return story.story
+
+    def get_story_window(
+        self, event_id: UUID, story_id: UUID, direction: Literal["next", "prev"] | None
+    ) -> VersionedStory:
+        """A story window, with the revisions of every story it was built
+        from. A cached window is only served while those revisions are
+        current, since other processes can't invalidate this one's cache."""
+        key = StoryCacheKey(story_id=story_id, event_id=event_id, direction=direction)
+        cached = self._story_cache.get(key)
+        if cached is not None:
+            if self._repository.get_revisions(cached.revisions) == cached.revisions:
+                return cached
+            self._story_cache.discard_stale(key, cached)
+
+        def build() -> VersionedStory:
+            generation = self._story_cache.generation
+            with self._repository.Session() as session:
+                story = self._build_story_window(key, session=session)
+            self._cache_story(key, story, generation=generation)
+            return story
+
+        return self._story_flight.do(key, build)
+
+    async def get_story_window_async(
+        self, event_id: UUID, story_id: UUID, direction: Literal["next", "prev"] | None
+    ) -> VersionedStory:
+        """get_story_window, reading through the async engine."""
+        key = StoryCacheKey(story_id=story_id, event_id=event_id, direction=direction)
+        cached = self._story_cache.get(key)
+        if cached is not None:
+            revisions = await self._repository.run_read(
+                lambda session: self._repository.get_revisions(
+                    cached.revisions, session
+                )
+            )
+            if revisions == cached.revisions:
+                return cached
+            self._story_cache.discard_stale(key, cached)
+
+        async def build() -> VersionedStory:
+            generation = self._story_cache.generation
+            story = await self._repository.run_read(
+                lambda session: self._build_story_window(key, session=session)
+            )
+            self._cache_story(key, story, generation=generation)
+            return story
+
+        return await self._story_flight.do_async(key, build)
+
+    def _build_story_window(
+        self, key: StoryCacheKey, session: Session
+    ) -> VersionedStory:
+        # the revisions are read in the window's snapshot, so they never
+        # describe newer data than the window holds
+        self._repository.use_snapshot(session)
+        story = self._build_story_list(
+            event_id=key.event_id,
+            story_id=key.story_id,
+            direction=key.direction,
+            session=session,
+        )
+        # every tag the window touches, so that a change to any of those
+        # stories is noticed
+        tag_ids = {story.id, *(tag.id for event in story.events for tag in event.tags)}
+        return VersionedStory(
+            story=story,
+            revisions=self._repository.get_revisions(tag_ids, session),
+        )
+
+    def _cache_story(
+        self, key: StoryCacheKey, story: VersionedStory, generation: int
+    ) -> None:
+        # index the window by every tag it touches, so that a change to any of
+        # those stories in this process evicts it.
+        tag_ids = {UUID(tag_id) for tag_id in story.revisions}
+        self._story_cache.put(key, story, tag_ids=tag_ids, generation=generation)
+
+    def _build_story_list(
+        self,
+        event_id: UUID,
+        story_id: UUID,
+        direction: Literal["next", "prev"] | None,
+        session: Session,
+    ) -> Story:
+        if self._repository.is_text_reader_story(story_id, session):
+            if direction is None:
+                prev_pointers = self._repository.get_text_reader_story_pointers(
+                    story_id=story_id,
+                    summary_id=event_id,
+                    direction="prev",
+                    session=session,
+                )
+                next_pointers = self._repository.get_text_reader_story_pointers(
+                    story_id=story_id,
+                    summary_id=event_id,
+                    direction="next",
+                    session=session,
+                )
+                story_pointers = (
+                    prev_pointers
+                    + [StoryPointer(story_id=story_id, event_id=event_id)]
+                    + next_pointers
+                )
             else:
-                story_pointers = self.get_story_pointers(
-                    event_id=event_id,
+                story_pointers = self._repository.get_text_reader_story_pointers(
                     story_id=story_id,
+                    summary_id=event_id,
                     direction=direction,
                     session=session,
                 )
-            events = self._repository.get_events(
-                event_ids=tuple([story.event_id for story in story_pointers]),
-                session=session,
-            )
-            story_names = self._repository.get_story_names(
-                story_ids=tuple(
-                    {
-                        *[story_pointer.story_id for story_pointer in story_pointers],
-                        story_id,
-                    }
-                ),
+        else:
+            story_pointers = self.get_story_pointers(
+                event_id=event_id,
+                story_id=story_id,
+                direction=direction,
                 session=session,
             )
+        events = self._repository.get_events(
+            event_ids=tuple([story.event_id for story in story_pointers]),
+            session=session,
+        )
+        story_names = self._repository.get_story_names(
+            story_ids=tuple(
+                {
+                    *[story_pointer.story_id for story_pointer in story_pointers],
+                    story_id,
+                }
+            ),
+            session=session,
+        )
 
         if not story_names:
             raise MissingResourceError("Story not found")
@@ -647,18 +1161,59 @@ class HistoryApp:
         self,
         story_id: UUID | None,
         event_id: UUID | None,
+        session: Session | None = None,
     ) -> StoryPointer:
         if story_id:
             # get the first story
-            return self._repository.get_default_event_by_story(story_id=story_id)
+            return self._repository.get_default_event_by_story(
+                story_id=story_id, session=session
+            )
         elif event_id:
             # get the person story associated with this event
-            return self._repository.get_default_story_by_event(event_id=event_id)
+            return self._repository.get_default_story_by_event(
+                event_id=event_id, session=session
+            )
         else:
             # return random story/event
-            return self._repository.get_default_story_and_event()
+            return self._repository.get_default_story_and_event(session=session)
 
-    def get_available_person_story_names(self, person: PersonInput) -> list[StoryName]:
+    async def get_default_story_and_event_async(
+        self,
+        story_id: UUID | None,
+        event_id: UUID | None,
+    ) -> StoryPointer:
+        """get_default_story_and_event, reading through the async engine."""
+        return await self._repository.run_read(
+            lambda session: self.get_default_story_and_event(
+                story_id=story_id, event_id=event_id, session=session
+            )
+        )
+
+    def get_story_revision(self, story_id: UUID) -> int:
+        """A counter which changes whenever the windows of the story may have
+        changed; read it before building a window to version the result."""
+        return self._repository.get_revisions([story_id])[str(story_id)]
+
+    def get_events_revision(self) -> int:
+        """A counter which changes whenever an event is created."""
+        return self._repository.get_events_revision()
+
+    async def get_events_revision_async(self) -> int:
+        """get_events_revision, reading through the async engine."""
+        return await self._repository.run_read(self._repository.get_events_revision)
+
+    async def get_nearby_version_async(self) -> str:
+        """A token which changes whenever the results of get_nearby_events may
+        have changed. While the in-memory nearby index serves them, that's the
+        index's version, as the index only sees other processes' events once
+        it's rebuilt; otherwise it's the events revision."""
+        nearby_index = self._nearby_index
+        if nearby_index is not None and nearby_index.available:
+            return f"index:{nearby_index.version}"
+        return f"events:{await self.get_events_revision_async()}"
+
+    @staticmethod
+    def get_available_person_story_names(person: PersonInput) -> list[StoryName]:
         return [
             StoryName(
                 lang="en",
@@ -667,7 +1222,8 @@ class HistoryApp:
             ),
         ]
 
-    def get_available_place_story_names(self, place: PlaceInput) -> list[StoryName]:
+    @staticmethod
+    def get_available_place_story_names(place: PlaceInput) -> list[StoryName]:
         return [
             StoryName(
                 lang="en",
@@ -676,7 +1232,8 @@ class HistoryApp:
             ),
         ]
 
-    def get_available_time_story_names(self, time: TimeInput) -> list[StoryName]:
+    @staticmethod
+    def get_available_time_story_names(time: TimeInput) -> list[StoryName]:
         return [
             StoryName(
                 lang="en",
@@ -711,27 +1268,194 @@ class HistoryApp:
     ):
         """Find events near the given event based on time prefix and spatial bounds.
 
-        If no results are found, reduces precision by 1 (broadening the time window)
-        and retries until precision reaches MIN_NEARBY_PRECISION (year), at which
-        point results are returned regardless.
+        If no results are found, falls back to coarser precisions (broadening the
+        time window) down to MIN_NEARBY_PRECISION (year), returning the results of
+        the finest precision which has any. All precisions are searched in a
+        single query, or in the in-memory nearby index when it's enabled.
         """
-        current_precision = precision
-        while True:
-            prefix_length = self.PRECISION_TO_PREFIX_LENGTH.get(current_precision, 5)
-            datetime_prefix = datetime[:prefix_length]
-            results = self._repository.get_nearby_events(
-                event_id=event_id,
+        levels = self._nearby_levels(precision=precision, datetime=datetime)
+        events = self._search_nearby_index(
+            event_id=event_id,
+            calendar_model=calendar_model,
+            levels=levels,
+            min_lat=min_lat,
+            max_lat=max_lat,
+            min_lng=min_lng,
+            max_lng=max_lng,
+        )
+        if events is not None:
+            return events
+
+        def search():
+            with self._repository.Session() as session:
+                return self._repository.get_nearby_events_at_finest_precision(
+                    event_id=event_id,
+                    calendar_model=calendar_model,
+                    levels=levels,
+                    min_lat=min_lat,
+                    max_lat=max_lat,
+                    min_lng=min_lng,
+                    max_lng=max_lng,
+                    session=session,
+                )
+
+        key = (
+            event_id,
+            calendar_model,
+            tuple(levels),
+            min_lat,
+            max_lat,
+            min_lng,
+            max_lng,
+        )
+        return self._nearby_flight.do(key, search)
+
+    async def get_nearby_events_async(
+        self,
+        event_id: UUID,
+        calendar_model: str,
+        precision: int,
+        datetime: str,
+        min_lat: float,
+        max_lat: float,
+        min_lng: float,
+        max_lng: float,
+    ):
+        """get_nearby_events, reading through the async engine."""
+        levels = self._nearby_levels(precision=precision, datetime=datetime)
+        events = self._search_nearby_index(
+            event_id=event_id,
+            calendar_model=calendar_model,
+            levels=levels,
+            min_lat=min_lat,
+            max_lat=max_lat,
+            min_lng=min_lng,
+            max_lng=max_lng,
+        )
+        if events is not None:
+            return events
+        key = (
+            event_id,
+            calendar_model,
+            tuple(levels),
+            min_lat,
+            max_lat,
+            min_lng,
+            max_lng,
+        )
+        return await self._nearby_flight.do_async(
+            key,
+            lambda: self._repository.run_read(
+                lambda session: self._repository.get_nearby_events_at_finest_precision(
+                    event_id=event_id,
+                    calendar_model=calendar_model,
+                    levels=levels,
+                    min_lat=min_lat,
+                    max_lat=max_lat,
+                    min_lng=min_lng,
+                    max_lng=max_lng,
+                    session=session,
+                )
+            ),
+        )
+
+    def _nearby_levels(self, precision: int, datetime: str) -> list[tuple[int, str]]:
+        """The (precision, datetime prefix) levels searched for nearby events:
+        from the requested precision down to MIN_NEARBY_PRECISION."""
+        precisions = range(precision, min(precision, self.MIN_NEARBY_PRECISION) - 1, -1)
+        return [
+            (
+                current_precision,
+                datetime[: self.PRECISION_TO_PREFIX_LENGTH.get(current_precision, 5)],
+            )
+            for current_precision in precisions
+        ]
+
+    def _search_nearby_index(
+        self,
+        event_id: UUID,
+        calendar_model: str,
+        levels: list[tuple[int, str]],
+        min_lat: float,
+        max_lat: float,
+        min_lng: float,
+        max_lng: float,
+    ):
+        """Search the in-memory nearby index. Returns None if it's disabled or
+        unavailable, in which case the database must be queried."""
+        if self._nearby_index is None:
+            NEARBY_QUERIES.labels(source="database").inc()
+            return None
+        events = self._nearby_index.search(
+            event_id=event_id,
+            calendar_model=calendar_model,
+            levels=[
+                NearbyIndexLevel(current_precision, *time_key_range(prefix))
+                for current_precision, prefix in levels
+            ],
+            min_lat=min_lat,
+            max_lat=max_lat,
+            min_lng=min_lng,
+            max_lng=max_lng,
+        )
+        NEARBY_QUERIES.labels(source="database" if events is None else "index").inc()
+        return events
+
+    def get_nearby_clusters(
+        self,
+        calendar_model: str,
+        precision: int,
+        datetime: str,
+        zoom: int,
+        min_lat: float,
+        max_lat: float,
+        min_lng: float,
+        max_lng: float,
+    ):
+        """Cluster the events in a map viewport by their grid cell at the given
+        zoom, within the time window of the datetime at the given precision."""
+        with self._repository.Session() as session:
+            return self._repository.get_nearby_clusters(
                 calendar_model=calendar_model,
-                precision=current_precision,
-                datetime_prefix=datetime_prefix,
+                precision=precision,
+                datetime_prefix=datetime[
+                    : self.PRECISION_TO_PREFIX_LENGTH.get(precision, 5)
+                ],
+                zoom=zoom,
                 min_lat=min_lat,
                 max_lat=max_lat,
                 min_lng=min_lng,
                 max_lng=max_lng,
+                session=session,
             )
-            if results or current_precision <= self.MIN_NEARBY_PRECISION:
-                return results
-            current_precision -= 1
+
+    async def get_nearby_clusters_async(
+        self,
+        calendar_model: str,
+        precision: int,
+        datetime: str,
+        zoom: int,
+        min_lat: float,
+        max_lat: float,
+        min_lng: float,
+        max_lng: float,
+    ):
+        """get_nearby_clusters, reading through the async engine."""
+        return await self._repository.run_read(
+            lambda session: self._repository.get_nearby_clusters(
+                calendar_model=calendar_model,
+                precision=precision,
+                datetime_prefix=datetime[
+                    : self.PRECISION_TO_PREFIX_LENGTH.get(precision, 5)
+                ],
+                zoom=zoom,
+                min_lat=min_lat,
+                max_lat=max_lat,
+                min_lng=min_lng,
+                max_lng=max_lng,
+                session=session,
+            )
+        )
 
     # --- Text Reader methods ---
 
@@ -757,6 +1481,7 @@ class HistoryApp:
                 ],
             )
             session.commit()
+        self._search_cache.invalidate()
         return {"id": id, "name": name, "description": description}
 
     def create_place_without_wikidata(
@@ -791,6 +1516,7 @@ class HistoryApp:
                 ],
             )
             session.commit()
+        self._search_cache.invalidate()
         return {
             "id": id,
             "name": name,
@@ -848,6 +1574,7 @@ class HistoryApp:
                 ],
             )
             session.commit()
+        self._search_cache.invalidate()
         return {
             "id": id,
             "name": name,
@@ -962,14 +1689,20 @@ class HistoryApp:
                 after=[],
                 session=session,
             )
+            self._repository.bump_revisions(tag_ids, session=session)
+            self._enqueue_story_order(tag_ids, session=session)
             session.commit()
 
+        self._repository.bump_events_revision()
         # Add to text-reader story
         position = self._repository.get_next_story_position(story_id=story_id)
         self._repository.add_summary_to_story(
             story_id=story_id, summary_id=summary_id, position=position
         )
 
+        self._story_cache.invalidate_tags([*tag_ids, story_id])
+        self._index_nearby_events([summary_id])
+        self._index_story_years([*tag_ids, story_id])
         return summary_id
 
     def search_people_by_name(self, name: str) -> list[dict]:
@@ -990,6 +1723,20 @@ class HistoryApp:
             name=name, latitude=latitude, longitude=longitude, radius=radius
         )
 
+    def search_people_by_names(self, names: list[str]) -> list[list[dict]]:
+        """Search for people tags by each of the names."""
+        return self._repository.search_tags_by_names_and_type(
+            names=names, tag_type="PERSON"
+        )
+
+    def search_places_batch(
+        self, queries: list[PlaceQuery], radius: float = 1.0
+    ) -> list[list[dict]]:
+        """Search for places by the name and/or coordinates of each query."""
+        return self._repository.search_places_by_names_and_coordinates(
+            queries=queries, radius=radius
+        )
+
     def find_matching_summary(
         self,
         person_ids: list[UUID],
@@ -1018,6 +1765,7 @@ class HistoryApp:
         self._repository.create_text_reader_story(
             id=id, name=name, description=description, source_id=source_id
         )
+        self._search_cache.invalidate()
         return {
             "id": id,
             "name": name,
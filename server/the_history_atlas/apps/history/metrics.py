@@ -0,0 +1,52 @@
+"""Prometheus metrics for the history app.
+
+Metrics are registered on the default prometheus_client registry, which is
+exposed by the Instrumentator on the /metrics endpoint.
+"""
+
+from prometheus_client import Counter, Gauge
+
+STORY_CACHE_HITS = Counter(
+    "history_story_cache_hits",
+    "Story windows served from the in-process story cache.",
+)
+STORY_CACHE_MISSES = Counter(
+    "history_story_cache_misses",
+    "Story window lookups that had to be built from the database.",
+)
+STORY_CACHE_EVICTIONS = Counter(
+    "history_story_cache_evictions",
+    "Story windows removed from the story cache.",
+    ["reason"],  # 'size' | 'ttl' | 'invalidated' | 'stale'
+)
+SEARCH_CACHE_HITS = Counter(
+    "history_search_cache_hits",
+    "Story searches served from the in-process search cache.",
+)
+SEARCH_CACHE_MISSES = Counter(
+    "history_search_cache_misses",
+    "Story searches that had to be run.",
+)
+SEARCH_CACHE_EVICTIONS = Counter(
+    "history_search_cache_evictions",
+    "Search results removed from the search cache.",
+    ["reason"],  # 'size' | 'invalidated'
+)
+NEARBY_INDEX_BYTES = Gauge(
+    "history_nearby_index_bytes",
+    "Estimated size of the in-memory nearby event index.",
+)
+NEARBY_INDEX_ROWS = Gauge(
+    "history_nearby_index_rows",
+    "Rows held by the in-memory nearby event index.",
+)
+NEARBY_QUERIES = Counter(
+    "history_nearby_queries",
+    "Nearby event queries, by where they were answered.",
+    ["source"],  # 'index' | 'database'
+)
+SINGLE_FLIGHT_REQUESTS = Counter(
+    "history_single_flight_requests",
+    "Requests which ran a computation, or waited on an identical one in flight.",
+    ["operation", "role"],  # role: 'leader' | 'coalesced'
+)
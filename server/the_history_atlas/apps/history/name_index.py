@@ -0,0 +1,239 @@
+"""An in-memory search index over story names, for /stories/search.
+
+Wikidata stories are found by the names of their tag (a person's, place's or
+time's names), and text-reader stories by their own name. Names are split
+into lower-cased, accent-folded words. A query matches a story when each of
+its words matches a word of one of the story's names, either exactly, as a
+prefix, or within one typo. Typos are found with a symmetric deletion index:
+two words are a typo apart when deleting at most one character from each
+makes them equal.
+"""
+
+import bisect
+import heapq
+import re
+import threading
+import unicodedata
+from dataclasses import dataclass, field
+from functools import partial
+from typing import Callable, Iterable, NamedTuple
+from uuid import UUID
+
+# match qualities, summed over the words of a query
+EXACT = 3
+PREFIX = 2
+TYPO = 1
+
+# words shorter than this are only matched exactly or as a prefix
+MIN_TYPO_LENGTH = 4
+# the most index words a single query word may expand to as a prefix
+MAX_PREFIX_WORDS = 512
+
+_WORD = re.compile(r"\w+")
+
+
+def words(text: str) -> list[str]:
+    """The lower-cased, accent-folded words of a name or query."""
+    decomposed = unicodedata.normalize("NFKD", text.lower())
+    folded = "".join(char for char in decomposed if not unicodedata.combining(char))
+    return _WORD.findall(folded)
+
+
+def _deletions(word: str) -> set[str]:
+    return {word[:i] + word[i + 1 :] for i in range(len(word))}
+
+
+@dataclass
+class StoryEntry:
+    id: UUID
+    name: str | None = None
+    description: str | None = None
+    earliest_year: int | None = None
+    latest_year: int | None = None
+    text_reader: bool = False
+    search_names: set[str] = field(default_factory=set)
+
+
+class StorySearchRow(NamedTuple):
+    story_id: UUID
+    name: str
+    description: str | None
+    earliest_year: int | None
+    latest_year: int | None
+    text_reader: bool
+    search_names: list[str]
+
+
+class NameIndex:
+    """Prefix and typo-tolerant search over story names, held in memory."""
+
+    def __init__(self):
+        self._entries: dict[UUID, StoryEntry] = {}
+        # word -> ids of the stories with a name containing it
+        self._postings: dict[str, set[UUID]] = {}
+        # every indexed word, sorted, for prefix matching
+        self._words: list[str] = []
+        # a word with one character deleted -> the words it was made from
+        self._deletions: dict[str, set[str]] = {}
+        # the updates made while the index is being rebuilt
+        self._rebuild_updates: list[Callable[[], None]] | None = None
+        self._lock = threading.RLock()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def build(self, rows: Iterable[StorySearchRow]) -> None:
+        """Replace the contents of the index. Searches are served by the old
+        contents while the rows are read, and updates made meanwhile, which
+        the rows may predate, are replayed onto the new contents."""
+        with self._lock:
+            self._rebuild_updates = []
+        entries: dict[UUID, StoryEntry] = {}
+        postings: dict[str, set[UUID]] = {}
+        deletions: dict[str, set[str]] = {}
+        for row in rows:
+            entries[row.story_id] = StoryEntry(
+                id=row.story_id,
+                name=row.name,
+                description=row.description,
+                earliest_year=row.earliest_year,
+                latest_year=row.latest_year,
+                text_reader=row.text_reader,
+                search_names=set(row.search_names),
+            )
+            for name in row.search_names:
+                for word in words(name):
+                    story_ids = postings.get(word)
+                    if story_ids is None:
+                        story_ids = postings[word] = set()
+                        self._add_deletions(deletions, word)
+                    story_ids.add(row.story_id)
+        with self._lock:
+            updates, self._rebuild_updates = self._rebuild_updates, None
+            self._entries = entries
+            self._postings = postings
+            self._words = sorted(postings)
+            self._deletions = deletions
+            for update in updates:
+                update()
+
+    def add_name(self, story_id: UUID, name: str) -> None:
+        """Make a story searchable by the given name."""
+        with self._lock:
+            if self._rebuild_updates is not None:
+                self._rebuild_updates.append(partial(self.add_name, story_id, name))
+            entry = self._entry(story_id)
+            if name in entry.search_names:
+                return
+            entry.search_names.add(name)
+            for word in words(name):
+                story_ids = self._postings.get(word)
+                if story_ids is None:
+                    story_ids = self._postings[word] = set()
+                    bisect.insort(self._words, word)
+                    self._add_deletions(self._deletions, word)
+                story_ids.add(story_id)
+
+    def set_story(
+        self,
+        story_id: UUID,
+        name: str | None = None,
+        description: str | None = None,
+        earliest_year: int | None = None,
+        latest_year: int | None = None,
+        text_reader: bool | None = None,
+    ) -> None:
+        """Set the given details of a story, leaving those passed as None."""
+        with self._lock:
+            if self._rebuild_updates is not None:
+                self._rebuild_updates.append(
+                    partial(
+                        self.set_story,
+                        story_id,
+                        name=name,
+                        description=description,
+                        earliest_year=earliest_year,
+                        latest_year=latest_year,
+                        text_reader=text_reader,
+                    )
+                )
+            entry = self._entry(story_id)
+            if name is not None:
+                entry.name = name
+            if description is not None:
+                entry.description = description
+            if earliest_year is not None:
+                entry.earliest_year = earliest_year
+            if latest_year is not None:
+                entry.latest_year = latest_year
+            if text_reader is not None:
+                entry.text_reader = text_reader
+
+    def search(self, query: str, limit: int = 10) -> list[StoryEntry]:
+        """The best matching named stories, best first. Stories matching
+        equally well are ordered by the shortest, then alphabetical, name."""
+        query_words = words(query)
+        if not query_words:
+            return []
+        with self._lock:
+            scores: dict[UUID, int] | None = None
+            for query_word in query_words:
+                word_scores: dict[UUID, int] = {}
+                for word, quality in self._match(query_word).items():
+                    for story_id in self._postings[word]:
+                        if word_scores.get(story_id, 0) < quality:
+                            word_scores[story_id] = quality
+                if scores is None:
+                    scores = word_scores
+                else:
+                    scores = {
+                        story_id: scores[story_id] + quality
+                        for story_id, quality in word_scores.items()
+                        if story_id in scores
+                    }
+                if not scores:
+                    return []
+            named = [
+                self._entries[story_id]
+                for story_id in scores
+                if self._entries[story_id].name is not None
+            ]
+            return heapq.nsmallest(
+                limit,
+                named,
+                key=lambda entry: (-scores[entry.id], len(entry.name), entry.name),
+            )
+
+    def _match(self, query_word: str) -> dict[str, int]:
+        """Index words matching a query word, with the quality of each match."""
+        matches: dict[str, int] = {}
+        if len(query_word) >= MIN_TYPO_LENGTH:
+            for variant in _deletions(query_word) | {query_word}:
+                for word in self._deletions.get(variant, ()):
+                    matches[word] = TYPO
+                if variant in self._postings:
+                    matches[variant] = TYPO
+        start = bisect.bisect_left(self._words, query_word)
+        for word in self._words[start : start + MAX_PREFIX_WORDS]:
+            if not word.startswith(query_word):
+                break
+            matches[word] = PREFIX
+        if query_word in self._postings:
+            matches[query_word] = EXACT
+        return matches
+
+    def _entry(self, story_id: UUID) -> StoryEntry:
+        entry = self._entries.get(story_id)
+        if entry is None:
+            entry = self._entries[story_id] = StoryEntry(id=story_id)
+        return entry
+
+    @staticmethod
+    def _add_deletions(deletions: dict[str, set[str]], word: str) -> None:
+        if len(word) < MIN_TYPO_LENGTH:
+            return
+        for variant in _deletions(word):
+            originals = deletions.get(variant)
+            if originals is None:
+                originals = deletions[variant] = set()
+            originals.add(word)
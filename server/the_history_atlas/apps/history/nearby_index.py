@@ -0,0 +1,334 @@
+"""An in-memory spatio-temporal index of events, for /history/nearby.
+
+Events are grouped by calendar model, then bucketed by year and by a grid
+cell of latitude and longitude. Row data is stored column-wise in flat
+arrays, and strings are interned in a shared table, so that the index stays
+compact. The index mirrors Repository.get_nearby_events_at_finest_precision,
+and stops serving queries (returning None, so callers fall back to SQL) once
+its estimated size exceeds `max_bytes`.
+"""
+
+import bisect
+import logging
+import math
+import sys
+import threading
+from array import array
+from typing import Iterable, NamedTuple
+from uuid import UUID, uuid4
+
+from the_history_atlas.apps.domain.models.history.get_nearby_events import (
+    NearbyEventRow,
+)
+from the_history_atlas.apps.history.grid_cell import viewport_boxes
+from the_history_atlas.apps.history.metrics import (
+    NEARBY_INDEX_BYTES,
+    NEARBY_INDEX_ROWS,
+)
+
+log = logging.getLogger(__name__)
+
+# rough per-object overheads used by the size estimate
+_CELL_OVERHEAD_BYTES = 200
+_EVENT_ID_OVERHEAD_BYTES = 90
+_STRING_OVERHEAD_BYTES = 100
+
+
+class NearbyIndexRow(NamedTuple):
+    event_id: UUID
+    story_id: UUID
+    person_name: str
+    person_description: str | None
+    summary_text: str | None
+    place_name: str
+    latitude: float
+    longitude: float
+    datetime: str
+    precision: int
+    calendar_model: str
+    time_key: int
+
+
+class NearbyIndexLevel(NamedTuple):
+    precision: int
+    min_time_key: int
+    max_time_key: int
+
+
+class _Partition:
+    """The rows of a single calendar model."""
+
+    def __init__(self):
+        # event_id followed by story_id, 32 bytes per row
+        self.ids = bytearray()
+        self.latitudes = array("d")
+        self.longitudes = array("d")
+        self.time_keys = array("q")
+        self.precisions = array("b")
+        # offsets into NearbyIndex._strings; -1 is None
+        self.person_names = array("i")
+        self.person_descriptions = array("i")
+        self.summary_texts = array("i")
+        self.place_names = array("i")
+        self.datetimes = array("i")
+        # year -> (lat cell, lng cell) -> row offsets
+        self.buckets: dict[int, dict[tuple[int, int], array]] = {}
+        self.years: list[int] = []
+
+    def __len__(self) -> int:
+        return len(self.time_keys)
+
+
+class NearbyIndex:
+    """A year and grid cell index of nearby event rows, per calendar model."""
+
+    def __init__(self, max_bytes: int, cell_degrees: float = 1.0):
+        self._max_bytes = max_bytes
+        self._cell_degrees = cell_degrees
+        self._partitions: dict[str, _Partition] = {}
+        self._strings: list[str] = []
+        self._string_offsets: dict[str, int] = {}
+        self._event_ids: set[bytes] = set()
+        self._nbytes = 0
+        self._available = True
+        # unique to this index, so that no other index, neither a rebuild
+        # nor another process's, shares its versions
+        self._build_id = uuid4().hex
+        self._generation = 0
+        self._lock = threading.RLock()
+
+    @property
+    def available(self) -> bool:
+        """False once the memory budget has been exceeded."""
+        return self._available
+
+    @property
+    def version(self) -> str:
+        """Changes whenever the rows of the index change."""
+        return f"{self._build_id}.{self._generation}"
+
+    @property
+    def nbytes(self) -> int:
+        """The estimated size of the index in bytes."""
+        return self._nbytes
+
+    def __len__(self) -> int:
+        return sum(len(partition) for partition in self._partitions.values())
+
+    def add(self, rows: Iterable[NearbyIndexRow]) -> bool:
+        """Add the rows of one or more events. Rows of an event which is
+        already indexed are skipped. Returns False if the index is, or has now
+        become, unavailable."""
+        with self._lock:
+            if not self._available:
+                return False
+            new_event_ids: set[bytes] = set()
+            for row in rows:
+                event_id = row.event_id.bytes
+                if event_id not in new_event_ids:
+                    if event_id in self._event_ids:
+                        continue
+                    new_event_ids.add(event_id)
+                    self._event_ids.add(event_id)
+                    self._nbytes += _EVENT_ID_OVERHEAD_BYTES
+                self._add_row(row)
+                if self._nbytes > self._max_bytes:
+                    log.warning(
+                        f"Nearby index exceeded its budget of {self._max_bytes} "
+                        "bytes; nearby queries will be served from the database"
+                    )
+                    self._disable()
+                    return False
+            if new_event_ids:
+                self._generation += 1
+            NEARBY_INDEX_BYTES.set(self._nbytes)
+            NEARBY_INDEX_ROWS.set(len(self))
+            return True
+
+    def clear(self) -> None:
+        """Drop every row and make the index available again."""
+        with self._lock:
+            self._reset()
+            self._available = True
+
+    def search(
+        self,
+        event_id: UUID,
+        calendar_model: str,
+        levels: list[NearbyIndexLevel],
+        min_lat: float,
+        max_lat: float,
+        min_lng: float,
+        max_lng: float,
+    ) -> list[NearbyEventRow] | None:
+        """Find events near the given event at several precision levels at
+        once, returning only the matches of the finest level which has any.
+
+        Returns None if the index is unavailable.
+        """
+        with self._lock:
+            if not self._available:
+                return None
+            partition = self._partitions.get(calendar_model)
+            if partition is None:
+                return []
+            # the levels nest, so the coarsest one selects every candidate
+            min_precision = min(level.precision for level in levels)
+            min_time_key = min(level.min_time_key for level in levels)
+            max_time_key = max(level.max_time_key for level in levels)
+            excluded_id = event_id.bytes
+
+            best_precision = None
+            matches: list[int] = []
+            # as in the SQL, a viewport across the antimeridian is two boxes
+            candidates = (
+                (offset, box)
+                for box in viewport_boxes(min_lat, max_lat, min_lng, max_lng)
+                for offset in self._candidates(
+                    partition, min_time_key, max_time_key, *box
+                )
+            )
+            for offset, (
+                box_min_lat,
+                box_max_lat,
+                box_min_lng,
+                box_max_lng,
+            ) in candidates:
+                time_key = partition.time_keys[offset]
+                precision = partition.precisions[offset]
+                latitude = partition.latitudes[offset]
+                longitude = partition.longitudes[offset]
+                if (
+                    precision < min_precision
+                    or not min_time_key <= time_key <= max_time_key
+                    or not box_min_lat <= latitude <= box_max_lat
+                    or not box_min_lng <= longitude <= box_max_lng
+                ):
+                    continue
+                start = offset * 32
+                if partition.ids[start : start + 16] == excluded_id:
+                    continue
+                matched_precision = max(
+                    level.precision
+                    for level in levels
+                    if precision >= level.precision
+                    and level.min_time_key <= time_key <= level.max_time_key
+                )
+                if best_precision is None or matched_precision > best_precision:
+                    best_precision = matched_precision
+                    matches = [offset]
+                elif matched_precision == best_precision:
+                    matches.append(offset)
+            return [
+                self._to_row(partition, calendar_model, offset) for offset in matches
+            ]
+
+    def _candidates(
+        self,
+        partition: _Partition,
+        min_time_key: int,
+        max_time_key: int,
+        min_lat: float,
+        max_lat: float,
+        min_lng: float,
+        max_lng: float,
+    ) -> Iterable[int]:
+        """Row offsets in every bucket overlapping the time range and the
+        bounding box. Rows are filtered exactly by the caller."""
+        lat_cells = range(self._cell(min_lat), self._cell(max_lat) + 1)
+        lng_cells = range(self._cell(min_lng), self._cell(max_lng) + 1)
+        first = bisect.bisect_left(partition.years, min_time_key // 10000)
+        last = bisect.bisect_right(partition.years, max_time_key // 10000)
+        for year in partition.years[first:last]:
+            cells = partition.buckets[year]
+            if len(lat_cells) * len(lng_cells) <= len(cells):
+                for lat_cell in lat_cells:
+                    for lng_cell in lng_cells:
+                        yield from cells.get((lat_cell, lng_cell), ())
+            else:
+                # a large box over a sparse year: scan its cells instead
+                for (lat_cell, lng_cell), offsets in cells.items():
+                    if lat_cell in lat_cells and lng_cell in lng_cells:
+                        yield from offsets
+
+    def _cell(self, degrees: float) -> int:
+        return math.floor(degrees / self._cell_degrees)
+
+    def _add_row(self, row: NearbyIndexRow) -> None:
+        partition = self._partitions.get(row.calendar_model)
+        if partition is None:
+            partition = self._partitions[row.calendar_model] = _Partition()
+            self._intern(row.calendar_model)
+        offset = len(partition)
+        partition.ids += row.event_id.bytes + row.story_id.bytes
+        partition.latitudes.append(row.latitude)
+        partition.longitudes.append(row.longitude)
+        partition.time_keys.append(row.time_key)
+        partition.precisions.append(row.precision)
+        partition.person_names.append(self._intern(row.person_name))
+        partition.person_descriptions.append(self._intern(row.person_description))
+        partition.summary_texts.append(self._intern(row.summary_text))
+        partition.place_names.append(self._intern(row.place_name))
+        partition.datetimes.append(self._intern(row.datetime))
+        # 32 bytes of ids, 3 * 8 of coordinates and time key, 1 of
+        # precision and 5 * 4 of string offsets
+        self._nbytes += 77
+
+        year = row.time_key // 10000
+        cells = partition.buckets.get(year)
+        if cells is None:
+            cells = partition.buckets[year] = {}
+            bisect.insort(partition.years, year)
+        cell = (self._cell(row.latitude), self._cell(row.longitude))
+        offsets = cells.get(cell)
+        if offsets is None:
+            offsets = cells[cell] = array("I")
+            self._nbytes += _CELL_OVERHEAD_BYTES
+        offsets.append(offset)
+        self._nbytes += offsets.itemsize
+
+    def _intern(self, value: str | None) -> int:
+        if value is None:
+            return -1
+        offset = self._string_offsets.get(value)
+        if offset is None:
+            offset = self._string_offsets[value] = len(self._strings)
+            self._strings.append(value)
+            self._nbytes += sys.getsizeof(value) + _STRING_OVERHEAD_BYTES
+        return offset
+
+    def _string(self, offset: int) -> str | None:
+        return None if offset < 0 else self._strings[offset]
+
+    def _to_row(
+        self, partition: _Partition, calendar_model: str, offset: int
+    ) -> NearbyEventRow:
+        start = offset * 32
+        return NearbyEventRow(
+            event_id=UUID(bytes=bytes(partition.ids[start : start + 16])),
+            story_id=UUID(bytes=bytes(partition.ids[start + 16 : start + 32])),
+            person_name=self._string(partition.person_names[offset]),
+            person_description=self._string(partition.person_descriptions[offset]),
+            summary_text=self._string(partition.summary_texts[offset]),
+            place_name=self._string(partition.place_names[offset]),
+            latitude=partition.latitudes[offset],
+            longitude=partition.longitudes[offset],
+            datetime=self._string(partition.datetimes[offset]),
+            precision=partition.precisions[offset],
+            calendar_model=calendar_model,
+        )
+
+    def _disable(self) -> None:
+        """Drop every row and stop serving queries. Caller holds the lock."""
+        self._reset()
+        self._available = False
+
+    def _reset(self) -> None:
+        self._partitions = {}
+        self._strings = []
+        self._string_offsets = {}
+        self._event_ids = set()
+        self._nbytes = 0
+        self._generation += 1
+        NEARBY_INDEX_BYTES.set(0)
+        NEARBY_INDEX_ROWS.set(0)
@@ -1,22 +1,30 @@
 import json
 import logging
+import random
 import threading
 import time
 from collections import defaultdict
 from datetime import datetime
+from contextlib import contextmanager
 from typing import (
     Tuple,
     Optional,
     List,
     Literal,
     Dict,
+    Callable,
+    Iterable,
+    Iterator,
+    TypeVar,
 )
 from uuid import uuid4, UUID
 
-from sqlalchemy import text
+from sqlalchemy import event, text, bindparam
+from sqlalchemy.exc import NoResultFound, MultipleResultsFound
+from sqlalchemy.ext.asyncio import async_sessionmaker
 from sqlalchemy.orm import Session, sessionmaker
 
-from the_history_atlas.apps.database import DatabaseClient
+from the_history_atlas.apps.database import DatabaseClient, AsyncDatabaseClient
 from the_history_atlas.apps.domain.core import (
     TagPointer,
     StoryOrder,
@@ -33,15 +41,12 @@ from the_history_atlas.apps.domain.models.history.get_fuzzy_search_by_name impor
 )
 from the_history_atlas.apps.domain.models.history.get_events import (
     EventQuery,
-    EventRow,
-    TagRow,
-    CalendarDateRow,
-    LocationRow,
-    TagNames,
 )
 from the_history_atlas.apps.domain.models.history.get_nearby_events import (
     NearbyEventRow,
+    NearbyClusterRow,
 )
+from the_history_atlas.apps.domain.models.history.search_places import PlaceQuery
 from the_history_atlas.apps.domain.models.history.tables import (
     PersonModel,
     TagInstanceModel,
@@ -57,15 +62,46 @@ from the_history_atlas.apps.domain.models.history.tables.time import (
     TimeModel,
 )
 from the_history_atlas.apps.history.errors import MissingResourceError
+from the_history_atlas.apps.history.grid_cell import GRID_ZOOM, viewport_boxes
+from the_history_atlas.apps.history.name_index import NameIndex, StorySearchRow
+from the_history_atlas.apps.history.nearby_index import NearbyIndexRow
 from the_history_atlas.apps.history.schema import (
     Base,
     Summary,
     Source,
 )
+from the_history_atlas.apps.history.story_order_jobs import StoryOrderJob
+from the_history_atlas.apps.history.time_key import sort_key, time_key_range
 from the_history_atlas.apps.history.trie import Trie
 
 log = logging.getLogger(__name__)
 
+T = TypeVar("T")
+
+
+# session.info key of the callbacks to run once the session commits
+AFTER_COMMIT = "after_commit"
+
+
+@event.listens_for(Session, "after_commit")
+def _run_after_commit(session: Session) -> None:
+    for callback in session.info.pop(AFTER_COMMIT, []):
+        try:
+            callback()
+        except Exception as e:
+            log.error(f"Error running after commit callback: {e}")
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_after_commit(session: Session) -> None:
+    session.info.pop(AFTER_COMMIT, None)
+
+
+def after_commit(session: Session, callback: Callable[[], None]) -> None:
+    """Run `callback` once the session's transaction commits, or never if it
+    rolls back; for in-memory state which must only reflect committed data."""
+    session.info.setdefault(AFTER_COMMIT, []).append(callback)
+
 
 class RebalanceError(Exception):
     """Story orders require rebalancing"""
@@ -77,11 +113,23 @@ class Repository:
 
     Session: sessionmaker
 
-    def __init__(self, database_client: DatabaseClient, source_trie: Trie):
+    def __init__(
+        self,
+        database_client: DatabaseClient,
+        source_trie: Trie,
+        async_database_client: AsyncDatabaseClient | None = None,
+        name_index: NameIndex | None = None,
+    ):
         self._source_trie = source_trie
+        self._name_index = name_index
         self._engine = database_client
 
         self.Session = sessionmaker(bind=database_client)
+        self.AsyncSession = (
+            async_sessionmaker(bind=async_database_client)
+            if async_database_client is not None
+            else None
+        )
         Base.metadata.create_all(self._engine)
 
         # Cache for default story and event
@@ -90,8 +138,42 @@ class Repository:
         self._cache_refresh_thread = None
         self._stop_cache_refresh = threading.Event()
 
-    def start_cache_refresh_thread(self, refresh_interval_seconds=3600):
-        """Start a background thread to periodically refresh the cache"""
+    @contextmanager
+    def _use_session(self, session: Session | None) -> Iterator[Session]:
+        """Use the caller's session, or open one for the duration of the call."""
+        if session is not None:
+            yield session
+            return
+        with Session(self._engine, future=True) as new_session:
+            yield new_session
+
+    async def run_read(self, read: Callable[[Session], T]) -> T:
+        """Run a read-only function against the async engine.
+
+        `read` is given a Session whose statements are executed by asyncpg, so
+        the sync query methods of this class can be reused from async code
+        without blocking the event loop on database IO.
+        """
+        if self.AsyncSession is None:
+            raise RuntimeError("Repository was created without an async client")
+        async with self.AsyncSession() as session:
+            return await session.run_sync(read)
+
+    @staticmethod
+    def use_snapshot(session: Session) -> None:
+        """Make every statement of the session's transaction read the same
+        snapshot, so that revisions read alongside data describe that data.
+        Must be called before the session's first statement."""
+        session.connection(execution_options={"isolation_level": "REPEATABLE READ"})
+
+    def start_cache_refresh_thread(
+        self,
+        refresh_interval_seconds=3600,
+        refresh_hooks: Iterable[Callable[[], None]] = (),
+    ):
+        """Start a background thread to periodically refresh the cache.
+        `refresh_hooks` are also called after each interval, to rebuild other
+        in-memory state from the database."""
         if (
             self._cache_refresh_thread is not None
             and self._cache_refresh_thread.is_alive()
@@ -102,7 +184,7 @@ class Repository:
         self._stop_cache_refresh.clear()
         self._cache_refresh_thread = threading.Thread(
             target=self._cache_refresh_worker,
-            args=(refresh_interval_seconds,),
+            args=(refresh_interval_seconds, list(refresh_hooks)),
             daemon=True,
             name="DefaultStoryCacheRefresher",
         )
@@ -126,7 +208,11 @@ class Repository:
                 log.info("Cache refresh thread stopped successfully")
         self._cache_refresh_thread = None
 
-    def _cache_refresh_worker(self, refresh_interval_seconds):
+    def _cache_refresh_worker(
+        self,
+        refresh_interval_seconds,
+        refresh_hooks: list[Callable[[], None]],
+    ):
         """Worker function for the cache refresh thread"""
         log.info("Cache refresh thread started")
         while not self._stop_cache_refresh.is_set():
@@ -137,36 +223,41 @@ class Repository:
                     if self._stop_cache_refresh.is_set():
                         break
                     time.sleep(1)
+                if self._stop_cache_refresh.is_set():
+                    break
+                # the indexes were built at startup; rebuilding them picks up
+                # what other processes have created since
+                self.refresh_name_index()
+                for refresh in refresh_hooks:
+                    refresh()
             except Exception as e:
                 log.error(f"Error refreshing default story cache: {e}")
                 # Sleep for a shorter period after error
                 time.sleep(60)
 
+    def refresh_name_index(self) -> None:
+        """Rebuild the name index from the database, if it's enabled."""
+        if self._name_index is None:
+            return
+        self._name_index.build(self.get_story_search_rows())
+        log.info(f"Built name index of {len(self._name_index)} stories")
+
     def prime_default_story_cache(self, cache_size=100):
         """Prime the cache with default story and event combinations"""
         log.info(f"Priming default story cache with {cache_size} entries")
         with Session(self._engine, future=True) as session:
             try:
-                # Get random person stories with valid story_order
-                rows = session.execute(
-                    text(
-                        """
-                        SELECT summary_id as event_id, tag_id as story_id
-                        FROM tag_instances
-                        JOIN tags ON tag_instances.tag_id = tags.id
-                        WHERE tag_instances.story_order IS NOT NULL
-                        AND tags.type = 'PERSON'
-                        ORDER BY RANDOM()
-                        LIMIT :limit;
-                        """
-                    ),
-                    {"limit": cache_size},
-                ).all()
+                story_pointers = self._sample_default_stories(
+                    sample_size=cache_size, session=session
+                )
 
                 with self._cache_lock:
                     self._default_story_cache = [
-                        {"event_id": row.event_id, "story_id": row.story_id}
-                        for row in rows
+                        {
+                            "event_id": story_pointer.event_id,
+                            "story_id": story_pointer.story_id,
+                        }
+                        for story_pointer in story_pointers
                     ]
                 log.info(
                     f"Default story cache primed with {len(self._default_story_cache)} entries"
@@ -177,6 +268,7 @@ class Repository:
 
     def get_default_story_and_event(
         self,
+        session: Session | None = None,
     ) -> StoryPointer:
         """Get a default story and event, using the cache if available"""
         with self._cache_lock:
@@ -187,8 +279,6 @@ class Repository:
 
             if self._default_story_cache:
                 # Use a random entry from the cache
-                import random
-
                 cache_entry = random.choice(self._default_story_cache)
                 return StoryPointer(
                     event_id=cache_entry["event_id"],
@@ -197,25 +287,66 @@ class Repository:
 
         # Fallback to direct database query if cache is still empty
         log.warning("Using fallback direct database query for default story and event")
-        with Session(self._engine, future=True) as session:
-            # get the beginning of a person's life
-            row = session.execute(
-                text(
-                    """
-                    SELECT summary_id as event_id, tag_id as story_id
-                    FROM tag_instances
-                    JOIN tags ON tag_instances.tag_id = tags.id
-                    AND tag_instances.story_order IS NOT NULL
-                    AND tags.type = 'PERSON'
-                    ORDER BY RANDOM()
-                    LIMIT 1;
-                    """
-                )
-            ).one()
-            return StoryPointer(
-                event_id=row.event_id,
-                story_id=row.story_id,
+        with self._use_session(session) as session:
+            story_pointers = self._sample_default_stories(
+                sample_size=1, session=session
+            )
+            if not story_pointers:
+                raise NoResultFound("No person stories have a story order")
+            return story_pointers[0]
+
+    # extra ids probed per requested sample, to make up for candidates whose
+    # story order has been cleared and for repeated probes
+    DEFAULT_STORY_OVERSAMPLING = 2
+
+    def _sample_default_stories(
+        self, sample_size: int, session: Session
+    ) -> list[StoryPointer]:
+        """Up to sample_size distinct random person story events.
+
+        Random ids are drawn between the smallest and largest candidate id,
+        and each is resolved to the first candidate at or after it, so the
+        cost depends on the sample size and not on the size of the atlas.
+        """
+        bounds = session.execute(
+            text(
+                """
+                SELECT min(id) AS min_id, max(id) AS max_id
+                FROM default_story_candidates;
+                """
+            )
+        ).one()
+        if bounds.max_id is None:
+            return []
+        probes = [
+            random.randint(bounds.min_id, bounds.max_id)
+            for _ in range(sample_size * self.DEFAULT_STORY_OVERSAMPLING)
+        ]
+        rows = session.execute(
+            text(
+                """
+                SELECT tag_instances.summary_id AS event_id,
+                    tag_instances.tag_id AS story_id
+                FROM unnest(CAST(:probes AS BIGINT[])) AS probe(id)
+                CROSS JOIN LATERAL (
+                    SELECT tag_instance_id FROM default_story_candidates
+                    WHERE default_story_candidates.id >= probe.id
+                    ORDER BY default_story_candidates.id
+                    LIMIT 1
+                ) AS candidate
+                JOIN tag_instances ON tag_instances.id = candidate.tag_instance_id
+                WHERE tag_instances.story_order IS NOT NULL;
+                """
+            ),
+            {"probes": probes},
+        ).all()
+        story_pointers = {
+            (row.event_id, row.story_id): StoryPointer(
+                event_id=row.event_id, story_id=row.story_id
             )
+            for row in rows
+        }
+        return list(story_pointers.values())[:sample_size]
 
     def get_tag_ids_with_null_orders(
         self,
@@ -262,6 +393,81 @@ class Repository:
         rows = session.execute(query, params).all()
         return [row[0] for row in rows]
 
+    def enqueue_story_order_jobs(
+        self, tag_ids: Iterable[UUID], delay_seconds: float, session: Session
+    ) -> None:
+        """Queue the stories of the given tags to have their story order
+        calculated in `delay_seconds`. A story already queued keeps its place,
+        and has its request count bumped. Does not commit."""
+        # a fixed order, so concurrent writers lock the rows without deadlock
+        tag_ids = sorted({str(tag_id) for tag_id in tag_ids})
+        if not tag_ids:
+            return
+        session.execute(
+            text(
+                """
+                INSERT INTO story_order_jobs AS jobs (tag_id, requests, run_after)
+                SELECT tag_id, 1, now() + make_interval(secs => :delay_seconds)
+                FROM unnest(CAST(:tag_ids AS UUID[])) AS tag_id
+                ON CONFLICT (tag_id) DO UPDATE SET requests = jobs.requests + 1;
+                """
+            ),
+            {"tag_ids": tag_ids, "delay_seconds": delay_seconds},
+        )
+
+    def claim_story_order_jobs(
+        self, limit: int, lease_seconds: float, session: Session
+    ) -> list[StoryOrderJob]:
+        """Claim up to `limit` due story order jobs, skipping any claimed by a
+        concurrent worker. Claimed jobs aren't due again until their lease
+        expires, so commit the claim before processing them."""
+        rows = session.execute(
+            text(
+                """
+                UPDATE story_order_jobs
+                SET run_after = now() + make_interval(secs => :lease_seconds)
+                WHERE tag_id IN (
+                    SELECT tag_id FROM story_order_jobs
+                    WHERE run_after <= now()
+                    ORDER BY run_after
+                    LIMIT :limit
+                    FOR UPDATE SKIP LOCKED
+                )
+                RETURNING tag_id, requests;
+                """
+            ),
+            {"limit": limit, "lease_seconds": lease_seconds},
+        ).all()
+        return [StoryOrderJob(tag_id=row.tag_id, requests=row.requests) for row in rows]
+
+    def finish_story_order_jobs(
+        self, jobs: list[StoryOrderJob], delay_seconds: float, session: Session
+    ) -> None:
+        """Remove processed jobs from the queue. A job which was requested
+        again while it was being processed is kept, and is due again in
+        `delay_seconds`. Does not commit."""
+        if not jobs:
+            return
+        session.execute(
+            text(
+                """
+                DELETE FROM story_order_jobs
+                USING unnest(CAST(:tag_ids AS UUID[]), CAST(:requests AS BIGINT[]))
+                    AS job(tag_id, requests)
+                WHERE story_order_jobs.tag_id = job.tag_id
+                AND story_order_jobs.requests = job.requests;
+                UPDATE story_order_jobs
+                SET run_after = now() + make_interval(secs => :delay_seconds)
+                WHERE tag_id = ANY(CAST(:tag_ids AS UUID[]));
+                """
+            ),
+            {
+                "tag_ids": [str(job.tag_id) for job in jobs],
+                "requests": [job.requests for job in jobs],
+                "delay_seconds": delay_seconds,
+            },
+        )
+
     def get_all_source_titles_and_authors(self) -> List[Tuple[str, str]]:
         """Util for building Source search trie. Returns a list of (name, id) tuples."""
         res: List[Tuple[str, str]] = []
@@ -276,13 +482,15 @@ class Repository:
                 )
         return res
 
-    def get_name_by_fuzzy_search(self, name: str) -> List[FuzzySearchByName]:
+    def get_name_by_fuzzy_search(
+        self, name: str, session: Session | None = None
+    ) -> List[FuzzySearchByName]:
         """Search for possible completions to a given string from known entity names using PostgreSQL."""
         if name == "":
             return []
 
         # Use PostgreSQL trigram similarity search
-        with Session(self._engine, future=True) as session:
+        with self._use_session(session) as session:
             # Query for names that match using trigram similarity
             query = text(
                 """
@@ -310,9 +518,11 @@ class Repository:
                 for row in results
             ]
 
-    def get_default_event_by_story(self, story_id: UUID) -> StoryPointer:
+    def get_default_event_by_story(
+        self, story_id: UUID, session: Session | None = None
+    ) -> StoryPointer:
         # given a story, return the first event
-        with Session(self._engine, future=True) as session:
+        with self._use_session(session) as session:
             row = session.execute(
                 text(
                     """
@@ -344,10 +554,12 @@ class Repository:
             ).one()
             return StoryPointer(event_id=row.event_id, story_id=row.story_id)
 
-    def get_default_story_by_event(self, event_id: UUID) -> StoryPointer:
-        with Session(self._engine, future=True) as session:
+    def get_default_story_by_event(
+        self, event_id: UUID, session: Session | None = None
+    ) -> StoryPointer:
+        with self._use_session(session) as session:
             # given an event, always return a person's story
-            row = session.execute(
+            rows = session.execute(
                 text(
                     """
                     SELECT summary_id as event_id, tag_id as story_id
@@ -355,13 +567,14 @@ class Repository:
                     JOIN tags ON tag_instances.tag_id = tags.id
                     AND tag_instances.story_order IS NOT NULL
                     AND tags.type = 'PERSON'
-                    AND tag_instances.tag_id = :event_id
-                    ORDER BY RANDOM()
-                    LIMIT 1;
+                    AND tag_instances.summary_id = :event_id;
                 """
                 ),
                 {"event_id": event_id},
-            ).one()
+            ).all()
+            if not rows:
+                raise NoResultFound(f"Event {event_id} has no person story")
+            row = random.choice(rows)
             return StoryPointer(
                 event_id=row.event_id,
                 story_id=row.story_id,
@@ -423,6 +636,29 @@ class Repository:
         direction: Literal["next", "prev"],
         session: Session,
     ) -> StoryPointer | None:
+        story_id, event_id = self._resolve_related_story(
+            summary_id=summary_id,
+            tag_id=tag_id,
+            direction=direction,
+            session=session,
+        )
+        if not story_id or not event_id:
+            return None
+        return StoryPointer(
+            event_id=event_id,
+            story_id=story_id,
+        )
+
+    def _resolve_related_story(
+        self,
+        summary_id: UUID,
+        tag_id: UUID,
+        direction: Literal["next", "prev"],
+        session: Session,
+    ) -> tuple[UUID | None, UUID | None]:
+        """Find the story the walk moves to from the end of a story, and the
+        event it resumes at. The story is returned even when no event is found,
+        so that the link can be recomputed once that story changes."""
         related_tags = session.execute(
             text(
                 """
@@ -448,14 +684,14 @@ class Repository:
         else:
             time_story_id = related_tags_by_type.get("TIME")
             if not time_story_id:
-                return None
+                return None, None
             story_id = self.get_related_time_story(
                 story_id=time_story_id,
                 direction=direction,
                 session=session,
             )
         if not story_id:
-            return None
+            return None, None
         last_datetime, last_precision = self.get_time_and_precision_by_tags(
             session=session, tag_ids=list(related_tags_by_id.keys())
         )
@@ -466,13 +702,392 @@ class Repository:
             direction=direction,
             session=session,
         )
-        if not event_id:
+        return story_id, event_id
+
+    def get_story_link(
+        self,
+        summary_id: UUID,
+        tag_id: UUID,
+        direction: Literal["next", "prev"],
+        session: Session,
+    ) -> StoryPointer | None:
+        """Return the story the walk continues into past the end of a story,
+        using the precomputed story_links row when it is current for
+        `summary_id`, and resolving it at read time otherwise."""
+        row = session.execute(
+            text(
+                """
+                select
+                    summary_id,
+                    related_story_id,
+                    related_event_id
+                from story_links
+                where tag_id = :tag_id
+                and direction = :direction;
+            """
+            ),
+            {"tag_id": tag_id, "direction": direction},
+        ).one_or_none()
+        if row is None or row.summary_id != summary_id:
+            return self.get_related_story(
+                summary_id=summary_id,
+                tag_id=tag_id,
+                direction=direction,
+                session=session,
+            )
+        if not row.related_story_id or not row.related_event_id:
             return None
         return StoryPointer(
-            event_id=event_id,
-            story_id=story_id,
+            event_id=row.related_event_id,
+            story_id=row.related_story_id,
+        )
+
+    def bump_revisions(self, keys: Iterable[UUID | str], session: Session) -> None:
+        """Increment the revision counters of the given tag ids or keys. Does
+        not commit."""
+        # a fixed order, so concurrent writers lock the rows without deadlock
+        keys = sorted({str(key) for key in keys})
+        if not keys:
+            return
+        session.execute(
+            text(
+                """
+                INSERT INTO revisions (key, revision)
+                SELECT key, 1 FROM unnest(CAST(:keys AS VARCHAR[])) AS key
+                ON CONFLICT (key) DO UPDATE SET revision = revisions.revision + 1;
+                """
+            ),
+            {"keys": keys},
+        )
+
+    def get_revisions(
+        self, keys: Iterable[UUID | str], session: Session | None = None
+    ) -> dict[str, int]:
+        """The revision counters of the given tag ids or keys, keyed by their
+        string form. Keys which were never bumped are revision 0."""
+        keys = sorted({str(key) for key in keys})
+        with self._use_session(session) as session:
+            rows = session.execute(
+                text(
+                    """
+                    SELECT key, revision FROM revisions
+                    WHERE key = ANY(CAST(:keys AS VARCHAR[]));
+                    """
+                ),
+                {"keys": keys},
+            ).all()
+        revisions = dict.fromkeys(keys, 0)
+        revisions.update({row.key: row.revision for row in rows})
+        return revisions
+
+    def bump_events_revision(self, session: Session | None = None) -> None:
+        """Advance the revision of the set of all events. nextval takes
+        effect without a commit, so call this once the events are committed;
+        otherwise a reader could pair the new revision with the old data."""
+        with self._use_session(session) as session:
+            session.execute(text("SELECT nextval('events_revision_seq');"))
+
+    def get_events_revision(self, session: Session | None = None) -> int:
+        """The revision of the set of all events, 0 until any is created."""
+        with self._use_session(session) as session:
+            return session.execute(
+                text(
+                    """
+                    SELECT CASE WHEN is_called THEN last_value ELSE 0 END
+                    FROM events_revision_seq;
+                    """
+                )
+            ).scalar_one()
+
+    def refresh_story_links(self, tag_id: UUID, session: Session) -> None:
+        """Recompute the story_links rows that depend on the given story:
+        its own links, links which resolve into it, and, for a time story,
+        the links of the adjacent time stories. Does not commit."""
+        tag_ids = {tag_id}
+        tag_ids.update(
+            session.execute(
+                text(
+                    """
+                    select tag_id from story_links
+                    where related_story_id = :tag_id;
+                """
+                ),
+                {"tag_id": tag_id},
+            ).scalars()
+        )
+        tag_ids.update(
+            session.execute(
+                text(
+                    """
+                    (
+                        select times.id from times
+                        where times.sort_key < (
+                            select sort_key from times where id = :tag_id
+                        )
+                        order by times.sort_key desc
+                        limit 1
+                    )
+                    union
+                    (
+                        select times.id from times
+                        where times.sort_key > (
+                            select sort_key from times where id = :tag_id
+                        )
+                        order by times.sort_key asc
+                        limit 1
+                    );
+                """
+                ),
+                {"tag_id": tag_id},
+            ).scalars()
+        )
+        for link_tag_id in tag_ids:
+            for direction in ("next", "prev"):
+                self._refresh_story_link(
+                    tag_id=link_tag_id, direction=direction, session=session
+                )
+        # each of these stories' windows may now continue differently
+        self.bump_revisions(tag_ids, session=session)
+
+    def _refresh_story_link(
+        self, tag_id: UUID, direction: Literal["next", "prev"], session: Session
+    ) -> None:
+        order_by_clause = "desc" if direction == "next" else "asc"
+        summary_id = session.execute(
+            text(
+                f"""
+                select summary_id from tag_instances
+                where tag_id = :tag_id
+                and story_order IS NOT NULL
+                order by story_order {order_by_clause}
+                limit 1;
+            """
+            ),
+            {"tag_id": tag_id},
+        ).scalar_one_or_none()
+        if summary_id is None:
+            session.execute(
+                text(
+                    """
+                    delete from story_links
+                    where tag_id = :tag_id and direction = :direction;
+                """
+                ),
+                {"tag_id": tag_id, "direction": direction},
+            )
+            return
+        try:
+            related_story_id, related_event_id = self._resolve_related_story(
+                summary_id=summary_id,
+                tag_id=tag_id,
+                direction=direction,
+                session=session,
+            )
+        except (NoResultFound, MultipleResultsFound):
+            # the end event doesn't have exactly one time; leave it to the
+            # read path, which raises the same error.
+            session.execute(
+                text(
+                    """
+                    delete from story_links
+                    where tag_id = :tag_id and direction = :direction;
+                """
+                ),
+                {"tag_id": tag_id, "direction": direction},
+            )
+            return
+        session.execute(
+            text(
+                """
+                insert into story_links (
+                    tag_id, direction, summary_id, related_story_id, related_event_id
+                )
+                values (
+                    :tag_id, :direction, :summary_id, :related_story_id, :related_event_id
+                )
+                on conflict (tag_id, direction) do update set
+                    summary_id = excluded.summary_id,
+                    related_story_id = excluded.related_story_id,
+                    related_event_id = excluded.related_event_id;
+            """
+            ),
+            {
+                "tag_id": tag_id,
+                "direction": direction,
+                "summary_id": summary_id,
+                "related_story_id": related_story_id,
+                "related_event_id": related_event_id,
+            },
         )
 
+    def get_story_window(
+        self, summary_id: UUID, tag_id: UUID, session: Session
+    ) -> list[StoryPointer]:
+        """Return the full window around an event -- the previous pointers, the
+        event itself, and the next pointers -- in a single statement.
+
+        This is the same walk as HistoryApp.get_prev_story_pointers and
+        HistoryApp.get_next_story_pointers: take up to 10 events of the story,
+        and while fewer than 10 pointers have been collected, continue into the
+        related story (PERSON -> PLACE -> TIME -> adjacent TIME) at the event
+        closest in time.
+        """
+        query = f"""
+            with recursive
+            {self._story_walk_cte(name="next_walk", operator=">", order_by_clause="asc")},
+            {self._story_walk_cte(name="prev_walk", operator="<", order_by_clause="desc")},
+            window_pointers as (
+                select
+                    -1 as side, w.depth, p.ordinality, p.event_id, w.story_id
+                from prev_walk w
+                cross join lateral unnest(
+                    case when w.depth = 0 then w.event_ids
+                    else array_prepend(w.anchor_id, w.event_ids) end
+                ) with ordinality as p(event_id, ordinality)
+                union all
+                select 0, 0, 0, cast(:summary_id as uuid), cast(:tag_id as uuid)
+                union all
+                select
+                    1 as side, w.depth, p.ordinality, p.event_id, w.story_id
+                from next_walk w
+                cross join lateral unnest(
+                    case when w.depth = 0 then w.event_ids
+                    else array_prepend(w.anchor_id, w.event_ids) end
+                ) with ordinality as p(event_id, ordinality)
+            )
+            select event_id, story_id
+            from window_pointers
+            order by side, side * depth, side * ordinality;
+        """
+        rows = session.execute(
+            text(query), {"summary_id": summary_id, "tag_id": tag_id}
+        ).all()
+        return [StoryPointer.model_validate(row, from_attributes=True) for row in rows]
+
+    @staticmethod
+    def _story_segment_sql(
+        story_id: str, anchor_id: str, operator: str, order_by_clause: str
+    ) -> str:
+        """The (up to 10) events following anchor_id in story_id, as an array
+        in walk order. Mirrors get_story_pointers."""
+        return f"""
+            select coalesce(
+                array_agg(segment.summary_id order by segment.story_order {order_by_clause}),
+                array[]::uuid[]
+            ) as event_ids
+            from (
+                select ti.summary_id, ti.story_order
+                from tag_instances ti
+                where ti.tag_id = {story_id}
+                and ti.story_order IS NOT NULL
+                and ti.story_order {operator} (
+                    select story_order from tag_instances
+                    where tag_instances.tag_id = {story_id}
+                    and tag_instances.summary_id = {anchor_id}
+                    and tag_instances.story_order IS NOT NULL
+                )
+                order by ti.story_order {order_by_clause}
+                limit 10
+            ) segment
+        """
+
+    def _story_walk_cte(self, name: str, operator: str, order_by_clause: str) -> str:
+        """Recursive CTE walking away from :summary_id in one direction, one
+        story segment per row. event_ids holds the events following anchor_id
+        in story_id, in walk order, and end_id is the last of them."""
+        focus_segment = self._story_segment_sql(
+            story_id="cast(:tag_id as uuid)",
+            anchor_id="cast(:summary_id as uuid)",
+            operator=operator,
+            order_by_clause=order_by_clause,
+        )
+        related_segment = self._story_segment_sql(
+            story_id="related.story_id",
+            anchor_id="related.event_id",
+            operator=operator,
+            order_by_clause=order_by_clause,
+        )
+        return f"""
+            {name}(depth, story_id, anchor_id, event_ids, end_id, total) as (
+                select
+                    0,
+                    cast(:tag_id as uuid),
+                    cast(:summary_id as uuid),
+                    segment.event_ids,
+                    coalesce(
+                        segment.event_ids[cardinality(segment.event_ids)],
+                        cast(:summary_id as uuid)
+                    ),
+                    cardinality(segment.event_ids)
+                from (
+                    {focus_segment}
+                ) segment
+                union all
+                select
+                    w.depth + 1,
+                    related.story_id,
+                    related.event_id,
+                    segment.event_ids,
+                    coalesce(
+                        segment.event_ids[cardinality(segment.event_ids)],
+                        related.event_id
+                    ),
+                    w.total + 1 + cardinality(segment.event_ids)
+                from {name} w
+                cross join lateral (
+                    select
+                        related_story.story_id,
+                        (
+                            select ti_story.summary_id
+                            from tag_instances ti_story
+                            join tag_instances ti_time
+                                on ti_time.summary_id = ti_story.summary_id
+                            join times on times.id = ti_time.tag_id
+                            where ti_story.tag_id = related_story.story_id
+                            and times.sort_key {operator} related_story.sort_key
+                            order by times.sort_key {order_by_clause}
+                            limit 1
+                        ) as event_id
+                    from (
+                        select
+                            case end_tags.story_type
+                                when 'PERSON' then end_tags.place_id
+                                when 'PLACE' then end_tags.time_id
+                                else (
+                                    select times.id from times
+                                    where times.sort_key {operator} end_tags.sort_key
+                                    order by times.sort_key {order_by_clause}
+                                    limit 1
+                                )
+                            end as story_id,
+                            end_tags.sort_key
+                        from (
+                            select
+                                max(tags.type) filter (
+                                    where tags.id = w.story_id
+                                ) as story_type,
+                                (array_agg(tags.id) filter (
+                                    where tags.type = 'PLACE'
+                                ))[1] as place_id,
+                                (array_agg(tags.id) filter (
+                                    where tags.type = 'TIME'
+                                ))[1] as time_id,
+                                max(times.sort_key) as sort_key
+                            from tag_instances
+                            join tags on tags.id = tag_instances.tag_id
+                            left join times on times.id = tags.id
+                            where tag_instances.summary_id = w.end_id
+                        ) end_tags
+                    ) related_story
+                ) related
+                cross join lateral (
+                    {related_segment}
+                ) segment
+                where w.total < 10
+                and related.event_id is not null
+            )
+        """
+
     def get_related_time_story(
         self, story_id: UUID, direction: Literal["next", "prev"], session: Session
     ) -> UUID | None:
@@ -485,21 +1100,20 @@ class Repository:
                 order_by_clause = "desc"
             case _:
                 raise RuntimeError("Unknown direction")
-        # todo: doesnt account for precision
         next_story_id = session.execute(
             text(
                 f"""
                  select 
                  times.id
                  from times
-                 where times.datetime {operator} (
-                    select times.datetime
+                 where times.sort_key {operator} (
+                    select times.sort_key
                     from tags
                     join times
                     on tags.id = times.id
                     where tags.id = :tag_id
                 )
-                order by times.datetime {order_by_clause}
+                order by times.sort_key {order_by_clause}
                 limit 1;
             """
             ),
@@ -515,7 +1129,6 @@ class Repository:
         direction: Literal["next", "prev"],
         session: Session,
     ) -> UUID | None:
-        # todo: account for precision
         match direction:
             case "next":
                 operator = ">"
@@ -539,200 +1152,139 @@ class Repository:
                     join tag_instances on summaries.id = tag_instances.summary_id
                     where tag_instances.tag_id = :tag_id
                 )
-                and times.datetime {operator} :datetime
-                order by times.datetime {order_by_clause}
+                and times.sort_key {operator} :sort_key
+                order by times.sort_key {order_by_clause}
                 limit 1;
             """
             ),
-            {"tag_id": story_id, "datetime": datetime},
+            {"tag_id": story_id, "sort_key": sort_key(datetime, precision)},
         ).scalar_one_or_none()
 
     def get_events(
         self, event_ids: tuple[UUID, ...], session: Session
     ) -> list[EventQuery]:
+        """Fetch everything needed to render the given events in one round trip.
+
+        Each row is a JSON document shaped like EventQuery, cast to text so that
+        it is parsed once, by pydantic, rather than by the driver and again on
+        validation.
+        """
         if not event_ids:
             return []
-        event_query = session.execute(
-            text(
-                """
-                -- event_rows
-                select 
-                    summaries.id as event_id,
-                    summaries.text as text,
-                    sources.id as source_id,
-                    citations.text as source_text,
-                    sources.title as source_title,
-                    sources.author as source_author,
-                    sources.publisher as source_publisher,
-                    citations.access_date as source_access_date
-                from summaries
-                join citations
-                    on citations.summary_id = summaries.id
-                join sources
-                    on sources.id = citations.source_id
-                where summaries.id in :summary_ids;
-            """
-            ),
-            {"summary_ids": event_ids},
-        ).all()
-        event_rows = {
-            row.event_id: EventRow.model_validate(row, from_attributes=True)
-            for row in event_query
-        }
-        if not event_rows:
-            raise MissingResourceError("No events found")
-
-        location_query = session.execute(
-            text(
-                """
-                select
-                    summaries.id as event_id,
-                    tags.id as tag_id,
-                    places.latitude,
-                    places.longitude
-                from summaries
-                join tag_instances
-                    on summaries.id = tag_instances.summary_id
-                join tags
-                    on tags.id = tag_instances.tag_id
-                join places
-                    on places.id = tags.id
-                where summaries.id in :summary_ids;
-            """
-            ),
-            {"summary_ids": event_ids},
-        )
-        location_rows = {
-            row.event_id: LocationRow.model_validate(row, from_attributes=True)
-            for row in location_query.all()
-        }
-        calendar_date_query = session.execute(
+        rows = session.execute(
             text(
                 """
                 select
-                	summaries.id as event_id,
-                    times.datetime as datetime,
-                    times.calendar_model as calendar_model,
-                    times.precision as precision
+                    jsonb_build_object(
+                        'event_id', summaries.id,
+                        'event_row', jsonb_build_object(
+                            'event_id', summaries.id,
+                            'text', summaries.text,
+                            'source_id', source.source_id,
+                            'source_text', source.source_text,
+                            'source_title', source.source_title,
+                            'source_author', source.source_author,
+                            'source_publisher', source.source_publisher,
+                            'source_access_date', source.source_access_date
+                        ),
+                        'calendar_date', (
+                            select jsonb_build_object(
+                                'event_id', summaries.id,
+                                'datetime', times.datetime,
+                                'calendar_model', times.calendar_model,
+                                'precision', times.precision
+                            )
+                            from tag_instances
+                            join times on times.id = tag_instances.tag_id
+                            where tag_instances.summary_id = summaries.id
+                            limit 1
+                        ),
+                        'location_row', (
+                            select jsonb_build_object(
+                                'event_id', summaries.id,
+                                'tag_id', places.id,
+                                'latitude', places.latitude,
+                                'longitude', places.longitude
+                            )
+                            from tag_instances
+                            join places on places.id = tag_instances.tag_id
+                            where tag_instances.summary_id = summaries.id
+                            limit 1
+                        ),
+                        'tags', coalesce(tags.tags, '[]'::jsonb),
+                        'names', coalesce(tags.names, '{}'::jsonb)
+                    )::text as event
                 from summaries
-                join tag_instances
-                    on summaries.id = tag_instances.summary_id
-                join tags
-                    on tags.id = tag_instances.tag_id
-                join times
-                    on times.id = tags.id
-                where summaries.id in :summary_ids;
-
-            """
-            ),
-            {"summary_ids": event_ids},
-        ).all()
-        calendar_date_rows = {
-            row.event_id: CalendarDateRow.model_validate(row, from_attributes=True)
-            for row in calendar_date_query
-        }
-        tag_query = session.execute(
-            text(
-                """
-                -- tag rows
-                select
-                    tags.type as type,
-                    summaries.id as event_id,
-                    tags.id as tag_id,
-                    tag_instances.start_char as start_char,
-                    tag_instances.stop_char as stop_char
-                from summaries
-                join tag_instances
-                    on tag_instances.summary_id = summaries.id
-                join tags
-                    on tag_instances.tag_id = tags.id
-                join tag_names
-                    on tags.id = tag_names.tag_id
+                join lateral (
+                    select
+                        sources.id as source_id,
+                        citations.text as source_text,
+                        sources.title as source_title,
+                        sources.author as source_author,
+                        sources.publisher as source_publisher,
+                        citations.access_date as source_access_date
+                    from citations
+                    join sources on sources.id = citations.source_id
+                    where citations.summary_id = summaries.id
+                    limit 1
+                ) source on true
+                left join lateral (
+                    select
+                        jsonb_agg(
+                            jsonb_build_object(
+                                'type', tags.type,
+                                'event_id', summaries.id,
+                                'tag_id', tags.id,
+                                'start_char', tag_instances.start_char,
+                                'stop_char', tag_instances.stop_char
+                            )
+                        ) as tags,
+                        jsonb_object_agg(
+                            tags.id,
+                            jsonb_build_object('tag_id', tags.id, 'names', tag_names.names)
+                        ) as names
+                    from tag_instances
+                    join tags on tags.id = tag_instances.tag_id
+                    join lateral (
+                        select array_agg(names.name) as names
+                        from tag_names
+                        join names on names.id = tag_names.name_id
+                        where tag_names.tag_id = tags.id
+                    ) tag_names on tag_names.names is not null
+                    where tag_instances.summary_id = summaries.id
+                ) tags on true
                 where summaries.id in :summary_ids;
             """
-            ),
+            ).bindparams(bindparam("summary_ids", expanding=True)),
             {"summary_ids": event_ids},
-        ).all()
-        tag_rows: defaultdict[UUID, list[TagRow]] = defaultdict(list)
-        for row in tag_query:
-            validated_row = TagRow.model_validate(row, from_attributes=True)
-            tag_rows[row.event_id].append(validated_row)
-
-        tag_ids = [
-            tag_row.tag_id
-            for tag_row_list in tag_rows.values()
-            for tag_row in tag_row_list
-        ]
-        tag_name_query = session.execute(
-            text(
-                """
-                select
-                    tags.id as tag_id,
-                    array_agg(names.name) as names
-                from tags
-                join tag_names
-                    on tags.id = tag_names.tag_id
-                join names
-                    on names.id = tag_names.name_id
-                where tags.id in :tag_ids
-                group by tags.id;
-            """
-            ),
-            {"tag_ids": tuple(tag_ids)},
-        ).all()
-        tag_names = {
-            row.tag_id: TagNames.model_validate(row, from_attributes=True)
-            for row in tag_name_query
-        }
-        unordered_events = {
-            event_id: EventQuery(
-                event_id=event_id,
-                event_row=event_row,
-                tags=tag_rows[event_id],
-                calendar_date=calendar_date_rows[event_id],
-                location_row=location_rows[event_id],
-                names=tag_names,
-            )
-            for event_id, event_row in event_rows.items()
-        }
+        ).scalars()
+        unordered_events = {}
+        for row in rows:
+            event = EventQuery.model_validate_json(row)
+            unordered_events[event.event_id] = event
+        if not unordered_events:
+            raise MissingResourceError("No events found")
         return [unordered_events[event_id] for event_id in event_ids]
 
     def get_story_names(
         self, story_ids: tuple[UUID, ...], session: Session
     ) -> dict[UUID, dict]:
+        """Name, description and year range of wikidata and text-reader
+        stories, read from story_stats. Stories without a name are left out."""
         rows = session.execute(
             text(
                 """
-                SELECT
-                    sn.tag_id AS story_id,
-                    sn.name AS story_name,
-                    sn.description,
-                    MIN(
-                        CASE
-                            WHEN s.datetime LIKE '+%' THEN CAST(SUBSTRING(s.datetime, 2, 4) AS INTEGER)
-                            WHEN s.datetime LIKE '-%' THEN -CAST(SUBSTRING(s.datetime, 2, 4) AS INTEGER)
-                            ELSE NULL
-                        END
-                    ) AS earliest_year,
-                    MAX(
-                        CASE
-                            WHEN s.datetime LIKE '+%' THEN CAST(SUBSTRING(s.datetime, 2, 4) AS INTEGER)
-                            WHEN s.datetime LIKE '-%' THEN -CAST(SUBSTRING(s.datetime, 2, 4) AS INTEGER)
-                            ELSE NULL
-                        END
-                    ) AS latest_year
-                FROM story_names sn
-                LEFT JOIN tag_instances ti ON ti.tag_id = sn.tag_id
-                LEFT JOIN summaries s ON s.id = ti.summary_id AND s.datetime IS NOT NULL
-                WHERE sn.tag_id IN :story_ids
-                GROUP BY sn.tag_id, sn.name, sn.description;
+                SELECT story_id, name, description, earliest_year, latest_year
+                FROM story_stats
+                WHERE story_id IN :story_ids
+                AND name IS NOT NULL;
             """
-            ),
+            ).bindparams(bindparam("story_ids", expanding=True)),
             {"story_ids": story_ids},
         ).all()
-        result = {
+        return {
             row.story_id: {
-                "name": row.story_name,
+                "name": row.name,
                 "description": row.description,
                 "earliest_year": row.earliest_year,
                 "latest_year": row.latest_year,
@@ -740,49 +1292,6 @@ class Repository:
             for row in rows
         }
 
-        # Also look up text-reader stories for any IDs not found in story_names
-        missing_ids = tuple(sid for sid in story_ids if sid not in result)
-        if missing_ids:
-            tr_rows = session.execute(
-                text(
-                    """
-                    SELECT
-                        s.id AS story_id,
-                        s.name AS story_name,
-                        s.description,
-                        MIN(
-                            CASE
-                                WHEN su.datetime LIKE '+%' THEN CAST(SUBSTRING(su.datetime, 2, 4) AS INTEGER)
-                                WHEN su.datetime LIKE '-%' THEN -CAST(SUBSTRING(su.datetime, 2, 4) AS INTEGER)
-                                ELSE NULL
-                            END
-                        ) AS earliest_year,
-                        MAX(
-                            CASE
-                                WHEN su.datetime LIKE '+%' THEN CAST(SUBSTRING(su.datetime, 2, 4) AS INTEGER)
-                                WHEN su.datetime LIKE '-%' THEN -CAST(SUBSTRING(su.datetime, 2, 4) AS INTEGER)
-                                ELSE NULL
-                            END
-                        ) AS latest_year
-                    FROM stories s
-                    LEFT JOIN story_summaries ss ON ss.story_id = s.id
-                    LEFT JOIN summaries su ON su.id = ss.summary_id AND su.datetime IS NOT NULL
-                    WHERE s.id IN :missing_ids
-                    GROUP BY s.id, s.name, s.description;
-                """
-                ),
-                {"missing_ids": missing_ids},
-            ).all()
-            for row in tr_rows:
-                result[row.story_id] = {
-                    "name": row.story_name,
-                    "description": row.description,
-                    "earliest_year": row.earliest_year,
-                    "latest_year": row.latest_year,
-                }
-
-        return result
-
     def is_text_reader_story(self, story_id: UUID, session: Session) -> bool:
         """Return True if story_id belongs to a text-reader story (stories table)."""
         row = session.execute(
@@ -834,9 +1343,11 @@ class Repository:
             pointers.reverse()
         return pointers
 
-    def search_stories_by_name(self, name: str) -> list[dict]:
+    def search_stories_by_name(
+        self, name: str, session: Session | None = None
+    ) -> list[dict]:
         """Search text-reader stories by name using fuzzy matching."""
-        with Session(self._engine, future=True) as session:
+        with self._use_session(session) as session:
             rows = session.execute(
                 text(
                     """
@@ -844,26 +1355,12 @@ class Repository:
                         s.id,
                         s.name,
                         s.description,
-                        MIN(
-                            CASE
-                                WHEN su.datetime LIKE '+%' THEN CAST(SUBSTRING(su.datetime, 2, 4) AS INTEGER)
-                                WHEN su.datetime LIKE '-%' THEN -CAST(SUBSTRING(su.datetime, 2, 4) AS INTEGER)
-                                ELSE NULL
-                            END
-                        ) AS earliest_year,
-                        MAX(
-                            CASE
-                                WHEN su.datetime LIKE '+%' THEN CAST(SUBSTRING(su.datetime, 2, 4) AS INTEGER)
-                                WHEN su.datetime LIKE '-%' THEN -CAST(SUBSTRING(su.datetime, 2, 4) AS INTEGER)
-                                ELSE NULL
-                            END
-                        ) AS latest_year
+                        stats.earliest_year,
+                        stats.latest_year
                     FROM stories s
-                    LEFT JOIN story_summaries ss ON ss.story_id = s.id
-                    LEFT JOIN summaries su ON su.id = ss.summary_id AND su.datetime IS NOT NULL
+                    LEFT JOIN story_stats stats ON stats.story_id = s.id
                     WHERE s.name ILIKE :like_pattern
                        OR similarity(s.name, :search_term) > 0.3
-                    GROUP BY s.id, s.name, s.description
                     ORDER BY similarity(s.name, :search_term) DESC
                     LIMIT 10
                 """
@@ -994,6 +1491,160 @@ class Repository:
             },
         )
 
+    def get_event_tag_data(
+        self, tag_ids: Iterable[UUID], session: Session
+    ) -> dict[UUID, dict]:
+        """The type of each of the tags which exist, with the time or place
+        data denormalized onto the summaries of their events."""
+        rows = session.execute(
+            text(
+                """
+                SELECT
+                    tags.id,
+                    tags.type,
+                    times.datetime,
+                    times.calendar_model,
+                    times.precision,
+                    places.latitude,
+                    places.longitude
+                FROM tags
+                LEFT JOIN times ON times.id = tags.id
+                LEFT JOIN places ON places.id = tags.id
+                WHERE tags.id = ANY(CAST(:tag_ids AS UUID[]));
+                """
+            ),
+            {"tag_ids": [str(tag_id) for tag_id in set(tag_ids)]},
+        ).all()
+        return {row.id: row._asdict() for row in rows}
+
+    def bulk_create_summaries(
+        self, summaries: list[dict], session: Session
+    ) -> set[UUID]:
+        """Insert summaries in a single statement, skipping any whose text
+        already exists. Returns the ids of those inserted. Does not commit."""
+        if not summaries:
+            return set()
+        columns = {
+            "id": "UUID",
+            "text": "VARCHAR",
+            "datetime": "VARCHAR",
+            "calendar_model": "VARCHAR",
+            "precision": "INTEGER",
+            "latitude": "DOUBLE PRECISION",
+            "longitude": "DOUBLE PRECISION",
+        }
+        rows = session.execute(
+            text(
+                f"""
+                INSERT INTO summaries ({", ".join(columns)})
+                SELECT * FROM unnest(
+                    {", ".join(f"CAST(:{name} AS {type}[])" for name, type in columns.items())}
+                )
+                ON CONFLICT (text) DO NOTHING
+                RETURNING id;
+                """
+            ),
+            {
+                name: [
+                    str(summary[name]) if name == "id" else summary.get(name)
+                    for summary in summaries
+                ]
+                for name in columns
+            },
+        ).all()
+        return {row.id for row in rows}
+
+    def bulk_create_citations(self, citations: list[dict], session: Session) -> None:
+        """Insert citations, with their source and summary, in a single
+        statement. Does not commit."""
+        if not citations:
+            return
+        session.execute(
+            text(
+                """
+                INSERT INTO citations
+                    (id, text, source_id, summary_id, page_num, access_date)
+                SELECT * FROM unnest(
+                    CAST(:ids AS UUID[]),
+                    CAST(:texts AS VARCHAR[]),
+                    CAST(:source_ids AS UUID[]),
+                    CAST(:summary_ids AS UUID[]),
+                    CAST(:page_nums AS INTEGER[]),
+                    CAST(:access_dates AS VARCHAR[])
+                );
+                """
+            ),
+            {
+                "ids": [str(citation["id"]) for citation in citations],
+                "texts": [citation["text"] for citation in citations],
+                "source_ids": [str(citation["source_id"]) for citation in citations],
+                "summary_ids": [str(citation["summary_id"]) for citation in citations],
+                "page_nums": [citation.get("page_num") for citation in citations],
+                "access_dates": [citation.get("access_date") for citation in citations],
+            },
+        )
+
+    def bulk_create_event_tag_instances(
+        self,
+        tag_instances: list[TagInstanceInput],
+        after: dict[UUID, list[UUID]],
+        session: Session,
+    ) -> None:
+        """Insert the tag instances of many events in a single statement.
+        `after` maps each summary id to the events it follows. Does not
+        commit."""
+        self._insert_tag_instances(
+            [
+                TagInstanceModel(id=uuid4(), **instance.model_dump())
+                for instance in tag_instances
+            ],
+            afters=[
+                json.dumps([str(id) for id in after.get(instance.summary_id, [])])
+                for instance in tag_instances
+            ],
+            session=session,
+        )
+
+    def _insert_tag_instances(
+        self, models: list[TagInstanceModel], afters: list[str], session: Session
+    ) -> None:
+        """Insert tag instances with one statement, passing each column as an
+        array so that the statement and its plan are the same for any number
+        of rows. `afters` holds the JSON encoded after list of each one."""
+        if not models:
+            return
+        session.execute(
+            text(
+                """
+                INSERT INTO tag_instances
+                    (id, start_char, stop_char, summary_id, tag_id, story_order, after)
+                SELECT
+                    id, start_char, stop_char, summary_id, tag_id, story_order,
+                    after::jsonb
+                FROM unnest(
+                    CAST(:ids AS UUID[]),
+                    CAST(:start_chars AS INTEGER[]),
+                    CAST(:stop_chars AS INTEGER[]),
+                    CAST(:summary_ids AS UUID[]),
+                    CAST(:tag_ids AS UUID[]),
+                    CAST(:story_orders AS INTEGER[]),
+                    CAST(:afters AS VARCHAR[])
+                ) AS instance(
+                    id, start_char, stop_char, summary_id, tag_id, story_order, after
+                );
+                """
+            ),
+            {
+                "ids": [str(model.id) for model in models],
+                "start_chars": [model.start_char for model in models],
+                "stop_chars": [model.stop_char for model in models],
+                "summary_ids": [str(model.summary_id) for model in models],
+                "tag_ids": [str(model.tag_id) for model in models],
+                "story_orders": [model.story_order for model in models],
+                "afters": afters,
+            },
+        )
+
     def create_person(
         self,
         id: UUID,
@@ -1090,14 +1741,119 @@ class Repository:
             wikidata_id=wikidata_id,
             wikidata_url=wikidata_url,
         )
-        insert_time = """
-            insert into tags (id, type, wikidata_id, wikidata_url)
-                values (:id, :type, :wikidata_id, :wikidata_url);
-            insert into times (id, datetime, calendar_model, precision)
-                values (:id, :datetime, :calendar_model, :precision);
-        """
-        session.execute(text(insert_time), time_model.model_dump())
-        return time_model
+        insert_time = """
+            insert into tags (id, type, wikidata_id, wikidata_url)
+                values (:id, :type, :wikidata_id, :wikidata_url);
+            insert into times (id, datetime, calendar_model, precision)
+                values (:id, :datetime, :calendar_model, :precision);
+        """
+        session.execute(text(insert_time), time_model.model_dump())
+        return time_model
+
+    # the columns of each tag type's own table, besides id
+    TAG_TYPE_COLUMNS = {
+        "PERSON": ("people", {}),
+        "PLACE": (
+            "places",
+            {"latitude": "DOUBLE PRECISION", "longitude": "DOUBLE PRECISION"},
+        ),
+        "TIME": (
+            "times",
+            {
+                "datetime": "VARCHAR",
+                "calendar_model": "VARCHAR",
+                "precision": "INTEGER",
+            },
+        ),
+    }
+
+    def bulk_create_tags(
+        self,
+        type: Literal["PERSON", "PLACE", "TIME"],
+        tags: list[dict],
+        session: Session,
+    ) -> dict[str, UUID]:
+        """Insert tags of one type in a single statement per table, skipping
+        any whose wikidata id already exists. Each tag is a dict of its id,
+        wikidata_id, wikidata_url and the columns of its type's table.
+        Returns the ids of the inserted tags by wikidata id. Does not commit."""
+        if not tags:
+            return {}
+        rows = session.execute(
+            text(
+                """
+                INSERT INTO tags (id, type, wikidata_id, wikidata_url)
+                SELECT id, :type, wikidata_id, wikidata_url
+                FROM unnest(
+                    CAST(:ids AS UUID[]),
+                    CAST(:wikidata_ids AS VARCHAR[]),
+                    CAST(:wikidata_urls AS VARCHAR[])
+                ) AS tag(id, wikidata_id, wikidata_url)
+                ON CONFLICT (wikidata_id) DO NOTHING
+                RETURNING id, wikidata_id;
+                """
+            ),
+            {
+                "type": type,
+                "ids": [str(tag["id"]) for tag in tags],
+                "wikidata_ids": [tag["wikidata_id"] for tag in tags],
+                "wikidata_urls": [tag["wikidata_url"] for tag in tags],
+            },
+        ).all()
+        created_ids = {row.id for row in rows}
+        created = [tag for tag in tags if tag["id"] in created_ids]
+        if not created:
+            return {}
+        table, columns = self.TAG_TYPE_COLUMNS[type]
+        casts = ", ".join(
+            f"CAST(:{name} AS {column_type}[])" for name, column_type in columns.items()
+        )
+        session.execute(
+            text(
+                f"""
+                INSERT INTO {table} ({", ".join(["id", *columns])})
+                SELECT * FROM unnest(CAST(:id AS UUID[]){", " if casts else ""}{casts});
+                """
+            ),
+            {
+                "id": [str(tag["id"]) for tag in created],
+                **{name: [tag[name] for tag in created] for name in columns},
+            },
+        )
+        return {row.wikidata_id: row.id for row in rows}
+
+    def bulk_add_names_to_new_tags(
+        self, names: dict[UUID, str], session: Session
+    ) -> None:
+        """Ensure each name exists, and associate it with its tag, in two
+        statements. The tags must not have any names yet."""
+        if not names:
+            return
+        session.execute(
+            text(
+                """
+                INSERT INTO names (id, name)
+                SELECT * FROM unnest(CAST(:ids AS UUID[]), CAST(:names AS VARCHAR[]))
+                ON CONFLICT (name) DO NOTHING;
+                INSERT INTO tag_names (tag_id, name_id)
+                SELECT tag.id, names.id
+                FROM unnest(CAST(:tag_ids AS UUID[]), CAST(:names AS VARCHAR[]))
+                    AS tag(id, name)
+                JOIN names ON names.name = tag.name;
+                """
+            ),
+            {
+                "ids": [str(uuid4()) for _ in names],
+                "tag_ids": [str(tag_id) for tag_id in names],
+                "names": list(names.values()),
+            },
+        )
+        if self._name_index is not None:
+            after_commit(session, lambda: self._index_names(names))
+
+    def _index_names(self, names: dict[UUID, str]) -> None:
+        for tag_id, name in names.items():
+            self._name_index.add_name(tag_id, name)
 
     def create_name(self, name: str, session: Session) -> NameModel:
         id = uuid4()
@@ -1215,7 +1971,7 @@ class Repository:
                 join times on tags.id = times.id
                 where tags.id in :tag_ids;
             """
-            ),
+            ).bindparams(bindparam("tag_ids", expanding=True)),
             {"tag_ids": tuple(tag_ids)},
         ).one()
         return row.datetime, row.precision
@@ -1234,12 +1990,16 @@ class Repository:
                 ),
                 {"wikidata_ids": tuple(wikidata_ids)},
             ).all()
+        # in the order requested, with missing tags last
+        position: dict[str, int] = {}
+        for i, wikidata_id in enumerate(wikidata_ids):
+            position.setdefault(wikidata_id, i)
         tag_pointers = [
             TagPointer(
                 id=row.id,
                 wikidata_id=row.wikidata_id,
             )
-            for row in rows
+            for row in sorted(rows, key=lambda row: position[row.wikidata_id])
         ]
         existing_wiki_ids = {tag.wikidata_id for tag in tag_pointers}
         for wikidata_id in wikidata_ids:
@@ -1276,10 +2036,31 @@ class Repository:
                 values (:tag_id, :name_id);
         """
         session.execute(text(stmt), tag_names.model_dump())
+        if self._name_index is not None:
+            after_commit(session, lambda: self._name_index.add_name(tag_id, name))
 
     def add_story_names(
         self, tag_id: UUID, session: Session, story_names: list[StoryName]
     ) -> None:
+        self.bulk_add_story_names({tag_id: story_names}, session=session)
+
+    def bulk_add_story_names(
+        self, story_names: dict[UUID, list[StoryName]], session: Session
+    ) -> None:
+        """Add the story names of many tags in a single statement."""
+        params = [
+            {
+                "id": uuid4(),
+                "tag_id": tag_id,
+                "name": story_name.name,
+                "lang": story_name.lang,
+                "description": story_name.description,
+            }
+            for tag_id, names in story_names.items()
+            for story_name in names
+        ]
+        if not params:
+            return
         session.execute(
             text(
                 """
@@ -1287,17 +2068,28 @@ class Repository:
                 values (:id, :tag_id, :name, :lang, :description)
             """
             ),
-            [
-                {
-                    "id": uuid4(),
-                    "tag_id": tag_id,
-                    "name": story_name.name,
-                    "lang": story_name.lang,
-                    "description": story_name.description,
-                }
-                for story_name in story_names
-            ],
+            params,
         )
+        if self._name_index is not None:
+            after_commit(session, lambda: self._index_story_names(story_names))
+
+    def _index_story_names(self, story_names: dict[UUID, list[StoryName]]) -> None:
+        for tag_id, names in story_names.items():
+            if not names:
+                continue
+            # as in story_stats, the first name and description are the story's
+            self._name_index.set_story(
+                tag_id,
+                name=names[0].name,
+                description=next(
+                    (
+                        story_name.description
+                        for story_name in names
+                        if story_name.description is not None
+                    ),
+                    None,
+                ),
+            )
 
     def create_source(
         self,
@@ -1330,6 +2122,22 @@ class Repository:
             session.commit()
             self._add_to_source_trie(source)
 
+    def get_wikidata_source_id(self) -> UUID:
+        """The id of the source which all wikidata citations refer to, created
+        the first time it is needed."""
+        source = self.get_source_by_title(title="Wikidata")
+        if source:
+            return UUID(source.id)
+        source_id = uuid4()
+        self.create_source(
+            id=source_id,
+            title="Wikidata",
+            author="Wikidata Contributors",
+            publisher="Wikimedia Foundation",
+            pub_date=None,
+        )
+        return source_id
+
     def get_source_by_title(self, title: str) -> ADMSource | None:
         with Session(self._engine, future=True) as session:
             row = session.execute(
@@ -1428,53 +2236,17 @@ class Repository:
         after: list[UUID],
         session: Session,
     ) -> list[TagInstanceModel]:
-        """Create multiple tag instances in a single operation for better performance."""
-        # Group tag instances by tag_id for efficient story ordering
-        instances_by_tag = defaultdict(list)
-        for instance in tag_instances:
-            instances_by_tag[instance.tag_id].append(instance)
-
-        # Process each tag group
-        result_instances = []
-
-        for tag_id, instances in instances_by_tag.items():
-            # Prepare all instances for this tag
-            models = []
-            values = []
-
-            for i, instance in enumerate(instances):
-                instance_id = uuid4()
-
-                model = TagInstanceModel(
-                    id=instance_id,
-                    **instance.model_dump(),
-                )
-                models.append(model)
-
-                values.append(model.model_dump())
-
-            if values:
-                placeholders = []
-                all_params = {"after": json.dumps([str(id) for id in after])}
-
-                for i, val in enumerate(values):
-                    placeholder = f"(:id_{i}, :start_char_{i}, :stop_char_{i}, :summary_id_{i}, :tag_id_{i}, :story_order_{i}, :after)"
-                    placeholders.append(placeholder)
-
-                    for key, value in val.items():
-                        all_params[f"{key}_{i}"] = value
-
-                stmt = f"""
-                    INSERT INTO tag_instances
-                        (id, start_char, stop_char, summary_id, tag_id, story_order, after)
-                    VALUES
-                        {', '.join(placeholders)}
-                """
-                session.execute(text(stmt), all_params)
-
-            result_instances.extend(models)
-
-        return result_instances
+        """Create multiple tag instances, all following the events in `after`,
+        in a single statement."""
+        models = [
+            TagInstanceModel(id=uuid4(), **instance.model_dump())
+            for instance in tag_instances
+        ]
+        after_json = json.dumps([str(id) for id in after])
+        self._insert_tag_instances(
+            models, afters=[after_json] * len(models), session=session
+        )
+        return models
 
     def update_null_story_order(self, tag_id: UUID, session: Session) -> None:
         """
@@ -1515,7 +2287,7 @@ class Repository:
                         JOIN tags t ON t.id = ti.tag_id AND t.type = 'TIME'
                         JOIN times ON times.id = t.id
                         WHERE s.id = tag_instances.summary_id
-                        ORDER BY times.datetime, times.precision
+                        ORDER BY times.sort_key
                         LIMIT 1
                     ) AS datetime,
                     (
@@ -1525,7 +2297,7 @@ class Repository:
                         JOIN tags t ON t.id = ti.tag_id AND t.type = 'TIME'
                         JOIN times ON times.id = t.id
                         WHERE s.id = tag_instances.summary_id
-                        ORDER BY times.datetime, times.precision
+                        ORDER BY times.sort_key
                         LIMIT 1
                     ) AS precision
                 FROM tag_instances
@@ -1561,6 +2333,7 @@ class Repository:
             except RebalanceError:
                 # commit current state so current calculations are included in the rebalance
                 if instance_updates:
+                    self.bump_revisions([tag_id], session=session)
                     self._bulk_update_story_order(
                         instance_updates=instance_updates,
                         session=session,
@@ -1587,6 +2360,7 @@ class Repository:
 
         # Update all instances in a single operation
         if instance_updates:
+            self.bump_revisions([tag_id], session=session)
             self._bulk_update_story_order(
                 instance_updates=instance_updates, session=session, tag_id=tag_id
             )
@@ -1594,24 +2368,43 @@ class Repository:
     def _bulk_update_story_order(
         self, instance_updates: list[dict[str, int]], session: Session, tag_id: UUID
     ):
-        # Prepare the SQL for bulk update
-        update_stmt = "UPDATE tag_instances SET story_order = CASE id "
-        params = {"tag_id": tag_id}
-        id_list = []
-        for i, update in enumerate(instance_updates):
-            update_stmt += f"WHEN :id_{i} THEN :order_{i} "
-            params[f"id_{i}"] = update["id"]
-            params[f"order_{i}"] = update["story_order"]
-            id_list.append(f":id_{i}")
-        update_stmt += (
-            "ELSE story_order END WHERE tag_id = :tag_id AND id IN ("
-            + ", ".join(id_list)
-            + ")"
+        self._set_story_orders(
+            ids=[update["id"] for update in instance_updates],
+            story_orders=[update["story_order"] for update in instance_updates],
+            tag_id=tag_id,
+            session=session,
         )
-        # Execute the update
-        session.execute(text(update_stmt), params)
         session.commit()
 
+    def _set_story_orders(
+        self,
+        ids: list[UUID],
+        story_orders: list[int],
+        tag_id: UUID,
+        session: Session,
+    ) -> None:
+        """Set the story order of many of a tag's instances with one statement,
+        whose plan doesn't depend on the number of rows."""
+        session.execute(
+            text(
+                """
+                UPDATE tag_instances
+                SET story_order = updates.story_order
+                FROM unnest(
+                    CAST(:ids AS UUID[]),
+                    CAST(:story_orders AS INTEGER[])
+                ) AS updates(id, story_order)
+                WHERE tag_instances.id = updates.id
+                AND tag_instances.tag_id = :tag_id;
+                """
+            ),
+            {
+                "ids": [str(id) for id in ids],
+                "story_orders": story_orders,
+                "tag_id": tag_id,
+            },
+        )
+
     def rebalance_story_order(self, tag_id: UUID, session: Session) -> dict[UUID, int]:
         """Rebalances story_order values for a given tag_id.
 
@@ -1643,6 +2436,8 @@ class Repository:
         if not rows:
             return {}
 
+        self.bump_revisions([tag_id], session=session)
+
         # First set all story_orders to NULL to avoid unique constraint violations
         session.execute(
             text(
@@ -1650,7 +2445,7 @@ class Repository:
                 UPDATE tag_instances 
                 SET story_order = NULL 
                 WHERE tag_id = :tag_id 
-                AND id IN (SELECT id FROM tag_instances WHERE tag_id = :tag_id AND story_order IS NOT NULL)
+                AND story_order IS NOT NULL
                 """
             ),
             {"tag_id": tag_id},
@@ -1660,33 +2455,16 @@ class Repository:
         BASE_ORDER = 100_000  # Start at 100,000 to match existing pattern
         INTERVAL = 1_000
 
-        updates = []
-        result = {}
-        for i, row in enumerate(rows):
-            new_order = BASE_ORDER + (i * INTERVAL)
-            updates.append({"id": row.id, "story_order": new_order})
-            result[row.id] = new_order
+        result = {row.id: BASE_ORDER + (i * INTERVAL) for i, row in enumerate(rows)}
 
         # Update all instances in a single operation
-        if updates:
-            update_stmt = "UPDATE tag_instances SET story_order = CASE id "
-            params = {"tag_id": tag_id}
-            id_list = []
-
-            for i, update in enumerate(updates):
-                update_stmt += f"WHEN :id_{i} THEN :order_{i} "
-                params[f"id_{i}"] = update["id"]
-                params[f"order_{i}"] = update["story_order"]
-                id_list.append(f":id_{i}")
-
-            update_stmt += (
-                "ELSE story_order END WHERE tag_id = :tag_id AND id IN ("
-                + ", ".join(id_list)
-                + ")"
-            )
-
-            session.execute(text(update_stmt), params)
-            session.commit()
+        self._set_story_orders(
+            ids=list(result),
+            story_orders=list(result.values()),
+            tag_id=tag_id,
+            session=session,
+        )
+        session.commit()
         return result
 
     def get_nearby_events(
@@ -1702,51 +2480,117 @@ class Repository:
         session: Session | None = None,
     ) -> list[NearbyEventRow]:
         """Find events near the given event based on time and location."""
+        return self.get_nearby_events_at_finest_precision(
+            event_id=event_id,
+            calendar_model=calendar_model,
+            levels=[(precision, datetime_prefix)],
+            min_lat=min_lat,
+            max_lat=max_lat,
+            min_lng=min_lng,
+            max_lng=max_lng,
+            session=session,
+        )
+
+    def get_nearby_events_at_finest_precision(
+        self,
+        event_id: UUID,
+        calendar_model: str,
+        levels: list[tuple[int, str]],
+        min_lat: float,
+        max_lat: float,
+        min_lng: float,
+        max_lng: float,
+        session: Session | None = None,
+    ) -> list[NearbyEventRow]:
+        """Find events near the given event at several (precision, datetime
+        prefix) levels at once, returning only the matches of the finest level
+        which has any.
+
+        Each coarser level's time range contains the finer ones, so the
+        coarsest level selects every candidate, and each candidate is tagged
+        with the finest level it satisfies.
+        """
         stmt = text(
             """
-            SELECT DISTINCT
-                s.id AS event_id,
-                person_tag.id AS story_id,
-                person_name.name AS person_name,
-                sn.description AS person_description,
-                s.text AS summary_text,
-                place_name.name AS place_name,
-                s.latitude,
-                s.longitude,
-                s.datetime,
-                s.precision,
-                s.calendar_model
-            FROM summaries s
-            -- join to person tag via tag_instances
-            JOIN tag_instances person_ti ON person_ti.summary_id = s.id
-            JOIN tags person_tag ON person_tag.id = person_ti.tag_id AND person_tag.type = 'PERSON'
-            JOIN tag_names person_tn ON person_tn.tag_id = person_tag.id
-            JOIN names person_name ON person_name.id = person_tn.name_id
-            -- person description from story_names
-            LEFT JOIN story_names sn ON sn.tag_id = person_tag.id
-            -- join to place tag via tag_instances
-            JOIN tag_instances place_ti ON place_ti.summary_id = s.id
-            JOIN tags place_tag ON place_tag.id = place_ti.tag_id AND place_tag.type = 'PLACE'
-            JOIN tag_names place_tn ON place_tn.tag_id = place_tag.id
-            JOIN names place_name ON place_name.id = place_tn.name_id
-            WHERE s.id != :event_id
-                AND s.calendar_model = :calendar_model
-                AND s.precision >= :precision
-                AND s.datetime LIKE :datetime_prefix
-                AND s.latitude BETWEEN :min_lat AND :max_lat
-                AND s.longitude BETWEEN :min_lng AND :max_lng
+            WITH levels AS (
+                SELECT * FROM unnest(
+                    CAST(:precisions AS INTEGER[]),
+                    CAST(:min_time_keys AS BIGINT[]),
+                    CAST(:max_time_keys AS BIGINT[])
+                ) AS level(precision, min_time_key, max_time_key)
+            ),
+            matches AS (
+                SELECT DISTINCT
+                    s.id AS event_id,
+                    person_tag.id AS story_id,
+                    person_name.name AS person_name,
+                    sn.description AS person_description,
+                    s.text AS summary_text,
+                    place_name.name AS place_name,
+                    s.latitude,
+                    s.longitude,
+                    s.datetime,
+                    s.precision,
+                    s.calendar_model,
+                    (
+                        SELECT max(levels.precision) FROM levels
+                        WHERE s.precision >= levels.precision
+                        AND s.time_key BETWEEN levels.min_time_key
+                            AND levels.max_time_key
+                    ) AS matched_precision
+                FROM summaries s
+                -- join to person tag via tag_instances
+                JOIN tag_instances person_ti ON person_ti.summary_id = s.id
+                JOIN tags person_tag ON person_tag.id = person_ti.tag_id AND person_tag.type = 'PERSON'
+                JOIN tag_names person_tn ON person_tn.tag_id = person_tag.id
+                JOIN names person_name ON person_name.id = person_tn.name_id
+                -- person description from story_names
+                LEFT JOIN story_names sn ON sn.tag_id = person_tag.id
+                -- join to place tag via tag_instances
+                JOIN tag_instances place_ti ON place_ti.summary_id = s.id
+                JOIN tags place_tag ON place_tag.id = place_ti.tag_id AND place_tag.type = 'PLACE'
+                JOIN tag_names place_tn ON place_tn.tag_id = place_tag.id
+                JOIN names place_name ON place_name.id = place_tn.name_id
+                WHERE s.id != :event_id
+                    AND s.calendar_model = :calendar_model
+                    AND s.precision >= :precision
+                    -- served together by idx_summaries_spacetime
+                    AND s.time_key BETWEEN CAST(:min_time_key AS BIGINT)
+                        AND CAST(:max_time_key AS BIGINT)
+                    -- a viewport across the antimeridian is two boxes
+                    AND (
+                        point(s.longitude, s.latitude) <@ box(
+                            point(:first_min_lng, :min_lat),
+                            point(:first_max_lng, :max_lat)
+                        )
+                        OR point(s.longitude, s.latitude) <@ box(
+                            point(:last_min_lng, :min_lat),
+                            point(:last_max_lng, :max_lat)
+                        )
+                    )
+            )
+            SELECT * FROM matches
+            WHERE matched_precision = (SELECT max(matched_precision) FROM matches)
         """
         )
 
+        boxes = viewport_boxes(min_lat, max_lat, min_lng, max_lng)
+        if not boxes:
+            return []
+        time_key_ranges = [time_key_range(prefix) for _, prefix in levels]
         params = {
             "event_id": event_id,
             "calendar_model": calendar_model,
-            "precision": precision,
-            "datetime_prefix": datetime_prefix + "%",
+            "precisions": [precision for precision, _ in levels],
+            "min_time_keys": [low for low, _ in time_key_ranges],
+            "max_time_keys": [high for _, high in time_key_ranges],
+            # the coarsest level
+            "precision": min(precision for precision, _ in levels),
+            "min_time_key": min(low for low, _ in time_key_ranges),
+            "max_time_key": max(high for _, high in time_key_ranges),
             "min_lat": min_lat,
             "max_lat": max_lat,
-            "min_lng": min_lng,
-            "max_lng": max_lng,
+            **self._viewport_params(boxes),
         }
 
         should_close = False
@@ -1776,64 +2620,314 @@ class Repository:
             if should_close:
                 session.close()
 
+    def get_nearby_clusters(
+        self,
+        calendar_model: str,
+        precision: int,
+        datetime_prefix: str,
+        zoom: int,
+        min_lat: float,
+        max_lat: float,
+        min_lng: float,
+        max_lng: float,
+        session: Session | None = None,
+    ) -> list[NearbyClusterRow]:
+        """Group the events in the time window and bounding box by their grid
+        cell at the given zoom, returning each cell's centroid, its number of
+        events and its most precise event. As in get_nearby_events, only
+        events with a named person and place are counted."""
+        stmt = text(
+            """
+            WITH events AS (
+                SELECT
+                    ((s.grid_cell >> CAST(:column_shift AS INTEGER))
+                        << CAST(:zoom AS INTEGER))
+                    | ((s.grid_cell & CAST(:row_mask AS BIGINT))
+                        >> CAST(:row_shift AS INTEGER)) AS cell,
+                    s.id,
+                    s.latitude,
+                    s.longitude,
+                    s.precision,
+                    s.time_key
+                FROM summaries s
+                WHERE s.calendar_model = :calendar_model
+                    AND s.precision >= :precision
+                    -- served together by idx_summaries_spacetime
+                    AND s.time_key BETWEEN CAST(:min_time_key AS BIGINT)
+                        AND CAST(:max_time_key AS BIGINT)
+                    -- a viewport across the antimeridian is two boxes
+                    AND (
+                        point(s.longitude, s.latitude) <@ box(
+                            point(:first_min_lng, :min_lat),
+                            point(:first_max_lng, :max_lat)
+                        )
+                        OR point(s.longitude, s.latitude) <@ box(
+                            point(:last_min_lng, :min_lat),
+                            point(:last_max_lng, :max_lat)
+                        )
+                    )
+                    AND EXISTS (
+                        SELECT FROM tag_instances ti
+                        JOIN tags t ON t.id = ti.tag_id AND t.type = 'PERSON'
+                        JOIN tag_names tn ON tn.tag_id = t.id
+                        WHERE ti.summary_id = s.id
+                    )
+                    AND EXISTS (
+                        SELECT FROM tag_instances ti
+                        JOIN tags t ON t.id = ti.tag_id AND t.type = 'PLACE'
+                        JOIN tag_names tn ON tn.tag_id = t.id
+                        WHERE ti.summary_id = s.id
+                    )
+            ),
+            cells AS (
+                SELECT
+                    cell,
+                    count(*) AS count,
+                    avg(latitude) AS latitude,
+                    avg(longitude) AS longitude
+                FROM events
+                GROUP BY cell
+            ),
+            representatives AS (
+                SELECT DISTINCT ON (cell) cell, id AS representative_id
+                FROM events
+                ORDER BY cell, precision DESC, time_key, id
+            )
+            SELECT
+                cells.cell,
+                cells.count,
+                cells.latitude AS cell_latitude,
+                cells.longitude AS cell_longitude,
+                representative.*
+            FROM cells
+            JOIN representatives ON representatives.cell = cells.cell
+            JOIN LATERAL (
+                SELECT
+                    s.id AS event_id,
+                    person_tag.id AS story_id,
+                    person_name.name AS person_name,
+                    sn.description AS person_description,
+                    s.text AS summary_text,
+                    place_name.name AS place_name,
+                    s.latitude,
+                    s.longitude,
+                    s.datetime,
+                    s.precision,
+                    s.calendar_model
+                FROM summaries s
+                JOIN tag_instances person_ti ON person_ti.summary_id = s.id
+                JOIN tags person_tag ON person_tag.id = person_ti.tag_id AND person_tag.type = 'PERSON'
+                JOIN tag_names person_tn ON person_tn.tag_id = person_tag.id
+                JOIN names person_name ON person_name.id = person_tn.name_id
+                LEFT JOIN story_names sn ON sn.tag_id = person_tag.id
+                JOIN tag_instances place_ti ON place_ti.summary_id = s.id
+                JOIN tags place_tag ON place_tag.id = place_ti.tag_id AND place_tag.type = 'PLACE'
+                JOIN tag_names place_tn ON place_tn.tag_id = place_tag.id
+                JOIN names place_name ON place_name.id = place_tn.name_id
+                WHERE s.id = representatives.representative_id
+                ORDER BY person_name.name, place_name.name
+                LIMIT 1
+            ) AS representative ON true
+            ORDER BY cells.cell
+        """
+        )
+        boxes = viewport_boxes(min_lat, max_lat, min_lng, max_lng)
+        if not boxes:
+            return []
+        min_time_key, max_time_key = time_key_range(datetime_prefix)
+        params = {
+            "zoom": zoom,
+            "column_shift": 2 * GRID_ZOOM - zoom,
+            "row_shift": GRID_ZOOM - zoom,
+            "row_mask": (1 << GRID_ZOOM) - 1,
+            "calendar_model": calendar_model,
+            "precision": precision,
+            "min_time_key": min_time_key,
+            "max_time_key": max_time_key,
+            "min_lat": min_lat,
+            "max_lat": max_lat,
+            **self._viewport_params(boxes),
+        }
+        with self._use_session(session) as session:
+            rows = session.execute(stmt, params).all()
+        return [
+            NearbyClusterRow(
+                cell=row.cell,
+                count=row.count,
+                latitude=row.cell_latitude,
+                longitude=row.cell_longitude,
+                event=NearbyEventRow(
+                    event_id=row.event_id,
+                    story_id=row.story_id,
+                    person_name=row.person_name,
+                    person_description=row.person_description,
+                    summary_text=row.summary_text,
+                    place_name=row.place_name,
+                    latitude=row.latitude,
+                    longitude=row.longitude,
+                    datetime=row.datetime,
+                    precision=row.precision,
+                    calendar_model=row.calendar_model,
+                ),
+            )
+            for row in rows
+        ]
+
+    @staticmethod
+    def _viewport_params(
+        boxes: list[tuple[float, float, float, float]]
+    ) -> dict[str, float]:
+        """The longitudes of the two boxes the nearby queries match against:
+        the viewport's boxes, the one box repeated if it has only one."""
+        (_, _, first_min_lng, first_max_lng) = boxes[0]
+        (_, _, last_min_lng, last_max_lng) = boxes[-1]
+        return {
+            "first_min_lng": first_min_lng,
+            "first_max_lng": first_max_lng,
+            "last_min_lng": last_min_lng,
+            "last_max_lng": last_max_lng,
+        }
+
+    def get_nearby_index_rows(
+        self,
+        summary_ids: list[UUID] | None = None,
+        session: Session | None = None,
+    ) -> Iterator[NearbyIndexRow]:
+        """Stream the rows of get_nearby_events_at_finest_precision, without its
+        filters, for every event or only the given ones."""
+        summary_filter = "AND s.id IN :summary_ids" if summary_ids is not None else ""
+        stmt = text(
+            f"""
+            SELECT DISTINCT
+                s.id AS event_id,
+                person_tag.id AS story_id,
+                person_name.name AS person_name,
+                sn.description AS person_description,
+                s.text AS summary_text,
+                place_name.name AS place_name,
+                s.latitude,
+                s.longitude,
+                s.datetime,
+                s.precision,
+                s.calendar_model,
+                s.time_key
+            FROM summaries s
+            JOIN tag_instances person_ti ON person_ti.summary_id = s.id
+            JOIN tags person_tag ON person_tag.id = person_ti.tag_id AND person_tag.type = 'PERSON'
+            JOIN tag_names person_tn ON person_tn.tag_id = person_tag.id
+            JOIN names person_name ON person_name.id = person_tn.name_id
+            LEFT JOIN story_names sn ON sn.tag_id = person_tag.id
+            JOIN tag_instances place_ti ON place_ti.summary_id = s.id
+            JOIN tags place_tag ON place_tag.id = place_ti.tag_id AND place_tag.type = 'PLACE'
+            JOIN tag_names place_tn ON place_tn.tag_id = place_tag.id
+            JOIN names place_name ON place_name.id = place_tn.name_id
+            WHERE s.calendar_model IS NOT NULL
+                AND s.precision IS NOT NULL
+                AND s.time_key IS NOT NULL
+                AND s.latitude IS NOT NULL
+                AND s.longitude IS NOT NULL
+                {summary_filter}
+        """
+        )
+        params = {}
+        if summary_ids is not None:
+            stmt = stmt.bindparams(bindparam("summary_ids", expanding=True))
+            params["summary_ids"] = summary_ids
+
+        with self._use_session(session) as session:
+            result = session.execute(
+                stmt, params, execution_options={"yield_per": 10_000}
+            )
+            for row in result:
+                yield NearbyIndexRow(**row._mapping)
+
+    def get_story_search_rows(
+        self, session: Session | None = None
+    ) -> Iterator[StorySearchRow]:
+        """Stream every named story with the names it is searched by: the
+        names of a wikidata story's tag, or a text-reader story's own name."""
+        stmt = text(
+            """
+            SELECT
+                stats.story_id,
+                stats.name,
+                stats.description,
+                stats.earliest_year,
+                stats.latest_year,
+                s.id IS NOT NULL AS text_reader,
+                CASE WHEN s.id IS NOT NULL THEN ARRAY[s.name]
+                ELSE ARRAY(
+                    SELECT names.name
+                    FROM tag_names
+                    JOIN names ON names.id = tag_names.name_id
+                    WHERE tag_names.tag_id = stats.story_id
+                ) END AS search_names
+            FROM story_stats stats
+            LEFT JOIN stories s ON s.id = stats.story_id
+            WHERE stats.name IS NOT NULL
+        """
+        )
+        with self._use_session(session) as session:
+            result = session.execute(stmt, execution_options={"yield_per": 10_000})
+            for row in result:
+                yield StorySearchRow(**row._mapping)
+
     # --- Text Reader methods ---
 
     def search_tags_by_name_and_type(self, name: str, tag_type: str) -> list[dict]:
         """Fuzzy search tags by name filtered by type (PERSON, PLACE, TIME).
 
-        Also returns description (from story_names) and earliest/latest summary
-        dates (from tag_instances → summaries) to aid entity disambiguation.
+        Also returns description and earliest/latest summary dates (from
+        story_stats) to aid entity disambiguation.
         """
-        if not name:
-            return []
+        return self.search_tags_by_names_and_type(names=[name], tag_type=tag_type)[0]
+
+    def search_tags_by_names_and_type(
+        self, names: list[str], tag_type: str
+    ) -> list[list[dict]]:
+        """search_tags_by_name_and_type for many names in one query. Returns
+        the candidates of each name, in the order of the names."""
+        results: list[list[dict]] = [[] for _ in names]
+        if not any(names):
+            return results
         with Session(self._engine, future=True) as session:
             rows = session.execute(
                 text(
                     """
-                    WITH matches AS (
+                    SELECT
+                        query.idx,
+                        m.id,
+                        m.name,
+                        m.type,
+                        stats.description,
+                        stats.earliest_datetime AS earliest_date,
+                        stats.latest_datetime AS latest_date
+                    FROM unnest(CAST(:names AS VARCHAR[]))
+                        WITH ORDINALITY AS query(name, idx)
+                    CROSS JOIN LATERAL (
                         SELECT DISTINCT
                             tags.id,
                             names.name,
                             tags.type,
-                            similarity(names.name, :search_term) AS sim
+                            similarity(names.name, query.name) AS sim
                         FROM tags
                         JOIN tag_names ON tags.id = tag_names.tag_id
                         JOIN names ON names.id = tag_names.name_id
                         WHERE tags.type = :tag_type
-                          AND (similarity(names.name, :search_term) > 0.3
-                               OR names.name ILIKE :like_pattern)
+                          AND (similarity(names.name, query.name) > 0.3
+                               OR names.name ILIKE '%' || query.name || '%')
                         ORDER BY sim DESC
                         LIMIT 20
-                    )
-                    SELECT
-                        m.id,
-                        m.name,
-                        m.type,
-                        m.sim,
-                        (SELECT sn.description
-                           FROM story_names sn
-                          WHERE sn.tag_id = m.id
-                            AND sn.description IS NOT NULL
-                          LIMIT 1) AS description,
-                        (SELECT MIN(s.datetime)
-                           FROM tag_instances ti
-                           JOIN summaries s ON s.id = ti.summary_id
-                          WHERE ti.tag_id = m.id) AS earliest_date,
-                        (SELECT MAX(s.datetime)
-                           FROM tag_instances ti
-                           JOIN summaries s ON s.id = ti.summary_id
-                          WHERE ti.tag_id = m.id) AS latest_date
-                    FROM matches m
-                    ORDER BY m.sim DESC
+                    ) AS m
+                    LEFT JOIN story_stats stats ON stats.story_id = m.id
+                    WHERE query.name <> ''
+                    ORDER BY query.idx, m.sim DESC
                     """
                 ),
-                {
-                    "tag_type": tag_type,
-                    "search_term": name,
-                    "like_pattern": f"%{name}%",
-                },
+                {"names": names, "tag_type": tag_type},
             ).all()
-            return [
+        for row in rows:
+            results[row.idx - 1].append(
                 {
                     "id": row.id,
                     "name": row.name,
@@ -1842,8 +2936,8 @@ class Repository:
                     "earliest_date": row.earliest_date,
                     "latest_date": row.latest_date,
                 }
-                for row in rows
-            ]
+            )
+        return results
 
     def search_places_by_name_and_coordinates(
         self,
@@ -1853,87 +2947,105 @@ class Repository:
         radius: float = 1.0,
     ) -> list[dict]:
         """Search places by name and/or coordinates."""
-        results = []
-
+        return self.search_places_by_names_and_coordinates(
+            queries=[PlaceQuery(name=name, latitude=latitude, longitude=longitude)],
+            radius=radius,
+        )[0]
+
+    def search_places_by_names_and_coordinates(
+        self, queries: list[PlaceQuery], radius: float = 1.0
+    ) -> list[list[dict]]:
+        """search_places_by_name_and_coordinates for many places in one query.
+        Returns the candidates of each query, in the order of the queries:
+        the places matching its name, then any other places within `radius`
+        degrees of its coordinates."""
+        results: list[list[dict]] = [[] for _ in queries]
+        if not queries:
+            return results
         with Session(self._engine, future=True) as session:
-            if name:
-                rows = session.execute(
-                    text(
-                        """
-                        SELECT DISTINCT
-                            tags.id,
-                            names.name,
-                            places.latitude,
-                            places.longitude,
-                            similarity(names.name, :search_term) AS sim
-                        FROM tags
-                        JOIN tag_names ON tags.id = tag_names.tag_id
-                        JOIN names ON names.id = tag_names.name_id
-                        JOIN places ON places.id = tags.id
-                        WHERE tags.type = 'PLACE'
-                          AND (similarity(names.name, :search_term) > 0.3
-                               OR names.name ILIKE :like_pattern)
-                        ORDER BY sim DESC
-                        LIMIT 50
-                        """
-                    ),
-                    {
-                        "search_term": name,
-                        "like_pattern": f"%{name}%",
-                    },
-                ).all()
-                results.extend(
-                    [
-                        {
-                            "id": row.id,
-                            "name": row.name,
-                            "latitude": row.latitude,
-                            "longitude": row.longitude,
-                        }
-                        for row in rows
-                    ]
-                )
-
-            if latitude is not None and longitude is not None:
-                rows = session.execute(
-                    text(
-                        """
-                        SELECT DISTINCT
-                            tags.id,
-                            names.name,
-                            places.latitude,
-                            places.longitude
-                        FROM tags
-                        JOIN tag_names ON tags.id = tag_names.tag_id
-                        JOIN names ON names.id = tag_names.name_id
-                        JOIN places ON places.id = tags.id
-                        WHERE tags.type = 'PLACE'
-                          AND places.latitude BETWEEN :min_lat AND :max_lat
-                          AND places.longitude BETWEEN :min_lng AND :max_lng
-                        LIMIT 20
-                        """
-                    ),
-                    {
-                        "min_lat": latitude - radius,
-                        "max_lat": latitude + radius,
-                        "min_lng": longitude - radius,
-                        "max_lng": longitude + radius,
-                    },
-                ).all()
-                existing_ids = {r["id"] for r in results}
-                results.extend(
-                    [
-                        {
-                            "id": row.id,
-                            "name": row.name,
-                            "latitude": row.latitude,
-                            "longitude": row.longitude,
-                        }
-                        for row in rows
-                        if row.id not in existing_ids
-                    ]
-                )
-
+            rows = session.execute(
+                text(
+                    """
+                    WITH queries AS (
+                        SELECT * FROM unnest(
+                            CAST(:names AS VARCHAR[]),
+                            CAST(:latitudes AS DOUBLE PRECISION[]),
+                            CAST(:longitudes AS DOUBLE PRECISION[])
+                        ) WITH ORDINALITY AS query(name, latitude, longitude, idx)
+                    )
+                    SELECT * FROM (
+                        SELECT queries.idx, true AS by_name, by_name.*
+                        FROM queries
+                        CROSS JOIN LATERAL (
+                            SELECT DISTINCT
+                                tags.id,
+                                names.name,
+                                places.latitude,
+                                places.longitude,
+                                similarity(names.name, queries.name) AS sim
+                            FROM tags
+                            JOIN tag_names ON tags.id = tag_names.tag_id
+                            JOIN names ON names.id = tag_names.name_id
+                            JOIN places ON places.id = tags.id
+                            WHERE tags.type = 'PLACE'
+                              AND (similarity(names.name, queries.name) > 0.3
+                                   OR names.name ILIKE '%' || queries.name || '%')
+                            ORDER BY sim DESC
+                            LIMIT 50
+                        ) AS by_name
+                        WHERE queries.name <> ''
+                        UNION ALL
+                        SELECT queries.idx, false AS by_name, nearby.*
+                        FROM queries
+                        CROSS JOIN LATERAL (
+                            SELECT DISTINCT
+                                tags.id,
+                                names.name,
+                                places.latitude,
+                                places.longitude,
+                                NULL::real AS sim
+                            FROM tags
+                            JOIN tag_names ON tags.id = tag_names.tag_id
+                            JOIN names ON names.id = tag_names.name_id
+                            JOIN places ON places.id = tags.id
+                            WHERE tags.type = 'PLACE'
+                              AND places.latitude
+                                  BETWEEN queries.latitude - :radius
+                                  AND queries.latitude + :radius
+                              AND places.longitude
+                                  BETWEEN queries.longitude - :radius
+                                  AND queries.longitude + :radius
+                            LIMIT 20
+                        ) AS nearby
+                        WHERE queries.latitude IS NOT NULL
+                          AND queries.longitude IS NOT NULL
+                    ) AS candidates
+                    ORDER BY idx, by_name DESC, sim DESC
+                    """
+                ),
+                {
+                    "names": [query.name for query in queries],
+                    "latitudes": [query.latitude for query in queries],
+                    "longitudes": [query.longitude for query in queries],
+                    "radius": radius,
+                },
+            ).all()
+        name_match_ids: list[set[UUID]] = [set() for _ in queries]
+        for row in rows:
+            match_ids = name_match_ids[row.idx - 1]
+            if row.by_name:
+                match_ids.add(row.id)
+            elif row.id in match_ids:
+                # already a candidate by name
+                continue
+            results[row.idx - 1].append(
+                {
+                    "id": row.id,
+                    "name": row.name,
+                    "latitude": row.latitude,
+                    "longitude": row.longitude,
+                }
+            )
         return results
 
     def find_matching_summary(
@@ -2005,6 +3117,11 @@ class Repository:
                 },
             )
             session.commit()
+        if self._name_index is not None:
+            self._name_index.add_name(id, name)
+            self._name_index.set_story(
+                id, name=name, description=description, text_reader=True
+            )
 
     def add_summary_to_story(
         self, story_id: UUID, summary_id: UUID, position: int
@@ -2025,6 +3142,7 @@ class Repository:
                     "position": position,
                 },
             )
+            self.bump_revisions([story_id], session=session)
             session.commit()
 
     def get_story_by_source_id(self, source_id: UUID) -> dict | None:
@@ -1,10 +1,43 @@
-from sqlalchemy import Column, String, TIMESTAMP, Index, Boolean
+from sqlalchemy import (
+    DDL,
+    Column,
+    String,
+    TIMESTAMP,
+    Index,
+    Boolean,
+    Computed,
+    Sequence,
+    event,
+)
 from sqlalchemy.orm import relationship, declarative_base
 from sqlalchemy.sql.schema import ForeignKey, Table, UniqueConstraint
-from sqlalchemy.dialects.postgresql import VARCHAR, INTEGER, FLOAT, UUID, JSONB
+from sqlalchemy.dialects.postgresql import VARCHAR, INTEGER, BIGINT, FLOAT, UUID, JSONB
 
 Base = declarative_base()
 
+# The generated time columns of summaries and times parse the wikidata
+# datetime string with these functions, by the same rule as
+# apps.history.time_key. They're created along with either table here, and
+# by the add_datetime_functions migration in migrated databases.
+DATETIME_FUNCTIONS = DDL(
+    """
+    CREATE OR REPLACE FUNCTION datetime_parts(datetime VARCHAR) RETURNS TEXT[] AS $$
+        SELECT regexp_match(datetime, '^([+-]?)([0-9]+)-([0-9]{2})-([0-9]{2})')
+    $$ LANGUAGE sql IMMUTABLE STRICT PARALLEL SAFE;
+
+    CREATE OR REPLACE FUNCTION datetime_year(datetime VARCHAR) RETURNS BIGINT AS $$
+        SELECT (CASE WHEN parts[1] = '-' THEN -1 ELSE 1 END) * parts[2]::bigint
+        FROM datetime_parts(datetime) AS parts
+    $$ LANGUAGE sql IMMUTABLE STRICT PARALLEL SAFE;
+
+    CREATE OR REPLACE FUNCTION datetime_time_key(datetime VARCHAR) RETURNS BIGINT AS $$
+        SELECT datetime_year(datetime) * 10000
+            + parts[3]::bigint * 100 + parts[4]::bigint
+        FROM datetime_parts(datetime) AS parts
+    $$ LANGUAGE sql IMMUTABLE STRICT PARALLEL SAFE;
+    """
+)
+
 
 class Summary(Base):
     """Model representing a user-created event summary"""
@@ -19,6 +52,37 @@ class Summary(Base):
     precision = Column(INTEGER, nullable=True)
     latitude = Column(FLOAT, nullable=True)
     longitude = Column(FLOAT, nullable=True)
+    # sortable numeric form of datetime, see apps.history.time_key
+    time_key = Column(
+        BIGINT, Computed("datetime_time_key(datetime)", persisted=True), nullable=True
+    )
+    # signed year of datetime
+    year = Column(
+        BIGINT, Computed("datetime_year(datetime)", persisted=True), nullable=True
+    )
+    # total order of datetime and precision, see apps.history.time_key
+    sort_key = Column(
+        BIGINT,
+        Computed(
+            "datetime_time_key(datetime) * 100 + coalesce(precision, 0)",
+            persisted=True,
+        ),
+        nullable=True,
+    )
+    # map grid cell of the location, see apps.history.grid_cell
+    grid_cell = Column(
+        BIGINT,
+        Computed(
+            """
+            CASE WHEN latitude IS NOT NULL AND longitude IS NOT NULL THEN
+                (LEAST(floor((longitude + 180) / 360 * 1048576), 1048575)::bigint << 20)
+                | LEAST(floor((latitude + 90) / 180 * 1048576), 1048575)::bigint
+            END
+            """,
+            persisted=True,
+        ),
+        nullable=True,
+    )
 
     # When set, this summary covers the same event as the referenced canonical summary.
     # NULL = canonical (first-seen); non-NULL = duplicate, points to the canonical.
@@ -32,8 +96,11 @@ class Summary(Base):
     # each summary may have multiple citations
     citations = relationship("Citation", back_populates="summary")
 
-    # Add hash index for faster text lookups
-    __table_args__ = (Index("idx_summaries_text", text, postgresql_using="hash"),)
+    __table_args__ = (
+        # Add hash index for faster text lookups
+        Index("idx_summaries_text", text, postgresql_using="hash"),
+        Index("idx_summaries_sort_key", sort_key),
+    )
 
 
 class StoryName(Base):
@@ -111,6 +178,129 @@ class TagInstance(Base):
     )  # semantic ordering data independent of dates
 
 
+class StoryLink(Base):
+    """Precomputed continuation of the /history walk past the end of a story.
+
+    For each tag's story and direction, stores the summary at that end of the
+    story, the related story the walk moves to (PERSON -> PLACE -> TIME -> TIME),
+    and the event it resumes at. related_event_id is NULL when the walk stops.
+    """
+
+    __tablename__ = "story_links"
+    tag_id = Column(
+        UUID(as_uuid=True),
+        ForeignKey("tags.id", ondelete="CASCADE"),
+        primary_key=True,
+    )
+    direction = Column(VARCHAR, primary_key=True)  # 'next' | 'prev'
+    summary_id = Column(
+        UUID(as_uuid=True),
+        ForeignKey("summaries.id", ondelete="CASCADE"),
+        nullable=False,
+    )
+    related_story_id = Column(
+        UUID(as_uuid=True), ForeignKey("tags.id", ondelete="CASCADE"), nullable=True
+    )
+    related_event_id = Column(
+        UUID(as_uuid=True),
+        ForeignKey("summaries.id", ondelete="CASCADE"),
+        nullable=True,
+    )
+
+    __table_args__ = (
+        # find the links that resolve into a story when its order changes
+        Index("idx_story_links_related_story_id", related_story_id),
+    )
+
+
+class DefaultStoryCandidate(Base):
+    """Person story events which may be served as the default /history story.
+
+    Rows are added by a trigger on tag_instances when a person tag instance is
+    given a story order, and ids are dense, so a random sample is a handful of
+    primary key lookups. Rows whose tag instance has since lost its story
+    order are skipped when sampling.
+    """
+
+    __tablename__ = "default_story_candidates"
+    id = Column(BIGINT, primary_key=True, autoincrement=True)
+    tag_instance_id = Column(
+        UUID(as_uuid=True),
+        ForeignKey("tag_instances.id", ondelete="CASCADE"),
+        nullable=False,
+        unique=True,
+    )
+
+
+class Revision(Base):
+    """Counters bumped whenever the data behind a cached response changes.
+
+    `key` is a tag id, whose counter is bumped when an event is added to its
+    story, when its story order changes, or when a story its walk continues
+    into changes. Missing rows are revision 0.
+    """
+
+    __tablename__ = "revisions"
+    key = Column(VARCHAR, primary_key=True)
+    revision = Column(BIGINT, nullable=False)
+
+
+# Advanced whenever events are created. Every event write would otherwise
+# update one shared revisions row and hold its lock until commit; nextval
+# doesn't block concurrent writers.
+events_revision_seq = Sequence("events_revision_seq", metadata=Base.metadata)
+
+
+class StoryOrderJob(Base):
+    """A story waiting to have its new events ordered, keyed by its tag id.
+
+    Creating an event enqueues its tags in the same transaction, and repeat
+    requests for a queued tag are folded into its row by bumping `requests`,
+    so a busy story is ordered once per run however many events touched it.
+    Workers claim due rows with FOR UPDATE SKIP LOCKED, pushing `run_after`
+    out by a lease, and delete them once done unless more requests arrived
+    meanwhile; a row left by a failed or crashed worker is retried once its
+    lease expires.
+    """
+
+    __tablename__ = "story_order_jobs"
+    tag_id = Column(
+        UUID(as_uuid=True),
+        ForeignKey("tags.id", ondelete="CASCADE"),
+        primary_key=True,
+    )
+    requests = Column(BIGINT, nullable=False, server_default="1")
+    run_after = Column(TIMESTAMP(timezone=True), nullable=False)
+
+    __table_args__ = (Index("idx_story_order_jobs_run_after", run_after),)
+
+
+class StoryStats(Base):
+    """Precomputed metadata of a story: a wikidata story, keyed by its tag id,
+    or a text-reader story, keyed by its stories.id.
+
+    Rows are maintained by triggers (see the add_story_stats_table migration)
+    as story names, stories and events are added. When they are removed or
+    moved, the recompute_story_stats database function rebuilds the rows of
+    the affected stories (see the recompute_story_stats_on_delete
+    migration); call it directly after changing events with the triggers
+    disabled. The earliest and latest datetimes are those with the lowest
+    and highest sort key.
+    """
+
+    __tablename__ = "story_stats"
+    story_id = Column(UUID(as_uuid=True), primary_key=True)
+    name = Column(VARCHAR, nullable=True)
+    description = Column(VARCHAR, nullable=True)
+    event_count = Column(INTEGER, nullable=False, server_default="0")
+    earliest_year = Column(BIGINT, nullable=True)
+    latest_year = Column(BIGINT, nullable=True)
+    earliest_sort_key = Column(BIGINT, nullable=True)
+    latest_sort_key = Column(BIGINT, nullable=True)
+    earliest_datetime = Column(VARCHAR, nullable=True)
+    latest_datetime = Column(VARCHAR, nullable=True)
+
+
 # Add index for tag_names for faster lookups
 tag_names = Table(
     "tag_names",
@@ -160,6 +350,19 @@ class Time(Tag):
     calendar_model = Column(String(64))
     #  6 - millennium, 7 - century, 8 - decade, 9 - year, 10 - month, 11 - day
     precision = Column(INTEGER)
+    # signed year of datetime
+    year = Column(
+        BIGINT, Computed("datetime_year(datetime)", persisted=True), nullable=True
+    )
+    # total order of datetime and precision, see apps.history.time_key
+    sort_key = Column(
+        BIGINT,
+        Computed(
+            "datetime_time_key(datetime) * 100 + coalesce(precision, 0)",
+            persisted=True,
+        ),
+        nullable=True,
+    )
 
     __mapper_args__ = {"polymorphic_identity": "TIME"}
     __table_args__ = (
@@ -167,9 +370,14 @@ class Time(Tag):
         Index("idx_times_lookup", datetime, calendar_model, precision),
         # Add index for faster time-based story lookups
         Index("idx_times_datetime", datetime),
+        Index("idx_times_sort_key", sort_key),
     )
 
 
+for _table in (Summary.__table__, Time.__table__):
+    event.listen(_table, "before_create", DATETIME_FUNCTIONS)
+
+
 class Person(Tag):
 
     __tablename__ = "people"
@@ -0,0 +1,203 @@
+import logging
+import threading
+import time
+from collections import OrderedDict, defaultdict
+from dataclasses import dataclass
+from typing import Iterable
+from uuid import UUID
+
+from the_history_atlas.apps.history.metrics import (
+    SEARCH_CACHE_HITS,
+    SEARCH_CACHE_MISSES,
+    SEARCH_CACHE_EVICTIONS,
+)
+
+log = logging.getLogger(__name__)
+
+
+def normalize_query(query: str) -> str:
+    """The cache key of a search: lower-cased, with whitespace collapsed."""
+    return " ".join(query.lower().split())
+
+
+@dataclass
+class _SearchCacheEntry:
+    expires_at: float
+    results: list[dict]
+    hits: int = 1
+
+
+class SearchCache:
+    """A bounded LFU cache of story search results, keyed by normalized query.
+
+    Entries expire after `ttl_seconds`. When the cache is full, the entry
+    looked up the fewest times is evicted, the least recently used of those
+    first, so that popular queries stay resident; an expired entry keeps its
+    count when it is refreshed. A `max_size` of 0 disables the cache.
+    """
+
+    def __init__(self, max_size: int, ttl_seconds: float):
+        self._max_size = max_size
+        self._ttl_seconds = ttl_seconds
+        self._entries: dict[str, _SearchCacheEntry] = {}
+        # hit count -> the queries with that count, least recently used first
+        self._queries_by_hits: defaultdict[int, OrderedDict[str, None]] = defaultdict(
+            OrderedDict
+        )
+        self._min_hits = 0
+        # story id -> the queries whose cached results include it
+        self._queries_by_story: defaultdict[str, set[str]] = defaultdict(set)
+        self._lock = threading.Lock()
+        # bumped on every invalidation, so that results computed from data
+        # read before the invalidation are never stored afterwards: results
+        # read before `_valid_since` are discarded, as are results including
+        # a story invalidated since they were read.
+        self._generation = 0
+        self._valid_since = 0
+        # story id -> the generation it was last invalidated at
+        self._story_generations: dict[str, int] = {}
+
+    @property
+    def generation(self) -> int:
+        return self._generation
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, query: str) -> list[dict] | None:
+        if not self._max_size:
+            return None
+        with self._lock:
+            entry = self._entries.get(query)
+            if entry is None:
+                SEARCH_CACHE_MISSES.inc()
+                return None
+            self._count_hit(query, entry)
+            if entry.expires_at <= time.monotonic():
+                SEARCH_CACHE_MISSES.inc()
+                return None
+            SEARCH_CACHE_HITS.inc()
+            return entry.results
+
+    def put(self, query: str, results: list[dict], generation: int) -> None:
+        """Store the results of a search.
+
+        `generation` is the value of `SearchCache.generation` read before the
+        search ran; if the whole cache, or any of the stories in the results,
+        was invalidated since, the results are discarded.
+        """
+        if not self._max_size:
+            return
+        with self._lock:
+            if generation < self._valid_since or any(
+                self._story_generations.get(result["id"], -1) > generation
+                for result in results
+            ):
+                return
+            expires_at = time.monotonic() + self._ttl_seconds
+            entry = self._entries.get(query)
+            if entry is not None:
+                self._unindex(query, entry.results)
+                entry.results = results
+                entry.expires_at = expires_at
+                self._index(query, results)
+                return
+            if len(self._entries) >= self._max_size:
+                self._evict()
+            self._entries[query] = _SearchCacheEntry(
+                expires_at=expires_at, results=results
+            )
+            self._index(query, results)
+            self._queries_by_hits[1][query] = None
+            self._min_hits = 1
+
+    def invalidate(self) -> int:
+        """Drop every cached result, as a new story or name may match any
+        query. Returns the number of entries removed."""
+        with self._lock:
+            self._generation += 1
+            self._valid_since = self._generation
+            self._story_generations.clear()
+            removed = len(self._entries)
+            self._entries.clear()
+            self._queries_by_hits.clear()
+            self._queries_by_story.clear()
+            self._min_hits = 0
+        if removed:
+            SEARCH_CACHE_EVICTIONS.labels(reason="invalidated").inc(removed)
+            log.debug(f"Invalidated {removed} cached searches")
+        return removed
+
+    def invalidate_stories(self, story_ids: Iterable[UUID]) -> int:
+        """Drop the cached results which include any of the given stories, as
+        their details have changed. Returns the number of entries removed."""
+        story_ids = {str(story_id) for story_id in story_ids}
+        with self._lock:
+            self._generation += 1
+            if len(self._story_generations) + len(story_ids) > self._max_size:
+                # rather than remember every story, discard all searches
+                # which are still running
+                self._story_generations.clear()
+                self._valid_since = self._generation
+            stale = set()
+            for story_id in story_ids:
+                self._story_generations[story_id] = self._generation
+                stale.update(self._queries_by_story.get(story_id, ()))
+            for query in stale:
+                self._remove(query)
+        if stale:
+            SEARCH_CACHE_EVICTIONS.labels(reason="invalidated").inc(len(stale))
+            log.debug(f"Invalidated {len(stale)} cached searches")
+        return len(stale)
+
+    def _remove(self, query: str) -> None:
+        """Remove an entry. Caller holds the lock."""
+        entry = self._entries.pop(query)
+        self._unindex(query, entry.results)
+        queries = self._queries_by_hits[entry.hits]
+        del queries[query]
+        if not queries:
+            del self._queries_by_hits[entry.hits]
+        # the next eviction skips ahead to the next resident count
+        if self._entries:
+            self._min_hits = min(self._queries_by_hits)
+        else:
+            self._min_hits = 0
+
+    def _count_hit(self, query: str, entry: _SearchCacheEntry) -> None:
+        """Move a query to the next hit count. Caller holds the lock."""
+        queries = self._queries_by_hits[entry.hits]
+        del queries[query]
+        if not queries:
+            del self._queries_by_hits[entry.hits]
+            if self._min_hits == entry.hits:
+                self._min_hits += 1
+        entry.hits += 1
+        self._queries_by_hits[entry.hits][query] = None
+
+    def _evict(self) -> None:
+        """Remove the least frequently used entry. Caller holds the lock."""
+        queries = self._queries_by_hits[self._min_hits]
+        query, _ = queries.popitem(last=False)
+        if not queries:
+            del self._queries_by_hits[self._min_hits]
+        entry = self._entries.pop(query)
+        self._unindex(query, entry.results)
+        SEARCH_CACHE_EVICTIONS.labels(reason="size").inc()
+
+    def _index(self, query: str, results: list[dict]) -> None:
+        """Map the stories of a query's results to it. Caller holds the
+        lock."""
+        for result in results:
+            self._queries_by_story[result["id"]].add(query)
+
+    def _unindex(self, query: str, results: list[dict]) -> None:
+        """Remove a query from the map of its results' stories. Caller holds
+        the lock."""
+        for result in results:
+            queries = self._queries_by_story.get(result["id"])
+            if queries is None:
+                continue
+            queries.discard(query)
+            if not queries:
+                del self._queries_by_story[result["id"]]
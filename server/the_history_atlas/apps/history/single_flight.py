@@ -0,0 +1,81 @@
+import asyncio
+import threading
+from typing import Awaitable, Callable, Generic, Hashable, TypeVar
+
+from the_history_atlas.apps.history.metrics import SINGLE_FLIGHT_REQUESTS
+
+T = TypeVar("T")
+
+
+class _Call(Generic[T]):
+    def __init__(self):
+        self.done = threading.Event()
+        self.result: T | None = None
+        self.error: BaseException | None = None
+
+
+class SingleFlight(Generic[T]):
+    """Coalesces concurrent calls with the same key into one computation.
+
+    The first caller for a key runs the computation; callers arriving while
+    it is in flight wait for it and share its result, or its exception.
+    Nothing is kept once the computation finishes. Threads and event loops
+    are coalesced separately, through `do` and `do_async`.
+    """
+
+    def __init__(self, operation: str):
+        self._operation = operation
+        self._calls: dict[Hashable, _Call[T]] = {}
+        self._tasks: dict[tuple[asyncio.AbstractEventLoop, Hashable], asyncio.Task] = {}
+        self._lock = threading.Lock()
+
+    def do(self, key: Hashable, compute: Callable[[], T]) -> T:
+        with self._lock:
+            call = self._calls.get(key)
+            is_leader = call is None
+            if is_leader:
+                call = self._calls[key] = _Call()
+        if not is_leader:
+            SINGLE_FLIGHT_REQUESTS.labels(
+                operation=self._operation, role="coalesced"
+            ).inc()
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result
+
+        SINGLE_FLIGHT_REQUESTS.labels(operation=self._operation, role="leader").inc()
+        try:
+            call.result = compute()
+            return call.result
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.done.set()
+
+    async def do_async(self, key: Hashable, compute: Callable[[], Awaitable[T]]) -> T:
+        loop = asyncio.get_running_loop()
+        task_key = (loop, key)
+        task = self._tasks.get(task_key)
+        if task is None:
+            SINGLE_FLIGHT_REQUESTS.labels(
+                operation=self._operation, role="leader"
+            ).inc()
+            task = self._tasks[task_key] = loop.create_task(compute())
+            task.add_done_callback(lambda done: self._forget(task_key, done))
+        else:
+            SINGLE_FLIGHT_REQUESTS.labels(
+                operation=self._operation, role="coalesced"
+            ).inc()
+        # a cancelled caller must not cancel the computation the others await
+        return await asyncio.shield(task)
+
+    def _forget(self, task_key: tuple, task: asyncio.Task) -> None:
+        if self._tasks.get(task_key) is task:
+            del self._tasks[task_key]
+        if not task.cancelled():
+            # retrieved here, in case every caller was cancelled
+            task.exception()
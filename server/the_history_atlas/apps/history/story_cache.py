@@ -0,0 +1,154 @@
+import logging
+import threading
+import time
+from collections import OrderedDict, defaultdict
+from typing import Iterable, Literal, NamedTuple
+from uuid import UUID
+
+from the_history_atlas.apps.domain.core import Story
+from the_history_atlas.apps.history.metrics import (
+    STORY_CACHE_HITS,
+    STORY_CACHE_MISSES,
+    STORY_CACHE_EVICTIONS,
+)
+
+log = logging.getLogger(__name__)
+
+
+class StoryCacheKey(NamedTuple):
+    story_id: UUID
+    event_id: UUID
+    direction: Literal["next", "prev"] | None
+
+
+class VersionedStory(NamedTuple):
+    story: Story
+    # the revision of every story the window was built from, read in the
+    # same snapshot as the window, keyed by story id
+    revisions: dict[str, int]
+
+
+class _StoryCacheEntry(NamedTuple):
+    expires_at: float
+    story: VersionedStory
+    tag_ids: frozenset[UUID]
+
+
+class StoryCache:
+    """A bounded LRU cache of fully built story windows.
+
+    Entries expire after `ttl_seconds`, and are dropped whenever one of the
+    tags they were built from is invalidated. Invalidation only reaches this
+    process, so each entry also holds the revisions it was built from; the
+    caller compares them with the current revisions and drops a stale entry
+    with `discard_stale`. A `max_size` of 0 disables the cache.
+    """
+
+    def __init__(self, max_size: int, ttl_seconds: float):
+        self._max_size = max_size
+        self._ttl_seconds = ttl_seconds
+        self._entries: OrderedDict[StoryCacheKey, _StoryCacheEntry] = OrderedDict()
+        self._keys_by_tag: defaultdict[UUID, set[StoryCacheKey]] = defaultdict(set)
+        self._lock = threading.Lock()
+        # bumped on every invalidation, so that a story built from data read
+        # before the invalidation is never stored afterwards.
+        self._generation = 0
+
+    @property
+    def generation(self) -> int:
+        return self._generation
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: StoryCacheKey) -> VersionedStory | None:
+        if not self._max_size:
+            return None
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                STORY_CACHE_MISSES.inc()
+                return None
+            if entry.expires_at <= time.monotonic():
+                self._remove(key)
+                STORY_CACHE_EVICTIONS.labels(reason="ttl").inc()
+                STORY_CACHE_MISSES.inc()
+                return None
+            self._entries.move_to_end(key)
+            STORY_CACHE_HITS.inc()
+            return entry.story
+
+    def put(
+        self,
+        key: StoryCacheKey,
+        story: VersionedStory,
+        tag_ids: Iterable[UUID],
+        generation: int,
+    ) -> None:
+        """Store a story window, indexed by every tag it was built from.
+
+        `generation` is the value of `StoryCache.generation` read before the
+        story was built; if any invalidation happened since, the story is
+        discarded.
+        """
+        if not self._max_size:
+            return
+        with self._lock:
+            if generation != self._generation:
+                return
+            if key in self._entries:
+                self._remove(key)
+            entry = _StoryCacheEntry(
+                expires_at=time.monotonic() + self._ttl_seconds,
+                story=story,
+                tag_ids=frozenset(tag_ids),
+            )
+            self._entries[key] = entry
+            for tag_id in entry.tag_ids:
+                self._keys_by_tag[tag_id].add(key)
+            while len(self._entries) > self._max_size:
+                oldest_key = next(iter(self._entries))
+                self._remove(oldest_key)
+                STORY_CACHE_EVICTIONS.labels(reason="size").inc()
+
+    def discard_stale(self, key: StoryCacheKey, story: VersionedStory) -> None:
+        """Drop a story window whose revisions are out of date, unless it has
+        been replaced since it was read."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry.story is not story:
+                return
+            self._remove(key)
+        STORY_CACHE_EVICTIONS.labels(reason="stale").inc()
+
+    def invalidate_tags(self, tag_ids: Iterable[UUID]) -> int:
+        """Drop every cached story window built from any of the given tags.
+        Returns the number of entries removed."""
+        removed = 0
+        with self._lock:
+            self._generation += 1
+            for tag_id in tag_ids:
+                for key in list(self._keys_by_tag.get(tag_id, ())):
+                    self._remove(key)
+                    removed += 1
+        if removed:
+            STORY_CACHE_EVICTIONS.labels(reason="invalidated").inc(removed)
+            log.debug(f"Invalidated {removed} cached story windows")
+        return removed
+
+    def clear(self) -> None:
+        with self._lock:
+            self._generation += 1
+            self._entries.clear()
+            self._keys_by_tag.clear()
+
+    def _remove(self, key: StoryCacheKey) -> None:
+        """Remove an entry and its tag index references. Caller holds the lock."""
+        entry = self._entries.pop(key)
+        for tag_id in entry.tag_ids:
+            keys = self._keys_by_tag.get(tag_id)
+            if keys is None:
+                continue
+            keys.discard(key)
+            if not keys:
+                del self._keys_by_tag[tag_id]
@@ -0,0 +1,77 @@
+"""A worker for the durable queue of stories waiting to be ordered.
+
+Creating an event queues each of its stories in the story_order_jobs table
+(see schema.StoryOrderJob), rather than ordering them in the request. The
+worker claims due jobs in batches and calculates their story order, so a
+story which gains many events within the queue delay is ordered once. Any
+number of workers may run, in the API processes or on their own.
+"""
+
+import logging
+import threading
+from typing import TYPE_CHECKING, NamedTuple
+from uuid import UUID
+
+if TYPE_CHECKING:
+    from the_history_atlas.apps.history.history_app import HistoryApp
+
+log = logging.getLogger(__name__)
+
+# how long a claimed job is held before another worker may retry it
+LEASE_SECONDS = 600
+
+
+class StoryOrderJob(NamedTuple):
+    tag_id: UUID
+    # the request count when the job was claimed
+    requests: int
+
+
+class StoryOrderWorker:
+    """Polls the story order queue until stopped. `run` works in the calling
+    thread, and `start` in a daemon thread."""
+
+    def __init__(
+        self,
+        history_app: "HistoryApp",
+        batch_size: int,
+        poll_interval_seconds: float,
+    ):
+        self._history_app = history_app
+        self._batch_size = batch_size
+        self._poll_interval_seconds = poll_interval_seconds
+        self._stop = threading.Event()
+        self._thread: threading.Thread | None = None
+
+    def run(self) -> None:
+        log.info("Story order worker started")
+        while not self._stop.is_set():
+            try:
+                processed = self._history_app.process_story_order_jobs(
+                    limit=self._batch_size
+                )
+            except Exception as e:
+                log.error(f"Error processing story order jobs: {e}")
+                processed = 0
+            # a full batch suggests more jobs are due
+            if processed < self._batch_size:
+                self._stop.wait(self._poll_interval_seconds)
+        log.info("Story order worker stopped")
+
+    def start(self) -> None:
+        if self._thread is not None and self._thread.is_alive():
+            log.warning("Story order worker is already running")
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(
+            target=self.run, daemon=True, name="StoryOrderWorker"
+        )
+        self._thread.start()
+
+    def stop(self, timeout: float = 5.0) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=timeout)
+            if self._thread.is_alive():
+                log.warning("Story order worker did not stop within timeout")
+            self._thread = None
@@ -0,0 +1,66 @@
+"""Numeric, sortable keys for wikidata datetime strings.
+
+A datetime such as '+1685-03-21T00:00:00Z' has the key 16850321: the signed
+year times 10000, plus the month times 100, plus the day. Keys sort in
+chronological order, including for negative years, so a prefix match on
+the datetime string becomes a range on the key. A datetime without a sign,
+as ISO dates are written, is a positive year.
+
+The sort key extends the time key with the precision, as time_key * 100 +
+precision, so that times sort in a total order: chronologically, and the
+less precise first among times sharing a datetime.
+
+The generated time_key, sort_key and year columns of summaries and times
+parse datetimes by the same rule, with the datetime_time_key and
+datetime_year database functions (see schema.DATETIME_FUNCTIONS).
+"""
+
+import re
+
+_DATETIME = re.compile(r"^([+-]?)([0-9]+)-([0-9]{2})-([0-9]{2})")
+
+
+def _key(match: re.Match) -> int:
+    sign, year, month, day = match.groups()
+    year_key = int(year) * 10000
+    if sign == "-":
+        year_key = -year_key
+    return year_key + int(month) * 100 + int(day)
+
+
+def time_key(datetime: str) -> int | None:
+    """The key of a datetime string, or None if it can't be parsed."""
+    match = _DATETIME.match(datetime)
+    if not match:
+        return None
+    return _key(match)
+
+
+def sort_key(datetime: str, precision: int | None) -> int | None:
+    """The sort key of a datetime string and precision, or None if the
+    datetime can't be parsed."""
+    key = time_key(datetime)
+    if key is None:
+        return None
+    return key * 100 + (precision or 0)
+
+
+def time_key_range(datetime_prefix: str) -> tuple[int, int]:
+    """The inclusive range of keys for datetimes starting with the given
+    prefix of a four digit year datetime, such as '+16' (the 1600s),
+    '+1685' or '+1685-03'."""
+    sign = -1 if datetime_prefix.startswith("-") else 1
+    year, _, month_and_day = datetime_prefix[1:].partition("-")
+    if len(year) < 4:
+        # a decade, century or millennium: every year it covers
+        low = int(year.ljust(4, "0"))
+        high = int(year.ljust(4, "9"))
+        if sign < 0:
+            low, high = -high, -low
+        return low * 10000, high * 10000 + 9999
+    year_key = sign * int(year) * 10000
+    digits = month_and_day.replace("-", "")
+    return (
+        year_key + int(digits.ljust(4, "0")),
+        year_key + int(digits.ljust(4, "9")),
+    )
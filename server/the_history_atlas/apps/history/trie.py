@@ -1,9 +1,10 @@
+from array import array
 from collections import deque
-import logging
 from dataclasses import dataclass
+from typing import Iterable
 
-log = logging.getLogger(__name__)
-log.setLevel("DEBUG")
+ROOT = 0
+NO_NODE = -1
 
 
 @dataclass(frozen=True)
@@ -15,11 +16,34 @@ class TrieResult:
 
 
 class Node:
-    def __init__(self, value: str):
-        self.value: str = value
-        self.children: dict[str, Node] = {}
-        self.ids: set[str] = set()
-        self.name = None
+    """A read-only view of one node of a Trie."""
+
+    __slots__ = ("_trie", "_index")
+
+    def __init__(self, trie: "Trie", index: int):
+        self._trie = trie
+        self._index = index
+
+    @property
+    def value(self) -> str:
+        if self._index == ROOT:
+            return ""
+        return chr(self._trie._chars[self._index])
+
+    @property
+    def children(self) -> dict[str, "Node"]:
+        return {
+            chr(self._trie._chars[child]): Node(self._trie, child)
+            for child in self._trie._children(self._index)
+        }
+
+    @property
+    def ids(self) -> set[str]:
+        return set(self._trie._guids_of(self._index))
+
+    @property
+    def name(self) -> str | None:
+        return self._trie._names.get(self._index)
 
     def __repr__(self):
         return f"""
@@ -32,23 +56,57 @@ class Node:
 
     def print(self, depth=0):
         indent = "-" * depth + "  "
-        print(indent, f"<{self.value}> {self.name}: ({len(self.children)} children)")
-        for child in self.children.values():
+        children = self.children
+        print(indent, f"<{self.value}> {self.name}: ({len(children)} children)")
+        for child in children.values():
             child.print(depth=depth + 1)
 
 
 class Trie:
-    def __init__(self):
-
-        self.root = Node("")
+    """
+    A trie stored in flat arrays: node i's character, first child and next
+    sibling are kept at index i of three typed arrays, so a node costs twelve
+    bytes rather than an object with its own dict and set. Names and guids
+    are only kept for the nodes which end an inserted string, and guids are
+    interned as ints.
+    """
 
-    def build(self, entity_tuples):
+    def __init__(self):
+        self._chars = array("I", [0])
+        self._first_child = array("i", [NO_NODE])
+        self._next_sibling = array("i", [NO_NODE])
+        # slots of deleted nodes, reused by later inserts
+        self._free: list[int] = []
+        self._names: dict[int, str] = {}
+        # node -> interned guid, or a set of them when there are several
+        self._ids: dict[int, int | set[int]] = {}
+        self._guids: list[str] = []
+        self._guid_ids: dict[str, int] = {}
+
+    @property
+    def root(self) -> Node:
+        return Node(self, ROOT)
+
+    def __len__(self) -> int:
+        """The number of nodes in the trie."""
+        return len(self._chars) - len(self._free)
+
+    @property
+    def nbytes(self) -> int:
+        """The size of the node arrays, in bytes."""
+        return sum(
+            len(values) * values.itemsize
+            for values in (self._chars, self._first_child, self._next_sibling)
+        )
+
+    def build(self, entity_tuples: Iterable[tuple[str, str]]) -> "Trie":
         """Initializes the data structure"""
 
         for name, guid in entity_tuples:
             sub_strings = self.phrase_parts(name)
             for sub_string in sub_strings:
                 self.insert(sub_string, guid)
+        return self
 
     def phrase_parts(self, phrase: str) -> list[str]:
         # individual words
@@ -61,60 +119,130 @@ class Trie:
         return result
 
     def insert(self, string: str, guid: str):
-        log.debug(f"trie: add string {string}")
-        processed_string = string.lower()
-        node = self.root
-        for char in processed_string:
-            if char in node.children:
-                node = node.children[char]
-            else:
-                new_node = Node(char)
-                node.children[char] = new_node
-                node = new_node
-        # this node is now a leaf
-        node.ids.add(guid)
-        node.name = string
-        log.debug(f"created leaf: {node.name}")
-        # debug only: self.root.print()
+        node = ROOT
+        for char in string.lower():
+            node = self._add_child(node, ord(char))
+        # this node now ends a string
+        self._add_guid(node, self._intern(guid))
+        self._names[node] = string
 
     def delete(self, string: str, guid: str) -> bool:
-        processed_string = string.lower()
-        node = self.root
+        node = ROOT
         path = [node]
-        for char in processed_string:
-            node = node.children.get(char, None)
-            if node:
-                path.append(node)
-            else:
+        for char in string.lower():
+            node = self._child(node, ord(char))
+            if node == NO_NODE:
                 return False
-        node.ids.remove(guid)
+            path.append(node)
+        self._remove_guid(node, self._guid_ids[guid])
         # remove any orphaned nodes
         path.pop()  # node points to this already
-        while not len(node.children) and not len(node.ids) and len(path):
-            val = node.value
-            node = path.pop()
-            del node.children[val]
+        while (
+            self._first_child[node] == NO_NODE and node not in self._ids and len(path)
+        ):
+            parent = path.pop()
+            self._unlink(parent, node)
+            node = parent
         return True
 
     def find(self, string: str, res_count=1) -> list[TrieResult]:
-        log.debug(f"searching for term {string}")
-        processed_string = string.lower()
-        node = self.root
-        for char in processed_string:
-            if char not in node.children:
+        node = ROOT
+        for char in string.lower():
+            child = self._child(node, ord(char))
+            if child == NO_NODE:
                 break
-            node = node.children[char]
-        log.debug(f"closest neighbor found is {node.name}, {node.value}")
+            node = child
         res = set()
         queue = deque([node])
         while len(queue) and len(res) < res_count:
-            current_node = queue.popleft()
-            queue.extend(current_node.children.values())
-            if current_node.name:
-                res.add(
-                    TrieResult(
-                        name=current_node.name, guids=frozenset(current_node.ids)
-                    )
-                )
-        log.debug(f"result is {res}")
+            current = queue.popleft()
+            queue.extend(self._children(current))
+            name = self._names.get(current)
+            if name:
+                res.add(TrieResult(name=name, guids=frozenset(self._guids_of(current))))
         return list(res)
+
+    def _children(self, node: int) -> Iterable[int]:
+        child = self._first_child[node]
+        while child != NO_NODE:
+            yield child
+            child = self._next_sibling[child]
+
+    def _child(self, node: int, char: int) -> int:
+        child = self._first_child[node]
+        while child != NO_NODE and self._chars[child] != char:
+            child = self._next_sibling[child]
+        return child
+
+    def _add_child(self, node: int, char: int) -> int:
+        """The node's child for the character, added after its siblings if
+        it doesn't exist yet."""
+        previous = NO_NODE
+        child = self._first_child[node]
+        while child != NO_NODE:
+            if self._chars[child] == char:
+                return child
+            previous = child
+            child = self._next_sibling[child]
+        if self._free:
+            child = self._free.pop()
+            self._chars[child] = char
+            self._first_child[child] = NO_NODE
+            self._next_sibling[child] = NO_NODE
+        else:
+            child = len(self._chars)
+            self._chars.append(char)
+            self._first_child.append(NO_NODE)
+            self._next_sibling.append(NO_NODE)
+        if previous == NO_NODE:
+            self._first_child[node] = child
+        else:
+            self._next_sibling[previous] = child
+        return child
+
+    def _unlink(self, parent: int, node: int) -> None:
+        if self._first_child[parent] == node:
+            self._first_child[parent] = self._next_sibling[node]
+        else:
+            sibling = self._first_child[parent]
+            while self._next_sibling[sibling] != node:
+                sibling = self._next_sibling[sibling]
+            self._next_sibling[sibling] = self._next_sibling[node]
+        self._names.pop(node, None)
+        self._free.append(node)
+
+    def _intern(self, guid: str) -> int:
+        guid_id = self._guid_ids.get(guid)
+        if guid_id is None:
+            guid_id = self._guid_ids[guid] = len(self._guids)
+            self._guids.append(guid)
+        return guid_id
+
+    def _guids_of(self, node: int) -> list[str]:
+        ids = self._ids.get(node)
+        if ids is None:
+            return []
+        if isinstance(ids, int):
+            return [self._guids[ids]]
+        return [self._guids[guid_id] for guid_id in ids]
+
+    def _add_guid(self, node: int, guid_id: int) -> None:
+        ids = self._ids.get(node)
+        if ids is None:
+            self._ids[node] = guid_id
+        elif isinstance(ids, int):
+            if ids != guid_id:
+                self._ids[node] = {ids, guid_id}
+        else:
+            ids.add(guid_id)
+
+    def _remove_guid(self, node: int, guid_id: int) -> None:
+        ids = self._ids.get(node)
+        if isinstance(ids, set):
+            ids.remove(guid_id)
+            if len(ids) == 1:
+                self._ids[node] = ids.pop()
+        elif ids == guid_id:
+            del self._ids[node]
+        else:
+            raise KeyError(guid_id)
@@ -1,3 +1,5 @@
+from contextlib import asynccontextmanager
+
 import uvicorn
 from fastapi import FastAPI
 from prometheus_fastapi_instrumentator import Instrumentator
@@ -14,7 +16,17 @@ def get_app() -> FastAPI:
     def apps():
         return app_manager
 
-    fastapi_app = FastAPI()
+    @asynccontextmanager
+    async def lifespan(_: FastAPI):
+        if config_app.COMPUTE_STORY_ORDER and config_app.STORY_ORDER_WORKER_ENABLED:
+            app_manager.history_app.start_story_order_worker()
+        yield
+        app_manager.history_app.stop_story_order_worker()
+        app_manager.database_app.dispose_client()
+        # the async pool belongs to this event loop
+        await app_manager.database_app.dispose_async_client()
+
+    fastapi_app = FastAPI(lifespan=lifespan)
 
     # Add Prometheus metrics instrumentation with default settings
     instrumentator = Instrumentator(
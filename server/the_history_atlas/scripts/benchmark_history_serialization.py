@@ -0,0 +1,153 @@
+#!/usr/bin/env python
+"""
+Benchmark the CPU cost of serializing a /history response.
+
+Compares the validated path, which converts the domain Story to
+api_types.Story and lets FastAPI validate it against the response_model and
+encode it with json.dumps, with the fast path, which encodes the domain Story
+directly with orjson. No database is needed: a synthetic story is used.
+
+Usage:
+    python -m the_history_atlas.scripts.benchmark_history_serialization [iterations] [events]
+"""
+
+import asyncio
+import json
+import statistics
+import sys
+import time
+from datetime import datetime, timezone
+from uuid import uuid4
+
+from fastapi.routing import serialize_response
+from fastapi.utils import create_model_field
+
+import the_history_atlas.api.types.history as api_types
+from the_history_atlas.api.handlers.history import (
+    convert_story_to_api,
+    story_to_json,
+)
+from the_history_atlas.api.responses import ORJSONResponse
+from the_history_atlas.apps.domain.core import (
+    CalendarDate,
+    HistoryEvent,
+    Map,
+    Point,
+    Source,
+    Story,
+    Tag,
+)
+
+
+def build_story(event_count: int) -> Story:
+    """A story shaped like those served by /history."""
+    story_id = uuid4()
+    events = []
+    for i in range(event_count):
+        tags = [
+            Tag(
+                id=uuid4(),
+                type=tag_type,
+                start_char=j * 20,
+                stop_char=j * 20 + 12,
+                name=f"{tag_type} {i}",
+                default_story_id=uuid4(),
+            )
+            for j, tag_type in enumerate(("PERSON", "PLACE", "TIME"))
+        ]
+        events.append(
+            HistoryEvent(
+                id=uuid4(),
+                text=f"Event {i} happened at a place, at a time, to a person. " * 3,
+                lang="en",
+                date=CalendarDate(
+                    datetime=f"+{1700 + i}-05-01T00:00:00Z",
+                    calendar="http://www.wikidata.org/entity/Q1985727",
+                    precision=11,
+                ),
+                source=Source(
+                    id=uuid4(),
+                    text="A source text",
+                    title="A source title",
+                    author="An author",
+                    publisher="A publisher",
+                    pub_date=datetime(2024, 1, 1, tzinfo=timezone.utc),
+                ),
+                tags=tags,
+                map=Map(
+                    locations=[
+                        Point(
+                            id=tags[1].id,
+                            latitude=48.85,
+                            longitude=2.35,
+                            name=tags[1].name,
+                        )
+                    ]
+                ),
+                focus=uuid4(),
+                story_title="The life of a person",
+                description="A description of the story",
+            )
+        )
+    return Story(id=story_id, name="The life of a person", events=events)
+
+
+async def validated_path(story: Story, field) -> bytes:
+    content = await serialize_response(
+        field=field, response_content=convert_story_to_api(story, index=0)
+    )
+    return json.dumps(
+        content, ensure_ascii=False, allow_nan=False, separators=(",", ":")
+    ).encode("utf-8")
+
+
+async def fast_path(story: Story) -> bytes:
+    return ORJSONResponse(content=story_to_json(story, index=0)).body
+
+
+def measure(loop, fn, iterations: int) -> list[float]:
+    """CPU time of each call, in microseconds."""
+    times = []
+    for _ in range(iterations):
+        start = time.process_time_ns()
+        loop.run_until_complete(fn())
+        times.append((time.process_time_ns() - start) / 1000)
+    return times
+
+
+def benchmark(iterations: int = 2000, event_count: int = 21) -> int:
+    story = build_story(event_count)
+    field = create_model_field(
+        name="Response_get_history", type_=api_types.Story, mode="serialization"
+    )
+    loop = asyncio.new_event_loop()
+    validated_body = loop.run_until_complete(validated_path(story, field))
+    fast_body = loop.run_until_complete(fast_path(story))
+    if json.loads(validated_body) != json.loads(fast_body):
+        print("The two paths produced different responses")
+        return 1
+
+    # warm up both paths before measuring
+    measure(loop, lambda: validated_path(story, field), 100)
+    measure(loop, lambda: fast_path(story), 100)
+    validated = measure(loop, lambda: validated_path(story, field), iterations)
+    fast = measure(loop, lambda: fast_path(story), iterations)
+    loop.close()
+
+    print(f"Story of {event_count} events, {iterations} iterations (CPU time)")
+    for name, times in (("validated", validated), ("fast", fast)):
+        print(
+            f"{name:>10}: median {statistics.median(times):8.1f} us, "
+            f"mean {statistics.mean(times):8.1f} us"
+        )
+    saved = statistics.median(validated) - statistics.median(fast)
+    print(
+        f"Saved per request: {saved:.1f} us "
+        f"({saved / statistics.median(validated):.0%})"
+    )
+    return 0
+
+
+if __name__ == "__main__":
+    args = [int(arg) for arg in sys.argv[1:3]]
+    exit(benchmark(*args))
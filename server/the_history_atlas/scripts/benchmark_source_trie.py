@@ -0,0 +1,82 @@
+#!/usr/bin/env python
+"""
+Benchmark the memory and build time of the source search trie.
+
+Builds the trie from every source title and author, as HistoryApp does at
+startup, and reports the build time, the memory the trie holds once built,
+and the time taken by a few searches.
+
+Usage:
+    THA_DB_URI=... python -m the_history_atlas.scripts.benchmark_source_trie [repeats]
+"""
+
+import gc
+import os
+import statistics
+import sys
+import time
+import tracemalloc
+
+from sqlalchemy import create_engine, text
+
+from the_history_atlas.apps.history.trie import Trie
+
+
+def load_entity_tuples(db_uri: str) -> list[tuple[str, str]]:
+    """(name, id) tuples, as returned by get_all_source_titles_and_authors."""
+    engine = create_engine(db_uri)
+    with engine.connect() as connection:
+        rows = connection.execute(text("SELECT id, title, author FROM sources")).all()
+    engine.dispose()
+    entity_tuples = []
+    for row in rows:
+        entity_tuples.extend([(row.title, str(row.id)), (row.author, str(row.id))])
+    return entity_tuples
+
+
+def benchmark(repeats: int = 5) -> int:
+    db_uri = os.environ.get("THA_DB_URI")
+    if not db_uri:
+        print("THA_DB_URI environment variable is not set")
+        return 1
+    entity_tuples = load_entity_tuples(db_uri)
+    if not entity_tuples:
+        print("The sources table is empty")
+        return 1
+
+    build_times = []
+    for _ in range(repeats):
+        gc.collect()
+        start = time.perf_counter()
+        trie = Trie().build(entity_tuples)
+        build_times.append(time.perf_counter() - start)
+
+    # measured separately, as tracing slows the build down
+    gc.collect()
+    tracemalloc.start()
+    trie = Trie().build(entity_tuples)
+    held, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    queries = [name[:3] for name, _ in entity_tuples[:1000]]
+    start = time.perf_counter()
+    for query in queries:
+        trie.find(query, res_count=10)
+    find_time = (time.perf_counter() - start) / len(queries)
+
+    print(f"{len(entity_tuples) // 2} sources, {len(trie)} trie nodes")
+    print(
+        f"build: median {statistics.median(build_times):.3f} s "
+        f"over {repeats} builds"
+    )
+    print(
+        f"memory: {held / 2**20:.1f} MiB held, {peak / 2**20:.1f} MiB peak, "
+        f"{trie.nbytes / 2**20:.1f} MiB of node arrays"
+    )
+    print(f"find: {find_time * 1e6:.1f} us per search")
+    return 0
+
+
+if __name__ == "__main__":
+    args = [int(arg) for arg in sys.argv[1:2]]
+    exit(benchmark(*args))
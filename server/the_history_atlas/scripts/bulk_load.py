@@ -0,0 +1,79 @@
+#!/usr/bin/env python
+"""
+Load an export of events into the database without going through the API.
+
+The export is NDJSON, with one event per line in the shape of BulkEvent: the
+summary text, its wikidata citation, and the full definition of each tag.
+Parquet files with the same columns are read too, if pyarrow is installed.
+
+The load is one transaction, and by default drops the secondary indexes of
+the loaded tables until it is done, so it is meant to be run while the
+server is stopped. Restart the server afterwards, as its search indexes are
+built at startup.
+
+Usage:
+    THA_DB_URI=... python -m the_history_atlas.scripts.bulk_load events.ndjson
+"""
+
+import argparse
+import logging
+import os
+from pathlib import Path
+
+from sqlalchemy import create_engine
+
+from the_history_atlas.apps.history.bulk_loader import BulkLoader, read_events
+from the_history_atlas.apps.history.repository import Repository
+from the_history_atlas.apps.history.trie import Trie
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0].strip())
+    parser.add_argument("path", type=Path, help="an NDJSON or Parquet export")
+    parser.add_argument(
+        "--keep-indexes",
+        action="store_true",
+        help="maintain indexes during the load, instead of rebuilding them after",
+    )
+    parser.add_argument(
+        "--chunk-size",
+        type=int,
+        default=50_000,
+        help="events buffered per COPY",
+    )
+    args = parser.parse_args()
+
+    db_uri = os.environ.get("THA_DB_URI")
+    if not db_uri:
+        logger.error("THA_DB_URI environment variable is not set")
+        return 1
+
+    engine = create_engine(db_uri)
+    repository = Repository(database_client=engine, source_trie=Trie())
+    loader = BulkLoader(
+        repository=repository,
+        defer_indexes=not args.keep_indexes,
+        chunk_size=args.chunk_size,
+    )
+    stats = loader.load(read_events(args.path))
+    engine.dispose()
+
+    print(
+        f"{stats.events_read} events read: {stats.events_created} created, "
+        f"{stats.duplicates} already existed"
+    )
+    print(
+        f"{stats.tags_created} tags and {stats.tag_instances_created} tag "
+        f"instances created, {stats.stories_ordered} stories ordered"
+    )
+    for step, seconds in stats.steps.items():
+        print(f"{step}: {seconds:.1f} s")
+    print(f"{stats.seconds:.1f} s, {stats.rows_per_second:.0f} rows/s")
+    return 0
+
+
+if __name__ == "__main__":
+    exit(main())
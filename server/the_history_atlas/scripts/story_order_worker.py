@@ -0,0 +1,52 @@
+#!/usr/bin/env python
+"""
+Process the story order queue outside the API.
+
+New events queue their stories in story_order_jobs; this worker claims due
+jobs in batches and calculates their story order until it is stopped. Any
+number of workers may run against the same database. When running dedicated
+workers, set STORY_ORDER_WORKER_ENABLED=false on the API so that it doesn't
+process the queue too. Ordering a story bumps its revision, so the API
+processes stop serving their cached windows of it on the next request.
+
+Usage:
+    THA_DB_URI=... python -m the_history_atlas.scripts.story_order_worker
+"""
+
+import logging
+import signal
+
+from the_history_atlas.apps.config import Config
+from the_history_atlas.apps.database import DatabaseApp
+from the_history_atlas.apps.history import HistoryApp
+from the_history_atlas.apps.history.story_order_jobs import StoryOrderWorker
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+
+def main() -> int:
+    config = Config()
+    if not config.DB_URI:
+        logger.error("THA_DB_URI environment variable is not set")
+        return 1
+    # the worker serves no searches or nearby queries, so it builds no
+    # in-memory indexes
+    config.NAME_INDEX_ENABLED = False
+    config.NEARBY_INDEX_ENABLED = False
+    history_app = HistoryApp(
+        config_app=config, database_client=DatabaseApp(config_app=config).client()
+    )
+    worker = StoryOrderWorker(
+        history_app=history_app,
+        batch_size=config.STORY_ORDER_JOB_BATCH_SIZE,
+        poll_interval_seconds=config.STORY_ORDER_JOB_POLL_SECONDS,
+    )
+    for signum in (signal.SIGINT, signal.SIGTERM):
+        signal.signal(signum, lambda *_: worker.stop())
+    worker.run()
+    return 0
+
+
+if __name__ == "__main__":
+    exit(main())
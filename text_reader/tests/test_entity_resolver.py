@@ -334,3 +334,58 @@ class TestResolveDuplicateDetection:
         result = resolver.resolve_event(event)
 
         assert result.duplicate_has_wikidata is True
+
+
+class TestPreResolve:
+    def test_searches_all_entities_in_one_batch(self, resolver, mock_rest, mock_claude):
+        person_id = uuid4()
+        place_id = uuid4()
+        mock_rest.search_people_batch.return_value = [
+            [{"id": str(person_id), "name": "J. S. Bach", "type": "PERSON"}],
+            [],
+        ]
+        mock_rest.create_person.return_value = {"id": str(uuid4()), "name": "Handel"}
+        mock_rest.search_places_batch.return_value = [
+            [{"id": str(place_id), "name": "Leipzig"}],
+            [],
+        ]
+        mock_rest.create_place.return_value = {
+            "id": str(uuid4()),
+            "name": "Halle",
+            "latitude": 51.5,
+            "longitude": 12.0,
+        }
+        mock_claude.poll_entity_match_batch.return_value = {
+            "entity-00000": person_id,
+            "entity-00001": place_id,
+        }
+
+        resolver.pre_resolve(
+            [
+                make_event(),
+                make_event(
+                    summary="Handel was born in Halle in 1685.",
+                    person_name="George Frideric Handel",
+                    place_name="Halle",
+                ),
+            ]
+        )
+
+        mock_rest.search_people_batch.assert_called_once_with(
+            names=["Johann Sebastian Bach", "George Frideric Handel"]
+        )
+        mock_rest.search_places_batch.assert_called_once_with(
+            queries=[
+                {"name": "Leipzig", "latitude": 51.3, "longitude": 12.4},
+                {"name": "Halle", "latitude": 51.3, "longitude": 12.4},
+            ]
+        )
+        mock_rest.search_people.assert_not_called()
+        mock_rest.search_places.assert_not_called()
+        mock_rest.create_person.assert_called_once()
+        mock_rest.create_place.assert_called_once()
+        [requests] = mock_claude.submit_entity_match_batch.call_args.args
+        assert [request["entity_name"] for request in requests] == [
+            "Johann Sebastian Bach",
+            "Leipzig",
+        ]
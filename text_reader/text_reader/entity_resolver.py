@@ -68,13 +68,15 @@ class EntityResolver:
             f"and {len(place_info)} unique places"
         )
 
-        # Step 2: Search DB for candidates; collect entity-match requests
+        # Step 2: Search DB for candidates in batches; collect entity-match requests
         entity_requests: list[dict] = []
 
-        for key, info in person_info.items():
-            if key in self._person_cache:
-                continue
-            candidates = self._rest.search_people(name=info["name"])
+        person_keys = [key for key in person_info if key not in self._person_cache]
+        person_candidates = self._rest.search_people_batch(
+            names=[person_info[key]["name"] for key in person_keys]
+        )
+        for key, candidates in zip(person_keys, person_candidates):
+            info = person_info[key]
             if candidates:
                 entity_requests.append(
                     {
@@ -97,15 +99,20 @@ class EntityResolver:
                     summary_name=info["name"],
                 )
 
-        for key, info in place_info.items():
-            if key in self._place_cache:
-                continue
+        place_keys = [key for key in place_info if key not in self._place_cache]
+        place_candidates = self._rest.search_places_batch(
+            queries=[
+                {
+                    "name": place_info[key]["search_name"],
+                    "latitude": place_info[key]["place"].latitude,
+                    "longitude": place_info[key]["place"].longitude,
+                }
+                for key in place_keys
+            ]
+        )
+        for key, candidates in zip(place_keys, place_candidates):
+            info = place_info[key]
             place = info["place"]
-            candidates = self._rest.search_places(
-                name=info["search_name"],
-                latitude=place.latitude,
-                longitude=place.longitude,
-            )
             if candidates:
                 entity_requests.append(
                     {
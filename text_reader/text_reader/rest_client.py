@@ -8,6 +8,11 @@ import requests
 log = logging.getLogger(__name__)
 
 
+# the most names or places sent in one batch search request, and the most the
+# server accepts
+SEARCH_BATCH_SIZE = 200
+
+
 class RestClientError(Exception):
     pass
 
@@ -65,6 +70,17 @@ class RestClient:
         result = self._get("/text-reader/people/search", params={"name": name})
         return result.get("candidates", [])
 
+    def search_people_batch(self, names: list[str]) -> list[list[dict]]:
+        """The candidates for each name, in the order of the names."""
+        candidates: list[list[dict]] = []
+        for start in range(0, len(names), SEARCH_BATCH_SIZE):
+            result = self._post_json(
+                "/text-reader/people/search/batch",
+                {"names": names[start : start + SEARCH_BATCH_SIZE]},
+            )
+            candidates.extend(r.get("candidates", []) for r in result["results"])
+        return candidates
+
     def create_person(self, name: str, description: str | None = None) -> dict:
         return self._post_json(
             "/text-reader/people",
@@ -91,6 +107,23 @@ class RestClient:
         result = self._get("/text-reader/places/search", params=params)
         return result.get("candidates", [])
 
+    def search_places_batch(
+        self, queries: list[dict], radius: float = 1.0
+    ) -> list[list[dict]]:
+        """The candidates for each query, in the order of the queries. Each
+        query has a name, and/or a latitude and longitude."""
+        candidates: list[list[dict]] = []
+        for start in range(0, len(queries), SEARCH_BATCH_SIZE):
+            result = self._post_json(
+                "/text-reader/places/search/batch",
+                {
+                    "queries": queries[start : start + SEARCH_BATCH_SIZE],
+                    "radius": radius,
+                },
+            )
+            candidates.extend(r.get("candidates", []) for r in result["results"])
+        return candidates
+
     def create_place(
         self,
         name: str,
@@ -72,6 +72,41 @@ def test_create_person_with_non_ascii_name(mock_session, config):
     assert json_data["description"] == description
 
 
+def test_create_people(mock_session, config):
+    client = RestClient(config)
+
+    mock_session.reset_mock()
+    mock_session.post.return_value.ok = True
+    output = {"created": [{"wikidata_id": "Q123", "id": "123"}], "existing": []}
+    mock_session.post.return_value.json.return_value = output
+    people = [
+        {
+            "name": "María Ruiz-Tagle",
+            "wikidata_id": "Q123",
+            "wikidata_url": "http://example.com/Q123",
+            "description": None,
+        }
+    ]
+
+    result = client.create_people(people=people)
+
+    call_args = mock_session.post.call_args
+    assert call_args[0][0] == "http://test.example.com/wikidata/people/bulk"
+    assert json.loads(call_args[1]["data"].decode("utf-8")) == {"people": people}
+    assert result == output
+
+
+def test_create_people_error_handling(mock_session, config):
+    client = RestClient(config)
+
+    mock_session.reset_mock()
+    mock_session.post.return_value.ok = False
+    mock_session.post.return_value.text = "Internal Server Error"
+
+    with pytest.raises(RestClientError, match="Failed to create people"):
+        client.create_people(people=[])
+
+
 def test_create_place_with_non_ascii_name(mock_session, config):
     """Test that non-ASCII characters in place names are handled correctly"""
     client = RestClient(config)
@@ -770,9 +770,9 @@ def config():
 def mock_rest_client():
     mock_client = Mock(spec=RestClient)
     mock_client.get_tags.return_value = []
-    mock_client.create_person.return_value = "person_id"
-    mock_client.create_place.return_value = "place_id"
-    mock_client.create_time.return_value = "time_id"
+    mock_client.create_people.return_value = {"created": [], "existing": []}
+    mock_client.create_places.return_value = {"created": [], "existing": []}
+    mock_client.create_times.return_value = {"created": [], "existing": []}
     mock_client.create_event.return_value = "event_id"
     return mock_client
 
@@ -904,9 +904,19 @@ class TestBuildEvents:
 
         # Mock rest client
         mock_rest_client.get_tags.return_value = {"wikidata_ids": []}
-        mock_rest_client.create_person.return_value = {"id": "person_id"}
-        mock_rest_client.create_place.return_value = {"id": "place_id"}
-        mock_rest_client.create_time.return_value = {"id": "time_id"}
+        mock_rest_client.create_people.return_value = {
+            "created": [{"wikidata_id": "Q123", "id": "person_id"}],
+            "existing": [],
+        }
+        mock_rest_client.create_places.return_value = {
+            "created": [{"wikidata_id": "Q456", "id": "place_id"}],
+            "existing": [],
+        }
+        # created by another worker since get_tags was called
+        mock_rest_client.create_times.return_value = {
+            "created": [],
+            "existing": [{"wikidata_id": "Q789", "id": "time_id"}],
+        }
         mock_rest_client.create_event.return_value = {"id": "event_id"}
 
         with patch(
@@ -935,30 +945,44 @@ class TestBuildEvents:
                 any_order=True,
             )
 
-            mock_rest_client.create_person.assert_called_once_with(
-                name="Test Person",
-                wikidata_id="Q123",
-                wikidata_url="https://www.wikidata.org/wiki/Q123",
-                description="A test person",
+            mock_rest_client.create_people.assert_called_once_with(
+                people=[
+                    {
+                        "name": "Test Person",
+                        "wikidata_id": "Q123",
+                        "wikidata_url": "https://www.wikidata.org/wiki/Q123",
+                        "description": "A test person",
+                    }
+                ]
             )
-            mock_rest_client.create_place.assert_called_once_with(
-                name="Test Place",
-                wikidata_id="Q456",
-                wikidata_url="https://www.wikidata.org/wiki/Q456",
-                latitude=37.7749,
-                longitude=-122.4194,
-                description="A test place",
+            mock_rest_client.create_places.assert_called_once_with(
+                places=[
+                    {
+                        "name": "Test Place",
+                        "wikidata_id": "Q456",
+                        "wikidata_url": "https://www.wikidata.org/wiki/Q456",
+                        "latitude": 37.7749,
+                        "longitude": -122.4194,
+                        "description": "A test place",
+                    }
+                ]
             )
-            mock_rest_client.create_time.assert_called_once_with(
-                name="Test Time",
-                wikidata_id="Q789",
-                wikidata_url="https://www.wikidata.org/wiki/Q789",
-                date="2024-01-01",
-                calendar_model="http://www.wikidata.org/entity/Q1985727",
-                precision=11,
-                description="A test time",
+            mock_rest_client.create_times.assert_called_once_with(
+                times=[
+                    {
+                        "name": "Test Time",
+                        "wikidata_id": "Q789",
+                        "wikidata_url": "https://www.wikidata.org/wiki/Q789",
+                        "date": "2024-01-01",
+                        "calendar_model": "http://www.wikidata.org/entity/Q1985727",
+                        "precision": 11,
+                        "description": "A test time",
+                    }
+                ]
             )
             mock_rest_client.create_event.assert_called_once()
+            tags = mock_rest_client.create_event.call_args[1]["tags"]
+            assert [tag["id"] for tag in tags] == ["person_id", "place_id", "time_id"]
             mock_database.upsert_created_event.assert_called_once()
 
     def test_build_events_from_person_rest_error(
@@ -1112,8 +1136,14 @@ class TestBuildEvents:
             mock_rest_client.check_time_exists.return_value = UUID(existing_time_id)
 
             # Mock successful creation of person and place
-            mock_rest_client.create_person.return_value = {"id": "person-uuid"}
-            mock_rest_client.create_place.return_value = {"id": "place-uuid"}
+            mock_rest_client.create_people.return_value = {
+                "created": [{"wikidata_id": "Q123", "id": "person-uuid"}],
+                "existing": [],
+            }
+            mock_rest_client.create_places.return_value = {
+                "created": [{"wikidata_id": "Q456", "id": "place-uuid"}],
+                "existing": [],
+            }
 
             # Mock successful event creation
             mock_rest_client.create_event.return_value = {
@@ -1133,6 +1163,7 @@ class TestBuildEvents:
 
             # Verify create_time was NOT called (since we found an existing time)
             mock_rest_client.create_time.assert_not_called()
+            mock_rest_client.create_times.assert_not_called()
 
             # Verify the event was created with the existing time ID
             mock_rest_client.create_event.assert_called_once()
@@ -144,6 +144,38 @@ class RestClient:
             raise RestClientError(f"Failed to create time: {response.text}")
         return response.json()
 
+    @trace_time()
+    def create_people(self, people: List[dict]) -> dict:
+        """Create many person tags in one request. Each person is a dict of
+        the arguments of create_person. Returns the tags which were created
+        and those which already existed."""
+        return self._create_tags(path="people", data={"people": people})
+
+    @trace_time()
+    def create_places(self, places: List[dict]) -> dict:
+        """Create many place tags in one request. Each place is a dict of
+        the arguments of create_place. Returns the tags which were created
+        and those which already existed."""
+        return self._create_tags(path="places", data={"places": places})
+
+    @trace_time()
+    def create_times(self, times: List[dict]) -> dict:
+        """Create many time tags in one request. Each time is a dict of the
+        arguments of create_time, and must have a wikidata_id. Returns the
+        tags which were created and those which already existed."""
+        return self._create_tags(path="times", data={"times": times})
+
+    def _create_tags(self, path: str, data: dict) -> dict:
+        self._check_token_refresh()
+        response = self._session.post(
+            f"{self._base_url}/wikidata/{path}/bulk",
+            data=json.dumps(data, ensure_ascii=False).encode("utf-8"),
+            headers={"Content-Type": "application/json; charset=utf-8"},
+        )
+        if not response.ok:
+            raise RestClientError(f"Failed to create {path}: {response.text}")
+        return response.json()
+
     @trace_time()
     def check_time_exists(
         self,
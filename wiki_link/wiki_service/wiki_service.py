@@ -9,7 +9,7 @@ from wiki_service.config import WikiServiceConfig
 from wiki_service.database import Database, Item
 from wiki_service.event_factories.event_factory import get_event_factories, EventFactory
 from wiki_service.rest_client import RestClient, RestClientError
-from wiki_service.types import WikiDataItem
+from wiki_service.types import WikiDataItem, WikiEvent
 from wiki_service.utils import get_current_time
 from wiki_service.event_metrics import EventMetrics
 from wiki_service.wikidata_query_service import (
@@ -376,6 +376,94 @@ class WikiService:
             )
             return
 
+    def _get_or_create_tags(self, events: list[WikiEvent]) -> dict[str, str]:
+        """
+        Map the WikiData ID of each person, place and time tagged in the
+        events to its server ID. Tags the server doesn't have yet are created
+        with one bulk request per tag type; a tag created concurrently by
+        another worker is returned as existing. Places without coordinates
+        can't be created, and are left out.
+        """
+        people, places, times = {}, {}, {}
+        for event in events:
+            for person_tag in event.people_tags:
+                people.setdefault(person_tag.wiki_id, person_tag)
+            places.setdefault(event.place_tag.wiki_id, event.place_tag)
+            if event.time_tag.wiki_id:
+                times.setdefault(event.time_tag.wiki_id, event.time_tag)
+
+        existing_tags = self._rest_client.get_tags(
+            wikidata_ids=[*people, *places, *times]
+        )
+        id_map = {
+            tag["wikidata_id"]: tag["id"]
+            for tag in existing_tags.get("wikidata_ids", [])
+            if tag.get("id")
+        }
+
+        new_people = [
+            {
+                "name": person_tag.name,
+                "wikidata_id": wiki_id,
+                "wikidata_url": f"https://www.wikidata.org/wiki/{wiki_id}",
+                "description": self._query.get_description(id=wiki_id, language="en"),
+            }
+            for wiki_id, person_tag in people.items()
+            if wiki_id not in id_map
+        ]
+        if new_people:
+            result = self._rest_client.create_people(people=new_people)
+            id_map.update(self._bulk_tag_ids(result))
+
+        new_places = []
+        for wiki_id, place_tag in places.items():
+            if wiki_id in id_map:
+                continue
+            coords = place_tag.location.coordinates
+            if not coords:
+                continue
+            new_places.append(
+                {
+                    "name": place_tag.name,
+                    "wikidata_id": wiki_id,
+                    "wikidata_url": f"https://www.wikidata.org/wiki/{wiki_id}",
+                    "latitude": coords.latitude,
+                    "longitude": coords.longitude,
+                    "description": self._query.get_description(
+                        id=wiki_id, language="en"
+                    ),
+                }
+            )
+        if new_places:
+            result = self._rest_client.create_places(places=new_places)
+            id_map.update(self._bulk_tag_ids(result))
+
+        new_times = [
+            {
+                "name": time_tag.name,
+                "wikidata_id": wiki_id,
+                "wikidata_url": f"https://www.wikidata.org/wiki/{wiki_id}",
+                "date": time_tag.time_definition.time,
+                "calendar_model": time_tag.time_definition.calendarmodel,
+                "precision": time_tag.time_definition.precision,
+                "description": self._query.get_description(id=wiki_id, language="en"),
+            }
+            for wiki_id, time_tag in times.items()
+            if wiki_id not in id_map
+        ]
+        if new_times:
+            result = self._rest_client.create_times(times=new_times)
+            id_map.update(self._bulk_tag_ids(result))
+
+        return id_map
+
+    @staticmethod
+    def _bulk_tag_ids(result: dict) -> dict[str, str]:
+        return {
+            tag["wikidata_id"]: tag["id"]
+            for tag in [*result["created"], *result["existing"]]
+        }
+
     def _create_wiki_event(
         self, event_factory: EventFactory, wiki_id: str, entity_title: str
     ) -> None:
@@ -406,118 +494,19 @@ class WikiService:
                 f"Created {len(events)} events for {wiki_id} using {event_factory.label}"
             )
 
+            # Look up or create the tags of every event, one request per type
+            id_map = self._get_or_create_tags(events)
+
             # Process each event
             for event in events:
-                # Collect all WikiData IDs to check
-                wikidata_ids = []
-                for person_tag in event.people_tags:
-                    wikidata_ids.append(person_tag.wiki_id)
-                wikidata_ids.append(event.place_tag.wiki_id)
-                if event.time_tag.wiki_id:
-                    wikidata_ids.append(event.time_tag.wiki_id)
-
-                # Check which tags already exist
-                existing_tags = self._rest_client.get_tags(wikidata_ids=wikidata_ids)
-                id_map = {
-                    tag["wikidata_id"]: tag["id"]
-                    for tag in existing_tags.get("wikidata_ids", [])
-                }
-
-                # Create missing tags
-                for person_tag in event.people_tags:
-                    if not id_map.get(person_tag.wiki_id):
-                        if person_tag.wiki_id:
-                            description = self._query.get_description(
-                                id=person_tag.wiki_id, language="en"
-                            )
-                        else:
-                            description = None
-                        try:
-                            result = self._rest_client.create_person(
-                                name=person_tag.name,
-                                wikidata_id=person_tag.wiki_id,
-                                wikidata_url=f"https://www.wikidata.org/wiki/{person_tag.wiki_id}",
-                                description=description,
-                            )
-                            id_map[person_tag.wiki_id] = result["id"]
-                        except RestClientError as e:
-                            # handle possible race condition where this entity was created between our check and now
-                            refreshed_existing_tags = self._rest_client.get_tags(
-                                wikidata_ids=[person_tag.wiki_id]
-                            )
-                            newly_created_id = refreshed_existing_tags["wikidata_ids"][
-                                0
-                            ].get("id")
-                            if not newly_created_id:
-                                raise e
-                            id_map[person_tag.wiki_id] = newly_created_id
-
                 if not id_map.get(event.place_tag.wiki_id):
-                    coords = event.place_tag.location.coordinates
-                    if coords:
-                        if event.place_tag.wiki_id:
-                            description = self._query.get_description(
-                                id=event.place_tag.wiki_id, language="en"
-                            )
-                        else:
-                            description = None
-                        try:
-                            result = self._rest_client.create_place(
-                                name=event.place_tag.name,
-                                wikidata_id=event.place_tag.wiki_id,
-                                wikidata_url=f"https://www.wikidata.org/wiki/{event.place_tag.wiki_id}",
-                                latitude=coords.latitude,
-                                longitude=coords.longitude,
-                                description=description,
-                            )
-                            id_map[event.place_tag.wiki_id] = result["id"]
-                        except RestClientError as e:
-                            # handle possible race condition where this entity was created between our check and now
-                            refreshed_existing_tags = self._rest_client.get_tags(
-                                wikidata_ids=[event.place_tag.wiki_id]
-                            )
-                            newly_created_id = refreshed_existing_tags["wikidata_ids"][
-                                0
-                            ].get("id")
-                            if not newly_created_id:
-                                raise e
-                            id_map[event.place_tag.wiki_id] = newly_created_id
-                    else:
-                        log.error(
-                            f"Place tag {event.place_tag.wiki_id} did not contain coords - skipping."
-                        )
-                        continue
+                    log.error(
+                        f"Place tag {event.place_tag.wiki_id} did not contain coords - skipping."
+                    )
+                    continue
 
-                # Create time tag
                 if event.time_tag.wiki_id:
-                    if not id_map.get(event.time_tag.wiki_id):
-                        description = self._query.get_description(
-                            id=event.time_tag.wiki_id, language="en"
-                        )
-                        try:
-                            result = self._rest_client.create_time(
-                                name=event.time_tag.name,
-                                wikidata_id=event.time_tag.wiki_id,
-                                wikidata_url=f"https://www.wikidata.org/wiki/{event.time_tag.wiki_id}",
-                                date=event.time_tag.time_definition.time,
-                                calendar_model=event.time_tag.time_definition.calendarmodel,
-                                precision=event.time_tag.time_definition.precision,
-                                description=description,
-                            )
-                            time_id = result["id"]
-                        except RestClientError as e:
-                            # handle possible race condition where this entity was created between our check and now
-                            refreshed_existing_tags = self._rest_client.get_tags(
-                                wikidata_ids=[event.time_tag.wiki_id]
-                            )
-                            newly_created_id = refreshed_existing_tags["wikidata_ids"][
-                                0
-                            ].get("id")
-                            if not newly_created_id:
-                                raise e
-                            id_map[event.time_tag.wiki_id] = newly_created_id
-                    else:
-                        time_id = id_map[event.time_tag.wiki_id]
+                    time_id = id_map[event.time_tag.wiki_id]
                 else:
                     # Check if the time already exists
                     time_exists = self._rest_client.check_time_exists(